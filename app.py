@@ -7,18 +7,24 @@ Twilio WhatsApp webhook integration for healthcare assistance
 import os
 import logging
 from datetime import datetime
-from flask import Flask, request, jsonify
-from twilio.twiml.messaging_response import MessagingResponse
+from flask import Flask, Response, request, jsonify
 from src.chatbot import SwasthyaGuide
 from src.config_loader import Config
 from src.voice_handler import get_voice_handler
+from src.rate_limiter import get_rate_limiter
+from src.conversation_state import get_state_store
+from src.twiml_renderer import render_message, render_static, twiml_response, warm_static_cache
+from src.logging_setup import configure_logging, log_event, redact_phone, redact_text
+from src.clinic_data import get_clinic_provider
+from src.response_catalog import get_response_catalog
+from src.health_prober import get_health_prober
+from src.metrics import (
+    count_message, instrument, instrument_engine, metrics_enabled, render_metrics, stage_timer
+)
 import requests
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (queued, structured, PII redacted)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
@@ -33,10 +39,15 @@ except ValueError as e:
     logger.warning(f"Configuration warning: {e}")
 
 # Initialize database
+db_initialized = False
 try:
-    from database import init_db
-    db_manager = init_db(Config.DATABASE_URL)
+    from database import PoolSettings, init_db
+    db_manager = init_db(Config.DATABASE_URL, PoolSettings.from_config(Config),
+                         Config.DATABASE_REPLICA_URLS, Config.DB_REPLICA_COOLDOWN)
+    for pool_name, engine in db_manager.engines():
+        instrument_engine(engine, pool=pool_name)
     logger.info("Database connection initialized successfully")
+    db_initialized = True
     
     # Optionally create tables on startup (recommended for first deployment)
     # db_manager.create_tables()
@@ -45,6 +56,10 @@ except Exception as e:
     logger.error(f"Database initialization failed: {e}")
     logger.warning("Application will continue without database logging")
 
+# Without a database there is nothing for /readyz to wait for
+if not (db_initialized and Config.DATABASE_CONFIGURED):
+    get_health_prober().not_required('database')
+
 # Session management - store bot instances per user session
 user_sessions = {}
 session_timestamps = {}
@@ -52,6 +67,24 @@ SESSION_TIMEOUT = 1800  # 30 minutes in seconds
 
 logger.info("SwasthyaGuide session manager initialized")
 
+# Per-sender rate limiting and load shedding
+rate_limiter = get_rate_limiter()
+
+# Dialogue state lives in a host-local store, so any worker can continue a conversation
+state_store = get_state_store()
+
+# Serialize static replies once instead of on every request
+warm_static_cache()
+
+# Dependency checks run in the background; probes read the cached result
+get_health_prober().start()
+
+# Clinic data is reloaded in the background when the file (or clinics table) changes
+get_clinic_provider().start()
+
+# Reply templates (data/translations.json) too; the TwiML cache is re-rendered on reload
+get_response_catalog().start()
+
 
 def cleanup_old_sessions():
     """Remove sessions that haven't been used in SESSION_TIMEOUT seconds"""
@@ -63,7 +96,7 @@ def cleanup_old_sessions():
             sessions_to_remove.append(session_id)
     
     for session_id in sessions_to_remove:
-        logger.info(f"Cleaning up inactive session: {session_id[:15]}...")
+        logger.info("Cleaning up inactive session: %s", redact_phone(session_id))
         user_sessions.pop(session_id, None)
         session_timestamps.pop(session_id, None)
     
@@ -79,10 +112,10 @@ def get_or_create_session(sender: str, user_phone: str) -> SwasthyaGuide:
     
     # Update or create session
     if sender not in user_sessions:
-        logger.info(f"Creating new session for {sender[:15]}...")
+        logger.info("Creating new session for %s", redact_phone(sender))
         user_sessions[sender] = SwasthyaGuide(session_id=sender, user_phone=user_phone)
     else:
-        logger.info(f"Reusing existing session for {sender[:15]}...")
+        logger.debug("Reusing existing session for %s", redact_phone(sender))
     
     # Update timestamp
     session_timestamps[sender] = datetime.now()
@@ -103,25 +136,48 @@ def home():
 
 @app.route('/health')
 def health_check():
-    """Health check endpoint for monitoring"""
-    db_health = {'status': 'not_initialized'}
-    
-    # Check database health if available
-    try:
-        from database import get_db_manager
-        db_manager = get_db_manager()
-        db_health = db_manager.health_check()
-    except Exception as e:
-        db_health = {'status': 'unavailable', 'error': str(e)}
+    """Health check endpoint for monitoring (cached dependency status)"""
+    snapshot = get_health_prober().snapshot() or {}
+    checks = snapshot.get('checks', {})
     
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'database': db_health
+        'ready': snapshot.get('ready', False),
+        'checked_at': snapshot.get('checked_at'),
+        'database': checks.get('database', {'status': 'not_checked'})
     }), 200
 
 
+@app.route('/livez')
+def liveness():
+    """Liveness probe - the process is up and serving requests"""
+    return jsonify({'status': 'alive'}), 200
+
+
+@app.route('/readyz')
+def readiness():
+    """Readiness probe - answered from the background prober's last snapshot"""
+    snapshot = get_health_prober().snapshot()
+    if snapshot is None:
+        return jsonify({'status': 'starting', 'ready': False}), 503
+    
+    body = {key: value for key, value in snapshot.items() if key != 'checked_monotonic'}
+    body['status'] = 'ready' if snapshot['ready'] else 'not_ready'
+    return jsonify(body), 200 if snapshot['ready'] else 503
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics (all workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+    if not metrics_enabled():
+        return jsonify({'error': 'metrics disabled'}), 404
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
+
 @app.route('/whatsapp', methods=['GET', 'POST'])
+@instrument('webhook')
 def whatsapp_webhook():
     """
     WhatsApp webhook endpoint
@@ -130,18 +186,31 @@ def whatsapp_webhook():
     """
     # Handle GET request for webhook verification
     if request.method == 'GET':
-        logger.info("GET request received - webhook verification")
+        logger.debug("GET request received - webhook verification")
         return jsonify({
             'status': 'webhook active',
             'message': 'WhatsApp webhook is ready to receive messages'
         }), 200
     
+    # Admission control - reject floods before creating sessions or downloading media
+    sender_id = request.values.get('From', '')
+    has_media = request.values.get('NumMedia', '0') not in ('', '0')
+    known_session = user_sessions.get(sender_id)
+    reply_language = known_session.user_context.get('language') if known_session else None
+    
+    if not rate_limiter.allow_sender(sender_id, is_media=has_media):
+        logger.warning("Rate limit exceeded for %s (media: %s)", redact_phone(sender_id), has_media)
+        count_message('media' if has_media else 'text', 'rate_limited')
+        return twiml_response(render_static('busy', reply_language))
+    
+    if not rate_limiter.try_acquire():
+        logger.warning("Concurrency limit reached - shedding load")
+        count_message('media' if has_media else 'text', 'shed')
+        return twiml_response(render_static('busy', reply_language))
+    
     # Handle POST request for incoming messages
+    session_bot = None
     try:
-        # Log the incoming request for debugging
-        logger.info(f"Webhook triggered - Method: {request.method}")
-        logger.info(f"Request data: {request.values}")
-        
         # Extract incoming message from Twilio request
         incoming_msg = request.values.get('Body', '').strip()
         sender = request.values.get('From', '')
@@ -152,22 +221,25 @@ def whatsapp_webhook():
         
         # Get or create session-specific bot instance (maintain conversation context)
         session_bot = get_or_create_session(sender, user_phone)
+        # One key lookup: the previous message may have gone to another worker
+        session_bot.restore_state(state_store)
         
-        # Log incoming message (remove PII in production)
-        logger.info(f"Received message: '{incoming_msg}' from {sender[:15]}... (Media: {num_media})")
+        # Log incoming message (phone and text are redacted when formatted)
+        log_event(logger, logging.INFO, 'message_received',
+                  sender=sender, body=incoming_msg, num_media=num_media)
         
         # Check if image/media is attached
         if num_media > 0:
-            logger.info(f"Processing {num_media} media file(s)")
             media_url = request.values.get('MediaUrl0', '')
             media_type = request.values.get('MediaContentType0', '')
             
-            logger.info(f"Media URL: {media_url}, Type: {media_type}")
+            log_event(logger, logging.DEBUG, 'media_received', verbose=True,
+                      num_media=num_media, media_type=media_type)
             
             # --- VOICE MESSAGE HANDLING ---
             # Check if it's a voice/audio message
             if media_type and ('audio' in media_type.lower() or 'ogg' in media_type.lower()):
-                logger.info(f"🎤 Voice message detected! Type: {media_type}")
+                logger.info("🎤 Voice message detected! Type: %s", media_type)
                 
                 try:
                     # Get voice handler
@@ -194,17 +266,16 @@ def whatsapp_webhook():
                     if not transcribed_text:
                         # Voice transcription failed
                         error_msg = voice_handler.get_error_message('unclear', user_language)
-                        resp = MessagingResponse()
-                        resp.message(error_msg)
-                        return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                        count_message('voice', 'unclear')
+                        return twiml_response(render_message(error_msg))
                     
-                    logger.info(f"✅ Voice transcribed: '{transcribed_text}'")
+                    log_event(logger, logging.INFO, 'voice_transcribed', transcript=transcribed_text)
                     
                     # Process transcribed text through chatbot
                     bot_text_response = session_bot.process_message(transcribed_text, message_type='voice')
                     
                     # Log what we heard from user
-                    logger.info(f"📝 Sending text response: {bot_text_response[:100]}...")
+                    log_event(logger, logging.DEBUG, 'voice_reply', verbose=True, response=bot_text_response)
                     
                     # Convert bot's text response to speech
                     logger.info("🔊 Converting response to speech...")
@@ -214,13 +285,10 @@ def whatsapp_webhook():
                         voice_gender='FEMALE'
                     )
                     
-                    resp = MessagingResponse()
-                    msg = resp.message()
-                    
                     # Send both text and audio response
                     # First, add transcription confirmation (so user knows we understood)
                     confirmation = f"🎤 आपने कहा: {transcribed_text}\n\n" if user_language == 'hindi' else f"🎤 You said: {transcribed_text}\n\n"
-                    msg.body(confirmation + bot_text_response)
+                    reply_text = confirmation + bot_text_response
                     
                     # Attach audio response if synthesis succeeded
                     if audio_response:
@@ -229,17 +297,17 @@ def whatsapp_webhook():
                         # For now, send text response only
                         # TODO: Implement audio file upload to cloud storage
                         logger.info("✅ Audio response generated (upload to cloud storage required)")
-                        msg.body(msg.body() + "\n\n🔊 [Audio response generated - cloud storage integration pending]")
+                        reply_text += "\n\n🔊 [Audio response generated - cloud storage integration pending]"
                     
-                    return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                    count_message('voice', 'ok')
+                    return twiml_response(render_message(reply_text))
                     
                 except Exception as voice_error:
-                    logger.error(f"Voice message processing failed: {voice_error}", exc_info=True)
+                    logger.error("Voice message processing failed: %s", voice_error, exc_info=True)
+                    count_message('voice', 'error')
                     user_language = session_bot.user_context.get('language', 'hindi')
                     error_msg = voice_handler.get_error_message('service_unavailable', user_language)
-                    resp = MessagingResponse()
-                    resp.message(error_msg)
-                    return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                    return twiml_response(render_message(error_msg))
             
             # --- IMAGE MESSAGE HANDLING ---
             # Download and process image
@@ -258,17 +326,18 @@ def whatsapp_webhook():
                 # Download image from Twilio's media URL with authentication
                 # Twilio requires HTTP Basic Auth to access media files
                 auth = (Config.TWILIO_ACCOUNT_SID, Config.TWILIO_AUTH_TOKEN)
-                media_response = requests.get(media_url, auth=auth, timeout=15)
-                
-                # Check response status
-                if media_response.status_code == 401:
-                    logger.error("Twilio authentication failed - check credentials in .env")
-                    raise ValueError("Authentication failed. Please contact support.")
+                with stage_timer('media_download'):
+                    media_response = requests.get(media_url, auth=auth, timeout=15)
                     
-                media_response.raise_for_status()
-                image_data = media_response.content
+                    # Check response status
+                    if media_response.status_code == 401:
+                        logger.error("Twilio authentication failed - check credentials in .env")
+                        raise ValueError("Authentication failed. Please contact support.")
+                        
+                    media_response.raise_for_status()
+                    image_data = media_response.content
                 
-                logger.info(f"Image downloaded successfully: {len(image_data)} bytes, Type: {media_type}")
+                logger.info("Image downloaded successfully: %d bytes, Type: %s", len(image_data), media_type)
                 
                 # Validate image data
                 if len(image_data) < 100:
@@ -277,15 +346,14 @@ def whatsapp_webhook():
                 # Process image with caption/message
                 logger.info("Processing image through analyzer...")
                 bot_response = session_bot.process_image_message(image_data, incoming_msg, media_type)
-                logger.info(f"Image processed successfully, response length: {len(bot_response)}")
+                logger.info("Image processed successfully, response length: %d", len(bot_response))
                 
-                resp = MessagingResponse()
-                resp.message(bot_response)
-                return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                count_message('image', 'ok')
+                return twiml_response(render_message(bot_response))
                 
             except requests.exceptions.RequestException as e:
-                logger.error(f"Error downloading image from Twilio: {str(e)}", exc_info=True)
-                resp = MessagingResponse()
+                logger.error("Error downloading image from Twilio: %s", e, exc_info=True)
+                count_message('image', 'download_error')
                 
                 # Provide more specific error message
                 if "401" in str(e) or "Unauthorized" in str(e):
@@ -293,63 +361,58 @@ def whatsapp_webhook():
                 else:
                     error_msg = "छवि डाउनलोड करने में त्रुटि। कृपया पुनः प्रयास करें। / Error downloading image. Please try again."
                 
-                resp.message(error_msg)
-                return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                return twiml_response(render_message(error_msg))
             
             except ValueError as e:
-                logger.error(f"Image validation error: {str(e)}", exc_info=True)
-                resp = MessagingResponse()
-                resp.message(f"छवि त्रुटि: {str(e)} / Image error: {str(e)}")
-                return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                logger.error("Image validation error: %s", e, exc_info=True)
+                count_message('image', 'invalid')
+                return twiml_response(render_message(f"छवि त्रुटि: {str(e)} / Image error: {str(e)}"))
                 
             except Exception as e:
-                logger.error(f"Error processing image: {str(e)}", exc_info=True)
-                logger.error(f"Error type: {type(e).__name__}")
-                resp = MessagingResponse()
+                logger.error("Error processing image (%s): %s", type(e).__name__, e, exc_info=True)
+                count_message('image', 'error')
                 error_msg = f"छवि संसाधित करने में त्रुटि: {type(e).__name__} / Error processing image: {type(e).__name__}"
-                resp.message(error_msg)
-                return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+                return twiml_response(render_message(error_msg))
         
         # Validate text message
         if not incoming_msg:
             logger.warning("Empty message received")
-            resp = MessagingResponse()
-            resp.message("कृपया अपना संदेश भेजें। / Please send your message.")
-            return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+            count_message('text', 'empty')
+            return twiml_response(render_static('error_empty'))
         
         # Check message length
         if len(incoming_msg) > Config.MAX_MESSAGE_LENGTH:
-            logger.warning(f"Message too long: {len(incoming_msg)} characters")
-            resp = MessagingResponse()
-            resp.message("संदेश बहुत लंबा है। कृपया छोटा संदेश भेजें। / Message too long. Please send a shorter message.")
-            return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+            logger.warning("Message too long: %d characters", len(incoming_msg))
+            count_message('text', 'too_long')
+            return twiml_response(render_static('error_too_long'))
         
         # Process message through SwasthyaGuide bot
-        logger.info(f"Processing message through bot...")
         try:
             bot_response = session_bot.process_message(incoming_msg)
-            logger.info(f"Bot response generated successfully: {len(bot_response)} characters")
-            logger.info(f"Bot response preview: {bot_response[:150]}...")
+            log_event(logger, logging.DEBUG, 'bot_reply', verbose=True,
+                      sender=sender, response=bot_response, length=len(bot_response))
         except Exception as bot_error:
-            logger.error(f"Error in bot.process_message(): {str(bot_error)}", exc_info=True)
+            logger.error("Error in bot.process_message(): %s", bot_error, exc_info=True)
             raise  # Re-raise to be caught by outer handler
         
-        # Create Twilio response
-        resp = MessagingResponse()
-        resp.message(bot_response)
+        count_message('text', 'ok')
         
-        logger.info("Response sent successfully")
-        return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+        # Create Twilio response (static replies come pre-rendered)
+        return twiml_response(render_message(bot_response))
         
     except Exception as e:
-        logger.error(f"CRITICAL ERROR in whatsapp_webhook: {str(e)}", exc_info=True)
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error occurred while processing: '{incoming_msg if 'incoming_msg' in locals() else 'N/A'}'")
+        logger.error("CRITICAL ERROR in whatsapp_webhook (%s): %s", type(e).__name__, e, exc_info=True)
+        logger.error("Error occurred while processing: %s",
+                     redact_text(incoming_msg) if 'incoming_msg' in locals() else 'N/A')
+        count_message('media' if has_media else 'text', 'error')
         
         # Send error message to user
-        resp = MessagingResponse()
-        resp.message("क्षमा करें, कुछ गलत हो गया। कृपया दोबारा प्रयास करें। / Sorry, something went wrong. Please try again.")
-        return str(resp), 200, {'Content-Type': 'text/xml; charset=utf-8'}
+        return twiml_response(render_static('error_generic'))
+    
+    finally:
+        if session_bot is not None:
+            session_bot.save_state(state_store)
+        rate_limiter.release()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+SwasthyaGuide Benchmarks
+Run a suite with: python -m benchmarks.<name>
+"""
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Connection pool checkout overhead benchmark
+
+Measures one checkout + checkin from the pool (no SQL) for:
+    plain     QueuePool, no listeners (floor)
+    legacy    the old global-Pool debug listeners, stacked once per
+              DatabaseManager created in the process
+    disabled  DatabaseManager pool with metrics off
+    enabled   DatabaseManager pool with per-engine pool metrics
+
+Each variant runs in its own process because metrics are switched on
+at import time and global Pool listeners cannot be removed cleanly.
+
+Usage:
+    python -m benchmarks.bench_db_pool [--iterations N] [--stacked 3]
+    python -m benchmarks.bench_db_pool --baseline benchmarks/results/baseline_db_pool.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import (
+    ROOT_DIR, compare_to_baseline, measure, measure_allocations, print_table, write_results
+)
+
+VARIANTS = ['plain', 'legacy', 'disabled', 'enabled']
+
+
+def build_engine(variant: str, stacked: int):
+    """Engine for one variant, on a throwaway SQLite file"""
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    if variant in ('plain', 'legacy'):
+        import logging
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.pool import Pool, QueuePool
+
+        engine = create_engine(url, poolclass=QueuePool, pool_size=5, max_overflow=10)
+        if variant == 'legacy':
+            logger = logging.getLogger('database.connection')
+            for _ in range(stacked):
+                # What DatabaseManager._add_pool_listeners used to register
+                event.listen(Pool, 'connect', lambda c, r: logger.debug("New database connection established"))
+                event.listen(Pool, 'checkout', lambda c, r, p: logger.debug("Connection checked out from pool"))
+                event.listen(Pool, 'checkin', lambda c, r: logger.debug("Connection returned to pool"))
+        return engine
+
+    from database import DatabaseManager, PoolSettings
+    from src.metrics import instrument_engine, metrics_enabled
+
+    manager = DatabaseManager(url, PoolSettings(pool_size=5, max_overflow=10))
+    if variant == 'enabled':
+        assert metrics_enabled(), 'prometheus_client is required for the enabled variant'
+        instrument_engine(manager.engine)
+    return manager.engine
+
+
+def run_variant(variant: str, iterations: int, stacked: int) -> dict:
+    """Checkout/checkin timing for one variant (runs in the child process)"""
+    engine = build_engine(variant, stacked)
+    pool = engine.pool
+
+    def checkout():
+        pool.connect().close()
+
+    result = measure(checkout, iterations=iterations)
+    result.update(measure_allocations(checkout, iterations=min(iterations, 2000)))
+    return result
+
+
+def spawn(variant: str, args) -> dict:
+    """Run one variant in a fresh interpreter and read its JSON result"""
+    env = dict(os.environ, METRICS_ENABLED='True' if variant == 'enabled' else 'False')
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    command = [sys.executable, '-m', 'benchmarks.bench_db_pool', '--variant', variant,
+               '--iterations', str(args.iterations), '--stacked', str(args.stacked)]
+    result = subprocess.run(command, cwd=ROOT_DIR, env=env, capture_output=True,
+                            text=True, timeout=600)
+    if result.returncode != 0:
+        raise RuntimeError(f"{variant} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Connection pool checkout overhead')
+    parser.add_argument('--iterations', type=int, default=20000, help='Checkouts per timing batch')
+    parser.add_argument('--stacked', type=int, default=3,
+                        help='DatabaseManagers created, i.e. stacked legacy listeners')
+    parser.add_argument('--only', nargs='+', choices=VARIANTS, help='Variants to run')
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Result JSON path')
+    parser.add_argument('--baseline', help='Previous result JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed ns/op slowdown')
+    args = parser.parse_args(argv)
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.iterations, args.stacked)))
+        return 0
+
+    results = {'config': {'iterations': args.iterations, 'stacked': args.stacked}, 'variants': {}}
+    for variant in args.only or VARIANTS:
+        results['variants'][variant] = spawn(variant, args)
+
+    floor = results['variants'].get('plain', {}).get('ns_per_op')
+    rows = []
+    for variant, r in results['variants'].items():
+        rows.append({'variant': variant, 'ns/op': r['ns_per_op'], 'bytes/op': r['bytes_per_op'],
+                     'overhead ns': r['ns_per_op'] - floor if floor else None})
+    print_table(rows, ['variant', 'ns/op', 'overhead ns', 'bytes/op'])
+    print(f"\nResults written to {write_results('db_pool', results, args.output)}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
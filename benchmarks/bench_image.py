@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Image analysis benchmark and profiler
+
+Runs ImageAnalyzer.analyze_skin_condition and each of its stages over
+synthetic JPEG/PNG/WebP skin photos from 100 px to 12 MP. Reports
+latency, peak RSS growth and Python/numpy allocations per stage. The
+Hugging Face call goes to a local stub, so runs are offline and
+deterministic.
+
+Usage:
+    python -m benchmarks.bench_image
+    python -m benchmarks.bench_image --sizes 640x480 4000x3000 --formats JPEG
+    python -m benchmarks.bench_image --profile benchmarks/results/profiles
+"""
+
+import argparse
+import cProfile
+import gc
+import io
+import logging
+import os
+import pstats
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import compare_to_baseline, print_table, write_results
+from benchmarks.payloads import synthetic_skin_image
+from benchmarks.stubs import StubServer
+
+# 100 px up to 12 MP
+DEFAULT_SIZES = ['100x100', '320x240', '640x480', '1280x960', '1920x1440', '3000x2000', '4000x3000']
+DEFAULT_FORMATS = ['JPEG', 'PNG', 'WEBP']
+CONTENT_TYPES = {'JPEG': 'image/jpeg', 'PNG': 'image/png', 'WEBP': 'image/webp'}
+
+
+def current_rss() -> int:
+    """Resident set size in bytes (Linux /proc, falls back to peak RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RssSampler:
+    """Polls RSS in a thread while a block runs and keeps the maximum"""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.baseline = current_rss()
+        self.peak = self.baseline
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+        return False
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(self.interval)
+
+    @property
+    def growth(self) -> int:
+        return self.peak - self.baseline
+
+
+def measure_stage(func: Callable[[], object], repeat: int) -> Dict:
+    """Latency over `repeat` runs, plus RSS growth and allocation peak of one run"""
+    func()  # warm-up (also surfaces exceptions before timing)
+
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    with RssSampler() as rss:
+        func()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, alloc_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'max_ms': max(samples),
+        'rss_growth_mb': rss.growth / 2 ** 20,
+        'alloc_peak_mb': alloc_peak / 2 ** 20,
+    }
+
+
+def build_stages(analyzer, image_data: bytes, content_type: str) -> List[Tuple[str, Callable]]:
+    """
+    One callable per pipeline stage, each fed the previous stage's output
+    (computed once up front so stages are timed in isolation)
+    """
+    decoded = analyzer._decode_image(image_data)
+    resized = analyzer._downscale(decoded)
+    enhanced = analyzer._enhance_image(resized)
+    colors = analyzer.analyze_colors(enhanced)
+    texture = analyzer.analyze_texture(enhanced)
+    conditions = analyzer.detect_skin_condition_type(colors, texture)
+    severity = analyzer._assess_severity(colors, texture)
+    ai_analysis = analyzer.analyze_with_ai(image_data)
+
+    return [
+        ('validate', lambda: analyzer.validate_image(image_data, content_type)),
+        ('decode', lambda: analyzer._decode_image(image_data).load()),
+        ('resize', lambda: analyzer._downscale(decoded)),
+        ('enhance', lambda: analyzer._enhance_image(resized)),
+        ('color', lambda: analyzer.analyze_colors(enhanced)),
+        ('texture', lambda: analyzer.analyze_texture(enhanced)),
+        ('severity', lambda: (analyzer.detect_skin_condition_type(colors, texture),
+                              analyzer._assess_severity(colors, texture))),
+        ('recommendations', lambda: (analyzer._get_detailed_recommendations(
+            conditions, severity, 'hinglish', ai_analysis),
+            analyzer._get_next_steps(severity, 'hinglish'))),
+        ('hf_stub', lambda: analyzer.analyze_with_ai(image_data)),
+        ('total', lambda: analyzer.analyze_skin_condition(image_data, 'hinglish')),
+    ]
+
+
+def profile_total(analyzer, image_data: bytes, path: str, top: int = 15):
+    """cProfile one full analysis; writes <path>.prof and prints the top functions"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    analyzer.analyze_skin_condition(image_data, 'hinglish')
+    profiler.disable()
+
+    profiler.dump_stats(path + '.prof')
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+    with open(path + '.txt', 'w', encoding='utf-8') as f:
+        f.write(stream.getvalue())
+    print(stream.getvalue())
+
+
+def run(args) -> Dict:
+    stub = StubServer(hf_latency=args.hf_latency_ms / 1000).start()
+    os.environ['HUGGINGFACE_API_KEY'] = 'hf_bench_token'
+    os.environ['HUGGINGFACE_API_URL'] = stub.hf_url
+
+    from src.image_analyzer import ImageAnalyzer
+    analyzer = ImageAnalyzer()
+    analyzer.hf_api_url = stub.hf_url
+    analyzer.ai_enabled = True
+
+    results = {'config': {'hf_latency_ms': args.hf_latency_ms, 'repeat': args.repeat}, 'images': {}}
+    for size in args.sizes:
+        width, height = (int(v) for v in size.lower().split('x'))
+        for fmt in args.formats:
+            image_data = synthetic_skin_image(width, height, fmt=fmt, seed=width)
+            key = f"{fmt.lower()}_{width}x{height}"
+            entry = {
+                'format': fmt, 'width': width, 'height': height,
+                'megapixels': round(width * height / 1e6, 2),
+                'file_kb': round(len(image_data) / 1024, 1),
+            }
+
+            valid, message, _ = analyzer.validate_image(image_data, CONTENT_TYPES[fmt])
+            entry['valid'] = valid
+            if not valid:
+                # Still time the rejection path - it is what users get
+                entry['rejected'] = message
+                entry['stages'] = {'validate': measure_stage(
+                    lambda: analyzer.validate_image(image_data, CONTENT_TYPES[fmt]), args.repeat)}
+                results['images'][key] = entry
+                print(f"{key}: rejected ({message})")
+                continue
+
+            # Big images are slow - fewer repeats keep the run short
+            repeat = args.repeat if width * height <= 2_000_000 else max(1, args.repeat // 3)
+            entry['stages'] = {name: measure_stage(func, repeat)
+                               for name, func in build_stages(analyzer, image_data, CONTENT_TYPES[fmt])}
+            analyzer.analysis_history.clear()
+            results['images'][key] = entry
+            print(f"{key}: total {entry['stages']['total']['median_ms']:.1f} ms")
+
+            if args.profile:
+                os.makedirs(args.profile, exist_ok=True)
+                profile_total(analyzer, image_data, os.path.join(args.profile, key))
+
+    stub.stop()
+    results['process_peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return results
+
+
+def report(results: Dict):
+    stage_names = ['validate', 'decode', 'resize', 'enhance', 'color', 'texture',
+                   'severity', 'recommendations', 'hf_stub', 'total']
+    rows = []
+    for key, entry in results['images'].items():
+        row = {'image': key, 'KB': entry['file_kb']}
+        for name in stage_names:
+            stage = entry['stages'].get(name)
+            row[name] = stage['median_ms'] if stage else None
+        rows.append(row)
+    print('\nMedian latency (ms) per stage')
+    print_table(rows, ['image', 'KB'] + stage_names)
+
+    rows = [{'image': key,
+             'rss_growth_mb': entry['stages'].get('total', entry['stages']['validate'])['rss_growth_mb'],
+             'alloc_peak_mb': entry['stages'].get('total', entry['stages']['validate'])['alloc_peak_mb']}
+            for key, entry in results['images'].items()]
+    print('\nMemory for one full analysis')
+    print_table(rows, ['image', 'rss_growth_mb', 'alloc_peak_mb'])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Image analysis benchmark')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='WIDTHxHEIGHT')
+    parser.add_argument('--formats', nargs='+', default=DEFAULT_FORMATS, choices=DEFAULT_FORMATS)
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per stage')
+    parser.add_argument('--hf-latency-ms', type=float, default=0, help='Stub Hugging Face latency')
+    parser.add_argument('--profile', metavar='DIR', help='Write cProfile output per image to DIR')
+    parser.add_argument('--output', help='Result JSON path')
+    parser.add_argument('--baseline', help='Previous result JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed median slowdown')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+
+    results = run(args)
+    report(results)
+    print(f"\nResults written to {write_results('image', results, args.output)}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, metric='median_ms',
+                                          tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
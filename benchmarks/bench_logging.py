@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Logging overhead benchmark
+
+Compares the per-request logging cost of the old webhook (f-strings,
+synchronous StreamHandler) with the queued, structured setup in
+src/logging_setup.py, at INFO and with the level filtered out.
+
+Usage:
+    python -m benchmarks.bench_logging [--iterations N] [--output PATH] [--baseline PATH]
+"""
+
+import argparse
+import io
+import logging
+import sys
+
+from benchmarks.common import (
+    compare_to_baseline, measure, measure_allocations, print_table, write_results
+)
+from src import logging_setup
+from src.logging_setup import configure_logging, log_event, stop_logging
+
+SENDER = 'whatsapp:+919876543210'
+MESSAGE = 'Mujhe 3 din se bukhar aur sir dard hai, kya karu?'
+RESPONSE = 'Bukhar ke liye aaram karein, paani zyada piyein... ' * 8
+REQUEST_VALUES = {
+    'SmsMessageSid': 'SM' + 'a' * 32, 'NumMedia': '0', 'ProfileName': 'Test User',
+    'WaId': '919876543210', 'Body': MESSAGE, 'To': 'whatsapp:+14155238886',
+    'From': SENDER, 'MessageSid': 'SM' + 'b' * 32, 'AccountSid': 'AC' + 'c' * 32,
+}
+
+logger = logging.getLogger('bench.webhook')
+
+
+class NullStream(io.TextIOBase):
+    """Discards output so only formatting/queueing cost is measured"""
+
+    def write(self, s):
+        return len(s)
+
+
+def legacy_request():
+    """What the webhook logged per text message before structured logging"""
+    logger.info(f"Webhook triggered - Method: POST")
+    logger.info(f"Request data: {REQUEST_VALUES}")
+    logger.info(f"Received message: '{MESSAGE}' from {SENDER[:15]}... (Media: 0)")
+    logger.info(f"Processing message through bot...")
+    logger.info(f"Bot response generated successfully: {len(RESPONSE)} characters")
+    logger.info(f"Bot response preview: {RESPONSE[:150]}...")
+    logger.info("Response sent successfully")
+
+
+def structured_request():
+    """What the webhook logs per text message now"""
+    log_event(logger, logging.INFO, 'message_received', sender=SENDER, body=MESSAGE, num_media=0)
+    log_event(logger, logging.DEBUG, 'bot_reply', verbose=True,
+              sender=SENDER, response=RESPONSE, length=len(RESPONSE))
+
+
+def setup_legacy(level: int):
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(NullStream())
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def setup_structured(level: int, log_format: str):
+    configure_logging(level=logging.getLevelName(level), log_format=log_format, stream=NullStream())
+
+
+def run(iterations: int) -> dict:
+    scenarios = [
+        ('legacy', 'INFO', lambda: setup_legacy(logging.INFO), legacy_request),
+        ('legacy', 'WARNING', lambda: setup_legacy(logging.WARNING), legacy_request),
+        ('structured_text', 'INFO', lambda: setup_structured(logging.INFO, 'text'), structured_request),
+        ('structured_json', 'INFO', lambda: setup_structured(logging.INFO, 'json'), structured_request),
+        ('structured_json', 'DEBUG', lambda: setup_structured(logging.DEBUG, 'json'), structured_request),
+        ('structured_json', 'WARNING', lambda: setup_structured(logging.WARNING, 'json'), structured_request),
+    ]
+
+    results = {}
+    for name, level, setup, func in scenarios:
+        setup()
+        timing = measure(func, iterations=iterations)
+        timing.update(measure_allocations(func, iterations=min(iterations, 2000)))
+        # Let the listener drain so queued records do not leak into the next scenario
+        stop_logging()
+        results.setdefault(name, {})[level] = timing
+
+    stop_logging()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--output', help='Result JSON path')
+    parser.add_argument('--baseline', help='Previous result JSON to compare against')
+    args = parser.parse_args(argv)
+
+    # Sample rate as configured in production
+    logging_setup.Config.LOG_SAMPLE_RATE = 0.1
+
+    results = run(args.iterations)
+
+    rows = [
+        {'setup': name, 'level': level, 'ns/request': r['ns_per_op'], 'bytes/request': r['bytes_per_op']}
+        for name, levels in results.items() for level, r in levels.items()
+    ]
+    print_table(rows, ['setup', 'level', 'ns/request', 'bytes/request'])
+    print(f"\nResults written to {write_results('logging', results, args.output)}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
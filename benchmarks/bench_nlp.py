@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+NLP micro-benchmarks
+
+Times the per-message text functions over a generated, labelled corpus
+and checks their answers against the labels, so an optimization that
+changes behavior shows up as an accuracy drop next to the speedup.
+
+Usage:
+    python -m benchmarks.bench_nlp [--size N] [--only detect_language ...]
+    python -m benchmarks.bench_nlp --baseline benchmarks/results/baseline_nlp.json
+"""
+
+import argparse
+import logging
+import sys
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from benchmarks.common import (
+    compare_to_baseline, measure, measure_allocations, print_table, write_results
+)
+from benchmarks.corpus import LENGTH_CLASSES, UNCHECKED, generate_corpus
+from src.clinic_finder import check_for_clinic_request, extract_location
+from src.emergency_handler import detect_emergency
+from src.language_detector import detect_language
+from src.message_analysis import analyze_message
+from src.symptom_checker import extract_symptoms
+
+# name -> (function, label key, output normalizer)
+FUNCTIONS: Dict[str, tuple] = {
+    'detect_language': (detect_language, 'language', lambda out: out),
+    'extract_symptoms': (extract_symptoms, 'symptoms', sorted),
+    'detect_emergency': (detect_emergency, 'emergency', bool),
+    'check_for_clinic_request': (check_for_clinic_request, 'clinic_request', bool),
+    'extract_location': (extract_location, 'location', lambda out: out),
+    # Every stage above behind the analysis cache; repeats in the corpus are hits
+    'analyze_message': (analyze_message, 'language', lambda out: out.language),
+}
+
+
+def check_accuracy(func: Callable, label: str, normalize: Callable,
+                   corpus: List[Dict]) -> Dict:
+    """Fraction of labelled messages answered correctly, plus the misses"""
+    checked, correct = 0, 0
+    misses = {}
+    for item in corpus:
+        expected = item[label]
+        if expected is UNCHECKED:
+            continue
+        checked += 1
+        actual = normalize(func(item['text']))
+        if actual == expected:
+            correct += 1
+        elif item['seed_id'] not in misses:
+            # One example per seed message is enough to find the bug
+            misses[item['seed_id']] = {'text': item['text'], 'expected': expected, 'actual': actual}
+    return {
+        'checked': checked,
+        'accuracy': correct / checked if checked else 1.0,
+        'misses': list(misses.values()),
+    }
+
+
+def bench_function(name: str, corpus: List[Dict], iterations: int) -> Dict:
+    """ns/op and allocations per length class, and accuracy over the whole corpus"""
+    func, label, normalize = FUNCTIONS[name]
+    by_class = defaultdict(list)
+    for item in corpus:
+        by_class[item['length_class']].append(item['text'])
+
+    result = {'by_length': {}}
+    for length_class in LENGTH_CLASSES:
+        texts = by_class.get(length_class)
+        if not texts:
+            continue
+        position = [0]
+
+        def call():
+            text = texts[position[0]]
+            position[0] = (position[0] + 1) % len(texts)
+            return func(text)
+
+        timing = measure(call, iterations=iterations)
+        timing.update(measure_allocations(call, iterations=min(iterations, 2000)))
+        timing['mean_chars'] = sum(len(t) for t in texts) / len(texts)
+        result['by_length'][length_class] = timing
+
+    all_texts = [item['text'] for item in corpus]
+    position = [0]
+
+    def call_any():
+        text = all_texts[position[0]]
+        position[0] = (position[0] + 1) % len(all_texts)
+        return func(text)
+
+    result.update(measure(call_any, iterations=iterations))
+    result.update(measure_allocations(call_any, iterations=min(iterations, 2000)))
+    result.update(check_accuracy(func, label, normalize, corpus))
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='NLP layer micro-benchmarks')
+    parser.add_argument('--size', type=int, default=2000, help='Generated corpus size')
+    parser.add_argument('--iterations', type=int, default=5000, help='Calls per timing batch')
+    parser.add_argument('--only', nargs='+', choices=sorted(FUNCTIONS), help='Functions to run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Result JSON path')
+    parser.add_argument('--baseline', help='Previous result JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Allowed ns/op slowdown')
+    args = parser.parse_args(argv)
+
+    # extract_location logs at INFO - measure the function, not the logging
+    logging.disable(logging.INFO)
+
+    corpus = generate_corpus(args.size, seed=args.seed)
+    names = args.only or list(FUNCTIONS)
+    results = {'corpus': {'size': len(corpus), 'seed': args.seed}, 'functions': {}}
+    for name in names:
+        results['functions'][name] = bench_function(name, corpus, args.iterations)
+
+    rows = [{'function': name, 'ns/op': r['ns_per_op'], 'bytes/op': r['bytes_per_op'],
+             'short': r['by_length'].get('short', {}).get('ns_per_op'),
+             'long': r['by_length'].get('long', {}).get('ns_per_op'),
+             'accuracy': f"{r['accuracy']:.1%}"}
+            for name, r in results['functions'].items()]
+    print_table(rows, ['function', 'ns/op', 'bytes/op', 'short', 'long', 'accuracy'])
+
+    for name, r in results['functions'].items():
+        for miss in r['misses']:
+            print(f"  {name}: {miss['text'][:50]!r} expected {miss['expected']!r} got {miss['actual']!r}")
+
+    print(f"\nResults written to {write_results('nlp', results, args.output)}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, tolerance=args.tolerance)
+        # Any accuracy drop is a behavior change, not noise
+        regressions += compare_to_baseline(results, args.baseline, metric='accuracy',
+                                           tolerance=0.0, higher_is_better=True)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Shared benchmark helpers
+Timing, allocation tracking, percentiles and JSON result files
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Repo root on sys.path so `python benchmarks/bench_x.py` works too
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        samples: Measurements (any order)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value (0.0 for no samples)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples_ns: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean of nanosecond samples"""
+    count = len(samples_ns)
+    return {
+        'count': count,
+        'mean_ns': sum(samples_ns) / count if count else 0.0,
+        'p50_ns': percentile(samples_ns, 50),
+        'p95_ns': percentile(samples_ns, 95),
+        'p99_ns': percentile(samples_ns, 99),
+    }
+
+
+def measure(func: Callable[[], object], iterations: int = 10000,
+            warmup: int = 100, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time a callable
+
+    Runs `repeat` batches of `iterations` calls and reports ns/op for the
+    fastest batch (least disturbed by the rest of the machine).
+
+    Args:
+        func: Zero-argument callable
+        iterations: Calls per batch
+        warmup: Calls before timing starts
+        repeat: Number of batches
+
+    Returns:
+        Dict with ns_per_op, best/worst batch and iterations
+    """
+    for _ in range(warmup):
+        func()
+
+    batches = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(iterations):
+                func()
+            batches.append((time.perf_counter_ns() - start) / iterations)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        'ns_per_op': min(batches),
+        'worst_ns_per_op': max(batches),
+        'iterations': iterations,
+        'repeat': repeat,
+    }
+
+
+def measure_allocations(func: Callable[[], object], iterations: int = 1000) -> Dict[str, float]:
+    """
+    Memory allocated per call, with tracemalloc
+
+    bytes_per_op is the mean transient peak of a call (what it allocates
+    while running); retained_bytes_per_op is what is still held afterwards.
+
+    Returns:
+        Dict with bytes_per_op, retained_bytes_per_op and blocks_per_op
+    """
+    func()  # populate caches before tracing
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        before = tracemalloc.take_snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        for _ in range(iterations):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            peak_total += tracemalloc.get_traced_memory()[1] - current
+        end_current, _ = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(max(stat.count_diff, 0) for stat in stats)
+    return {
+        'bytes_per_op': peak_total / iterations,
+        'retained_bytes_per_op': max(0, end_current - start_current) / iterations,
+        'blocks_per_op': blocks / iterations,
+    }
+
+
+def environment() -> Dict[str, str]:
+    """Machine description stored next to results"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(name: str, results: dict, output: Optional[str] = None) -> str:
+    """
+    Save results as JSON
+
+    Args:
+        name: Suite name (file defaults to benchmarks/results/<name>.json)
+        results: Suite results
+        output: Explicit output path
+
+    Returns:
+        Path written
+    """
+    path = output or os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    document = {
+        'suite': name,
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'environment': environment(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare_to_baseline(results: dict, baseline_path: str,
+                        metric: str = 'ns_per_op', tolerance: float = 0.10,
+                        higher_is_better: bool = False) -> List[str]:
+    """
+    Compare results with a previous run
+
+    Walks both result trees and reports every `metric` value that got
+    worse than the baseline by more than `tolerance` (slower by default,
+    lower when `higher_is_better`, e.g. accuracy).
+
+    Returns:
+        List of regression descriptions (empty = no regressions)
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+
+    regressions = []
+
+    def walk(current, previous, path):
+        if not isinstance(current, dict) or not isinstance(previous, dict):
+            return
+        for key, value in current.items():
+            if key not in previous:
+                continue
+            if key == metric and isinstance(value, (int, float)) and previous[key]:
+                change = (value - previous[key]) / previous[key]
+                if higher_is_better:
+                    change = -change
+                if change > tolerance:
+                    regressions.append(
+                        f"{path or '.'}: {metric} {previous[key]:.3f} -> {value:.3f} ({change:+.0%} worse)"
+                    )
+            else:
+                walk(value, previous[key], f"{path}.{key}" if path else key)
+
+    walk(results, baseline, '')
+    return regressions
+
+
+def print_table(rows: List[Dict[str, object]], columns: List[str]):
+    """Print rows as a fixed-width table"""
+    widths = {c: max(len(c), *(len(_fmt(r.get(c))) for r in rows)) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    print('  '.join('-' * widths[c] for c in columns))
+    for row in rows:
+        print('  '.join(_fmt(row.get(c)).ljust(widths[c]) for c in columns))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:,.1f}"
+    return '' if value is None else str(value)
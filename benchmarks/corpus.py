@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Labelled NLP corpus
+Seed messages with expected outputs, expanded into a larger corpus of
+varied length for the NLP micro-benchmarks
+"""
+
+import random
+from typing import Dict, List, Optional
+
+# Marker for labels that are not checked on a generated variant
+UNCHECKED = object()
+
+
+def _seed(text: str, language: str, symptoms=(), emergency: bool = False,
+          clinic: bool = False, location: Optional[str] = UNCHECKED) -> Dict:
+    return {
+        'text': text,
+        'language': language,
+        'symptoms': sorted(symptoms),
+        'emergency': emergency,
+        'clinic_request': clinic,
+        'location': location,
+    }
+
+
+# Expected outputs are what a correct bot should answer, not a snapshot
+# of the current implementation - accuracy below 100% is information.
+SEED_MESSAGES: List[Dict] = [
+    # Hinglish (Romanized Hindi)
+    _seed('Mujhe 3 din se bukhar hai', 'hinglish', ['fever']),
+    _seed('sir dard ho raha hai kya karu', 'hinglish', ['headache']),
+    _seed('pet dard aur ulti ho rahi hai', 'hinglish', ['stomach_pain', 'vomiting']),
+    _seed('mujhe khansi aur zukam hai', 'hinglish', ['cough', 'cold']),
+    _seed('bahut kamzori lag rahi hai aur badan dard hai', 'hinglish', ['weakness', 'body_pain']),
+    _seed('seene mein dard hai saans nahi aa rahi', 'hinglish', emergency=True),
+    _seed('najdeeki clinic batao', 'hinglish', clinic=True),
+    _seed('mujhe doctor dikhaana hai', 'hinglish', clinic=True),
+    _seed('Gomti Nagar', 'english', location='Lucknow_Gomti_Nagar'),
+    _seed('226010', 'english', location='226010'),
+    _seed('Lucknow_Gomti_Nagar_Patrakarpuram', 'english', location='Lucknow_Gomti_Nagar_Patrakarpuram'),
+    _seed('mera area gomtinagar hai', 'hinglish', location='Lucknow_Gomti_Nagar'),
+    _seed('Vibhuti Khand, Gomti Nagar, Lucknow', 'english', location='Lucknow_Gomti_Nagar_Vibhuti_Khand'),
+    _seed('main hazratganj mein rehta hoon', 'hinglish', location='Lucknow_Hazratganj'),
+    _seed('mujhe loose motion ho rahe hain', 'hinglish', ['diarrhea']),
+    _seed('bhukhaar aur khaansi hai', 'hinglish', ['fever', 'cough']),
+    _seed('kal se sirdard ho raha hai', 'hinglish', ['headache']),
+    # English
+    _seed('I have had a fever since yesterday', 'english', ['fever']),
+    _seed('I have a bad headache and body pain', 'english', ['headache', 'body_pain']),
+    _seed('My father has chest pain and is sweating', 'english', emergency=True),
+    _seed('Find a hospital near me please', 'english', clinic=True),
+    _seed('What are some general health tips for this season?', 'english'),
+    _seed('I feel weakness and fatigue all day', 'english', ['weakness']),
+    _seed('hello', 'english'),
+    # Hindi (Devanagari)
+    _seed('मुझे बुखार है', 'hindi', ['fever']),
+    _seed('मेरे सिर में बहुत दर्द हो रहा है क्या करूं', 'hindi', ['headache']),
+    _seed('क्या आप मेरी मदद कर सकते हैं', 'hindi'),
+    _seed('मुझे खांसी और सर्दी है', 'hindi', ['cough', 'cold']),
+    # Marathi
+    _seed('मला ताप आला आहे', 'marathi', ['fever']),
+    _seed('मला खोकला आहे', 'marathi', ['cough']),
+    _seed('तुम्ही मला मदत करू शकता का? मला पोटदुखी आहे', 'marathi', ['stomach_pain']),
+    # Bengali
+    _seed('আমার জ্বর হয়েছে', 'bengali', ['fever']),
+    _seed('আমার মাথা ব্যথা করছে', 'bengali', ['headache']),
+    _seed('বুকে ব্যথা হচ্ছে', 'bengali', emergency=True),
+    # Tamil
+    _seed('எனக்கு காய்ச்சல் இருக்கிறது', 'tamil', ['fever']),
+    _seed('தலைவலி அதிகமாக உள்ளது', 'tamil', ['headache']),
+    _seed('மார்பு வலி இருக்கிறது', 'tamil', emergency=True),
+    # Telugu
+    _seed('నాకు జ్వరం వచ్చింది', 'telugu', ['fever']),
+    _seed('కడుపు నొప్పి ఉంది', 'telugu', ['stomach_pain']),
+    _seed('ఛాతీ నొప్పి గా ఉంది', 'telugu', emergency=True),
+    # Punjabi
+    _seed('ਮੈਨੂੰ ਬੁਖ਼ਾਰ ਹੈ', 'punjabi', ['fever']),
+    _seed('ਮੈਨੂੰ ਖੰਘ ਤੇ ਜ਼ੁਕਾਮ ਹੈ', 'punjabi', ['cough', 'cold']),
+    _seed('ਛਾਤੀ ਵਿੱਚ ਦਰਦ ਹੋ ਰਿਹਾ ਹੈ', 'punjabi', emergency=True),
+    # Gujarati
+    _seed('મને તાવ આવ્યો છે', 'gujarati', ['fever']),
+    _seed('મને ઉધરસ અને શરદી છે', 'gujarati', ['cough', 'cold']),
+    _seed('છાતીમાં દુખાવો થાય છે', 'gujarati', emergency=True),
+]
+
+# Neutral words appended to make longer messages without changing any label
+FILLERS: Dict[str, List[str]] = {
+    'hinglish': ['aur', 'abhi', 'kal', 'raat', 'subah', 'thoda', 'zyada', 'bhi'],
+    'english': ['and', 'also', 'really', 'today', 'since', 'morning', 'quite', 'very'],
+    'hindi': ['और', 'अभी', 'कल', 'रात', 'सुबह', 'थोड़ा', 'ज्यादा', 'भी'],
+    'marathi': ['आणि', 'आता', 'काल', 'रात्री', 'सकाळी', 'थोडा', 'जास्त', 'पण'],
+    'bengali': ['এবং', 'এখন', 'কাল', 'রাতে', 'সকালে', 'একটু', 'বেশি', 'ও'],
+    'tamil': ['மற்றும்', 'இப்போது', 'நேற்று', 'இரவு', 'காலை', 'கொஞ்சம்', 'அதிகம்'],
+    'telugu': ['మరియు', 'ఇప్పుడు', 'నిన్న', 'రాత్రి', 'ఉదయం', 'కొంచెం', 'ఎక్కువ'],
+    'punjabi': ['ਅਤੇ', 'ਹੁਣ', 'ਕੱਲ੍ਹ', 'ਰਾਤ', 'ਸਵੇਰੇ', 'ਥੋੜ੍ਹਾ', 'ਜ਼ਿਆਦਾ'],
+    'gujarati': ['અને', 'હમણાં', 'કાલે', 'રાત્રે', 'સવારે', 'થોડું', 'વધારે'],
+}
+
+# Words appended per variant: short, medium, long messages
+LENGTH_CLASSES = {'short': 0, 'medium': 12, 'long': 60}
+
+
+def generate_corpus(size: int = 2000, seed: int = 42) -> List[Dict]:
+    """
+    Expand the seeds into `size` labelled messages
+
+    Variants pad a seed with neutral filler words of its language (the
+    location label is only checked on unpadded seeds) and vary case
+    and trailing punctuation.
+
+    Returns:
+        List of {'text', 'length_class', 'seed_id', <labels>} dicts
+    """
+    rng = random.Random(seed)
+    corpus = []
+    classes = list(LENGTH_CLASSES.items())
+
+    for i in range(size):
+        seed_id = i % len(SEED_MESSAGES)
+        item = dict(SEED_MESSAGES[seed_id], seed_id=seed_id)
+        length_class, extra_words = classes[(i // len(SEED_MESSAGES)) % len(classes)]
+        text = item['text']
+
+        if extra_words and item['location'] is UNCHECKED:
+            fillers = FILLERS[item['language']]
+            text = text + ' ' + ' '.join(rng.choice(fillers) for _ in range(extra_words))
+        else:
+            length_class = 'short'
+
+        if item['location'] is UNCHECKED:
+            if rng.random() < 0.3:
+                text += rng.choice(['?', '!', '.', ' 🙏'])
+            if rng.random() < 0.2:
+                text = text.upper() if rng.random() < 0.5 else text.capitalize()
+
+        item['text'] = text
+        item['length_class'] = length_class
+        corpus.append(item)
+
+    return corpus
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end load test for the WhatsApp webhook
+
+Replays Twilio form payloads (text in every language, images, voice
+notes) against the Flask app served locally, with Twilio media,
+Hugging Face and Google speech replaced by local stubs. Reports client
+latency percentiles and messages/sec per message type, and the
+server-side per-stage breakdown scraped from /metrics.
+
+Usage:
+    python -m benchmarks.load_test --requests 300 --concurrency 8
+    python -m benchmarks.load_test --baseline benchmarks/results/baseline_load.json
+
+    # Against an already running server (it must be configured with
+    # HUGGINGFACE_API_URL pointing at a stub and METRICS_ENABLED=True
+    # for the stage breakdown)
+    python -m benchmarks.load_test --target http://127.0.0.1:5000
+
+    # Under gunicorn with gunicorn.conf.py (text and image only; the speech
+    # stubs cannot be injected into worker processes)
+    WEB_CONCURRENCY=2 GUNICORN_THREADS=16 python -m benchmarks.load_test --gunicorn
+"""
+
+import argparse
+import importlib
+import itertools
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.common import compare_to_baseline, percentile, print_table, write_results
+from benchmarks.payloads import (
+    IMAGE_CAPTIONS, TEXT_MESSAGES, sender_pool, synthetic_skin_image,
+    synthetic_voice_note, twilio_form
+)
+from benchmarks.stubs import StubServer, StubSpeechClient, StubTTSClient
+
+MESSAGE_TYPES = ('text', 'image', 'voice')
+ERROR_MARKER = 'Sorry, something went wrong'.encode('utf-8')
+BUSY_MARKER = '⏳'.encode('utf-8')  # Only the load shedding reply starts with it
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure_environment(stub: StubServer, database_url: str):
+    """Environment for the app under test - must run before it is imported"""
+    os.environ.update({
+        'FLASK_ENV': 'development',
+        'DATABASE_URL': database_url,
+        'TWILIO_ACCOUNT_SID': 'AC' + '1' * 32,
+        'TWILIO_AUTH_TOKEN': 'bench-token',
+        'HUGGINGFACE_API_KEY': 'hf_bench_token',
+        'HUGGINGFACE_API_URL': stub.hf_url,
+        'METRICS_ENABLED': 'True',
+        'RATE_LIMIT_ENABLED': 'False',
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING'),
+    })
+    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+
+def start_local_app(stt_latency: float, tts_latency: float) -> str:
+    """Import the app, swap in the speech stubs and serve it on a free port"""
+    from werkzeug.serving import make_server
+
+    app_module = importlib.import_module('app')
+    try:
+        db_manager = app_module.db_manager
+        db_manager.create_tables()
+    except Exception:
+        pass  # Benchmark without conversation logging
+
+    from src.voice_handler import get_voice_handler
+    voice_handler = get_voice_handler()
+    voice_handler.speech_client = StubSpeechClient(latency=stt_latency)
+    voice_handler.tts_client = StubTTSClient(latency=tts_latency)
+
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='app-server', daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def start_gunicorn(database_url: str) -> Tuple[str, subprocess.Popen]:
+    """
+    Serve app.py with gunicorn.conf.py on a free port
+
+    Workers, threads and worker class come from the environment
+    (WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_WORKER_CLASS).
+    """
+    from database import init_db
+    init_db(database_url).create_tables()
+
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='swasthya_bench_metrics_')
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '--bind', f'127.0.0.1:{port}', 'app:app'],
+        cwd=ROOT_DIR, env=dict(os.environ)
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/livez", timeout=1).status_code == 200:
+                return base_url, process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start within 60 s")
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """
+    Resident (RSS) and proportional (PSS, shared pages split between the
+    processes sharing them) memory of a process and its children, in MB
+
+    Returns:
+        {'master_rss_mb', 'master_pss_mb', 'workers', 'worker_rss_mb', 'worker_pss_mb'}
+        (worker values are the mean), {} where /proc is not available
+    """
+    def read(p):
+        values = {}
+        try:
+            with open(f"/proc/{p}/smaps_rollup") as f:
+                for line in f:
+                    key, _, rest = line.partition(':')
+                    if key in ('Rss', 'Pss'):
+                        values[key.lower()] = int(rest.split()[0]) / 1024
+        except OSError:
+            pass
+        return values
+
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        return {}
+    master = read(pid)
+    workers = [read(child) for child in children]
+    workers = [w for w in workers if w]
+    if not master or not workers:
+        return {}
+    return {
+        'master_rss_mb': master['rss'],
+        'master_pss_mb': master['pss'],
+        'workers': len(workers),
+        'worker_rss_mb': sum(w['rss'] for w in workers) / len(workers),
+        'worker_pss_mb': sum(w['pss'] for w in workers) / len(workers),
+    }
+
+
+def build_payloads(message_type: str, count: int, stub: StubServer,
+                   senders: List[str], rng: random.Random) -> List[Dict[str, str]]:
+    """Form bodies for one phase"""
+    payloads = []
+    if message_type == 'text':
+        texts = list(itertools.chain.from_iterable(
+            itertools.product([language], messages) for language, messages in TEXT_MESSAGES.items()
+        ))
+        for i in range(count):
+            _, body = texts[i % len(texts)]
+            payloads.append(twilio_form(rng.choice(senders), body, rng=rng))
+    elif message_type == 'image':
+        urls = [
+            (stub.add_media('skin.jpg', synthetic_skin_image(fmt='JPEG'), 'image/jpeg'), 'image/jpeg'),
+            (stub.add_media('skin.png', synthetic_skin_image(fmt='PNG', seed=2), 'image/png'), 'image/png'),
+            (stub.add_media('skin.webp', synthetic_skin_image(fmt='WEBP', seed=3), 'image/webp'), 'image/webp'),
+        ]
+        for i in range(count):
+            url, content_type = urls[i % len(urls)]
+            payloads.append(twilio_form(rng.choice(senders), rng.choice(IMAGE_CAPTIONS),
+                                        media_url=url, media_type=content_type, rng=rng))
+    elif message_type == 'voice':
+        url = stub.add_media('note.ogg', synthetic_voice_note(), 'audio/ogg')
+        for _ in range(count):
+            payloads.append(twilio_form(rng.choice(senders), '', media_url=url,
+                                        media_type='audio/ogg', rng=rng))
+    return payloads
+
+
+def scrape_stages(base_url: str) -> Dict[str, Dict]:
+    """Cumulative per-stage histogram from /metrics ({} if unavailable)"""
+    try:
+        from prometheus_client.parser import text_string_to_metric_families
+        response = requests.get(f"{base_url}/metrics", timeout=10)
+        if response.status_code != 200:
+            return {}
+    except Exception:
+        return {}
+
+    stages = {}
+    for family in text_string_to_metric_families(response.text):
+        if family.name != 'swasthya_stage_seconds':
+            continue
+        for sample in family.samples:
+            stage = stages.setdefault(sample.labels['stage'], {'buckets': {}, 'sum': 0.0, 'count': 0.0})
+            if sample.name.endswith('_bucket'):
+                stage['buckets'][float(sample.labels['le'])] = sample.value
+            elif sample.name.endswith('_sum'):
+                stage['sum'] = sample.value
+            elif sample.name.endswith('_count'):
+                stage['count'] = sample.value
+    return stages
+
+
+def histogram_quantile(q: float, buckets: Dict[float, float]) -> float:
+    """Prometheus-style quantile estimate from cumulative bucket counts"""
+    bounds = sorted(buckets)
+    if not bounds or buckets[bounds[-1]] <= 0:
+        return 0.0
+    rank = q * buckets[bounds[-1]]
+    lower, previous = 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= rank:
+            if bound == float('inf'):
+                return lower
+            width = count - previous
+            return lower + (bound - lower) * ((rank - previous) / width if width else 0.0)
+        lower, previous = bound, count
+    return lower
+
+
+def stage_breakdown(before: Dict[str, Dict], after: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Per-stage latency for the requests made between two scrapes"""
+    breakdown = {}
+    for stage, end in after.items():
+        start = before.get(stage, {'buckets': {}, 'sum': 0.0, 'count': 0.0})
+        count = end['count'] - start['count']
+        if count <= 0:
+            continue
+        buckets = {le: value - start['buckets'].get(le, 0.0) for le, value in end['buckets'].items()}
+        breakdown[stage] = {
+            'count': int(count),
+            'mean_ms': (end['sum'] - start['sum']) / count * 1000,
+            'p50_ms': histogram_quantile(0.50, buckets) * 1000,
+            'p95_ms': histogram_quantile(0.95, buckets) * 1000,
+            'p99_ms': histogram_quantile(0.99, buckets) * 1000,
+        }
+    return breakdown
+
+
+def run_phase(base_url: str, payloads: List[Dict[str, str]], concurrency: int) -> Dict:
+    """Post every payload with `concurrency` client threads"""
+    local = threading.local()
+    latencies = []
+    errors = []
+    shed = []
+
+    def send(form):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/whatsapp", data=form, timeout=120)
+            ok = response.status_code == 200 and ERROR_MARKER not in response.content
+            if ok and BUSY_MARKER in response.content:
+                shed.append(1)
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        latencies.append(elapsed)
+        if not ok:
+            errors.append(elapsed)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, payloads))
+    wall = time.perf_counter() - wall_start
+
+    return {
+        'requests': len(payloads),
+        'errors': len(errors),
+        'shed': len(shed),
+        'wall_seconds': wall,
+        'msgs_per_sec': len(payloads) / wall if wall else 0.0,
+        'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+    }
+
+
+def run(args) -> Dict:
+    rng = random.Random(args.seed)
+    stub = StubServer(media_latency=args.media_latency_ms / 1000,
+                      hf_latency=args.hf_latency_ms / 1000).start()
+
+    server = None
+    if args.target:
+        base_url = args.target.rstrip('/')
+    else:
+        database_url = args.database_url or 'sqlite:///' + os.path.join(
+            tempfile.mkdtemp(prefix='swasthya_bench_'), 'bench.db')
+        configure_environment(stub, database_url)
+        if args.gunicorn:
+            base_url, server = start_gunicorn(database_url)
+        else:
+            base_url = start_local_app(args.stt_latency_ms / 1000, args.tts_latency_ms / 1000)
+        logging.disable(logging.ERROR if args.quiet else logging.NOTSET)
+
+    senders = sender_pool(args.senders, seed=args.seed)
+    counts = {'text': args.requests, 'image': max(1, args.requests // 10),
+              'voice': max(1, args.requests // 10)}
+
+    results = {'config': {
+        'requests': counts, 'concurrency': args.concurrency, 'senders': args.senders,
+        'hf_latency_ms': args.hf_latency_ms, 'stt_latency_ms': args.stt_latency_ms,
+        'tts_latency_ms': args.tts_latency_ms, 'media_latency_ms': args.media_latency_ms,
+    }, 'types': {}}
+
+    for message_type in args.types:
+        # Warm-up: first sessions, analyzers and connections are not measured
+        run_phase(base_url, build_payloads(message_type, args.concurrency, stub, senders, rng),
+                  args.concurrency)
+
+        payloads = build_payloads(message_type, counts[message_type], stub, senders, rng)
+        before = scrape_stages(base_url)
+        summary = run_phase(base_url, payloads, args.concurrency)
+        summary['stages'] = stage_breakdown(before, scrape_stages(base_url))
+        results['types'][message_type] = summary
+
+    if server is not None:
+        results['config']['gunicorn'] = {
+            key: os.environ.get(key, '') for key in ('WEB_CONCURRENCY', 'GUNICORN_WORKER_CLASS', 'GUNICORN_THREADS')
+        }
+        results['memory'] = process_memory(server.pid)
+        server.terminate()
+        server.wait(timeout=30)
+    stub.stop()
+    return results
+
+
+def report(results: Dict):
+    columns = ['requests', 'errors', 'shed', 'msgs_per_sec', 'p50_ms', 'p95_ms', 'p99_ms']
+    rows = [{'type': t, **{k: r[k] for k in columns}} for t, r in results['types'].items()]
+    print_table(rows, ['type'] + columns)
+
+    if results.get('memory'):
+        print()
+        print_table([results['memory']], list(results['memory']))
+
+    for message_type, summary in results['types'].items():
+        if not summary['stages']:
+            continue
+        print(f"\n{message_type} - per stage (server side)")
+        stage_rows = sorted(({'stage': s, **v} for s, v in summary['stages'].items()),
+                            key=lambda row: -row['mean_ms'])
+        print_table(stage_rows, ['stage', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load test the WhatsApp webhook')
+    parser.add_argument('--requests', type=int, default=200, help='Text messages (images/voice get 1/10)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--senders', type=int, default=50)
+    parser.add_argument('--types', nargs='+', choices=MESSAGE_TYPES, default=list(MESSAGE_TYPES))
+    parser.add_argument('--target', help='Base URL of a running server (default: serve app.py locally)')
+    parser.add_argument('--gunicorn', action='store_true',
+                        help='Serve app.py with gunicorn.conf.py instead of the in-process server (text and image only)')
+    parser.add_argument('--database-url', help='DATABASE_URL for the local app (default: temp SQLite)')
+    parser.add_argument('--hf-latency-ms', type=float, default=300)
+    parser.add_argument('--stt-latency-ms', type=float, default=200)
+    parser.add_argument('--tts-latency-ms', type=float, default=150)
+    parser.add_argument('--media-latency-ms', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Result JSON path')
+    parser.add_argument('--baseline', help='Previous result JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed p95/p99 slowdown')
+    parser.add_argument('--verbose', dest='quiet', action='store_false', help='Keep app logging')
+    args = parser.parse_args(argv)
+    if args.gunicorn and 'voice' in args.types:
+        print("Skipping voice notes: the speech stubs cannot be injected into gunicorn workers")
+        args.types = [t for t in args.types if t != 'voice']
+
+    results = run(args)
+    report(results)
+    print(f"\nResults written to {write_results('load_test', results, args.output)}")
+
+    if args.baseline:
+        regressions = []
+        for metric in ('p95_ms', 'p99_ms'):
+            regressions += compare_to_baseline(results, args.baseline, metric=metric,
+                                               tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
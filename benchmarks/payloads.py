@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark payloads
+Realistic Twilio webhook form bodies and synthetic media
+"""
+
+import io
+import math
+import random
+import struct
+import wave
+from typing import Dict, List
+
+import numpy as np
+from PIL import Image
+
+# One entry per language the bot answers in (Hinglish included)
+TEXT_MESSAGES: Dict[str, List[str]] = {
+    'hindi': [
+        'मुझे तीन दिन से बुखार है',
+        'मेरे सिर में बहुत दर्द हो रहा है',
+        'पेट में दर्द और उल्टी हो रही है',
+        'लखनऊ में नजदीकी क्लिनिक बताइए',
+        'नमस्ते',
+    ],
+    'hinglish': [
+        'Mujhe 3 din se bukhar hai',
+        'Sir dard ho raha hai kya karu',
+        'Pet dard aur ulti ho rahi hai',
+        'Gomti Nagar mein clinic batao',
+        'Mujhe seene mein dard hai aur saans nahi aa rahi',
+    ],
+    'english': [
+        'I have had a fever since yesterday',
+        'I have a bad headache and body pain',
+        'My stomach hurts after eating',
+        'Find a clinic near 226010',
+        'What are some general health tips?',
+    ],
+    'marathi': [
+        'मला ताप आला आहे',
+        'माझे डोके दुखत आहे',
+        'पोटात दुखत आहे',
+        'पुण्यात जवळचे क्लिनिक सांगा',
+    ],
+    'bengali': [
+        'আমার জ্বর হয়েছে',
+        'আমার মাথা ব্যথা করছে',
+        'পেটে ব্যথা হচ্ছে',
+        'কাছাকাছি ক্লিনিক কোথায়',
+    ],
+    'tamil': [
+        'எனக்கு காய்ச்சல் இருக்கிறது',
+        'தலைவலி அதிகமாக உள்ளது',
+        'வயிற்று வலி இருக்கிறது',
+        'அருகிலுள்ள மருத்துவமனை எங்கே',
+    ],
+    'telugu': [
+        'నాకు జ్వరం వచ్చింది',
+        'తలనొప్పి ఎక్కువగా ఉంది',
+        'కడుపు నొప్పి ఉంది',
+        'దగ్గరలో క్లినిక్ ఎక్కడ ఉంది',
+    ],
+    'punjabi': [
+        'ਮੈਨੂੰ ਬੁਖਾਰ ਹੈ',
+        'ਮੇਰੇ ਸਿਰ ਵਿੱਚ ਦਰਦ ਹੈ',
+        'ਪੇਟ ਵਿੱਚ ਦਰਦ ਹੈ',
+        'ਨੇੜੇ ਕਲੀਨਿਕ ਦੱਸੋ',
+    ],
+    'gujarati': [
+        'મને તાવ આવ્યો છે',
+        'મારું માથું દુખે છે',
+        'પેટમાં દુખાવો છે',
+        'નજીકનું ક્લિનિક બતાવો',
+    ],
+}
+
+IMAGE_CAPTIONS = ['', 'ye kya hai?', 'skin par rash hai', 'is this infected?']
+
+TWILIO_NUMBER = 'whatsapp:+14155238886'
+ACCOUNT_SID = 'AC' + '0' * 32
+
+
+def sender_pool(size: int, seed: int = 7) -> List[str]:
+    """Distinct WhatsApp senders so sessions look like real traffic"""
+    rng = random.Random(seed)
+    return [f"whatsapp:+91{rng.randint(6000000000, 9999999999)}" for _ in range(size)]
+
+
+def _message_sid(rng: random.Random) -> str:
+    return 'SM' + ''.join(rng.choice('0123456789abcdef') for _ in range(32))
+
+
+def twilio_form(sender: str, body: str = '', media_url: str = None,
+                media_type: str = None, rng: random.Random = None) -> Dict[str, str]:
+    """
+    Form fields Twilio posts to the webhook for one WhatsApp message
+
+    Args:
+        sender: 'From' value
+        body: Message text or media caption
+        media_url: URL of the first attachment
+        media_type: Content type of the attachment
+    """
+    rng = rng or random
+    sid = _message_sid(rng)
+    form = {
+        'SmsMessageSid': sid,
+        'MessageSid': sid,
+        'SmsSid': sid,
+        'AccountSid': ACCOUNT_SID,
+        'MessagingServiceSid': '',
+        'From': sender,
+        'To': TWILIO_NUMBER,
+        'WaId': sender.rsplit('+', 1)[-1],
+        'ProfileName': 'Load Test',
+        'Body': body,
+        'NumMedia': '1' if media_url else '0',
+        'NumSegments': '1',
+        'SmsStatus': 'received',
+        'ReferralNumMedia': '0',
+        'ApiVersion': '2010-04-01',
+    }
+    if media_url:
+        form['MediaUrl0'] = media_url
+        form['MediaContentType0'] = media_type
+    return form
+
+
+def synthetic_skin_image(width: int = 800, height: int = 600, fmt: str = 'JPEG',
+                         seed: int = 1, quality: int = 85) -> bytes:
+    """
+    Skin-toned photo with a few red patches
+
+    Args:
+        width, height: Pixel size
+        fmt: PIL format name ('JPEG', 'PNG', 'WEBP')
+        seed: Noise seed (same seed -> same bytes)
+    """
+    rng = np.random.default_rng(seed)
+    base = np.array([224, 172, 140], dtype=np.float32)
+    pixels = rng.normal(0, 12, size=(height, width, 3)).astype(np.float32)
+    pixels += base
+
+    yy, xx = np.ogrid[0:height, 0:width]
+    for _ in range(4):
+        cy, cx = rng.integers(0, height), rng.integers(0, width)
+        radius = max(8, int(min(width, height) * rng.uniform(0.05, 0.15)))
+        mask = ((yy - cy) ** 2 + (xx - cx) ** 2) < radius ** 2
+        pixels[mask] = pixels[mask] * [1.05, 0.65, 0.65]
+
+    image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+    output = io.BytesIO()
+    save_kwargs = {'quality': quality} if fmt in ('JPEG', 'WEBP') else {}
+    image.save(output, format=fmt, **save_kwargs)
+    return output.getvalue()
+
+
+def synthetic_voice_note(seconds: float = 3.0, sample_rate: int = 16000) -> bytes:
+    """Mono 16-bit WAV tone standing in for a WhatsApp voice note"""
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        value = int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate))
+        frames += struct.pack('<h', value)
+
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return output.getvalue()
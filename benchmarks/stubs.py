@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-ins for the external services the webhook calls
+
+- StubServer: Twilio media host and Hugging Face inference API over HTTP
+- StubSpeechClient / StubTTSClient: drop-in replacements for the Google
+  Speech and Text-to-Speech clients (they speak gRPC, so they are
+  swapped on the VoiceHandler instead of served over HTTP)
+
+Every stub sleeps for a configurable latency so the benchmark sees
+realistic waiting without touching the network.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, Tuple
+
+HF_CAPTION = 'a close up of a person with a red rash on their skin'
+
+
+class StubServer:
+    """
+    Threaded HTTP server on 127.0.0.1 with:
+        GET  /media/<name>  -> registered media bytes (Twilio media URL)
+        HEAD/POST /hf       -> BLIP-style caption JSON (Hugging Face)
+    """
+
+    def __init__(self, media_latency: float = 0.02, hf_latency: float = 0.3):
+        self.media: Dict[str, Tuple[bytes, str]] = {}
+        self.media_latency = media_latency
+        self.hf_latency = hf_latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hf_url(self) -> str:
+        return f"{self.base_url}/hf"
+
+    def add_media(self, name: str, data: bytes, content_type: str) -> str:
+        """Register a media file and return its URL"""
+        self.media[name] = (data, content_type)
+        return f"{self.base_url}/media/{name}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                stub._count()
+                if self.path.startswith('/media/'):
+                    item = stub.media.get(self.path[len('/media/'):])
+                    if item is None:
+                        return self._send(404, b'not found', 'text/plain')
+                    time.sleep(stub.media_latency)
+                    return self._send(200, item[0], item[1])
+                self._send(404, b'not found', 'text/plain')
+
+            def do_HEAD(self):
+                stub._count()
+                self._send(200 if self.path == '/hf' else 404, b'', 'application/json')
+
+            def do_POST(self):
+                stub._count()
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                if self.path != '/hf':
+                    return self._send(404, b'not found', 'text/plain')
+                time.sleep(stub.hf_latency)
+                body = json.dumps([{'generated_text': HF_CAPTION}]).encode('utf-8')
+                self._send(200, body, 'application/json')
+
+        return Handler
+
+
+class StubSpeechClient:
+    """Answers recognize() like google.cloud.speech with a fixed transcript"""
+
+    def __init__(self, transcript: str = 'mujhe bukhar aur sir dard hai', latency: float = 0.2):
+        self.transcript = transcript
+        self.latency = latency
+
+    def recognize(self, config=None, audio=None):
+        time.sleep(self.latency)
+        alternative = SimpleNamespace(transcript=self.transcript, confidence=0.92)
+        result = SimpleNamespace(alternatives=[alternative], language_code='hi-in')
+        return SimpleNamespace(results=[result])
+
+
+class StubTTSClient:
+    """Answers synthesize_speech() like google.cloud.texttospeech"""
+
+    def __init__(self, latency: float = 0.15, audio_bytes: int = 24000):
+        self.latency = latency
+        self.audio = b'\x00' * audio_bytes
+
+    def synthesize_speech(self, input=None, voice=None, audio_config=None):
+        time.sleep(self.latency)
+        return SimpleNamespace(audio_content=self.audio)
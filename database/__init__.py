@@ -3,8 +3,11 @@
 Database package initialization
 """
 
-from .models import Base, Clinic, Conversation, Message, Analytics, UserProfile
-from .connection import DatabaseManager, get_db_session, get_db_manager, init_db, db_session
+from .models import Base, Clinic, Conversation, Message, Analytics, RollupState, UserProfile
+from .connection import (
+    DatabaseManager, get_db_session, get_db_manager, init_db, db_session, db_read_session
+)
+from .pool import PoolSettings
 
 __all__ = [
     'Base',
@@ -12,10 +15,13 @@ __all__ = [
     'Conversation',
     'Message',
     'Analytics',
+    'RollupState',
     'UserProfile',
     'DatabaseManager',
     'get_db_session',
     'get_db_manager',
     'init_db',
-    'db_session'
+    'db_session',
+    'db_read_session',
+    'PoolSettings'
 ]
@@ -5,7 +5,9 @@ SQLAlchemy ORM models for PostgreSQL
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, JSON, ForeignKey
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Boolean, Float, JSON, ForeignKey, Index
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -13,10 +15,16 @@ Base = declarative_base()
 
 
 class Clinic(Base):
-    """Model for storing clinic/pharmacy information"""
+    """
+    Model for storing clinic/pharmacy information
+
+    natural_key is a hash of the normalized name and address; imports
+    upsert on it so re-running them never duplicates a clinic.
+    """
     __tablename__ = 'clinics'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
+    natural_key = Column(String(40), unique=True, index=True, nullable=True)  # sha1(name|address)
     name = Column(String(255), nullable=False)
     address = Column(Text, nullable=False)
     city = Column(String(100), index=True)
@@ -53,7 +61,16 @@ class Clinic(Base):
 
 
 class Conversation(Base):
-    """Model for storing user conversation history"""
+    """
+    Model for storing user conversation history
+    
+    Static replies are stored as response_template + response_language
+    with bot_response left NULL; only dynamic replies keep their text.
+    response_hash is the hash of the template text when it was sent, so
+    an edited template is not mistaken for the original reply.
+    In PostgreSQL the table can be partitioned by month on created_at
+    (see database/sql/conversations_partitioned.sql).
+    """
     __tablename__ = 'conversations'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -63,14 +80,17 @@ class Conversation(Base):
     language = Column(String(20), default='hindi')
     message_type = Column(String(20))  # 'text', 'image', 'voice'
     user_message = Column(Text)
-    bot_response = Column(Text)
+    bot_response = Column(Text, nullable=True)  # NULL when response_template is set
+    response_template = Column(String(40), nullable=True)  # Static reply id, e.g. 'location_prompt'
+    response_language = Column(String(20), nullable=True)  # Language variant of the template
+    response_hash = Column(String(16), nullable=True)  # static_responses.text_hash() of the sent text
     detected_intent = Column(String(50))  # 'symptom_check', 'clinic_search', 'emergency', 'general'
     detected_symptoms = Column(JSON, nullable=True)  # Array of symptoms
     detected_location = Column(String(100), nullable=True)
     is_emergency = Column(Boolean, default=False)
     image_url = Column(String(500), nullable=True)
     image_analysis = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Partition key
     
     # Relationship to messages
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
@@ -88,6 +108,9 @@ class Conversation(Base):
             'message_type': self.message_type,
             'user_message': self.user_message,
             'bot_response': self.bot_response,
+            'response_template': self.response_template,
+            'response_language': self.response_language,
+            'response_hash': self.response_hash,
             'detected_intent': self.detected_intent,
             'detected_symptoms': self.detected_symptoms,
             'detected_location': self.detected_location,
@@ -114,12 +137,22 @@ class Message(Base):
 
 
 class Analytics(Base):
-    """Model for storing usage analytics and metrics"""
+    """
+    Model for storing usage analytics and metrics
+
+    Daily conversation rollups (database/rollups.py) use one row per
+    (date, metric_type, metric_name, language, location) bucket, with ''
+    for an unknown language or location so the bucket can be upserted.
+    """
     __tablename__ = 'analytics'
+    __table_args__ = (
+        Index('uq_analytics_bucket', 'date', 'metric_type', 'metric_name', 'language', 'location',
+              unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(DateTime, default=datetime.utcnow, index=True)
-    metric_type = Column(String(50), index=True)  # 'total_users', 'active_users', 'messages_count'
+    metric_type = Column(String(50), index=True)  # 'messages', 'intent', 'symptom', 'emergency'
     metric_name = Column(String(100))
     metric_value = Column(Integer, default=0)
     language = Column(String(20), nullable=True)
@@ -143,6 +176,18 @@ class Analytics(Base):
         }
 
 
+class RollupState(Base):
+    """High-water mark of an incremental aggregation job"""
+    __tablename__ = 'rollup_state'
+
+    name = Column(String(50), primary_key=True)  # e.g. 'analytics'
+    last_id = Column(Integer, nullable=False, default=0)  # Last conversations.id rolled up
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<RollupState(name='{self.name}', last_id={self.last_id})>"
+
+
 class UserProfile(Base):
     """Model for storing user profile information"""
     __tablename__ = 'user_profiles'
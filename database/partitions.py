@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Conversation Partitions
+Monthly range partitions of the conversations table (PostgreSQL)
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'conversations'
+SQL_DIR = Path(__file__).parent / 'sql'
+
+
+def month_start(value):
+    """First instant of the month containing `value`"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """First day of the month `months` after the month of `value`"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """e.g. conversations_2024_03"""
+    return f"{TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def is_postgres(engine):
+    return engine.dialect.name == 'postgresql'
+
+
+def is_partitioned(engine):
+    """True when conversations is a partitioned PostgreSQL table"""
+    if not is_postgres(engine):
+        return False
+    with engine.connect() as conn:
+        return bool(conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND c.relnamespace = 'public'::regnamespace"
+        ), {'table': TABLE}).scalar())
+
+
+def list_partitions(engine):
+    """
+    Monthly partitions that exist
+
+    Returns:
+        Sorted list of month start datetimes
+    """
+    if not is_partitioned(engine):
+        return []
+    with engine.connect() as conn:
+        names = conn.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ), {'table': TABLE}).scalars().all()
+
+    months = []
+    prefix = f"{TABLE}_"
+    for name in names:
+        try:
+            months.append(datetime.strptime(name[len(prefix):], '%Y_%m'))
+        except ValueError:
+            continue  # the default partition
+    return sorted(months)
+
+
+def create_partition(conn, month):
+    """Create the partition for one month if it does not exist"""
+    start, end = month_start(month), add_months(month, 1)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    ))
+
+
+def ensure_partitions(engine, start=None, months_ahead=3):
+    """
+    Create monthly partitions from `start` up to `months_ahead` months
+    after the current one, so inserts never land in the default partition
+
+    Args:
+        engine: Engine for the primary
+        start: First month to cover (default: current month)
+        months_ahead: Future months to create
+
+    Returns:
+        Number of months covered (0 when the table is not partitioned)
+    """
+    if not is_partitioned(engine):
+        return 0
+    month = month_start(start or datetime.utcnow())
+    last = add_months(datetime.utcnow(), months_ahead)
+    count = 0
+    with engine.begin() as conn:
+        while month <= last:
+            create_partition(conn, month)
+            month = add_months(month, 1)
+            count += 1
+    return count
+
+
+def drop_partition(conn, month):
+    """Detach and drop one month's partition (after it has been archived)"""
+    name = partition_name(month)
+    conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+
+
+def load_sql(name):
+    """Contents of a file in database/sql"""
+    return (SQL_DIR / name).read_text(encoding='utf-8')
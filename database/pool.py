@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Connection Pool Settings
+Sizes the SQLAlchemy pool from configuration and splits a global
+connection budget across worker processes
+"""
+
+import time
+import logging
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+POOL_MODES = ('queue', 'null')
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that can report how long callers wait for a connection
+
+    wait_observer is set per pool (see src.metrics.instrument_pool) and
+    called as wait_observer(seconds, timed_out). Left as None, checkout
+    costs one attribute lookup more than a plain QueuePool.
+    """
+
+    wait_observer = None
+
+    def connect(self):
+        observer = self.wait_observer
+        if observer is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            observer(time.perf_counter() - start, True)
+            raise
+        observer(time.perf_counter() - start, False)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool; keep the observer
+        pool = super().recreate()
+        pool.wait_observer = self.wait_observer
+        return pool
+
+
+class PoolSettings:
+    """
+    Connection pool configuration for one worker process
+
+    mode 'queue' keeps a local pool per worker. mode 'null' opens a
+    connection per checkout and closes it on checkin, for deployments
+    behind PgBouncer in transaction pooling mode where PgBouncer does
+    the pooling.
+    """
+
+    def __init__(self, mode='queue', pool_size=10, max_overflow=20, timeout=30,
+                 recycle=3600, liveness_interval=30, max_connections=0, workers=1):
+        """
+        Args:
+            mode: 'queue' or 'null'
+            pool_size: Connections kept open per worker
+            max_overflow: Extra connections a worker may open under load
+            timeout: Seconds to wait for a free connection
+            recycle: Seconds after which a connection is replaced
+            liveness_interval: Ping a connection on checkout only if it sat
+                               idle longer than this many seconds (0 = never)
+            max_connections: Connection budget shared by all workers (0 = no limit)
+            workers: Worker processes sharing the budget
+
+        Raises:
+            ValueError: Unknown mode, or a budget smaller than the number of
+                        workers (each pooled worker needs at least one connection)
+        """
+        if mode not in POOL_MODES:
+            raise ValueError(f"Unknown pool mode {mode!r}, expected one of {POOL_MODES}")
+        if mode == 'queue' and 0 < max_connections < max(1, workers):
+            raise ValueError(
+                f"DB_MAX_CONNECTIONS={max_connections} is less than one connection for each of "
+                f"the {workers} workers; raise it, lower WEB_CONCURRENCY or use DB_POOL_MODE=null"
+            )
+        self.mode = mode
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.liveness_interval = liveness_interval
+        self.max_connections = max_connections
+        self.workers = max(1, workers)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build settings from the DB_* attributes of a Config class"""
+        return cls(
+            mode=getattr(config, 'DB_POOL_MODE', 'queue'),
+            pool_size=getattr(config, 'DB_POOL_SIZE', 10),
+            max_overflow=getattr(config, 'DB_MAX_OVERFLOW', 20),
+            timeout=getattr(config, 'DB_POOL_TIMEOUT', 30),
+            recycle=getattr(config, 'DB_POOL_RECYCLE', 3600),
+            liveness_interval=getattr(config, 'DB_LIVENESS_INTERVAL', 30),
+            max_connections=getattr(config, 'DB_MAX_CONNECTIONS', 0),
+            workers=getattr(config, 'WEB_CONCURRENCY', 1),
+        )
+
+    def worker_limits(self):
+        """
+        Pool size and overflow for this worker
+
+        With a connection budget, each worker gets an equal share of it:
+        the steady pool first, overflow from what is left.
+
+        Returns:
+            (pool_size, max_overflow)
+        """
+        pool_size, max_overflow = self.pool_size, self.max_overflow
+        if self.max_connections > 0:
+            share = self.max_connections // self.workers
+            pool_size = min(pool_size, share)
+            max_overflow = min(max_overflow, share - pool_size)
+        return pool_size, max_overflow
+
+    def engine_kwargs(self, database_url):
+        """
+        Keyword arguments for create_engine
+
+        Args:
+            database_url: Database URL the engine will connect to
+
+        Returns:
+            dict of pool arguments suited to the URL's backend
+        """
+        url = make_url(database_url)
+        if self.mode == 'null':
+            return {'poolclass': NullPool}
+
+        if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+            # In-memory SQLite lives in one connection; keep SQLAlchemy's default pool
+            return {}
+
+        pool_size, max_overflow = self.worker_limits()
+        kwargs = {
+            'poolclass': TimedQueuePool,
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': self.timeout,
+            'pool_recycle': self.recycle,
+            # Reuse the most recent connection so idle extras age out
+            'pool_use_lifo': True,
+        }
+        if url.get_backend_name() == 'postgresql' and url.get_driver_name() in ('psycopg2', ''):
+            # Let the kernel notice dead peers instead of pinging on every checkout
+            kwargs['connect_args'] = {
+                'keepalives': 1,
+                'keepalives_idle': 30,
+                'keepalives_interval': 10,
+                'keepalives_count': 3,
+            }
+        return kwargs
+
+    def describe(self):
+        """Short summary for the startup log"""
+        if self.mode == 'null':
+            return 'mode=null (no local pooling)'
+        pool_size, max_overflow = self.worker_limits()
+        return (f"mode=queue pool_size={pool_size} max_overflow={max_overflow} "
+                f"workers={self.workers} budget={self.max_connections or 'unlimited'}")
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Read Replica Routing
+Health-aware round robin over read-only database engines
+"""
+
+import time
+import logging
+import threading
+from sqlalchemy import event, exc, text
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """
+    Round robin over replica engines, skipping unhealthy ones
+
+    A replica is marked down when a query on it fails with a connection
+    error (passively, through the engine's handle_error event) or when
+    check() cannot reach it. It is tried again after `cooldown` seconds,
+    or as soon as check() reaches it again.
+    """
+
+    def __init__(self, engines, cooldown=30):
+        """
+        Args:
+            engines: dict of name -> SQLAlchemy engine, in routing order
+            cooldown: Seconds a failed replica is skipped
+        """
+        self.engines = dict(engines)
+        self.cooldown = cooldown
+        self._names = list(self.engines)
+        self._down_until = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        for name, engine in self.engines.items():
+            self._watch(name, engine)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _watch(self, name, engine):
+        @event.listens_for(engine, "handle_error")
+        def receive_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+                self.mark_down(name, context.original_exception)
+
+    def choose(self):
+        """
+        Next healthy replica
+
+        Returns:
+            (name, engine), or None when every replica is down
+        """
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self._names)):
+                name = self._names[self._next]
+                self._next = (self._next + 1) % len(self._names)
+                if self._down_until.get(name, 0) <= now:
+                    return name, self.engines[name]
+        return None
+
+    def mark_down(self, name, reason=None):
+        """Skip a replica for the cooldown period"""
+        with self._lock:
+            was_up = self._down_until.get(name, 0) <= time.monotonic()
+            self._down_until[name] = time.monotonic() + self.cooldown
+        if was_up:
+            logger.warning("Replica %s marked down: %s", name, reason)
+
+    def mark_up(self, name):
+        """Route to a replica again"""
+        with self._lock:
+            was_down = self._down_until.pop(name, 0) > time.monotonic()
+        if was_down:
+            logger.info("Replica %s is back up", name)
+
+    def is_up(self, name):
+        return self._down_until.get(name, 0) <= time.monotonic()
+
+    def check(self):
+        """
+        Ping every replica and update its state
+
+        Returns:
+            dict of name -> 'up' or 'down'
+        """
+        status = {}
+        for name, engine in self.engines.items():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                self.mark_up(name)
+                status[name] = 'up'
+            except Exception as e:
+                self.mark_down(name, e)
+                status[name] = 'down'
+        return status
+
+    def dispose(self):
+        for engine in self.engines.values():
+            engine.dispose()
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Analytics Rollups
+Incremental daily aggregation of conversations into the analytics table
+
+Each run reads only conversations with an id above the stored high-water
+mark, adds their counts to the daily buckets with an upsert, and moves
+the mark forward in the same transaction, so a crash never double counts.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import Analytics, Conversation, RollupState
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = 'analytics'
+METRIC_TYPES = ('messages', 'intent', 'symptom', 'emergency')
+BUCKET_COLUMNS = ('date', 'metric_type', 'metric_name', 'language', 'location')
+
+CONVERSATIONS = Conversation.__table__
+ANALYTICS = Analytics.__table__
+SOURCE_COLUMNS = (
+    CONVERSATIONS.c.id, CONVERSATIONS.c.created_at, CONVERSATIONS.c.language,
+    CONVERSATIONS.c.detected_intent, CONVERSATIONS.c.detected_symptoms,
+    CONVERSATIONS.c.detected_location, CONVERSATIONS.c.is_emergency
+)
+
+
+def day_start(value):
+    """Midnight of the day containing `value`"""
+    return datetime(value.year, value.month, value.day)
+
+
+def _bucket_value(value, limit):
+    return (value or '').strip().lower()[:limit]
+
+
+def aggregate(rows, counts=None):
+    """
+    Count conversation rows into daily buckets
+
+    Args:
+        rows: Iterable of rows with SOURCE_COLUMNS
+        counts: Counter to add to (default: a new one)
+
+    Returns:
+        Counter keyed by (date, metric_type, metric_name, language, location)
+    """
+    counts = Counter() if counts is None else counts
+    for row in rows:
+        day = day_start(row.created_at)
+        language = _bucket_value(row.language, 20)
+        location = _bucket_value(row.detected_location, 100)
+
+        counts[(day, 'messages', 'total', language, location)] += 1
+        counts[(day, 'intent', _bucket_value(row.detected_intent, 100) or 'unknown',
+                language, location)] += 1
+        if row.is_emergency:
+            counts[(day, 'emergency', 'emergency', language, location)] += 1
+        # A set, so a symptom repeated in one message counts once
+        for symptom in set(row.detected_symptoms or ()):
+            if isinstance(symptom, str) and symptom.strip():
+                counts[(day, 'symptom', _bucket_value(symptom, 100), language, location)] += 1
+    return counts
+
+
+def _bucket_rows(counts):
+    return [dict(zip(BUCKET_COLUMNS, key), metric_value=value) for key, value in counts.items()]
+
+
+def upsert_counts(conn, counts):
+    """
+    Add `counts` to the matching analytics rows, inserting missing buckets
+
+    Uses INSERT ... ON CONFLICT on PostgreSQL and SQLite, and an
+    update-then-insert loop elsewhere.
+    """
+    if not counts:
+        return 0
+    rows = _bucket_rows(counts)
+
+    dialect = conn.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        statement = insert(ANALYTICS)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(BUCKET_COLUMNS),
+            set_={'metric_value': ANALYTICS.c.metric_value + statement.excluded.metric_value}
+        )
+        conn.execute(statement, rows)
+        return len(rows)
+
+    for row in rows:
+        match = and_(*(ANALYTICS.c[column] == row[column] for column in BUCKET_COLUMNS))
+        updated = conn.execute(
+            update(ANALYTICS).where(match)
+            .values(metric_value=ANALYTICS.c.metric_value + row['metric_value'])
+        ).rowcount
+        if not updated:
+            conn.execute(ANALYTICS.insert().values(**row))
+    return len(rows)
+
+
+def ensure_schema(engine):
+    """Create the analytics tables and bucket index if they are missing"""
+    ANALYTICS.create(engine, checkfirst=True)
+    RollupState.__table__.create(engine, checkfirst=True)
+    # Tables created before the rollups existed lack the unique bucket index
+    for index in ANALYTICS.indexes:
+        index.create(engine, checkfirst=True)
+
+
+def _lock_state(conn):
+    """Current high-water mark, row-locked so two jobs cannot interleave"""
+    state = RollupState.__table__
+    last_id = conn.execute(
+        select(state.c.last_id).where(state.c.name == STATE_NAME).with_for_update()
+    ).scalar()
+    if last_id is None:
+        conn.execute(state.insert().values(name=STATE_NAME, last_id=0, updated_at=datetime.utcnow()))
+        last_id = 0
+    return last_id
+
+
+def _save_state(conn, last_id):
+    state = RollupState.__table__
+    conn.execute(update(state).where(state.c.name == STATE_NAME)
+                 .values(last_id=last_id, updated_at=datetime.utcnow()))
+
+
+def get_watermark(engine):
+    """Last conversations.id rolled up (0 before the first run)"""
+    state = RollupState.__table__
+    with engine.connect() as conn:
+        return conn.execute(select(state.c.last_id).where(state.c.name == STATE_NAME)).scalar() or 0
+
+
+def rollup(engine, batch_size=10000, lag_seconds=60, now=None):
+    """
+    Roll up conversations added since the last run
+
+    Rows newer than `lag_seconds` are left for the next run: ids are
+    handed out before commit, so a just-committed row can carry a lower
+    id than one that is already visible.
+
+    Args:
+        engine: Engine for the primary
+        batch_size: Conversations per transaction
+        lag_seconds: Settling time before a row is rolled up
+        now: Reference time (default: now, UTC)
+
+    Returns:
+        Dict with rows, buckets, batches and last_id
+    """
+    ensure_schema(engine)
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=lag_seconds)
+    with engine.connect() as conn:
+        upper = conn.execute(
+            select(func.max(CONVERSATIONS.c.id)).where(CONVERSATIONS.c.created_at < cutoff)
+        ).scalar() or 0
+
+    stats = {'rows': 0, 'buckets': 0, 'batches': 0, 'last_id': get_watermark(engine)}
+    while True:
+        with engine.begin() as conn:
+            last_id = _lock_state(conn)
+            if last_id >= upper:
+                stats['last_id'] = last_id
+                break
+            rows = conn.execute(
+                select(*SOURCE_COLUMNS)
+                .where(CONVERSATIONS.c.id > last_id, CONVERSATIONS.c.id <= upper)
+                .order_by(CONVERSATIONS.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                _save_state(conn, upper)
+                stats['last_id'] = upper
+                break
+
+            stats['buckets'] += upsert_counts(conn, aggregate(rows))
+            _save_state(conn, rows[-1].id)
+
+        stats['rows'] += len(rows)
+        stats['batches'] += 1
+        stats['last_id'] = rows[-1].id
+        logger.debug("Rolled up conversations up to id %d", rows[-1].id)
+
+    return stats
+
+
+def rebuild(engine, start, end, batch_size=10000):
+    """
+    Recompute the rollups for days in [start, end) from conversations
+
+    Only rows at or below the high-water mark are counted, so a later
+    incremental run does not add them again. Days whose conversations
+    have been archived are kept as they are.
+
+    Returns:
+        Dict with rows, buckets and the rebuilt (start, end)
+    """
+    ensure_schema(engine)
+    start, end = day_start(start), day_start(end)
+
+    with engine.begin() as conn:
+        last_id = _lock_state(conn)
+        first = conn.execute(select(func.min(CONVERSATIONS.c.created_at))).scalar()
+        if first is None or day_start(first) >= end:
+            return {'rows': 0, 'buckets': 0, 'start': start, 'end': end}
+        if start < day_start(first):
+            logger.warning("Conversations before %s are archived; keeping their rollups",
+                           f"{first:%Y-%m-%d}")
+            start = day_start(first)
+
+        conn.execute(ANALYTICS.delete().where(
+            ANALYTICS.c.date >= start, ANALYTICS.c.date < end,
+            ANALYTICS.c.metric_type.in_(METRIC_TYPES)
+        ))
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            select(*SOURCE_COLUMNS).where(
+                CONVERSATIONS.c.created_at >= start, CONVERSATIONS.c.created_at < end,
+                CONVERSATIONS.c.id <= last_id
+            )
+        )
+        counts = Counter()
+        rows = 0
+        for partition in result.partitions():
+            aggregate(partition, counts)
+            rows += len(partition)
+        buckets = upsert_counts(conn, counts)
+
+    return {'rows': rows, 'buckets': buckets, 'start': start, 'end': end}
+
+
+def reset(engine):
+    """Delete all rollups and the high-water mark; the next run starts over"""
+    ensure_schema(engine)
+    with engine.begin() as conn:
+        _lock_state(conn)
+        conn.execute(ANALYTICS.delete().where(ANALYTICS.c.metric_type.in_(METRIC_TYPES)))
+        _save_state(conn, 0)
+
+
+def query_rollups(session, metric_type, start, end, language=None, location=None, daily=False):
+    """
+    Totals for one metric type over [start, end) from the rollup table
+
+    Args:
+        session: Database session (a read replica session is fine)
+        metric_type: 'messages', 'intent', 'symptom' or 'emergency'
+        start, end: Date range
+        language: Only this language (default: all)
+        location: Only this location (default: all)
+        daily: One row per day instead of one per metric name
+
+    Returns:
+        List of (metric_name, total), or (date, metric_name, total) when daily
+    """
+    total = func.sum(Analytics.metric_value).label('total')
+    columns = [Analytics.date, Analytics.metric_name] if daily else [Analytics.metric_name]
+    query = session.query(*columns, total).filter(
+        Analytics.metric_type == metric_type,
+        Analytics.date >= day_start(start),
+        Analytics.date < day_start(end)
+    )
+    if language is not None:
+        query = query.filter(Analytics.language == _bucket_value(language, 20))
+    if location is not None:
+        query = query.filter(Analytics.location == _bucket_value(location, 100))
+
+    query = query.group_by(*columns)
+    query = query.order_by(Analytics.date, total.desc()) if daily else query.order_by(total.desc())
+    return [tuple(row) for row in query.all()]
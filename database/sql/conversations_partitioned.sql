@@ -0,0 +1,53 @@
+-- Conversations, partitioned by month on created_at (PostgreSQL 11+)
+--
+-- Run through scripts/partition_conversations.py, which also creates the
+-- monthly partitions and copies rows over from conversations_legacy.
+--
+-- Compared with the original table:
+--   * bot_response is NULL for static replies; response_template +
+--     response_language name the template instead and response_hash is
+--     the hash of its text (see src/static_responses.py). Only dynamic
+--     replies keep their text.
+--   * JSON columns are JSONB.
+--   * One composite (user_phone, created_at) btree and a BRIN index on
+--     created_at replace the separate btrees on session_id, user_phone
+--     and created_at.
+--   * The primary key includes created_at (required for partitioning),
+--     so messages.conversation_id can no longer be a foreign key.
+
+ALTER TABLE conversations RENAME TO conversations_legacy;
+ALTER INDEX conversations_pkey RENAME TO conversations_legacy_pkey;
+ALTER SEQUENCE conversations_id_seq RENAME TO conversations_legacy_id_seq;
+ALTER TABLE messages DROP CONSTRAINT IF EXISTS messages_conversation_id_fkey;
+
+CREATE SEQUENCE conversations_id_seq AS BIGINT;
+
+CREATE TABLE conversations (
+    id BIGINT NOT NULL DEFAULT nextval('conversations_id_seq'),
+    session_id VARCHAR(100),
+    user_phone VARCHAR(20),
+    user_name VARCHAR(100),
+    language VARCHAR(20),
+    message_type VARCHAR(20),
+    user_message TEXT,
+    bot_response TEXT,
+    response_template VARCHAR(40),
+    response_language VARCHAR(20),
+    response_hash VARCHAR(16),
+    detected_intent VARCHAR(50),
+    detected_symptoms JSONB,
+    detected_location VARCHAR(100),
+    is_emergency BOOLEAN DEFAULT FALSE,
+    image_url VARCHAR(500),
+    image_analysis JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+ALTER SEQUENCE conversations_id_seq OWNED BY conversations.id;
+
+-- Catches rows outside every monthly partition so inserts never fail
+CREATE TABLE conversations_default PARTITION OF conversations DEFAULT;
+
+CREATE INDEX ix_conversations_user_phone_created ON conversations (user_phone, created_at);
+CREATE INDEX ix_conversations_created_brin ON conversations USING BRIN (created_at);
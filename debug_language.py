@@ -1,7 +1,5 @@
 # Debug language detection scoring
-import sys
 import re
-sys.path.insert(0, 'src')
 
 text = "mujhe bukhar hai"
 text_lower = text.lower()
@@ -1,8 +1,9 @@
 # Quick test to debug pincode issue
+import os
 import sys
-sys.path.insert(0, 'src')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from clinic_finder import extract_location, search_clinics_in_json
+from src.clinic_finder import extract_location, search_clinics_in_json
 
 # Test extract_location with pincode
 test_input = "226010"
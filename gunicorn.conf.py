@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Gunicorn Configuration
+Production server profile, picked up by `gunicorn app:app` from the project root
+(Procfile and render.yaml pass it explicitly with -c)
+
+- The app is preloaded in the master and shared copy-on-write by the workers
+- Workers and threads are derived from CPUs and memory (see src/server_profile.py);
+  WEB_CONCURRENCY and GUNICORN_THREADS override them
+- Workers are recycled after GUNICORN_MAX_REQUESTS (+ jitter) requests, which
+  bounds slow leaks in native libraries
+"""
+
+import os
+
+# gevent has to patch the standard library before the app (requests, ssl,
+# threading) is imported, and with preload_app that happens in the master
+if os.getenv('GUNICORN_WORKER_CLASS', 'gthread').lower() == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        pass  # psycopg2 calls then block the whole worker
+
+from src.config_loader import Config
+from src.server_profile import WORKER_CLASSES, init_worker, prepare_master, thread_count, worker_count
+
+if Config.GUNICORN_WORKER_CLASS not in WORKER_CLASSES:
+    raise ValueError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}")
+
+# The pool settings divide DB_MAX_CONNECTIONS by WEB_CONCURRENCY, so the
+# derived value has to be known before the app is preloaded
+if not os.getenv('WEB_CONCURRENCY'):
+    os.environ['WEB_CONCURRENCY'] = str(worker_count())
+    Config.WEB_CONCURRENCY = int(os.environ['WEB_CONCURRENCY'])
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+preload_app = True
+workers = Config.WEB_CONCURRENCY
+worker_class = Config.GUNICORN_WORKER_CLASS
+threads = thread_count(worker_class)
+if worker_class == 'gevent':
+    worker_connections = threads
+
+max_requests = Config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = Config.GUNICORN_MAX_REQUESTS_JITTER
+timeout = Config.GUNICORN_TIMEOUT
+graceful_timeout = Config.GUNICORN_TIMEOUT
+keepalive = 5  # Longer than nothing, shorter than the proxy's idle timeout
+
+# Worker heartbeats in memory, not on a possibly slow container disk
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+
+def on_starting(server):
+    from src.metrics import reset_multiprocess_dir
+    reset_multiprocess_dir()
+
+
+def when_ready(server):
+    prepare_master()
+    server.log.info("Serving with %d %s workers x %d threads",
+                    server.cfg.workers, server.cfg.worker_class_str, server.cfg.threads)
+
+
+def post_fork(server, worker):
+    init_worker()
+
+
+def child_exit(server, worker):
+    from src.metrics import mark_worker_dead
+    mark_worker_dead(worker.pid)
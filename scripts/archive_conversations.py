@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Conversation Retention Job
+Archives months older than the retention period to compressed files,
+then drops them from the database
+
+Run monthly (cron / Render cron job):
+    python scripts/archive_conversations.py
+"""
+
+import os
+import sys
+import gzip
+import json
+import logging
+from datetime import date, datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+
+from database import Conversation, DatabaseManager
+from database.partitions import (
+    add_months, drop_partition, ensure_partitions, is_partitioned, list_partitions, month_start
+)
+from src.config_loader import Config
+
+# Optional Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+TABLE = Conversation.__table__
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def iter_month(conn, month):
+    """Stream one month of conversations in id order"""
+    start, end = month_start(month), add_months(month, 1)
+    query = (select(TABLE)
+             .where(TABLE.c.created_at >= start, TABLE.c.created_at < end)
+             .order_by(TABLE.c.id))
+    result = conn.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(query)
+    for row in result:
+        yield dict(row._mapping)
+
+
+def write_jsonl(rows, path):
+    """One JSON object per line, gzip-compressed; returns the row count"""
+    count = 0
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        for row in rows:
+            f.write(json.dumps(row, default=_json_default, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def write_parquet(rows, path):
+    """Parquet with zstd compression; JSON columns are stored as strings"""
+    writer = None
+    count = 0
+    batch = []
+
+    def flush():
+        nonlocal writer
+        for row in batch:
+            for key in ('detected_symptoms', 'image_analysis'):
+                if row.get(key) is not None:
+                    row[key] = json.dumps(row[key], ensure_ascii=False)
+        table = pa.Table.from_pylist(batch)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+        writer.write_table(table.cast(writer.schema))
+        batch.clear()
+
+    try:
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) >= BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def months_to_archive(engine, cutoff):
+    """Months with conversations strictly before `cutoff`"""
+    if is_partitioned(engine):
+        return [month for month in list_partitions(engine) if month < cutoff]
+
+    with engine.connect() as conn:
+        first = conn.execute(select(func.min(TABLE.c.created_at))).scalar()
+    months = []
+    month = month_start(first) if first else cutoff
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def archive_month(engine, month, archive_dir, fmt='jsonl', dry_run=False):
+    """
+    Write one month to `archive_dir`, verify it, then remove it from the database
+
+    Returns:
+        (path, rows archived)
+    """
+    start, end = month_start(month), add_months(month, 1)
+    extension = 'parquet' if fmt == 'parquet' else 'jsonl.gz'
+    path = os.path.join(archive_dir, f"conversations_{start:%Y_%m}.{extension}")
+    partitioned = is_partitioned(engine)
+
+    with engine.connect() as conn:
+        expected = conn.execute(
+            select(func.count()).select_from(TABLE)
+            .where(TABLE.c.created_at >= start, TABLE.c.created_at < end)
+        ).scalar()
+        if dry_run:
+            logger.info("[dry run] %s: %d rows -> %s", f"{start:%Y-%m}", expected, path)
+            return path, expected
+        if not expected and not partitioned:
+            return None, 0
+
+        # Write to a temporary name so a crash never leaves a partial archive
+        temporary = path + '.tmp'
+        writer = write_parquet if fmt == 'parquet' else write_jsonl
+        written = writer(iter_month(conn, start), temporary)
+
+    if written != expected:
+        os.remove(temporary)
+        raise RuntimeError(f"{start:%Y-%m}: wrote {written} rows, expected {expected}")
+    os.replace(temporary, path)
+
+    with engine.begin() as conn:
+        if partitioned:
+            drop_partition(conn, start)
+        else:
+            conn.execute(TABLE.delete().where(TABLE.c.created_at >= start, TABLE.c.created_at < end))
+
+    logger.info("Archived %s: %d rows -> %s", f"{start:%Y-%m}", written, path)
+    return path, written
+
+
+def archive_conversations(db_manager, retention_months, archive_dir, fmt='jsonl',
+                          dry_run=False, now=None):
+    """
+    Archive and drop every month older than the retention period, then
+    create upcoming partitions
+
+    Args:
+        db_manager: DatabaseManager for the primary
+        retention_months: Full months kept in the database besides the current one
+        archive_dir: Directory for archive files
+        fmt: 'jsonl' (gzip) or 'parquet'
+        dry_run: Only report what would be archived
+        now: Reference time (default: now, UTC)
+
+    Returns:
+        List of (path, rows) per archived month
+    """
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+
+    engine = db_manager.engine
+    cutoff = add_months(now or datetime.utcnow(), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archived = []
+    for month in months_to_archive(engine, cutoff):
+        path, rows = archive_month(engine, month, archive_dir, fmt, dry_run)
+        if path:
+            archived.append((path, rows))
+
+    if not dry_run:
+        ensure_partitions(engine)
+    return archived
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Archive old conversations')
+    parser.add_argument(
+        '--database-url',
+        help='Database URL (optional, uses Config.DATABASE_URL if not provided)'
+    )
+    parser.add_argument(
+        '--retention-months',
+        type=int,
+        default=Config.CONVERSATION_RETENTION_MONTHS,
+        help=f'Months kept in the database (default: {Config.CONVERSATION_RETENTION_MONTHS})'
+    )
+    parser.add_argument(
+        '--archive-dir',
+        default=Config.CONVERSATION_ARCHIVE_DIR,
+        help=f'Where archive files go (default: {Config.CONVERSATION_ARCHIVE_DIR})'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['jsonl', 'parquet'],
+        default='jsonl',
+        help='Archive file format (parquet needs pyarrow)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show what would be archived without changing anything'
+    )
+
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.database_url or Config.DATABASE_URL)
+    try:
+        archived = archive_conversations(db_manager, args.retention_months, args.archive_dir,
+                                         args.format, args.dry_run)
+    except Exception as e:
+        logger.error(f"❌ Archiving failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+    total = sum(rows for _, rows in archived)
+    logger.info("✅ %d months, %d conversations archived", len(archived), total)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Startup Check Script
+Imports the web app in a fresh interpreter with `python -X importtime` and
+reports where the cold-start time goes
+
+Fails when a heavy library that should load lazily (NumPy/PIL, Google Cloud,
+pydub) is imported at startup, or when the import takes longer than the budget:
+    python scripts/check_startup.py --budget-ms 1000
+"""
+
+import os
+import sys
+import logging
+import subprocess
+import tempfile
+from typing import Dict, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Loaded on first image / voice message only (see src/lazy_import.py)
+HEAVY_MODULES = (
+    'numpy',
+    'PIL.Image',
+    'google.cloud.speech_v1p1beta1',
+    'google.cloud.texttospeech',
+    'pydub',
+)
+
+# Importing app.py measured 0.44 s (fastest of 3) with the lazy imports, 1.05 s
+# without; the budget leaves headroom for slower hosts such as free-tier instances
+DEFAULT_BUDGET_MS = 1000
+
+
+def measure_import(module: str = 'app', env: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[int, int]]:
+    """
+    Import `module` in a new interpreter and collect -X importtime output
+
+    Args:
+        module: Module to import
+        env: Extra environment variables
+
+    Returns:
+        Module name -> (self microseconds, cumulative microseconds)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        run_env = dict(os.environ)
+        # Keep the measurement away from the real database
+        run_env.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tmp, 'startup.db')}")
+        run_env.update(env or {})
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=PROJECT_ROOT, env=run_env, capture_output=True, text=True, timeout=120
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def check_startup(module: str = 'app', budget_ms: float = DEFAULT_BUDGET_MS, runs: int = 3) -> Dict:
+    """
+    Measure the import `runs` times and compare the fastest run to the budget
+
+    Returns:
+        {'ok', 'import_ms', 'budget_ms', 'heavy' (eagerly loaded heavy modules), 'timings'}
+    """
+    best = None
+    for _ in range(runs):
+        timings = measure_import(module)
+        if best is None or timings[module][1] < best[module][1]:
+            best = timings
+
+    import_ms = best[module][1] / 1000
+    heavy = [name for name in HEAVY_MODULES if name in best]
+    return {
+        'ok': not heavy and import_ms <= budget_ms,
+        'import_ms': import_ms,
+        'budget_ms': budget_ms,
+        'heavy': heavy,
+        'timings': best,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure web app cold-start import time')
+    parser.add_argument('--module', default='app', help='Module to import (default: app)')
+    parser.add_argument(
+        '--budget-ms',
+        type=float,
+        default=float(os.getenv('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)),
+        help=f'Maximum import time in ms (default: {DEFAULT_BUDGET_MS}, or STARTUP_BUDGET_MS)'
+    )
+    parser.add_argument('--runs', type=int, default=3, help='Imports to run; the fastest counts (default: 3)')
+    parser.add_argument('--top', type=int, default=15, help='Slowest modules to list (default: 15)')
+
+    args = parser.parse_args()
+
+    try:
+        report = check_startup(args.module, args.budget_ms, args.runs)
+    except Exception as e:
+        logger.error(f"❌ Startup check failed: {e}")
+        sys.exit(1)
+
+    slowest = sorted(report['timings'].items(), key=lambda item: item[1][1], reverse=True)
+    logger.info("Slowest imports (cumulative ms):")
+    for name, (_, cumulative_us) in slowest[:args.top]:
+        logger.info(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    if report['heavy']:
+        logger.error(f"❌ Imported at startup (should be lazy): {', '.join(report['heavy'])}")
+    if report['import_ms'] > report['budget_ms']:
+        logger.error(f"❌ import {args.module}: {report['import_ms']:.0f} ms > budget {report['budget_ms']:.0f} ms")
+    if not report['ok']:
+        sys.exit(1)
+    logger.info(f"✅ import {args.module}: {report['import_ms']:.0f} ms (budget {report['budget_ms']:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
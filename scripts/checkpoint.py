@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint files for resumable batch scripts
+
+A checkpoint is a small JSON file written atomically after each committed
+batch. It carries a fingerprint of the job (input file, options) so a
+checkpoint from a different run is never resumed by mistake.
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def file_fingerprint(path, **extra):
+    """Identify an input file by path, size and modification time"""
+    stat = os.stat(path)
+    fingerprint = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+    fingerprint.update(extra)
+    return fingerprint
+
+
+class Checkpoint:
+    """Progress of one resumable job, stored as JSON next to its input"""
+
+    def __init__(self, path, fingerprint):
+        """
+        Args:
+            path: Checkpoint file path
+            fingerprint: JSON-serializable dict identifying the job
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.state = {}
+
+    def load(self):
+        """
+        Read saved progress for this job
+
+        Returns:
+            The saved state dict, or {} when there is none or it belongs to another job
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+
+        if saved.get('fingerprint') != self.fingerprint:
+            logger.warning(f"Checkpoint {self.path} is for a different job; starting over")
+            return {}
+        self.state = saved.get('state', {})
+        return self.state
+
+    def save(self, **state):
+        """Merge `state` into the saved progress (write to a temp file, then rename)"""
+        self.state.update(state)
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'state': self.state,
+                       'saved_at': datetime.utcnow().isoformat()}, f)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        """Remove the checkpoint once the job has finished"""
+        self.state = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -2,21 +2,51 @@
 # -*- coding: utf-8 -*-
 """
 Migration Script: JSON to PostgreSQL
-Migrates clinic data from data/clinics.json to PostgreSQL database
+Imports clinic data into the database in idempotent, resumable batches
+
+Input formats:
+    json    data/clinics.json layout ({"City_Area": [clinic, ...]}) or a list of clinics
+    ndjson  one clinic object per line (.ndjson / .jsonl)
+    csv     one clinic per row; specialties separated by ';' or '|'
+
+Clinics are upserted on a natural key (hash of normalized name, address and
+location key), so running the import again updates clinics instead of
+duplicating them.
 """
 
 import os
+import io
+import re
+import csv
 import sys
 import json
+import time
+import hashlib
 import logging
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import bindparam, cast, inspect, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+
 from database import DatabaseManager, Clinic
 from src.config_loader import Config
 
+# Handle both `python scripts/migrate_to_postgres.py` and `import scripts.migrate_to_postgres`
+try:
+    from checkpoint import Checkpoint, file_fingerprint
+except ImportError:
+    from scripts.checkpoint import Checkpoint, file_fingerprint
+
+# Optional streaming JSON parser (otherwise .json files are loaded whole)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +54,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CLINICS = Clinic.__table__
+COLUMNS = (
+    'natural_key', 'name', 'address', 'city', 'area', 'location_key', 'timing', 'phone',
+    'specialties', 'fees', 'latitude', 'longitude', 'is_active', 'created_at', 'updated_at'
+)
+# Columns compared to decide whether an existing clinic changed
+COMPARED_COLUMNS = COLUMNS[1:-2]
+MAX_ERRORS = 100  # Errors kept in the stats; the rest are only counted
+PROGRESS_INTERVAL = 5  # Seconds between progress lines
+
+PINCODE_PATTERN = re.compile(r'(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)')
+KEY_SEPARATORS = re.compile(r'[\W_]+', re.UNICODE)
+SPECIALTY_SEPARATORS = re.compile(r'\s*[;|]\s*')
+
 
 def parse_location_key(location_key):
     """
@@ -36,138 +80,527 @@ def parse_location_key(location_key):
     return city, area
 
 
-def migrate_clinics(json_file='data/clinics.json', database_url=None):
+def natural_key(name, address, location_key=None):
+    """
+    Stable clinic identity: sha1 of the lowercased name, address and location
+    key, punctuation ignored
+
+    The location key is part of it because clinics are searched by location:
+    a clinic listed under two locations is one row per location.
+    """
+    def fold(value):
+        return KEY_SEPARATORS.sub(' ', (value or '').lower()).strip()
+    return hashlib.sha1(
+        f"{fold(name)}|{fold(address)}|{fold(location_key)}".encode('utf-8')
+    ).hexdigest()
+
+
+def extract_pincode(address):
+    """Six-digit Indian pincode in an address ("226010" or "226 010"), or None"""
+    match = PINCODE_PATTERN.search(str(address or ''))
+    return match.group(1) + match.group(2) if match else None
+
+
+def _clean(value, limit=None):
+    """Collapse whitespace; empty values become None"""
+    if value is None:
+        return None
+    value = ' '.join(str(value).split())
+    if not value:
+        return None
+    return value[:limit] if limit else value
+
+
+def _coordinate(value, bound):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if -bound <= number <= bound and number != 0 else None
+
+
+def _specialties(value):
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                value = SPECIALTY_SEPARATORS.split(value.strip('[]'))
+        else:
+            value = SPECIALTY_SEPARATORS.split(value)
+    specialties = []
+    for item in value:
+        item = _clean(item, 100)
+        if item and item not in specialties:
+            specialties.append(item)
+    return specialties
+
+
+class PincodeGeocoder:
+    """
+    Pincode -> (latitude, longitude)
+
+    Coordinates come from an optional pincode CSV (pincode, latitude,
+    longitude columns, e.g. the India Post pincode directory; offices in
+    the same pincode are averaged) and from clinics in the input that
+    already have coordinates.
+    """
+
+    def __init__(self, path=None):
+        self._sums = {}  # pincode -> [lat sum, lon sum, count]
+        self.geocoded = 0
+        if path:
+            self.load(path)
+
+    def load(self, path):
+        """Read a pincode CSV; rows without usable coordinates are skipped"""
+        loaded = 0
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                row = {(key or '').strip().lower(): value for key, value in row.items()}
+                pincode = extract_pincode(row.get('pincode'))
+                if pincode and self.learn(pincode, row.get('latitude'), row.get('longitude')):
+                    loaded += 1
+        logger.info(f"Loaded {loaded} pincode coordinates ({len(self._sums)} pincodes) from {path}")
+
+    def learn(self, pincode, latitude, longitude):
+        """Add one known location for `pincode`; returns False if the coordinates are unusable"""
+        latitude, longitude = _coordinate(latitude, 90), _coordinate(longitude, 180)
+        if latitude is None or longitude is None:
+            return False
+        sums = self._sums.setdefault(pincode, [0.0, 0.0, 0])
+        sums[0] += latitude
+        sums[1] += longitude
+        sums[2] += 1
+        return True
+
+    def locate(self, pincode):
+        """Mean coordinates for `pincode`, or None"""
+        sums = self._sums.get(pincode)
+        if not sums:
+            return None
+        self.geocoded += 1
+        return round(sums[0] / sums[2], 6), round(sums[1] / sums[2], 6)
+
+
+def normalize_clinic(record, location_key=None, geocoder=None):
+    """
+    Turn one input record into a clinics row
+
+    Args:
+        record: Clinic dict from any input format
+        location_key: "City_Area" key from the JSON layout, if any
+        geocoder: PincodeGeocoder used when coordinates are missing
+
+    Returns:
+        Dict with COLUMNS except the timestamps
+
+    Raises:
+        ValueError: if the name or address is missing
+    """
+    name = _clean(record.get('name'), 255)
+    address = _clean(record.get('address'))
+    if not name or not address:
+        raise ValueError("name and address are required")
+
+    location_key = _clean(record.get('location_key') or location_key, 200)
+    city, area = parse_location_key(location_key) if location_key else (None, None)
+    city = _clean(record.get('city'), 100) or city
+    area = _clean(record.get('area'), 100) or area
+    if city:
+        city = city.title()
+    if not location_key and city:
+        location_key = '_'.join(filter(None, [city, area])).replace(' ', '_')[:200]
+
+    latitude = _coordinate(record.get('latitude'), 90)
+    longitude = _coordinate(record.get('longitude'), 180)
+    pincode = extract_pincode(record.get('pincode')) or extract_pincode(address)
+    if geocoder and pincode:
+        if latitude is not None and longitude is not None:
+            geocoder.learn(pincode, latitude, longitude)
+        else:
+            latitude, longitude = geocoder.locate(pincode) or (None, None)
+
+    is_active = record.get('is_active', True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() not in ('0', 'false', 'no', 'n', '')
+
+    return {
+        'natural_key': natural_key(name, address, location_key),
+        'name': name,
+        'address': address,
+        'city': city,
+        'area': area,
+        'location_key': location_key,
+        'timing': _clean(record.get('timing'), 200),
+        'phone': _clean(record.get('phone'), 20),
+        'specialties': _specialties(record.get('specialties')),
+        'fees': _clean(record.get('fees'), 100),
+        'latitude': latitude,
+        'longitude': longitude,
+        'is_active': bool(is_active),
+    }
+
+
+def detect_format(path):
+    """'ndjson', 'csv' or 'json' from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if extension == '.csv':
+        return 'csv'
+    return 'json'
+
+
+def iter_records(f, fmt):
+    """
+    Stream (location_key, record) pairs from a binary file
+
+    The JSON layout is streamed with ijson when it is installed; without
+    it the file is loaded whole.
+    """
+    if fmt == 'ndjson':
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                try:
+                    yield None, json.loads(line)
+                except ValueError as e:
+                    yield None, ValueError(f"line {line_number}: invalid JSON ({e})")
+        return
+
+    if fmt == 'csv':
+        reader = csv.DictReader(io.TextIOWrapper(f, encoding='utf-8-sig', newline=''))
+        for row in reader:
+            yield None, row
+        return
+
+    is_list = f.peek(64).lstrip()[:1] == b'['
+    if IJSON_AVAILABLE:
+        if is_list:
+            for record in ijson.items(f, 'item', use_float=True):
+                yield None, record
+        else:
+            for location_key, clinics in ijson.kvitems(f, '', use_float=True):
+                for record in clinics:
+                    yield location_key, record
+        return
+
+    data = json.load(f)
+    if isinstance(data, list):
+        for record in data:
+            yield None, record
+    else:
+        for location_key, clinics in data.items():
+            for record in clinics:
+                yield location_key, record
+
+
+def ensure_schema(engine):
+    """
+    Create clinics if needed and give older tables the natural_key column
+
+    Existing rows without a key, or with a key from before the location
+    key was part of it, get their key; rows that turn out to be duplicates
+    of an earlier row (the result of re-running the old import) are deleted.
+    """
+    CLINICS.create(engine, checkfirst=True)
+    columns = {column['name'] for column in inspect(engine).get_columns('clinics')}
+    if 'natural_key' not in columns:
+        logger.info("Adding clinics.natural_key")
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE clinics ADD COLUMN natural_key VARCHAR(40)"))
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(CLINICS.c.id, CLINICS.c.name, CLINICS.c.address, CLINICS.c.location_key,
+                   CLINICS.c.natural_key)
+            .order_by(CLINICS.c.id)
+        ).all()
+        seen = set()
+        keyed, duplicates = [], []
+        for row in rows:
+            key = natural_key(row.name, row.address, row.location_key)
+            if key in seen:
+                duplicates.append(row.id)
+                continue
+            seen.add(key)
+            if key != row.natural_key:
+                keyed.append({'clinic_id': row.id, 'key': key})
+        if keyed or duplicates:
+            # Duplicates first: a kept row may take over a deleted row's key
+            if duplicates:
+                conn.execute(CLINICS.delete().where(CLINICS.c.id.in_(duplicates)))
+            if keyed:
+                conn.execute(
+                    update(CLINICS).where(CLINICS.c.id == bindparam('clinic_id'))
+                    .values(natural_key=bindparam('key')),
+                    keyed
+                )
+            logger.info(f"Keyed {len(keyed)} existing clinics, removed {len(duplicates)} duplicates")
+
+    for index in CLINICS.indexes:
+        index.create(engine, checkfirst=True)
+
+
+def _copy_value(value):
+    if isinstance(value, list):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _copy_upsert(conn, rows):
+    """PostgreSQL: COPY the batch into a temp table, then one INSERT ... ON CONFLICT"""
+    column_list = ', '.join(COLUMNS)
+    conn.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS clinics_stage ON COMMIT DELETE ROWS AS "
+        f"SELECT {column_list} FROM clinics WITH NO DATA"
+    ))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in COLUMNS])
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY clinics_stage ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+    assignments = ', '.join(f"{column} = EXCLUDED.{column}" for column in COLUMNS[1:] if column != 'created_at')
+
+    def compared(prefix):
+        return ', '.join(f"{prefix}.{column}::jsonb" if column == 'specialties' else f"{prefix}.{column}"
+                         for column in COMPARED_COLUMNS)
+
+    result = conn.execute(text(
+        f"INSERT INTO clinics ({column_list}) SELECT {column_list} FROM clinics_stage "
+        f"ON CONFLICT (natural_key) DO UPDATE SET {assignments} "
+        f"WHERE ({compared('clinics')}) IS DISTINCT FROM ({compared('EXCLUDED')})"
+    ))
+    return result.rowcount
+
+
+def _executemany_upsert(conn, rows):
+    """INSERT ... ON CONFLICT with executemany (SQLite, or PostgreSQL drivers without COPY)"""
+    dialect = conn.dialect.name
+    statement = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(CLINICS)
+    excluded = statement.excluded
+
+    def comparable(column):
+        if dialect == 'postgresql' and column.name == 'specialties':
+            return cast(column, postgresql.JSONB)
+        return column
+
+    statement = statement.on_conflict_do_update(
+        index_elements=['natural_key'],
+        set_={column: excluded[column] for column in COLUMNS[1:] if column != 'created_at'},
+        where=or_(*(comparable(CLINICS.c[column]).is_distinct_from(comparable(excluded[column]))
+                    for column in COMPARED_COLUMNS))
+    )
+    result = conn.execute(statement, rows)
+    return result.rowcount if result.rowcount >= 0 else len(rows)
+
+
+def upsert_clinics(engine, rows):
+    """
+    Upsert one batch in its own transaction
+
+    Returns:
+        Rows inserted or changed (unchanged clinics are not rewritten)
+    """
+    dialect = engine.dialect.name
+    if dialect not in ('postgresql', 'sqlite'):
+        raise RuntimeError(f"Clinic import supports PostgreSQL and SQLite, not {dialect}")
+
+    now = datetime.utcnow()
+    # ON CONFLICT cannot touch the same row twice in one statement: last record wins
+    unique = {}
+    for row in rows:
+        unique[row['natural_key']] = dict(row, created_at=now, updated_at=now)
+    rows = list(unique.values())
+
+    with engine.begin() as conn:
+        if dialect == 'postgresql' and engine.dialect.driver == 'psycopg2':
+            return _copy_upsert(conn, rows)
+        return _executemany_upsert(conn, rows)
+
+
+def import_clinics(db_manager, source, fmt='auto', batch_size=5000, geocoder=None,
+                   checkpoint=None):
     """
-    Migrate clinics from JSON file to PostgreSQL database
-    
+    Stream clinics from `source` into the database in upserted batches
+
     Args:
-        json_file: Path to clinics.json file
+        db_manager: DatabaseManager for the primary
+        source: Input file path
+        fmt: 'auto', 'json', 'ndjson' or 'csv'
+        batch_size: Clinics per transaction
+        geocoder: PincodeGeocoder for clinics without coordinates
+        checkpoint: Checkpoint to resume from and update after each batch
+
+    Returns:
+        dict: Import statistics
+    """
+    fmt = detect_format(source) if fmt == 'auto' else fmt
+    engine = db_manager.engine
+    ensure_schema(engine)
+
+    state = checkpoint.load() if checkpoint else {}
+    stats = {
+        'total_locations': 0,
+        'total_clinics': state.get('records', 0),
+        'inserted': state.get('inserted', 0),  # inserted or updated
+        'unchanged': state.get('unchanged', 0),
+        'failed': state.get('failed', 0),
+        'geocoded': 0,
+        'errors': []
+    }
+    resume_at = stats['total_clinics']
+    if resume_at:
+        logger.info(f"Resuming {source} after {resume_at} records")
+
+    size = os.path.getsize(source)
+    locations = set()
+    batch = []
+    started = last_report = time.monotonic()
+
+    def flush():
+        written = upsert_clinics(engine, batch)
+        stats['inserted'] += written
+        stats['unchanged'] += len(batch) - written
+        batch.clear()
+        if checkpoint:
+            checkpoint.save(records=stats['total_clinics'], inserted=stats['inserted'],
+                            unchanged=stats['unchanged'], failed=stats['failed'])
+
+    with open(source, 'rb') as f:
+        for position, (location_key, record) in enumerate(iter_records(f, fmt)):
+            if position < resume_at:
+                continue
+            stats['total_clinics'] += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                row = normalize_clinic(record, location_key, geocoder)
+            except (ValueError, TypeError, AttributeError) as e:
+                stats['failed'] += 1
+                if len(stats['errors']) < MAX_ERRORS:
+                    name = record.get('name') if isinstance(record, dict) else None
+                    stats['errors'].append(f"Record {position + 1} ({name or 'unnamed'}): {e}")
+                continue
+
+            locations.add(row['location_key'])
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                done = stats['total_clinics'] - resume_at
+                logger.info(f"{stats['total_clinics']:,} clinics ({100 * f.tell() / max(size, 1):.1f}%), "
+                            f"{done / (now - started):,.0f}/s")
+
+        if batch:
+            flush()
+
+    stats['total_locations'] = len(locations - {None})
+    stats['geocoded'] = geocoder.geocoded if geocoder else 0
+    stats['seconds'] = round(time.monotonic() - started, 1)
+    if checkpoint:
+        checkpoint.clear()
+    return stats
+
+
+def migrate_clinics(json_file='data/clinics.json', database_url=None, fmt='auto',
+                    batch_size=5000, pincode_file=None, resume=True, checkpoint_path=None):
+    """
+    Import clinics from a JSON/NDJSON/CSV file into the database
+
+    Args:
+        json_file: Input file (default: data/clinics.json)
         database_url: PostgreSQL connection URL (optional, uses Config if not provided)
-    
+        fmt: 'auto' (from the extension), 'json', 'ndjson' or 'csv'
+        batch_size: Clinics per transaction
+        pincode_file: Optional pincode CSV used to geocode clinics without coordinates
+        resume: Continue from the checkpoint of an interrupted run
+        checkpoint_path: Checkpoint file (default: <input>.checkpoint)
+
     Returns:
         dict: Migration statistics
     """
-    logger.info("Starting clinic migration from JSON to PostgreSQL")
-    
+    logger.info(f"Starting clinic import from {json_file}")
+    if not os.path.exists(json_file):
+        logger.error(f"File not found: {json_file}")
+        return {'success': False, 'errors': ['File not found']}
+    fmt = detect_format(json_file) if fmt == 'auto' else fmt
+    if fmt == 'json' and not IJSON_AVAILABLE and os.path.getsize(json_file) > 100 * 1024 * 1024:
+        logger.warning("Large JSON file loaded into memory; install ijson or use NDJSON to stream it")
+
     # Initialize database
-    if database_url:
-        db_manager = DatabaseManager(database_url)
-    else:
-        db_manager = DatabaseManager(Config.DATABASE_URL)
-    
-    # Create tables
-    logger.info("Creating database tables...")
-    db_manager.create_tables()
-    
-    # Load JSON data
-    logger.info(f"Loading clinic data from {json_file}")
+    db_manager = DatabaseManager(database_url or Config.DATABASE_URL)
+
+    checkpoint_path = checkpoint_path or f"{json_file}.checkpoint"
+    checkpoint = Checkpoint(checkpoint_path, file_fingerprint(json_file, format=fmt))
+    if not resume:
+        checkpoint.clear()
+
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            clinics_data = json.load(f)
-    except FileNotFoundError:
-        logger.error(f"File not found: {json_file}")
-        return {'success': False, 'error': 'File not found'}
+        geocoder = PincodeGeocoder(pincode_file)
+        stats = import_clinics(db_manager, json_file, fmt, batch_size, geocoder, checkpoint)
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON format: {e}")
-        return {'success': False, 'error': 'Invalid JSON format'}
-    
-    # Migration statistics
-    stats = {
-        'total_locations': len(clinics_data),
-        'total_clinics': 0,
-        'inserted': 0,
-        'failed': 0,
-        'errors': []
-    }
-    
-    # Migrate clinics
-    with db_manager.get_session() as session:
-        for location_key, clinics_list in clinics_data.items():
-            logger.info(f"Processing location: {location_key} ({len(clinics_list)} clinics)")
-            
-            # Parse location
-            city, area = parse_location_key(location_key)
-            
-            for clinic_data in clinics_list:
-                stats['total_clinics'] += 1
-                
-                try:
-                    # Create Clinic object
-                    clinic = Clinic(
-                        name=clinic_data.get('name'),
-                        address=clinic_data.get('address'),
-                        city=city,
-                        area=area,
-                        location_key=location_key,
-                        timing=clinic_data.get('timing'),
-                        phone=clinic_data.get('phone'),
-                        specialties=clinic_data.get('specialties', []),
-                        fees=clinic_data.get('fees'),
-                        latitude=clinic_data.get('latitude'),
-                        longitude=clinic_data.get('longitude'),
-                        is_active=True,
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    
-                    # Add to session
-                    session.add(clinic)
-                    stats['inserted'] += 1
-                    
-                except Exception as e:
-                    stats['failed'] += 1
-                    error_msg = f"Failed to insert clinic '{clinic_data.get('name')}': {e}"
-                    logger.error(error_msg)
-                    stats['errors'].append(error_msg)
-        
-        # Commit all changes
-        try:
-            session.commit()
-            logger.info("All clinics committed to database successfully")
-        except Exception as e:
-            logger.error(f"Failed to commit changes: {e}")
-            session.rollback()
-            stats['success'] = False
-            stats['errors'].append(f"Commit failed: {e}")
-            return stats
-    
+        return {'success': False, 'errors': ['Invalid JSON format']}
+    except Exception as e:
+        logger.error(f"Import stopped: {e} (re-run to resume from {checkpoint_path})")
+        return {'success': False, 'errors': [str(e)]}
+    finally:
+        db_manager.close()
+
     # Success
     stats['success'] = True
     logger.info(f"Migration completed successfully!")
-    logger.info(f"Statistics: {stats}")
-    
+    logger.info(f"Statistics: { {key: value for key, value in stats.items() if key != 'errors'} }")
+
     return stats
 
 
 def verify_migration(database_url=None):
     """
     Verify migration by checking clinic count
-    
+
     Args:
         database_url: PostgreSQL connection URL
-    
+
     Returns:
         dict: Verification results
     """
     logger.info("Verifying migration...")
-    
+
     # Initialize database
     if database_url:
         db_manager = DatabaseManager(database_url)
     else:
         db_manager = DatabaseManager(Config.DATABASE_URL)
-    
+
     with db_manager.get_session() as session:
         clinic_count = session.query(Clinic).count()
-        
+
         # Get sample clinics
         sample_clinics = session.query(Clinic).limit(5).all()
-        
+
         logger.info(f"Total clinics in database: {clinic_count}")
         logger.info("Sample clinics:")
         for clinic in sample_clinics:
             logger.info(f"  - {clinic.name} ({clinic.city}, {clinic.area})")
-        
+
         return {
             'total_clinics': clinic_count,
             'sample_clinics': [c.to_dict() for c in sample_clinics]
@@ -177,17 +610,39 @@ def verify_migration(database_url=None):
 def main():
     """Main entry point for migration script"""
     import argparse
-    
-    parser = argparse.ArgumentParser(description='Migrate clinic data from JSON to PostgreSQL')
+
+    parser = argparse.ArgumentParser(description='Import clinic data (JSON, NDJSON or CSV) into the database')
     parser.add_argument(
-        '--json-file',
+        '--json-file', '--input',
+        dest='json_file',
         default='data/clinics.json',
-        help='Path to clinics.json file (default: data/clinics.json)'
+        help='Input file (default: data/clinics.json)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['auto', 'json', 'ndjson', 'csv'],
+        default='auto',
+        help='Input format (default: from the file extension)'
     )
     parser.add_argument(
         '--database-url',
         help='PostgreSQL database URL (optional, uses Config.DATABASE_URL if not provided)'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=5000,
+        help='Clinics per transaction (default: 5000)'
+    )
+    parser.add_argument(
+        '--pincode-file',
+        help='CSV with pincode, latitude, longitude columns for geocoding clinics without coordinates'
+    )
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore the checkpoint of an interrupted run and start from the beginning'
+    )
     parser.add_argument(
         '--verify-only',
         action='store_true',
@@ -198,16 +653,16 @@ def main():
         action='store_true',
         help='Drop existing tables before migration (CAUTION: deletes all data!)'
     )
-    
+
     args = parser.parse_args()
-    
+
     try:
         # Verify only
         if args.verify_only:
             results = verify_migration(args.database_url)
             print(f"\n✅ Verification complete: {results['total_clinics']} clinics found")
             return
-        
+
         # Drop tables if requested
         if args.drop_tables:
             logger.warning("⚠️  Dropping all existing tables...")
@@ -215,28 +670,32 @@ def main():
             if response.lower() != 'yes':
                 logger.info("Migration cancelled")
                 return
-            
+
             db_manager = DatabaseManager(args.database_url or Config.DATABASE_URL)
             db_manager.drop_tables()
             logger.info("Tables dropped successfully")
-        
+
         # Run migration
-        stats = migrate_clinics(args.json_file, args.database_url)
-        
+        stats = migrate_clinics(args.json_file, args.database_url, args.format, args.batch_size,
+                                args.pincode_file, resume=not args.restart)
+
         if stats.get('success'):
             print("\n" + "="*60)
             print("✅ MIGRATION SUCCESSFUL!")
             print("="*60)
             print(f"Total Locations: {stats['total_locations']}")
             print(f"Total Clinics: {stats['total_clinics']}")
-            print(f"Successfully Inserted: {stats['inserted']}")
+            print(f"Inserted/Updated: {stats['inserted']}")
+            print(f"Unchanged: {stats['unchanged']}")
+            print(f"Geocoded by pincode: {stats['geocoded']}")
             print(f"Failed: {stats['failed']}")
-            
+            print(f"Time: {stats['seconds']}s")
+
             if stats['errors']:
                 print("\nErrors:")
                 for error in stats['errors'][:5]:  # Show first 5 errors
                     print(f"  - {error}")
-            
+
             # Verify migration
             print("\nVerifying migration...")
             verify_results = verify_migration(args.database_url)
@@ -247,7 +706,8 @@ def main():
             print("Errors:")
             for error in stats.get('errors', []):
                 print(f"  - {error}")
-    
+            sys.exit(1)
+
     except Exception as e:
         logger.error(f"Migration failed: {e}", exc_info=True)
         print(f"\n❌ Migration failed: {e}")
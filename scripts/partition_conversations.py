@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Conversation Partitioning Script
+Converts the PostgreSQL conversations table to monthly partitions and
+stores static bot replies as template references
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from database import DatabaseManager
+from database.partitions import (
+    add_months, create_partition, ensure_partitions, is_partitioned, is_postgres,
+    load_sql, month_start
+)
+from src.config_loader import Config
+from src.static_responses import iter_static_responses, text_hash
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    'id, session_id, user_phone, user_name, language, message_type, user_message, '
+    'detected_intent, detected_symptoms, detected_location, is_emergency, image_url, '
+    'image_analysis, created_at'
+)
+
+COPY_ROWS = f"""
+INSERT INTO conversations ({COLUMNS}, bot_response, response_template, response_language,
+                           response_hash)
+SELECT l.id, l.session_id, l.user_phone, l.user_name, l.language, l.message_type,
+       l.user_message, l.detected_intent, l.detected_symptoms::jsonb, l.detected_location,
+       l.is_emergency, l.image_url, l.image_analysis::jsonb,
+       COALESCE(l.created_at, now() AT TIME ZONE 'utc'),
+       CASE WHEN s.template_id IS NULL THEN l.bot_response END,
+       s.template_id, s.language, s.hash
+FROM conversations_legacy l
+LEFT JOIN static_response_texts s ON s.text = l.bot_response
+"""
+
+
+def load_static_texts(conn):
+    """Temporary lookup table: static reply text -> (template id, language, hash)"""
+    conn.execute(text(
+        "CREATE TEMP TABLE static_response_texts "
+        "(text TEXT PRIMARY KEY, template_id VARCHAR(40), language VARCHAR(20), "
+        "hash VARCHAR(16)) ON COMMIT DROP"
+    ))
+    seen = {}
+    for template_id, language, static_text in iter_static_responses():
+        seen.setdefault(static_text, {'text': static_text, 'template_id': template_id,
+                                      'language': language, 'hash': text_hash(static_text)})
+    conn.execute(text(
+        "INSERT INTO static_response_texts VALUES (:text, :template_id, :language, :hash)"
+    ), list(seen.values()))
+    return len(seen)
+
+
+def partition_conversations(db_manager, months_ahead=3, drop_legacy=False):
+    """
+    Convert conversations to a partitioned table in one transaction
+
+    Args:
+        db_manager: DatabaseManager for the primary
+        months_ahead: Future monthly partitions to create
+        drop_legacy: Drop conversations_legacy after a verified copy
+
+    Returns:
+        True on success
+    """
+    engine = db_manager.engine
+    if not is_postgres(engine):
+        logger.error("Partitioning needs PostgreSQL (got %s)", engine.dialect.name)
+        return False
+
+    if is_partitioned(engine):
+        created = ensure_partitions(engine, months_ahead=months_ahead)
+        logger.info("conversations is already partitioned; %d monthly partitions ensured", created)
+        return True
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(load_sql('conversations_partitioned.sql'))
+
+        first, last = conn.execute(text(
+            "SELECT min(created_at), max(created_at) FROM conversations_legacy"
+        )).one()
+        month = month_start(first or datetime.utcnow())
+        end = add_months(max(last or datetime.utcnow(), datetime.utcnow()), months_ahead)
+        partitions = 0
+        while month <= end:
+            create_partition(conn, month)
+            month = add_months(month, 1)
+            partitions += 1
+        logger.info("Created %d monthly partitions", partitions)
+
+        templates = load_static_texts(conn)
+        copied = conn.execute(text(COPY_ROWS)).rowcount
+        legacy = conn.execute(text("SELECT count(*) FROM conversations_legacy")).scalar()
+        if copied != legacy:
+            raise RuntimeError(f"Copied {copied} of {legacy} rows - rolling back")
+
+        conn.execute(text(
+            "SELECT setval('conversations_id_seq', COALESCE((SELECT max(id) FROM conversations), 0) + 1, false)"
+        ))
+        stored_as_template = conn.execute(text(
+            "SELECT count(*) FROM conversations WHERE response_template IS NOT NULL"
+        )).scalar()
+        logger.info("Copied %d conversations (%d static replies matched %d templates)",
+                    copied, stored_as_template, templates)
+
+        if drop_legacy:
+            conn.execute(text("DROP TABLE conversations_legacy"))
+            logger.info("Dropped conversations_legacy")
+
+    return True
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Partition the conversations table by month')
+    parser.add_argument(
+        '--database-url',
+        help='PostgreSQL database URL (optional, uses Config.DATABASE_URL if not provided)'
+    )
+    parser.add_argument(
+        '--months-ahead',
+        type=int,
+        default=3,
+        help='Future monthly partitions to create (default: 3)'
+    )
+    parser.add_argument(
+        '--drop-legacy',
+        action='store_true',
+        help='Drop conversations_legacy once the copy is verified'
+    )
+    parser.add_argument(
+        '--print-sql',
+        action='store_true',
+        help='Print the table DDL and exit'
+    )
+
+    args = parser.parse_args()
+
+    if args.print_sql:
+        print(load_sql('conversations_partitioned.sql'))
+        sys.exit(0)
+
+    db_manager = DatabaseManager(args.database_url or Config.DATABASE_URL)
+    try:
+        success = partition_conversations(db_manager, args.months_ahead, args.drop_legacy)
+    finally:
+        db_manager.close()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
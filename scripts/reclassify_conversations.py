@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Conversation Re-classification Script
+Re-runs language, emergency and symptom detection over the conversation
+log and writes back the rows whose language, intent, symptoms or
+emergency flag changed
+
+Run after changing the keyword lists in symptom_checker, emergency_handler
+or language_detector:
+    python scripts/reclassify_conversations.py --workers 4
+
+An interrupted run resumes from its checkpoint; --dry-run only counts the
+rows that would change.
+"""
+
+import os
+import sys
+import time
+import logging
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import bindparam, func, select, update
+
+from database import Conversation, DatabaseManager
+from src.batch_analysis import classify_batch, rules_version
+from src.config_loader import Config
+
+# Handle both `python scripts/reclassify_conversations.py` and `import scripts.reclassify_conversations`
+try:
+    from checkpoint import Checkpoint
+except ImportError:
+    from scripts.checkpoint import Checkpoint
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CONVERSATIONS = Conversation.__table__
+SOURCE_COLUMNS = (
+    CONVERSATIONS.c.id, CONVERSATIONS.c.created_at, CONVERSATIONS.c.message_type,
+    CONVERSATIONS.c.user_message, CONVERSATIONS.c.language,
+    CONVERSATIONS.c.detected_intent, CONVERSATIONS.c.detected_symptoms,
+    CONVERSATIONS.c.is_emergency
+)
+# created_at is matched too, so PostgreSQL only touches the row's partition
+UPDATE_ROW = (
+    update(CONVERSATIONS)
+    .where(CONVERSATIONS.c.id == bindparam('_id'),
+           CONVERSATIONS.c.created_at == bindparam('_created_at'))
+)
+
+PROGRESS_INTERVAL = 5  # Seconds between progress lines
+CHUNKS_PER_WORKER = 4  # Chunks read per window and worker
+
+
+def _fingerprint(engine):
+    """A checkpoint is only resumed against the same database and keyword lists"""
+    return {'database': engine.url.render_as_string(hide_password=True),
+            'rules': rules_version()}
+
+
+def _classify_window(engine, last_id, upper, window, chunk_size, pool):
+    """
+    Classify up to `window` rows after `last_id`, chunk by chunk
+
+    The rows are streamed with a server-side cursor; each chunk goes to a
+    worker as soon as it is read. Results are collected after the read
+    connection is released.
+
+    Returns:
+        (rows read, last id read, changed rows)
+    """
+    pending = []
+    rows = 0
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+            select(*SOURCE_COLUMNS)
+            .where(CONVERSATIONS.c.id > last_id, CONVERSATIONS.c.id <= upper)
+            .order_by(CONVERSATIONS.c.id)
+            .limit(window)
+        )
+        for partition in result.partitions():
+            chunk = [tuple(row) for row in partition]
+            rows += len(chunk)
+            last_id = chunk[-1][0]
+            pending.append(pool.submit(classify_batch, chunk) if pool else classify_batch(chunk))
+
+    changes = []
+    for item in pending:
+        changes.extend(item.result() if pool else item)
+    return rows, last_id, changes
+
+
+def reclassify_conversations(engine, chunk_size=2000, workers=None, dry_run=False, checkpoint=None):
+    """
+    Re-classify every logged conversation with the current keyword lists
+
+    Rows are read in id order up to the newest id at the start, so rows
+    logged meanwhile (already classified with the current lists) are
+    skipped. Each window of changed rows is written in one transaction
+    before the checkpoint moves past it.
+
+    Args:
+        engine: Engine for the primary
+        chunk_size: Rows per fetch and per worker task
+        workers: Worker processes (default: CPU count; 1 runs in this process)
+        dry_run: Count the changes without writing them
+        checkpoint: Checkpoint to resume from and update after each window
+
+    Returns:
+        Dict with rows, changed, seconds, rows_per_second and the
+        created_at range of the changed rows (first_changed, last_changed)
+    """
+    workers = workers or os.cpu_count() or 1
+    window = chunk_size * workers * CHUNKS_PER_WORKER
+    state = checkpoint.load() if checkpoint else {}
+    last_id = state.get('last_id', 0)
+    stats = {'rows': state.get('rows', 0), 'changed': state.get('changed', 0),
+             'first_changed': state.get('first_changed'), 'last_changed': state.get('last_changed')}
+    if last_id:
+        logger.info(f"Resuming after conversation id {last_id}")
+
+    with engine.connect() as conn:
+        upper = conn.execute(select(func.max(CONVERSATIONS.c.id))).scalar() or 0
+
+    # Spawned, not forked: workers must not inherit the engine's open connections
+    pool = (ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            if workers > 1 else None)
+    started = last_report = time.monotonic()
+    done = 0
+    try:
+        while last_id < upper:
+            rows, last_id, changes = _classify_window(engine, last_id, upper, window, chunk_size, pool)
+            if not rows:
+                break
+
+            if changes and not dry_run:
+                with engine.begin() as conn:
+                    conn.execute(UPDATE_ROW, changes)
+            if changes:
+                times = [change['_created_at'].isoformat() for change in changes]
+                stats['first_changed'] = min(filter(None, (stats['first_changed'], min(times))))
+                stats['last_changed'] = max(filter(None, (stats['last_changed'], max(times))))
+            stats['rows'] += rows
+            stats['changed'] += len(changes)
+            done += rows
+            if checkpoint and not dry_run:
+                checkpoint.save(last_id=last_id, **stats)
+
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                logger.info(f"{stats['rows']:,} conversations ({100 * last_id / max(upper, 1):.1f}% of ids), "
+                            f"{stats['changed']:,} changed, {done / (now - started):,.0f}/s")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    seconds = time.monotonic() - started
+    stats['seconds'] = round(seconds, 1)
+    stats['rows_per_second'] = round(done / seconds) if seconds else done
+    if checkpoint and not dry_run:
+        checkpoint.clear()
+    return stats
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Re-classify logged conversations with the current keyword lists')
+    parser.add_argument(
+        '--database-url',
+        help='Database URL (optional, uses Config.DATABASE_URL if not provided)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=2000,
+        help='Conversations per fetch and worker task (default: 2000)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes (default: CPU count; 1 runs without a pool)'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        default='reclassify_conversations.checkpoint',
+        help='Checkpoint file (default: reclassify_conversations.checkpoint)'
+    )
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore the checkpoint of an interrupted run and start from the beginning'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Count the conversations that would change without writing them'
+    )
+
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.database_url or Config.DATABASE_URL)
+    engine = db_manager.engine
+    checkpoint = Checkpoint(args.checkpoint, _fingerprint(engine))
+    if args.restart:
+        checkpoint.clear()
+    try:
+        stats = reclassify_conversations(engine, args.chunk_size, args.workers, args.dry_run, checkpoint)
+        prefix = '[dry run] ' if args.dry_run else ''
+        logger.info("✅ %sRe-classified %d conversations in %.1fs (%d/s), %d changed",
+                    prefix, stats['rows'], stats['seconds'], stats['rows_per_second'], stats['changed'])
+        if stats['changed'] and not args.dry_run:
+            end = datetime.fromisoformat(stats['last_changed'][:10]) + timedelta(days=1)
+            logger.info("Rebuild the analytics rollups of the changed days: "
+                        "python scripts/rollup_analytics.py --rebuild-from %s --rebuild-to %s",
+                        stats['first_changed'][:10], f"{end:%Y-%m-%d}")
+    except Exception as e:
+        logger.error(f"❌ Re-classification stopped: {e} (re-run to resume from {args.checkpoint})",
+                     exc_info=True)
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
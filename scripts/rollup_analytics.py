@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Analytics Rollup Script
+Adds conversations logged since the last run to the daily analytics rollups
+
+Run every few minutes (cron / Render cron job):
+    python scripts/rollup_analytics.py
+
+Recompute a date range after changing the rollup logic:
+    python scripts/rollup_analytics.py --rebuild-from 2024-01-01 --rebuild-to 2024-02-01
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+from database.rollups import get_watermark, rebuild, reset, rollup
+from src.config_loader import Config
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Roll up conversations into the analytics table')
+    parser.add_argument(
+        '--database-url',
+        help='Database URL (optional, uses Config.DATABASE_URL if not provided)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=Config.ANALYTICS_ROLLUP_BATCH_SIZE,
+        help=f'Conversations per transaction (default: {Config.ANALYTICS_ROLLUP_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--lag-seconds',
+        type=int,
+        default=Config.ANALYTICS_ROLLUP_LAG_SECONDS,
+        help=f'Leave rows newer than this for the next run (default: {Config.ANALYTICS_ROLLUP_LAG_SECONDS})'
+    )
+    parser.add_argument(
+        '--rebuild-from',
+        type=_date,
+        metavar='YYYY-MM-DD',
+        help='Recompute rollups from this day (inclusive)'
+    )
+    parser.add_argument(
+        '--rebuild-to',
+        type=_date,
+        metavar='YYYY-MM-DD',
+        help='Recompute rollups up to this day (exclusive, default: tomorrow)'
+    )
+    parser.add_argument(
+        '--reset',
+        action='store_true',
+        help='Delete all rollups and roll up every conversation again'
+    )
+
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.database_url or Config.DATABASE_URL)
+    engine = db_manager.engine
+    try:
+        if args.reset:
+            reset(engine)
+            logger.info("Rollups cleared")
+
+        if args.rebuild_from:
+            end = args.rebuild_to or datetime.utcnow() + timedelta(days=1)
+            result = rebuild(engine, args.rebuild_from, end, args.batch_size)
+            logger.info("✅ Rebuilt %s to %s: %d conversations, %d buckets",
+                        f"{result['start']:%Y-%m-%d}", f"{result['end']:%Y-%m-%d}",
+                        result['rows'], result['buckets'])
+        else:
+            stats = rollup(engine, args.batch_size, args.lag_seconds)
+            logger.info("✅ Rolled up %d conversations into %d buckets (%d batches, high-water mark %d)",
+                        stats['rows'], stats['buckets'], stats['batches'], get_watermark(engine))
+    except Exception as e:
+        logger.error(f"❌ Rollup failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Analysis
+Re-runs language, emergency and symptom detection over logged messages,
+for re-classifying the conversation log after the keyword lists change
+(see scripts/reclassify_conversations.py)
+
+Only what a message determines on its own is recomputed. Intents that
+also depend on the conversation (clinic search, replies to a question,
+images) and the symptoms carried over from earlier messages are kept
+as logged. is_emergency follows the intent when it moves to or from
+'emergency', so the rollups' emergency and intent counts agree.
+"""
+
+import hashlib
+import os
+from typing import Dict, List, Optional, Sequence
+
+from .emergency_handler import detect_emergency
+from .language_detector import detect_language
+from .symptom_checker import extract_symptoms
+
+# Intents decided by the keyword lists alone
+RECLASSIFIED_INTENTS = ('general', 'symptom_check', 'emergency')
+# Message types whose user_message is what the user wrote or said
+TEXT_MESSAGE_TYPES = ('text', 'voice')
+
+# Modules whose keyword lists decide the result
+RULE_MODULES = ('emergency_handler.py', 'keyword_index.py', 'language_detector.py', 'symptom_checker.py')
+
+
+def rules_version() -> str:
+    """Hash of the detection modules; a checkpoint from other rules is not resumed"""
+    digest = hashlib.sha1()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in RULE_MODULES:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def classify_message(message_type: str, text: str, language: str, intent: str,
+                     symptoms: Optional[List[str]], is_emergency: bool = False) -> Optional[Dict]:
+    """
+    Current language, intent, symptoms and emergency flag of one logged message
+
+    Args:
+        message_type: 'text', 'voice' or 'image'
+        text: The logged user message
+        language, intent, symptoms, is_emergency: Values as logged
+
+    Returns:
+        {'language', 'detected_intent', 'detected_symptoms', 'is_emergency'}
+        if any of them changed, otherwise None
+    """
+    if message_type not in TEXT_MESSAGE_TYPES or not text:
+        return None
+
+    new_language = detect_language(text)
+    new_intent, new_symptoms, new_emergency = intent, symptoms, bool(is_emergency)
+    if intent in RECLASSIFIED_INTENTS:
+        found = extract_symptoms(text)
+        if detect_emergency(text):
+            new_intent = 'emergency'
+        else:
+            new_intent = 'symptom_check' if found else 'general'
+        if new_intent == 'symptom_check':
+            new_symptoms = found
+        elif intent == 'symptom_check':
+            new_symptoms = []  # They came from this message
+        if new_intent == 'emergency':
+            new_emergency = True
+        elif intent == 'emergency':
+            new_emergency = False  # The flag was set by this message
+
+    if (new_language, new_intent, new_symptoms, new_emergency) == (language, intent, symptoms, bool(is_emergency)):
+        return None
+    return {'language': new_language, 'detected_intent': new_intent,
+            'detected_symptoms': new_symptoms, 'is_emergency': new_emergency}
+
+
+def classify_batch(rows: Sequence[tuple]) -> List[Dict]:
+    """
+    Re-classify a chunk of logged messages (runs in a worker process)
+
+    Args:
+        rows: (id, created_at, message_type, user_message, language,
+               detected_intent, detected_symptoms, is_emergency) tuples
+
+    Returns:
+        One dict per changed row: the new values plus '_id' and '_created_at'
+    """
+    changes = []
+    for row_id, created_at, message_type, text, language, intent, symptoms, is_emergency in rows:
+        change = classify_message(message_type, text, language, intent, symptoms, is_emergency)
+        if change is not None:
+            change['_id'] = row_id
+            change['_created_at'] = created_at
+            changes.append(change)
+    return changes
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Result Cache Module
+In-process LRU cache with per-entry TTL, negative caching and
+invalidation when the underlying data version changes
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from .metrics import counter, gauge
+
+logger = logging.getLogger(__name__)
+
+# Returned by get() when there is no usable entry (None is a valid cached value)
+MISS = object()
+
+CACHE_REQUESTS = counter(
+    'cache_requests_total', 'Cache lookups by result (hit, negative_hit, miss)', ['cache', 'result']
+)
+CACHE_EVICTIONS = counter(
+    'cache_evictions_total', 'Entries dropped by reason (lru, expired, invalidated)', ['cache', 'reason']
+)
+CACHE_ENTRIES = gauge(
+    'cache_entries', 'Entries currently cached', ['cache']
+)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a TTL
+
+    Negative entries ("nothing found") get their own, usually shorter,
+    TTL. Passing a data version to get()/set() drops every entry the
+    first time the version changes.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 600,
+                 negative_ttl: float = None):
+        """
+        Args:
+            name: Cache name used in metrics
+            maxsize: Maximum entries; 0 disables the cache
+            ttl: Seconds a positive entry is served
+            negative_ttl: Seconds a negative entry is served (default: ttl)
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+
+        self._data = OrderedDict()  # key -> (value, expires_at, negative)
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Bind metric children once instead of on every lookup
+        self._hit = CACHE_REQUESTS.labels(name, 'hit')
+        self._negative_hit = CACHE_REQUESTS.labels(name, 'negative_hit')
+        self._miss = CACHE_REQUESTS.labels(name, 'miss')
+        self._evicted = {reason: CACHE_EVICTIONS.labels(name, reason)
+                         for reason in ('lru', 'expired', 'invalidated')}
+        self._entries = CACHE_ENTRIES.labels(name)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def _check_version(self, version):
+        # Caller holds the lock
+        if version != self._version:
+            if self._data:
+                self._evicted['invalidated'].inc(len(self._data))
+                logger.debug(f"Cache '{self.name}' invalidated (version {self._version} -> {version})")
+            self._data.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: Hashable = None) -> Any:
+        """
+        Cached value for `key`, or MISS
+
+        Args:
+            key: Cache key
+            version: Current data version; a new version empties the cache
+        """
+        if not self.enabled:
+            return MISS
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            entry = self._data.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._data[key]
+                self._evicted['expired'].inc()
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            size = len(self._data)
+
+        self._entries.set(size)
+        if entry is None:
+            self._miss.inc()
+            return MISS
+        (self._negative_hit if entry[2] else self._hit).inc()
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, version: Hashable = None, negative: bool = False):
+        """
+        Store `value`, evicting the least recently used entries beyond maxsize
+
+        Args:
+            negative: Cache as a "not found" result (uses negative_ttl)
+        """
+        if not self.enabled:
+            return
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = (value, time.monotonic() + ttl, negative)
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+            size = len(self._data)
+
+        if evicted:
+            self._evicted['lru'].inc(evicted)
+        self._entries.set(size)
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any], version: Hashable = None,
+                   is_negative: Callable[[Any], bool] = None) -> Any:
+        """
+        Cached value for `key`, computing and storing it on a miss
+
+        `compute` runs outside the lock, so two threads missing the same key
+        may both compute it; the last one stored wins.
+        """
+        value = self.get(key, version)
+        if value is MISS:
+            value = compute()
+            self.set(key, value, version, negative=bool(is_negative and is_negative(value)))
+        return value
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+        self._entries.set(0)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """Entry count and hit rate since start"""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
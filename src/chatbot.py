@@ -7,12 +7,14 @@ Orchestrates all modules and handles conversation flow
 import json
 import logging
 from datetime import datetime
-from .language_detector import detect_language
-from .emergency_handler import detect_emergency, get_emergency_response
-from .symptom_checker import extract_symptoms
+from .emergency_handler import get_emergency_response
 from .health_responses import get_symptom_response, get_general_health_tips
-from .clinic_finder import check_for_clinic_request, extract_location, find_nearby_clinics
+from .clinic_finder import find_nearby_clinics
+from .message_analysis import analyze_message
 from .image_analyzer import ImageAnalyzer
+from .static_responses import find_static, get_static, text_hash
+from .logging_setup import redact_phone
+from .metrics import instrument, stage_timer
 
 # Database imports (optional, for conversation logging)
 try:
@@ -63,6 +65,26 @@ class SwasthyaGuide:
         else:
             self.db_enabled = False
     
+    def restore_state(self, store):
+        """
+        Continue from the state saved for this session by any worker
+        
+        Args:
+            store: ConversationStateStore
+        
+        Returns:
+            True if a saved state was found
+        """
+        state = store.load(self.session_id)
+        if state is None:
+            return False
+        self.user_context.update(state)
+        return True
+    
+    def save_state(self, store):
+        """Save user_context for the next message, whichever worker gets it"""
+        store.save(self.session_id, self.user_context)
+    
     def load_config(self):
         """Load configuration"""
         try:
@@ -71,6 +93,7 @@ class SwasthyaGuide:
         except FileNotFoundError:
             self.config = {'default_language': 'hindi'}
     
+    @instrument('db_log')
     def log_conversation(self, user_message: str, bot_response: str, 
                         detected_intent: str = 'general', 
                         message_type: str = 'text',
@@ -89,6 +112,9 @@ class SwasthyaGuide:
             logger.debug("Database logging disabled")
             return
         
+        # Static replies are stored by reference (template id + language)
+        template = find_static(bot_response)
+        
         try:
             with self.db_manager.get_session() as session:
                 conversation = Conversation(
@@ -97,7 +123,10 @@ class SwasthyaGuide:
                     language=self.user_context['language'],
                     message_type=message_type,
                     user_message=user_message[:5000],  # Limit length
-                    bot_response=bot_response[:5000],  # Limit length
+                    bot_response=None if template else bot_response[:5000],  # Limit length
+                    response_template=template[0] if template else None,
+                    response_language=template[1] if template else None,
+                    response_hash=text_hash(bot_response) if template else None,
                     detected_intent=detected_intent,
                     detected_symptoms=self.user_context.get('symptoms'),
                     detected_location=self.user_context.get('location'),
@@ -112,6 +141,7 @@ class SwasthyaGuide:
         except Exception as e:
             logger.error(f"Failed to log conversation: {e}")
     
+    @instrument('db_profile')
     def update_user_profile(self):
         """Update or create user profile in database"""
         if not self.db_enabled or not self.user_phone:
@@ -145,11 +175,12 @@ class SwasthyaGuide:
                     session.add(profile)
                 
                 session.commit()
-                logger.debug(f"User profile updated: {self.user_phone}")
+                logger.debug("User profile updated: %s", redact_phone(self.user_phone))
         
         except Exception as e:
             logger.error(f"Failed to update user profile: {e}")
     
+    @instrument('process_message')
     def process_message(self, user_input: str, message_type: str = 'text') -> str:
         """
         Main method to process user message and generate response
@@ -158,8 +189,10 @@ class SwasthyaGuide:
             user_input: User's message (text or transcribed voice)
             message_type: Type of message ('text', 'voice', 'image')
         """
-        # Detect language
-        language = detect_language(user_input)
+        # Language, intents, symptoms and location; cached per normalized text,
+        # so everything user-specific below works on copies
+        analysis = analyze_message(user_input)
+        language = analysis.language
         
         self.user_context['language'] = language
         
@@ -170,14 +203,15 @@ class SwasthyaGuide:
         if self.user_context.get('waiting_for_location', False):
             # FIRST: Check if user is reporting a NEW SYMPTOM instead of providing location
             # This prevents getting stuck in location-waiting mode
-            new_symptoms = extract_symptoms(user_input)
+            new_symptoms = list(analysis.symptoms)
             if new_symptoms:
                 logger.info(f"New symptom detected while waiting for location: {new_symptoms}. Resetting location wait.")
                 self.user_context['waiting_for_location'] = False
                 self.user_context['symptoms'] = new_symptoms
                 self.user_context['last_detected_symptoms'] = new_symptoms
                 detected_intent = 'symptom_check'
-                response = get_symptom_response(new_symptoms, language)
+                with stage_timer('response_build'):
+                    response = get_symptom_response(new_symptoms, language)
                 
                 # Set flag to wait for location if response asks about clinic
                 if ('najdeeki clinic' in response.lower() or 
@@ -196,10 +230,7 @@ class SwasthyaGuide:
             negative_words = ['nahi', 'no', 'nai', 'naa', 'cancel', 'rehne', 'mat']
             if any(word in user_words for word in negative_words):
                 self.user_context['waiting_for_location'] = False
-                if language == 'hindi':
-                    response = "Theek hai. Koi baat nahi!\n\nAgar aapko koi aur madad chahiye toh bataayein. 😊"
-                else:
-                    response = "Okay, no problem!\n\nLet me know if you need any other help. 😊"
+                response = get_static('clinic_declined', language)
                 self.log_conversation(user_input, response, 'declined_clinic', message_type)
                 return response
             
@@ -208,30 +239,26 @@ class SwasthyaGuide:
                                 'sure', 'ok', 'okay', 'please', 'kripya', 'batao', 'bataye']
             if any(word in user_words for word in affirmative_words) and len(user_input.split()) <= 3:
                 # User confirmed but didn't provide location yet
-                if language == 'hindi':
-                    response = "Kripya apna area, city, ya pincode clearly bataayein.\n\nUdaharan: 'Lucknow', 'Gomti Nagar', '226010'"
-                else:
-                    response = "Please clearly share your area, city, or pincode.\n\nExample: 'Lucknow', 'Gomti Nagar', '226010'"
+                response = get_static('location_retry', language)
                 self.log_conversation(user_input, response, 'location_request', message_type)
                 return response
             
-            # Try to extract location
-            location = extract_location(user_input)
+            # Try to extract location: a known place, or a short text that
+            # reads like a place name (chatter gets the retry prompt below)
+            location = analysis.location_key()
             if location:
                 logger.info(f"User provided location (continuation): {location}")
                 self.user_context['location'] = location
                 self.user_context['waiting_for_location'] = False
-                response = find_nearby_clinics(location, language)
+                with stage_timer('clinic_search'):
+                    response = find_nearby_clinics(location, language)
                 detected_intent = 'clinic_search'
                 self.log_conversation(user_input, response, detected_intent, message_type)
                 self.update_user_profile()
                 return response
             else:
                 # Still waiting for valid location
-                if language == 'hindi':
-                    response = "Kripya apna area, city, ya pincode clearly bataayein.\n\nUdaharan: 'Lucknow', 'Gomti Nagar', '226010'"
-                else:
-                    response = "Please clearly share your area, city, or pincode.\n\nExample: 'Lucknow', 'Gomti Nagar', '226010'"
+                response = get_static('location_retry', language)
                 self.log_conversation(user_input, response, 'location_request', message_type)
                 return response
         
@@ -250,7 +277,7 @@ class SwasthyaGuide:
             return response
         
         # Check for emergency
-        if detect_emergency(user_input):
+        if analysis.emergency:
             self.user_context['emergency_detected'] = True
             response = get_emergency_response(language)
             detected_intent = 'emergency'
@@ -258,31 +285,31 @@ class SwasthyaGuide:
             return response
         
         # Check for clinic request
-        if check_for_clinic_request(user_input):
+        if analysis.clinic_request:
             detected_intent = 'clinic_search'
-            location = extract_location(user_input)
+            # Only a known place here; free text is read as a location once we asked for one
+            location = analysis.location_key(min_confidence=0.5)
             if location:
                 self.user_context['location'] = location
                 self.user_context['waiting_for_location'] = False
-                response = find_nearby_clinics(location, language)
+                with stage_timer('clinic_search'):
+                    response = find_nearby_clinics(location, language)
             else:
                 # Ask for location and set state
                 self.user_context['waiting_for_location'] = True
-                if language == 'hindi':
-                    response = "Kripya apna area, city, ya pincode bataayein toh main aapko najdeeki clinic suggest kar sakta/sakti hoon.\n\nUdaharan: 'Lucknow', 'Gomti Nagar', '226010'"
-                else:
-                    response = "Please share your area, city, or pincode so I can suggest nearby clinics.\n\nExample: 'Lucknow', 'Gomti Nagar', '226010'"
+                response = get_static('location_prompt', language)
             self.log_conversation(user_input, response, detected_intent, message_type)
             self.update_user_profile()
             return response
         
         # Extract and handle symptoms
-        symptoms = extract_symptoms(user_input)
+        symptoms = list(analysis.symptoms)
         if symptoms:
             self.user_context['symptoms'] = symptoms
             self.user_context['last_detected_symptoms'] = symptoms
             detected_intent = 'symptom_check'
-            response = get_symptom_response(symptoms, language)
+            with stage_timer('response_build'):
+                response = get_symptom_response(symptoms, language)
             
             # Set flag to wait for location if response asks about clinic
             if ('najdeeki clinic' in response.lower() or 
@@ -300,6 +327,7 @@ class SwasthyaGuide:
         
         return response
     
+    @instrument('image_message')
     def process_image_message(self, image_data: bytes, caption: str = "", content_type: str = "image/jpeg") -> str:
         """
         Process image message with optional caption
@@ -314,7 +342,7 @@ class SwasthyaGuide:
             logger.info(f"Processing image: {len(image_data)} bytes, type: {content_type}")
             
             # Detect language from caption if provided
-            language = detect_language(caption) if caption else 'hindi'
+            language = analyze_message(caption).language if caption else 'hindi'
             
             self.user_context['language'] = language
             logger.info(f"Detected language: {language}")
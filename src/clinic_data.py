@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Clinic Data Provider
+Keeps the clinic dataset in memory as an immutable snapshot and swaps in
+a rebuilt one when the source changes, so data updates need no restart
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from .config_loader import Config, resolve_data_path
+from .location_index import EMPTY_GAZETTEER, LocationGazetteer, load_locations
+from .metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+# Database imports are optional, as in clinic_finder
+try:
+    from database import get_db_manager, Clinic
+    from sqlalchemy import func
+    DB_AVAILABLE = True
+except ImportError:
+    DB_AVAILABLE = False
+
+RELOAD_SECONDS = histogram(
+    'clinic_data_reload_seconds', 'Time to load and index the clinic dataset', ['source']
+)
+RELOADS = counter(
+    'clinic_data_reloads_total', 'Clinic dataset reloads by outcome', ['source', 'outcome']
+)
+SNAPSHOT_VERSION = gauge(
+    'clinic_data_version_timestamp', 'Source timestamp of the clinic snapshot being served',
+    ['source'], multiprocess_mode='livemin'
+)
+SNAPSHOT_CLINICS = gauge(
+    'clinic_data_clinics', 'Clinics in the snapshot being served', ['source'],
+    multiprocess_mode='livemax'
+)
+
+
+class ClinicSnapshot:
+    """
+    One loaded clinic dataset plus its lookup structures
+
+    Never modified after construction, so readers can use it without
+    locking while a newer snapshot is being built.
+    """
+
+    def __init__(self, data: Dict[str, List[dict]], version=None, version_time: float = 0.0,
+                 source: str = 'file', locations: Dict = None):
+        """
+        Args:
+            data: location key -> list of clinic dicts (the clinics.json layout)
+            version: Opaque source version used to detect changes
+            version_time: Source timestamp (seconds since the epoch) for metrics
+            source: 'file' or 'db'
+            locations: Area / pincode list for the location gazetteer
+        """
+        self.data = data
+        self.version = version
+        self.version_time = version_time
+        self.source = source
+        self.loaded_at = datetime.utcnow()
+
+        self._keys = [(key.lower(), key) for key in data]
+        self._exact = {key_lower: key for key_lower, key in reversed(self._keys)}
+        # Lowercased name + address per clinic, each clinic once
+        self._haystacks = []
+        seen = set()
+        for clinics in data.values():
+            for clinic in clinics:
+                identity = (clinic.get('name'), clinic.get('address'))
+                if identity not in seen:
+                    seen.add(identity)
+                    haystack = f"{clinic.get('address', '')}\x00{clinic.get('name', '')}".lower()
+                    self._haystacks.append((haystack, clinic))
+        self.size = len(self._haystacks)
+        self.gazetteer = LocationGazetteer(data, locations) if data or locations else EMPTY_GAZETTEER
+
+    def search(self, location: str, limit: int = 10) -> List[dict]:
+        """
+        Clinics for a location: exact location key, then partial key match,
+        then name/address match (pincodes, area names); all case-insensitive
+
+        Canonical keys from the gazetteer that no clinic key contains (areas
+        only named in addresses) are matched by their area name.
+        """
+        location_lower = location.strip().lower()
+        key = self._exact.get(location_lower)
+        if key is not None:
+            logger.info(f"Found exact location key match: {key}")
+            return self.data[key][:limit]
+
+        matching_clinics = []
+        for key_lower, key in self._keys:
+            if location_lower in key_lower:
+                logger.info(f"Found partial match in key: {key}")
+                matching_clinics.extend(self.data[key])
+                if len(matching_clinics) >= limit:
+                    break
+        if matching_clinics:
+            return matching_clinics[:limit]
+
+        location_lower = self.gazetteer.display_name(location_lower).lower()
+        for haystack, clinic in self._haystacks:
+            if location_lower in haystack:
+                matching_clinics.append(clinic)
+                if len(matching_clinics) >= limit:
+                    break
+        return matching_clinics
+
+
+EMPTY_SNAPSHOT = ClinicSnapshot({}, version=None)
+
+
+def database_version():
+    """
+    Cheap version of the clinics table: its row count and latest updated_at
+
+    Returns:
+        (version, version_time); version is None without the database module
+    """
+    if not DB_AVAILABLE:
+        return None, 0.0
+    with get_db_manager().get_read_session() as session:
+        count, updated = session.query(func.count(Clinic.id), func.max(Clinic.updated_at)).one()
+    return (count, updated), updated.timestamp() if updated else 0.0
+
+
+class ClinicDataProvider:
+    """
+    Serves the current ClinicSnapshot and reloads it in a background thread
+
+    The watcher polls a cheap version (file mtime and size, or the clinic
+    count and latest updated_at in the database, plus the mtime and size of
+    the area / pincode list); when it changes, the new
+    snapshot is built on the watcher thread and swapped in with a single
+    assignment. Readers keep using whichever snapshot they picked up.
+
+    With the file source the watcher also polls the clinics table version
+    into db_version, since search results come from the database first.
+    """
+
+    def __init__(self, source: str = None, path: str = None, interval: float = None,
+                 locations_path: str = None):
+        """
+        Args:
+            source: 'file' (clinics JSON) or 'db' (clinics table)
+            path: Clinics JSON path for the file source
+            interval: Seconds between change checks
+            locations_path: Area / pincode list for the location gazetteer
+        """
+        self.source = (source or Config.CLINIC_DATA_SOURCE).lower()
+        if self.source not in ('file', 'db'):
+            raise ValueError(f"Unknown clinic data source: {self.source}")
+        self.path = resolve_data_path(path or Config.CLINIC_DATA_PATH)
+        self.locations_path = resolve_data_path(locations_path or Config.LOCATION_DATA_PATH)
+        self.interval = interval or Config.CLINIC_DATA_POLL_INTERVAL
+
+        self._snapshot = None
+        # Clinics table version as of the last poll (file source only)
+        self.db_version = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self) -> ClinicSnapshot:
+        """
+        Current snapshot (never blocks once the first load has finished)
+
+        The very first call loads synchronously, so callers always see data.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot or EMPTY_SNAPSHOT
+        return snapshot
+
+    def current_version(self):
+        """
+        Version of the source right now, without loading it
+
+        Returns:
+            (version, version_time); version is None when the source is unavailable
+        """
+        version, version_time = self._source_version()
+        if version is None:
+            return None, 0.0
+        try:
+            stat = self.locations_path.stat()
+            locations_version = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            locations_version = None
+        return (version, locations_version), version_time
+
+    def _source_version(self):
+        if self.source == 'file':
+            try:
+                stat = self.path.stat()
+            except OSError:
+                return None, 0.0
+            return (stat.st_mtime_ns, stat.st_size), stat.st_mtime
+        return database_version()
+
+    def _load(self, version, version_time) -> ClinicSnapshot:
+        if self.source == 'file':
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return ClinicSnapshot(data, version, version_time, 'file', load_locations(self.locations_path))
+
+        data = {}
+        with get_db_manager().get_read_session() as session:
+            rows = session.query(Clinic).filter(Clinic.is_active == True).order_by(Clinic.id)
+            for clinic in rows.yield_per(5000):
+                data.setdefault(clinic.location_key or '', []).append(clinic.to_dict())
+        return ClinicSnapshot(data, version, version_time, 'db', load_locations(self.locations_path))
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the snapshot if the source changed
+
+        Args:
+            force: Rebuild even if the version is unchanged
+
+        Returns:
+            True when a new snapshot was swapped in
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            try:
+                version, version_time = self.current_version()
+                current = self._snapshot
+                if current is not None and not force and version == current.version:
+                    return False
+                if version is None:
+                    if current is None:
+                        logger.warning(f"Clinic data not available ({self.source}: {self.path})")
+                        self._snapshot = EMPTY_SNAPSHOT
+                    return False
+
+                snapshot = self._load(version, version_time)
+            except Exception as e:
+                RELOADS.labels(self.source, 'error').inc()
+                logger.error(f"Error loading clinic data ({self.source}): {e}")
+                if self._snapshot is None:
+                    self._snapshot = EMPTY_SNAPSHOT
+                return False
+
+            # Atomic swap: readers see the old or the new snapshot, never a mix
+            self._snapshot = snapshot
+            elapsed = time.perf_counter() - start
+            RELOAD_SECONDS.labels(self.source).observe(elapsed)
+            RELOADS.labels(self.source, 'success').inc()
+            SNAPSHOT_VERSION.labels(self.source).set(version_time)
+            SNAPSHOT_CLINICS.labels(self.source).set(snapshot.size)
+            logger.info(f"Loaded {snapshot.size} clinics from {self.source} in {elapsed * 1000:.0f} ms")
+            return True
+
+    def refresh_db_version(self):
+        """
+        Re-read the clinics table version into db_version
+
+        Runs on the watcher thread, so requests never wait on the database
+        for it. Not needed with the db source, whose snapshot version is
+        already the table's.
+        """
+        if self.source == 'db' or not DB_AVAILABLE:
+            return
+        try:
+            self.db_version = database_version()[0]
+        except Exception as e:
+            logger.debug(f"Clinic database version unavailable: {e}")
+            self.db_version = None
+
+    def start(self):
+        """Start the background watcher (no-op if it is running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='clinic-data-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background watcher"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def restart(self):
+        """Start a fresh watcher thread (threads do not survive fork())"""
+        self._thread = None
+        self.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.reload()
+            self.refresh_db_version()
+            self._stop.wait(self.interval)
+
+
+# Global provider instance
+_provider_instance = None
+
+
+def get_clinic_provider() -> ClinicDataProvider:
+    """Get or create singleton clinic data provider"""
+    global _provider_instance
+    if _provider_instance is None:
+        _provider_instance = ClinicDataProvider()
+    return _provider_instance
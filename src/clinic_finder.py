@@ -5,12 +5,15 @@ Finds and returns nearby clinics based on user location
 Uses PostgreSQL database with JSON file fallback
 """
 
-import json
 import logging
 from typing import Optional, List
-from pathlib import Path
 from sqlalchemy import or_
 
+from .cache import MISS, TTLCache
+from .clinic_data import get_clinic_provider
+from .config_loader import Config
+from .location_index import LocationMatch
+
 logger = logging.getLogger(__name__)
 
 # Database imports are optional - moved inside functions to handle gracefully
@@ -21,37 +24,55 @@ except ImportError:
     DB_AVAILABLE = False
     logger.warning("Database module not available - clinic search will use fallback")
 
-# Load clinics from JSON file
-CLINICS_DATA = None
+
+# Stands in for the user's location text in cached replies
+LOCATION_PLACEHOLDER = '\x00location\x00'
+
+# Free-text locations (no known place in a message of at most
+# FREE_TEXT_MAX_WORDS words)
+FREE_TEXT_CONFIDENCE = 0.3
+FREE_TEXT_MAX_WORDS = 6
+SKIP_WORDS = frozenset([
+    'mein', 'ka', 'ki', 'hai', 'hain', 'the', 'in', 'at', 'me',
+    'please', 'kripya', 'se', 'batayen', 'batao', 'bataye', 'tell',
+    'my', 'is', 'area', 'location', 'jagah', 'city', 'shahar'
+])
+# Whole words, so place names like 'Gomti' or 'Hometown' are not rejected
+SYMPTOM_INDICATORS = frozenset([
+    'hai', 'ho', 'raha', 'rahi', 'gaya', 'feeling', 'have', 'got',
+    'mujhe', 'mera', 'my', 'me', 'dard', 'pain', 'ache'
+])
+# Question words, pronouns, greetings and fillers: a short message with
+# one of them is chatter ('how are you', 'theek hoon'), not a place name
+CHATTER_WORDS = frozenset([
+    'how', 'what', 'why', 'who', 'when', 'where', 'which', 'are', 'you', 'your',
+    'was', 'were', 'can', 'could', 'will', 'would', 'did', 'does', 'not', 'and',
+    'this', 'that', 'there', 'here', 'thanks', 'thank', 'hello', 'hii', 'hey',
+    'good', 'fine', 'okay', 'bye', 'sorry', 'doing', 'know', 'want', 'need',
+    'kaise', 'kaisa', 'kya', 'kyu', 'kyun', 'kaun', 'kab', 'kahan', 'aap', 'tum',
+    'theek', 'thik', 'accha', 'acha', 'hoon', 'hun', 'shukriya', 'dhanyavad',
+    'namaste', 'pata', 'nahi', 'abhi', 'baad'
+])
+
+_results_cache = None
+
+
+def get_results_cache() -> TTLCache:
+    """Get or create the clinic reply cache"""
+    global _results_cache
+    if _results_cache is None:
+        _results_cache = TTLCache(
+            'clinic_results',
+            maxsize=Config.CLINIC_CACHE_SIZE,
+            ttl=Config.CLINIC_CACHE_TTL,
+            negative_ttl=Config.CLINIC_CACHE_NEGATIVE_TTL
+        )
+    return _results_cache
+
 
 def load_clinics_json():
-    """Load clinics data from JSON file"""
-    global CLINICS_DATA
-    if CLINICS_DATA is not None:
-        return CLINICS_DATA
-    
-    try:
-        # Try multiple possible paths
-        json_paths = [
-            Path('data/clinics.json'),
-            Path('clinics.json'),
-            Path('../data/clinics.json')
-        ]
-        
-        for json_path in json_paths:
-            if json_path.exists():
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    CLINICS_DATA = json.load(f)
-                    logger.info(f"Loaded clinics data from {json_path}")
-                    return CLINICS_DATA
-        
-        logger.warning("Could not find clinics.json file")
-        CLINICS_DATA = {}
-        return CLINICS_DATA
-    except Exception as e:
-        logger.error(f"Error loading clinics.json: {e}")
-        CLINICS_DATA = {}
-        return CLINICS_DATA
+    """Clinics data (location key -> clinics) from the current snapshot"""
+    return get_clinic_provider().snapshot().data
 
 
 def check_for_clinic_request(text: str) -> bool:
@@ -66,61 +87,65 @@ def check_for_clinic_request(text: str) -> bool:
     return any(keyword in text_lower for keyword in clinic_keywords)
 
 
-def extract_location(text: str) -> Optional[str]:
-    """Extract location from user input"""
-    # Simple location extraction - looks for common patterns
-    # In production, you'd use NER or location API
-    
-    # Clean the input
-    text = text.strip()
-    
-    # If input is a location key format (e.g., "Lucknow_Gomti_Nagar_Patrakarpuram")
-    if '_' in text and text.replace('_', '').replace(' ', '').isalnum():
-        logger.info(f"Detected location key format: {text}")
-        return text
-    
-    # If input is a pincode (6 digits), return as is
-    if text.isdigit() and len(text) == 6:
-        logger.info(f"Detected pincode: {text}")
-        return text
-    
-    # Remove common filler words but keep location-related terms
+def recognize_location(text: str) -> Optional[LocationMatch]:
+    """
+    Location in a message, with a confidence score
+
+    Known places (clinic location keys, areas and their aliases from the
+    location list, pincodes in the pincode table) are found with the
+    gazetteer of the current clinic snapshot. A short message naming no
+    known place is taken as a free-text location with low confidence,
+    unless it reads like a symptom description or chatter, or has words
+    that are not made of letters.
+
+    Args:
+        text: User message
+
+    Returns:
+        LocationMatch (canonical key, display name, confidence, kind), or None
+    """
+    match = get_clinic_provider().snapshot().gazetteer.match(text)
+    if match is not None:
+        logger.info("Recognized location %s (%s, confidence %.1f)", match.key, match.kind, match.confidence)
+        return match
+
+    # Digits that are no valid pincode (e.g. '012345', a phone number)
     words = text.split()
-    location_words = []
-    
-    skip_words = [
-        'mein', 'ka', 'ki', 'hai', 'hain', 'the', 'in', 'at', 'me', 
-        'please', 'kripya', 'se', 'batayen', 'batao', 'bataye', 'tell',
-        'my', 'is', 'area', 'location', 'jagah', 'city', 'shahar'
-    ]
-    
-    for word in words:
-        cleaned_word = word.strip('.,!?;:')
-        if cleaned_word.lower() not in skip_words and len(cleaned_word) > 2:
-            location_words.append(cleaned_word)
-    
-    if location_words:
-        # Join extracted words (up to 3 words for compound locations)
-        location = ' '.join(location_words[:3])
-        
-        # Validate: Don't accept text that looks like a symptom description
-        symptom_indicators = ['hai', 'ho', 'raha', 'gaya', 'feeling', 'have', 'got', 
-                             'mujhe', 'mera', 'my', 'me', 'dard', 'pain', 'ache']
-        if any(indicator in location.lower() for indicator in symptom_indicators):
-            logger.info(f"Rejected as location (looks like symptom): {location}")
-            return None
-        
-        logger.info(f"Extracted location: {location}")
-        return location
-    
-    # Don't blindly return any input as location - this causes false matches
-    # Only very specific patterns should reach here
-    return None
+    if len(words) > FREE_TEXT_MAX_WORDS or text.strip().isdigit():
+        return None
+    words = [word.strip('.,!?;:') for word in words]
+    if any(word.lower() in SYMPTOM_INDICATORS or word.lower() in CHATTER_WORDS for word in words):
+        return None
+    location_words = [word for word in words if word.lower() not in SKIP_WORDS and len(word) > 2]
+    if not location_words or len(location_words) > 3:
+        return None
+    if not all(word.replace('-', '').isalpha() for word in location_words):
+        return None
+    location = ' '.join(location_words)
+    logger.info(f"Unrecognized free-text location: {location}")
+    return LocationMatch(location, location, FREE_TEXT_CONFIDENCE, 'text')
+
+
+def extract_location(text: str, min_confidence: float = 0.0) -> Optional[str]:
+    """
+    Canonical location key from user input (see recognize_location)
+
+    Args:
+        text: User message
+        min_confidence: Ignore matches below this confidence
+
+    Returns:
+        Location key, pincode or free-text location; None if there is none
+    """
+    match = recognize_location(text)
+    if match is None or match.confidence < min_confidence:
+        return None
+    return match.key
 
 
 def search_clinics_in_json(location: str, limit: int = 10) -> List[dict]:
     """
-    Search for clinics in JSON file
+    Search for clinics in the in-memory clinic snapshot (JSON file or DB)
     
     Args:
         location: Location string to search for
@@ -129,44 +154,12 @@ def search_clinics_in_json(location: str, limit: int = 10) -> List[dict]:
     Returns:
         List of clinic dictionaries
     """
-    clinics_data = load_clinics_json()
-    if not clinics_data:
-        return []
-    
-    location_clean = location.strip()
-    matching_clinics = []
-    
-    # Strategy 1: Exact location key match (e.g., "Lucknow_Gomti_Nagar_Patrakarpuram")
-    if location_clean in clinics_data:
-        logger.info(f"Found exact location key match: {location_clean}")
-        matching_clinics = clinics_data[location_clean]
-        return matching_clinics[:limit]
-    
-    # Strategy 2: Partial match in location keys (case-insensitive)
-    location_lower = location_clean.lower()
-    for location_key, clinics in clinics_data.items():
-        if location_lower in location_key.lower():
-            logger.info(f"Found partial match in key: {location_key}")
-            matching_clinics.extend(clinics)
-    
-    if matching_clinics:
-        return matching_clinics[:limit]
-    
-    # Strategy 3: Search in clinic addresses and names (for pincode or area name)
-    for location_key, clinics in clinics_data.items():
-        for clinic in clinics:
-            # Check if location appears in address or name
-            if (location_lower in clinic.get('address', '').lower() or
-                location_lower in clinic.get('name', '').lower()):
-                if clinic not in matching_clinics:  # Avoid duplicates
-                    matching_clinics.append(clinic)
-    
-    return matching_clinics[:limit]
+    return get_clinic_provider().snapshot().search(location, limit)
 
 
 def search_clinics_in_db(location: str, limit: int = 5) -> List[dict]:
     """
-    Search for clinics in PostgreSQL database
+    Search for clinics in PostgreSQL database (read replica when configured)
     
     Args:
         location: Location string to search for
@@ -182,7 +175,7 @@ def search_clinics_in_db(location: str, limit: int = 5) -> List[dict]:
     try:
         db_manager = get_db_manager()
         
-        with db_manager.get_session() as session:
+        with db_manager.get_read_session() as session:
             # Clean location string
             location_clean = location.strip().lower()
             
@@ -207,16 +200,50 @@ def search_clinics_in_db(location: str, limit: int = 5) -> List[dict]:
         return []
 
 
-def find_nearby_clinics(location: str, language: str) -> str:
-    """Find and return nearby clinics based on location"""
+def search_nearby_clinics(location: str, limit: int = 10) -> List[dict]:
+    """Clinics for a location: database first, then the in-memory snapshot"""
     
     # First, try database search
-    matching_clinics = search_clinics_in_db(location, limit=10)
+    matching_clinics = search_clinics_in_db(location, limit=limit)
     
     # If database is empty or unavailable, use JSON fallback
     if not matching_clinics:
         logger.info("Database search returned no results, trying JSON fallback")
-        matching_clinics = search_clinics_in_json(location, limit=10)
+        matching_clinics = search_clinics_in_json(location, limit=limit)
+    
+    return matching_clinics
+
+
+def find_nearby_clinics(location: str, language: str) -> str:
+    """
+    Find and return nearby clinics based on location
+    
+    Formatted replies are cached per (location, language); the location is
+    stored as a placeholder and filled in with its display name (canonical
+    keys from extract_location show as the area name). Cached replies are
+    dropped when the clinic snapshot or the clinics table changes.
+    """
+    location = ' '.join(location.split())
+    cache = get_results_cache()
+    key = (location.lower(), language)
+    provider = get_clinic_provider()
+    snapshot = provider.snapshot()
+    # Results come from the database first, so its version is part of the
+    # key too (already the snapshot's version when it was loaded from there;
+    # otherwise the one the watcher last polled)
+    version = snapshot.version if snapshot.source == 'db' else (snapshot.version, provider.db_version)
+    
+    template = cache.get(key, version)
+    if template is MISS:
+        matching_clinics = search_nearby_clinics(location, limit=10)
+        template = format_clinics_response(LOCATION_PLACEHOLDER, language, matching_clinics)
+        cache.set(key, template, version, negative=not matching_clinics)
+    
+    return template.replace(LOCATION_PLACEHOLDER, snapshot.gazetteer.display_name(location))
+
+
+def format_clinics_response(location: str, language: str, matching_clinics: List[dict]) -> str:
+    """Reply text listing `matching_clinics`, or the not-found help text"""
     
     if not matching_clinics:
         # No clinics found
@@ -5,11 +5,15 @@ Loads environment variables and application settings
 """
 
 import os
+import tempfile
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 
 class Config:
     """Application configuration"""
@@ -31,6 +35,8 @@ class Config:
     
     # Database Settings
     DATABASE_URL = os.getenv('DATABASE_URL', '')
+    # False when running on the built-in localhost default below
+    DATABASE_CONFIGURED = bool(DATABASE_URL or os.getenv('DEV_DATABASE_URL'))
     # Default to local PostgreSQL for development
     if not DATABASE_URL:
         DATABASE_URL = os.getenv(
@@ -41,13 +47,91 @@ class Config:
     if DATABASE_URL.startswith('postgres://'):
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
     
+    # Read replicas (comma-separated URLs); clinic searches and other reads go here
+    DATABASE_REPLICA_URLS = os.getenv('DATABASE_REPLICA_URLS', '')
+    DB_REPLICA_COOLDOWN = float(os.getenv('DB_REPLICA_COOLDOWN', '30'))  # Seconds a failing replica is skipped
+    
+    # Conversation retention (scripts/archive_conversations.py)
+    CONVERSATION_RETENTION_MONTHS = int(os.getenv('CONVERSATION_RETENTION_MONTHS', '12'))
+    CONVERSATION_ARCHIVE_DIR = os.getenv('CONVERSATION_ARCHIVE_DIR', 'archive/conversations')
+    
+    # Clinic dataset served from memory; reloaded in the background when it changes
+    CLINIC_DATA_SOURCE = os.getenv('CLINIC_DATA_SOURCE', 'file').lower()  # 'file' or 'db'
+    CLINIC_DATA_PATH = os.getenv('CLINIC_DATA_PATH', 'data/clinics.json')  # Relative to the project root
+    CLINIC_DATA_POLL_INTERVAL = float(os.getenv('CLINIC_DATA_POLL_INTERVAL', '30'))  # Seconds between change checks
+    LOCATION_DATA_PATH = os.getenv('LOCATION_DATA_PATH', 'data/locations.json')  # Areas and pincodes for location recognition
+    
+    # Clinic reply cache per (location, language); CLINIC_CACHE_SIZE=0 disables it
+    CLINIC_CACHE_SIZE = int(os.getenv('CLINIC_CACHE_SIZE', '1024'))
+    CLINIC_CACHE_TTL = float(os.getenv('CLINIC_CACHE_TTL', '600'))  # Seconds
+    CLINIC_CACHE_NEGATIVE_TTL = float(os.getenv('CLINIC_CACHE_NEGATIVE_TTL', '60'))  # Seconds for "no clinics found"
+    
+    # Reply templates and phrases; edits are picked up without a restart
+    RESPONSE_CATALOG_PATH = os.getenv('RESPONSE_CATALOG_PATH', 'data/translations.json')  # Relative to the project root
+    RESPONSE_CATALOG_POLL_INTERVAL = float(os.getenv('RESPONSE_CATALOG_POLL_INTERVAL', '30'))  # Seconds between change checks
+    SYMPTOM_REPLY_CACHE_SIZE = int(os.getenv('SYMPTOM_REPLY_CACHE_SIZE', '512'))  # Composed replies per (symptom set, language); 0 disables
+    
+    # Message analysis cache per normalized text; ANALYSIS_CACHE_SIZE=0 disables it
+    ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '4096'))
+    ANALYSIS_CACHE_TTL = float(os.getenv('ANALYSIS_CACHE_TTL', '3600'))  # Seconds
+    ANALYSIS_CACHE_MAX_LENGTH = int(os.getenv('ANALYSIS_CACHE_MAX_LENGTH', '64'))  # Longer messages are not cached
+    
+    # Analytics rollups (scripts/rollup_analytics.py)
+    ANALYTICS_ROLLUP_BATCH_SIZE = int(os.getenv('ANALYTICS_ROLLUP_BATCH_SIZE', '10000'))  # Conversations per transaction
+    ANALYTICS_ROLLUP_LAG_SECONDS = int(os.getenv('ANALYTICS_ROLLUP_LAG_SECONDS', '60'))  # Skip rows newer than this
+    
     # Database Connection Pool Settings
     DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
     DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
     DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'queue').lower()  # 'queue', or 'null' behind PgBouncer
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))  # Seconds
+    DB_LIVENESS_INTERVAL = float(os.getenv('DB_LIVENESS_INTERVAL', '30'))  # Ping connections idle longer than this
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '0'))  # Budget shared by all workers, 0 = no limit
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))  # Gunicorn worker processes (gunicorn.conf.py derives it when unset)
+    
+    # Gunicorn (gunicorn.conf.py)
+    GUNICORN_WORKER_CLASS = os.getenv('GUNICORN_WORKER_CLASS', 'gthread').lower()  # 'gthread', 'gevent' or 'sync'
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '0'))  # Threads/greenlets per worker, 0 = MAX_CONCURRENT_REQUESTS + 2
+    GUNICORN_WORKER_MEMORY_MB = int(os.getenv('GUNICORN_WORKER_MEMORY_MB', '200'))  # Memory budget per worker when deriving WEB_CONCURRENCY
+    GUNICORN_MAX_REQUESTS = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))  # Recycle a worker after this many requests, 0 = never
+    GUNICORN_MAX_REQUESTS_JITTER = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))  # Random extra requests so workers don't recycle together
+    GUNICORN_TIMEOUT = int(os.getenv('GUNICORN_TIMEOUT', '30'))  # Seconds before a silent worker is killed
+    
+    # Rate Limiting / Load Shedding
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    RATE_LIMIT_MESSAGES_PER_MINUTE = float(os.getenv('RATE_LIMIT_MESSAGES_PER_MINUTE', '20'))
+    RATE_LIMIT_MESSAGE_BURST = int(os.getenv('RATE_LIMIT_MESSAGE_BURST', '10'))
+    RATE_LIMIT_MEDIA_PER_MINUTE = float(os.getenv('RATE_LIMIT_MEDIA_PER_MINUTE', '4'))
+    RATE_LIMIT_MEDIA_BURST = int(os.getenv('RATE_LIMIT_MEDIA_BURST', '3'))
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', '8'))  # Per worker process
+    RATE_LIMIT_STORE_PATH = os.getenv(
+        'RATE_LIMIT_STORE_PATH',
+        os.path.join(tempfile.gettempdir(), 'swasthya_ratelimit.db')
+    )
+    
+    # Conversation state (waiting for a location, last symptoms) shared by all workers on the host
+    CONVERSATION_STATE_ENABLED = os.getenv('CONVERSATION_STATE_ENABLED', 'True').lower() == 'true'
+    CONVERSATION_STATE_TTL = int(os.getenv('CONVERSATION_STATE_TTL', '1800'))  # Seconds after the last message
+    CONVERSATION_STATE_PATH = os.getenv(
+        'CONVERSATION_STATE_PATH',
+        os.path.join(tempfile.gettempdir(), 'swasthya_state.db')
+    )
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # 'text' or 'json'
+    LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', '0.1'))  # Fraction of verbose events kept
+    LOG_REDACT_PII = os.getenv('LOG_REDACT_PII', 'True').lower() == 'true'
+    
+    # Metrics (Prometheus)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+    METRICS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')  # Shared by gunicorn workers
+    
+    # Health probes (/livez, /readyz)
+    HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', '30'))  # Seconds between checks
+    HEALTH_PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', '5'))
+    HEALTH_REQUIRED_CHECKS = os.getenv('HEALTH_REQUIRED_CHECKS', 'database')  # Comma-separated
     
     @staticmethod
     def validate():
@@ -73,3 +157,9 @@ class Config:
             raise ValueError(f"Configuration errors: {', '.join(errors)}")
         
         return True
+
+
+def resolve_data_path(path: str) -> Path:
+    """Relative paths are relative to the project root, not the working directory"""
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
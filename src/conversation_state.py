@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Conversation State Module
+Dialogue state of each sender (language, location, symptoms, whether a
+location was asked for), kept in a LocalStore so it survives restarts
+and is the same in every gunicorn worker on the host
+"""
+
+import logging
+import struct
+import time
+from typing import Dict, Optional
+
+from .config_loader import Config
+from .local_store import LocalStore
+from .metrics import instrument
+
+logger = logging.getLogger(__name__)
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversation_state (
+    session_id TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Bump when the encoding changes; states of another version are dropped
+# (the conversation starts over) instead of being misread
+STATE_VERSION = 1
+# version, flags, then the byte lengths of language, location, symptoms
+# and last_detected_symptoms, whose UTF-8 text follows the header
+_HEADER = struct.Struct('<BBHHHH')
+_WAITING_FOR_LOCATION = 0x01
+_EMERGENCY_DETECTED = 0x02
+
+CLEANUP_EVERY = 500
+
+
+def _join(symptoms) -> bytes:
+    return ','.join(symptoms or ()).encode('utf-8')
+
+
+def _split(data: bytes) -> list:
+    return data.decode('utf-8').split(',') if data else []
+
+
+def encode_state(context: Dict) -> bytes:
+    """
+    Pack the persistent part of a user_context
+
+    Args:
+        context: SwasthyaGuide.user_context
+
+    Returns:
+        Bytes for decode_state()
+    """
+    flags = ((_WAITING_FOR_LOCATION if context.get('waiting_for_location') else 0)
+             | (_EMERGENCY_DETECTED if context.get('emergency_detected') else 0))
+    parts = [(context.get('language') or '').encode('utf-8'),
+             (context.get('location') or '').encode('utf-8'),
+             _join(context.get('symptoms')),
+             _join(context.get('last_detected_symptoms'))]
+    return _HEADER.pack(STATE_VERSION, flags, *map(len, parts)) + b''.join(parts)
+
+
+def decode_state(data: bytes) -> Dict:
+    """
+    Unpack a state written by encode_state()
+
+    Raises:
+        ValueError: Truncated data or another STATE_VERSION
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated conversation state")
+    version, flags, *lengths = _HEADER.unpack_from(data)
+    if version != STATE_VERSION:
+        raise ValueError(f"Conversation state version {version}, expected {STATE_VERSION}")
+    if _HEADER.size + sum(lengths) != len(data):
+        raise ValueError("Truncated conversation state")
+
+    parts = []
+    offset = _HEADER.size
+    for length in lengths:
+        parts.append(data[offset:offset + length])
+        offset += length
+    language, location, symptoms, last_symptoms = parts
+    return {
+        'language': language.decode('utf-8') or None,
+        'location': location.decode('utf-8') or None,
+        'symptoms': _split(symptoms),
+        'emergency_detected': bool(flags & _EMERGENCY_DETECTED),
+        'waiting_for_location': bool(flags & _WAITING_FOR_LOCATION),
+        'last_detected_symptoms': _split(last_symptoms),
+    }
+
+
+class ConversationStateStore:
+    """
+    Conversation states by session id, one row (a few dozen bytes) each
+
+    A message costs one primary key lookup and one upsert. A broken
+    store never fails a message: it is logged and the worker's own
+    copy of the state is used.
+    """
+
+    def __init__(self, store_path: str = None, ttl: int = None, enabled: bool = None):
+        """
+        Args:
+            store_path: SQLite file (default: Config.CONVERSATION_STATE_PATH)
+            ttl: Seconds a state is kept after the last message
+            enabled: Persist states (default: Config.CONVERSATION_STATE_ENABLED)
+        """
+        self.enabled = Config.CONVERSATION_STATE_ENABLED if enabled is None else enabled
+        self.ttl = Config.CONVERSATION_STATE_TTL if ttl is None else ttl
+        self.store = LocalStore(store_path or Config.CONVERSATION_STATE_PATH, STATE_SCHEMA)
+        self._saves = 0
+
+    @instrument('state_load')
+    def load(self, session_id: str) -> Optional[Dict]:
+        """
+        State saved for a session by any worker
+
+        Returns:
+            The decoded state, or None when there is none (or it expired)
+        """
+        if not self.enabled or not session_id:
+            return None
+        try:
+            row = self.store.connection().execute(
+                'SELECT state FROM conversation_state WHERE session_id = ? AND updated >= ?',
+                (session_id, time.time() - self.ttl)
+            ).fetchone()
+            return decode_state(row[0]) if row else None
+        except ValueError as e:
+            logger.debug(f"Ignoring stored conversation state: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Conversation state store unavailable: {e}")
+            return None
+
+    @instrument('state_save')
+    def save(self, session_id: str, context: Dict):
+        """Store the state of a session (replaces the previous one)"""
+        if not self.enabled or not session_id:
+            return
+        try:
+            self.store.connection().execute(
+                'INSERT OR REPLACE INTO conversation_state (session_id, state, updated) VALUES (?, ?, ?)',
+                (session_id, encode_state(context), time.time())
+            )
+            self._maybe_cleanup()
+        except Exception as e:
+            logger.warning(f"Failed to save conversation state: {e}")
+
+    def delete(self, session_id: str):
+        """Forget a session's state"""
+        if self.enabled:
+            self.store.connection().execute(
+                'DELETE FROM conversation_state WHERE session_id = ?', (session_id,)
+            )
+
+    def _maybe_cleanup(self):
+        """Periodically delete states that have expired"""
+        self._saves += 1
+        if self._saves % CLEANUP_EVERY:
+            return
+        self.store.connection().execute(
+            'DELETE FROM conversation_state WHERE updated < ?', (time.time() - self.ttl,)
+        )
+
+
+# Global store instance
+_state_store_instance = None
+
+
+def get_state_store() -> ConversationStateStore:
+    """Get or create singleton conversation state store"""
+    global _state_store_instance
+    if _state_store_instance is None:
+        _state_store_instance = ConversationStateStore()
+    return _state_store_instance
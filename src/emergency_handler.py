@@ -4,6 +4,9 @@ Emergency Detection and Response Module
 Handles emergency situations and provides immediate alerts
 """
 
+from .response_catalog import get_response_catalog
+
+
 def detect_emergency(text: str) -> bool:
     """
     Detect emergency keywords in user input across all 8 languages
@@ -59,97 +62,4 @@ def detect_emergency(text: str) -> bool:
 
 def get_emergency_response(language: str) -> str:
     """Generate emergency response message"""
-    responses = {
-        'hinglish': """
-🚨 YEH EMERGENCY JAISA LAG RAHA HAI!
-
-KRIPYA TURANT:
-✅ Apne najdeeki hospital ya emergency service se contact karein
-✅ 108 (Ambulance) dial karein
-✅ Kisi ko saath mein rakhein
-
-Agar possible ho toh immediately hospital jayein. Delay na karein!
-""",
-        'hindi': """
-🚨 YEH EMERGENCY JAISA LAG RAHA HAI!
-
-KRIPYA TURANT:
-✅ Apne najdeeki hospital ya emergency service se sampark karein
-✅ 108 (Ambulance) dial karein
-✅ Kisi ko saath mein rakhein
-
-Agar sambhav ho toh turant hospital jayein. Der na karein!
-""",
-        'english': """
-🚨 THIS SEEMS LIKE AN EMERGENCY!
-
-PLEASE IMMEDIATELY:
-✅ Contact your nearest hospital or emergency service
-✅ Call 108 (Ambulance)
-✅ Have someone stay with you
-
-If possible, go to the hospital right away. Don't delay!
-""",
-        'marathi': """
-🚨 ही आपत्कालीन परिस्थिती दिसते आहे!
-
-कृपया तातडीने:
-✅ तुमच्या जवळच्या रुग्णालय किंवा आपत्कालीन सेवेशी संपर्क साधा
-✅ 108 (रुग्णवाहिका) डायल करा
-✅ कोणाला तरी सोबत ठेवा
-
-शक्य असल्यास ताबडतोब रुग्णालयात जा. उशीर करू नका!
-""",
-        'bengali': """
-🚨 এটি জরুরী অবস্থার মতো মনে হচ্ছে!
-
-অনুগ্রহ করে তাৎক্ষণিকভাবে:
-✅ আপনার নিকটতম হাসপাতাল বা জরুরি সেবার সাথে যোগাযোগ করুন
-✅ 108 (অ্যাম্বুলেন্স) ডায়াল করুন
-✅ কাউকে আপনার সাথে রাখুন
-
-সম্ভব হলে অবিলম্বে হাসপাতালে যান। দেরি করবেন না!
-""",
-        'tamil': """
-🚨 இது அவசரநிலை போல் தெரிகிறது!
-
-உடனடியாக:
-✅ உங்கள் அருகிலுள்ள மருத்துவமனை அல்லது அவசர சேவையை தொடர்பு கொள்ளுங்கள்
-✅ 108 (ஆம்புலன்ஸ்) டயல் செய்யுங்கள்
-✅ யாரையாவது உங்களுடன் வைக்கவும்
-
-முடிந்தால் உடனடியாக மருத்துவமனைக்கு செல்லுங்கள். தாமதிக்காதீர்கள்!
-""",
-        'telugu': """
-🚨 ఇది అత్యవసర పరిస్థితిగా కనిపిస్తోంది!
-
-దయచేసి వెంటనే:
-✅ మీ సమీప ఆసుపత్రి లేదా అత్యవసర సేవను సంప్రదించండి
-✅ 108 (అంబులెన్స్) డయల్ చేయండి
-✅ ఎవరినైనా మీతో ఉంచుకోండి
-
-వీలైతే వెంటనే ఆసుపత్రికి వెళ్లండి. ఆలస్యం చేయవద్దు!
-""",
-        'punjabi': """
-🚨 ਇਹ ਐਮਰਜੈਂਸੀ ਜਿਹੀ ਲੱਗ ਰਹੀ ਹੈ!
-
-ਕਿਰਪਾ ਕਰਕੇ ਤੁਰੰਤ:
-✅ ਆਪਣੇ ਨੇੜੇ ਦੇ ਹਸਪਤਾਲ ਜਾਂ ਐਮਰਜੈਂਸੀ ਸੇਵਾ ਨਾਲ ਸੰਪਰਕ ਕਰੋ
-✅ 108 (ਐਂਬੂਲੈਂਸ) ਡਾਇਲ ਕਰੋ
-✅ ਕਿਸੇ ਨੂੰ ਆਪਣੇ ਨਾਲ ਰੱਖੋ
-
-ਜੇ ਸੰਭਵ ਹੋਵੇ ਤਾਂ ਤੁਰੰਤ ਹਸਪਤਾਲ ਜਾਓ। ਦੇਰੀ ਨਾ ਕਰੋ!
-""",
-        'gujarati': """
-🚨 આ કટોકટી જેવું લાગે છે!
-
-કૃપા કરીને તાત્કાલિક:
-✅ તમારી નજીકની હોસ્પિટલ અથવા ઇમરજન્સી સેવાનો સંપર્ક કરો
-✅ 108 (એમ્બ્યુલન્સ) ડાયલ કરો
-✅ કોઈને તમારી સાથે રાખો
-
-શક્ય હોય તો તાત્કાલિક હોસ્પિટલમાં જાઓ. વિલંબ ન કરો!
-"""
-    }
-    
-    return responses.get(language, responses['hindi'])
+    return get_response_catalog().get('emergency', language)
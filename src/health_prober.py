@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Health Prober Module
+Checks dependencies in a background thread so /livez and /readyz
+only read a cached snapshot
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable
+
+import requests
+
+from .config_loader import Config
+from .metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+UP = 'up'
+DOWN = 'down'
+DISABLED = 'disabled'
+
+DEPENDENCY_UP = gauge(
+    'dependency_up', 'Last probe result per dependency (1 = up)', ['check'],
+    multiprocess_mode='livemin'
+)
+
+
+def check_database() -> Dict:
+    """SELECT 1 on the primary plus pool statistics"""
+    try:
+        from database import get_db_manager
+        db_manager = get_db_manager()
+    except Exception as e:
+        return {'status': DOWN, 'error': f"not initialized: {e}"}
+
+    result = db_manager.health_check()
+    status = UP if result.pop('status', None) == 'healthy' else DOWN
+    return {'status': status, **result}
+
+
+def check_ffmpeg() -> Dict:
+    """ffmpeg binary used by pydub for voice notes"""
+    path = shutil.which('ffmpeg') or shutil.which('avconv')
+    if path:
+        return {'status': UP, 'path': path}
+    return {'status': DOWN, 'error': 'ffmpeg not found on PATH'}
+
+
+def check_speech() -> Dict:
+    """
+    Google Speech-to-Text / Text-to-Speech credentials
+
+    Never builds the clients: that would load the SDKs, and under
+    preload_app the first probe runs in the gunicorn master, whose gRPC
+    channels must not be inherited by the workers. The clients of a voice
+    handler that already exists are reported as well.
+    """
+    from . import voice_handler
+    if not voice_handler.GOOGLE_AVAILABLE:
+        return {'status': DISABLED, 'error': 'google-cloud libraries not installed'}
+
+    credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    if not credentials_path:
+        return {'status': DOWN, 'error': 'GOOGLE_APPLICATION_CREDENTIALS not set'}
+    try:
+        with open(credentials_path, encoding='utf-8') as f:
+            credentials = json.load(f)
+    except (OSError, ValueError) as e:
+        return {'status': DOWN, 'error': f"credentials file unreadable: {e}"}
+    if not isinstance(credentials, dict) or 'type' not in credentials:
+        return {'status': DOWN, 'error': 'credentials file is not a Google credentials file'}
+
+    result = {'status': UP, 'credentials_type': credentials['type']}
+    handler = voice_handler._voice_handler_instance
+    if handler is not None:
+        result['speech_to_text'] = handler.speech_client is not None
+        result['text_to_speech'] = handler.tts_client is not None
+        if not (result['speech_to_text'] and result['text_to_speech']):
+            result['status'] = DOWN
+    return result
+
+
+def check_huggingface() -> Dict:
+    """HuggingFace inference endpoint is reachable and accepts our token"""
+    from .image_analyzer import HF_API_URL
+    api_key = os.getenv('HUGGINGFACE_API_KEY')
+    if not api_key or api_key.startswith('hf_your'):
+        return {'status': DISABLED, 'error': 'HUGGINGFACE_API_KEY not configured'}
+
+    response = requests.head(
+        HF_API_URL,
+        headers={'Authorization': f"Bearer {api_key}"},
+        timeout=Config.HEALTH_PROBE_TIMEOUT,
+        allow_redirects=True
+    )
+    if response.status_code in (401, 403):
+        return {'status': DOWN, 'http_status': response.status_code, 'error': 'token rejected'}
+    if response.status_code >= 500:
+        return {'status': DOWN, 'http_status': response.status_code}
+    return {'status': UP, 'http_status': response.status_code}
+
+
+DEFAULT_CHECKS = {
+    'database': check_database,
+    'ffmpeg': check_ffmpeg,
+    'speech': check_speech,
+    'huggingface': check_huggingface,
+}
+
+
+class HealthProber:
+    """
+    Runs dependency checks every `interval` seconds in a daemon thread
+    and publishes the results as one immutable snapshot
+    """
+
+    def __init__(self, checks: Dict[str, Callable[[], Dict]] = None,
+                 required: Iterable[str] = None, interval: float = None):
+        """
+        Args:
+            checks: check name -> callable returning {'status': 'up'|'down'|'disabled', ...}
+            required: Checks that must be up for the app to be ready
+            interval: Seconds between probe rounds
+        """
+        self.checks = dict(checks or DEFAULT_CHECKS)
+        if required is None:
+            required = [c.strip() for c in Config.HEALTH_REQUIRED_CHECKS.split(',') if c.strip()]
+        self.required = frozenset(required)
+        self.interval = interval or Config.HEALTH_PROBE_INTERVAL
+
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def not_required(self, name: str):
+        """Stop waiting for a check; it is still run and reported"""
+        self.required = self.required - {name}
+
+    def probe(self) -> Dict:
+        """Run every check once and publish the snapshot"""
+        results = {}
+        for name, check in self.checks.items():
+            start = time.perf_counter()
+            try:
+                result = check()
+            except Exception as e:
+                result = {'status': DOWN, 'error': f"{type(e).__name__}: {e}"}
+            result['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            results[name] = result
+            DEPENDENCY_UP.labels(name).set(1 if result['status'] != DOWN else 0)
+
+        ready = all(results.get(name, {}).get('status') == UP for name in self.required)
+        snapshot = {
+            'ready': ready,
+            'checked_at': datetime.utcnow().isoformat() + 'Z',
+            'checked_monotonic': time.monotonic(),
+            'checks': results,
+        }
+        if self._snapshot is None or snapshot['ready'] != self._snapshot['ready']:
+            logger.info("Readiness changed: %s", 'ready' if ready else 'not ready')
+        self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self) -> Dict:
+        """
+        Latest snapshot (never blocks)
+
+        Returns:
+            The last published snapshot; 'stale' is set when the prober
+            has missed several rounds, and None is returned before the
+            first round finishes
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        age = time.monotonic() - snapshot['checked_monotonic']
+        if age > self.interval * 3:
+            return {**snapshot, 'ready': False, 'stale': True}
+        return snapshot
+
+    def start(self):
+        """Start the background thread (no-op if it is running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def restart(self):
+        """Start a fresh thread (threads do not survive fork())"""
+        self._thread = None
+        self.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            self._stop.wait(self.interval)
+
+
+# Global prober instance
+_prober_instance = None
+
+
+def get_health_prober() -> HealthProber:
+    """Get or create singleton health prober"""
+    global _prober_instance
+    if _prober_instance is None:
+        _prober_instance = HealthProber()
+    return _prober_instance
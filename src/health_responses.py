@@ -1,702 +1,148 @@
 # -*- coding: utf-8 -*-
 """
 Health Response Templates Module
-Contains all health guidance responses for different symptoms
+Health guidance replies for different symptoms; the texts live in the
+response catalog (data/translations.json)
 """
 
-from typing import List
+from typing import List, Optional, Tuple
+
+from .cache import TTLCache
+from .config_loader import Config
+from .response_catalog import CatalogSnapshot, get_response_catalog
+
+# Per-symptom catalog fragments of a composed answer
+FRAGMENTS = ('symptom_name', 'symptom_causes', 'symptom_home_care', 'symptom_red_flags')
+# Shared parts of a composed answer ('composed_advice' in the catalog)
+COMPOSED_PARTS = ('causes_heading', 'home_care_heading', 'red_flags_heading', 'clinic_offer', 'disclaimer')
+
+# Replies per (sorted symptom set, language); emptied when the catalog reloads
+_composed_cache = None
+
+
+def get_composed_cache() -> TTLCache:
+    """Get or create the symptom reply cache (no TTL - entries only change with the catalog)"""
+    global _composed_cache
+    if _composed_cache is None:
+        _composed_cache = TTLCache('symptom_replies', maxsize=Config.SYMPTOM_REPLY_CACHE_SIZE,
+                                   ttl=float('inf'))
+    return _composed_cache
 
 
 def handle_headache(language: str) -> str:
     """Provide guidance for headache"""
-    responses = {
-        'hinglish': """
-1️⃣ **Sir dard ke common karan:**
-Sir dard kai reasons se ho sakta hai - kam neend, stress, dehydration, tension, aankh ki weakness, ya long screen time.
-
-2️⃣ **Ghar par aap ye try kar sakte hain:**
-• Quiet aur dark room mein rest karein
-• Zyada pani piyein (8-10 glass daily)
-• Maatha par thanda pani ka kapda rakhein
-• Aankh band karke 15-20 minute rest lein
-• Screen time kam karein
-• Halka stretching ya walk karein
-• Proper neend lein (7-8 hours)
-
-3️⃣ **Doctor ko kab dikhayein:**
-⚠️ Agar pain bahut zyada ho
-⚠️ 2-3 din se zyada chal raha ho
-⚠️ Vomiting, dizziness, ya dekhne mein problem ho
-⚠️ Baar baar ho raha ho
-⚠️ Ghar ke upay se relief nahi mil raha
-
-4️⃣ **Kya aapko najdeeki clinic ki zaroorat hai?**
-Agar haan, toh apna area, city, ya pincode bataayein.
-
-5️⃣ **Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh immediately doctor ko dikhaye.
-""",
-        'hindi': """
-1️⃣ **Sir dard ke samanya karan:**
-Sir dard kai karan se ho sakta hai - kam neend, stress, dehydration, tension, aankh ki kamzori, ya long screen time.
-
-2️⃣ **Ghar par aap ye try kar sakte hain:**
-• Shaant aur andheri jagah mein aaram karein
-• Pani zyada piyein (8-10 glass daily)
-• Maatha par thanda pani ka patla kapda rakhein
-• Aankh band karke 15-20 minute rest lein
-• Screen time kam karein
-• Halka stretching ya walk karein
-• Proper neend lein (7-8 ghante)
-
-3️⃣ **Doctor ko kab dikhaayein:**
-⚠️ Agar dard bahut zyada ho
-⚠️ 2-3 din se zyada chal raha ho
-⚠️ Ulti, chakkar, ya dekhne mein dikkat ho
-⚠️ Baar baar ho raha ho
-⚠️ Ghar ke upay se aaraam nahi mil raha
-
-4️⃣ **Kya aapko najdeeki clinic ki zaroorat hai?**
-Agar haan, toh apna area, city, ya pincode bataayein.
-
-5️⃣ **Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh turant doctor ko dikhaaye.
-""",
-        'english': """
-1️⃣ **Common causes of headache:**
-Headaches can be caused by lack of sleep, stress, dehydration, tension, eye strain, or prolonged screen time.
-
-2️⃣ **Home care steps you can try:**
-• Rest in a quiet, dark room
-• Drink plenty of water (8-10 glasses daily)
-• Apply a cool compress to your forehead
-• Close your eyes and rest for 15-20 minutes
-• Reduce screen time
-• Do light stretching or take a walk
-• Get proper sleep (7-8 hours)
-
-3️⃣ **When to see a doctor:**
-⚠️ If pain is very severe
-⚠️ Lasts more than 2-3 days
-⚠️ Accompanied by vomiting, dizziness, or vision problems
-⚠️ Recurring frequently
-⚠️ Home remedies don't provide relief
-
-4️⃣ **Do you need nearby clinic information?**
-If yes, please share your area, city, or pincode.
-
-5️⃣ **Disclaimer:**
-This is not a medical diagnosis. If the condition seems serious, please consult a doctor immediately.
-""",
-        'marathi': """
-1️⃣ **डोकेदुखीची सामान्य कारणे:**
-डोकेदुखी कमी झोप, ताण, पाण्याचा अभाव, तणाव, डोळ्यांचा ताण किंवा जास्त स्क्रीन वेळेमुळे होऊ शकते.
-
-2️⃣ **घरी तुम्ही हे प्रयत्न करू शकता:**
-• शांत आणि अंधारी खोलीत विश्रांती घ्या
-• भरपूर पाणी प्या (दररोज 8-10 ग्लास)
-• कपाळावर थंड पाण्याचा कापड ठेवा
-• डोळे बंद करून 15-20 मिनिटे विश्रांती घ्या
-• स्क्रीन वेळ कमी करा
-• हलकी स्ट्रेचिंग किंवा चालणे करा
-• योग्य झोप घ्या (7-8 तास)
-
-3️⃣ **डॉक्टरांना कधी भेटावे:**
-⚠️ जर वेदना खूप तीव्र असेल
-⚠️ 2-3 दिवसांपेक्षा जास्त काळ राहिल्यास
-⚠️ उलट्या, चक्कर किंवा दृष्टी समस्यांसह
-⚠️ वारंवार होत असेल
-⚠️ घरगुती उपाय मदत करत नसतील
-
-4️⃣ **तुम्हाला जवळपासच्या क्लिनिकची गरज आहे का?**
-हो असल्यास, कृपया तुमचा परिसर, शहर किंवा पिनकोड शेअर करा.
-
-5️⃣ **अस्वीकरण:**
-हे वैद्यकीय निदान नाही. परिस्थिती गंभीर असल्यास कृपया डॉक्टरांचा सल्ला घ्या.
-""",
-        'bengali': """
-1️⃣ **মাথা ব্যথার সাধারণ কারণ:**
-মাথা ব্যথা ঘুমের অভাব, চাপ, পানিশূন্যতা, টেনশন, চোখের চাপ বা দীর্ঘ সময় স্ক্রীন ব্যবহারের কারণে হতে পারে।
-
-2️⃣ **বাড়িতে আপনি এই পদক্ষেপগুলি চেষ্টা করতে পারেন:**
-• শান্ত এবং অন্ধকার ঘরে বিশ্রাম নিন
-• প্রচুর পানি পান করুন (প্রতিদিন 8-10 গ্লাস)
-• কপালে ঠান্ডা কাপড় দিন
-• চোখ বন্ধ করে 15-20 মিনিট বিশ্রাম নিন
-• স্ক্রীন টাইম কমান
-• হালকা স্ট্রেচিং বা হাঁটাহাঁটি করুন
-• সঠিক ঘুম নিন (7-8 ঘণ্টা)
-
-3️⃣ **কখন ডাক্তার দেখাবেন:**
-⚠️ যদি ব্যথা খুব তীব্র হয়
-⚠️ 2-3 দিনের বেশি স্থায়ী হয়
-⚠️ বমি, মাথা ঘোরা বা দৃষ্টি সমস্যা থাকে
-⚠️ বারবার হতে থাকে
-⚠️ ঘরোয়া প্রতিকার উপশম দেয় না
-
-4️⃣ **আপনার কি কাছাকাছি ক্লিনিকের তথ্য প্রয়োজন?**
-হ্যাঁ হলে, আপনার এলাকা, শহর বা পিনকোড শেয়ার করুন।
-
-5️⃣ **দাবি পরিত্যাগী:**
-এটি চিকিৎসা নির্ণয় নয়। অবস্থা গুরুতর মনে হলে ডাক্তারের পরামর্শ নিন।
-""",
-        'tamil': """
-1️⃣ **தலைவலியின் பொதுவான காரணங்கள்:**
-தலைவலி தூக்கமின்மை, மன அழுத்தம், நீரிழப்பு, பதற்றம், கண் சோர்வு அல்லது நீண்ட நேர திரை பயன்பாட்டால் ஏற்படலாம்.
-
-2️⃣ **வீட்டில் நீங்கள் முயற்சிக்கக்கூடிய படிகள்:**
-• அமைதியான மற்றும் இருண்ட அறையில் ஓய்வெடுங்கள்
-• நிறைய தண்ணீர் குடியுங்கள் (தினமும் 8-10 கிளாஸ்)
-• நெற்றியில் குளிர்ந்த துணி வைக்கவும்
-• கண்களை மூடி 15-20 நிமிடங்கள் ஓய்வெடுங்கள்
-• திரை நேரத்தை குறைக்கவும்
-• லேசான நீட்சி அல்லது நடைப்பயிற்சி செய்யுங்கள்
-• சரியான தூக்கம் பெறுங்கள் (7-8 மணி நேரம்)
-
-3️⃣ **மருத்துவரை எப்போது பார்க்க வேண்டும்:**
-⚠️ வலி மிகவும் கடுமையாக இருந்தால்
-⚠️ 2-3 நாட்களுக்கு மேல் நீடித்தால்
-⚠️ வாந்தி, தலைசுற்றல் அல்லது பார்வை பிரச்சினைகள் இருந்தால்
-⚠️ அடிக்கடி நிகழ்ந்தால்
-⚠️ வீட்டு வைத்தியம் நிவாரணம் அளிக்கவில்லை என்றால்
-
-4️⃣ **உங்களுக்கு அருகிலுள்ள கிளினிக் தகவல் தேவையா?**
-ஆம் எனில், உங்கள் பகுதி, நகரம் அல்லது பின்கோடை பகிருங்கள்.
-
-5️⃣ **மறுப்பு:**
-இது மருத்துவ நோயறிதல் அல்ல. நிலை தீவிரமாக இருந்தால் மருத்துவரை ஆலோசிக்கவும்.
-""",
-        'telugu': """
-1️⃣ **తలనొప్పి యొక్క సాధారణ కారణాలు:**
-తలనొప్పి నిద్ర లేమి, ఒత్తిడి, నీటి కొరత, టెన్షన్, కంటి ఒత్తిడి లేదా ఎక్కువ స్క్రీన్ సమయం వల్ల సంభవించవచ్చు.
-
-2️⃣ **ఇంట్లో మీరు ప్రయత్నించగల చర్యలు:**
-• నిశ్శబ్ద మరియు చీకటి గదిలో విశ్రాంతి తీసుకోండి
-• చాలా నీళ్లు తాగండి (రోజూ 8-10 గ్లాసులు)
-• నుదుటిపై చల్లని వస్త్రం పెట్టండి
-• కళ్ళు మూసుకుని 15-20 నిమిషాలు విశ్రాంతి తీసుకోండి
-• స్క్రీన్ సమయాన్ని తగ్గించండి
-• తేలికైన స్ట్రెచింగ్ లేదా నడవండి
-• సరైన నిద్ర పొందండి (7-8 గంటలు)
-
-3️⃣ **వైద్యుడిని ఎప్పుడు చూడాలి:**
-⚠️ నొప్పి చాలా తీవ్రంగా ఉంటే
-⚠️ 2-3 రోజుల కంటే ఎక్కువ కాలం ఉంటే
-⚠️ వాంతులు, తలతిరగడం లేదా దృష్టి సమస్యలు ఉంటే
-⚠️ తరచుగా సంభవిస్తుంటే
-⚠️ ఇంటి చికిత్సలు ఉపశమనం ఇవ్వవు
-
-4️⃣ **మీకు సమీప క్లినిక్ సమాచారం అవసరమా?**
-అవును అయితే, మీ ప్రాంతం, నగరం లేదా పిన్‌కోడ్ షేర్ చేయండి.
-
-5️⃣ **నిరాకరణ:**
-ఇది వైద్య నిర్ధారణ కాదు. పరిస్థితి తీవ్రంగా ఉంటే వైద్యుడిని సంప్రదించండి.
-""",
-        'punjabi': """
-1️⃣ **ਸਿਰ ਦਰਦ ਦੇ ਆਮ ਕਾਰਨ:**
-ਸਿਰ ਦਰਦ ਨੀਂਦ ਦੀ ਕਮੀ, ਤਣਾਅ, ਪਾਣੀ ਦੀ ਕਮੀ, ਟੈਂਸ਼ਨ, ਅੱਖਾਂ ਦਾ ਤਣਾਅ ਜਾਂ ਲੰਮੇ ਸਮੇਂ ਤੱਕ ਸਕ੍ਰੀਨ ਦੇ ਕਾਰਨ ਹੋ ਸਕਦਾ ਹੈ।
-
-2️⃣ **ਘਰ ਵਿੱਚ ਤੁਸੀਂ ਇਹ ਕਦਮ ਅਜ਼ਮਾ ਸਕਦੇ ਹੋ:**
-• ਸ਼ਾਂਤ ਅਤੇ ਹਨੇਰੇ ਕਮਰੇ ਵਿੱਚ ਆਰਾਮ ਕਰੋ
-• ਬਹੁਤ ਸਾਰਾ ਪਾਣੀ ਪੀਓ (ਰੋਜ਼ਾਨਾ 8-10 ਗਲਾਸ)
-• ਮੱਥੇ ਉੱਤੇ ਠੰਡਾ ਕੱਪੜਾ ਲਗਾਓ
-• ਅੱਖਾਂ ਬੰਦ ਕਰਕੇ 15-20 ਮਿੰਟ ਆਰਾਮ ਕਰੋ
-• ਸਕ੍ਰੀਨ ਟਾਈਮ ਘਟਾਓ
-• ਹਲਕੀ ਸਟ੍ਰੈਚਿੰਗ ਜਾਂ ਸੈਰ ਕਰੋ
-• ਢੁਕਵੀਂ ਨੀਂਦ ਲਓ (7-8 ਘੰਟੇ)
-
-3️⃣ **ਡਾਕਟਰ ਨੂੰ ਕਦੋਂ ਮਿਲਣਾ ਹੈ:**
-⚠️ ਜੇ ਦਰਦ ਬਹੁਤ ਤੀਬਰ ਹੈ
-⚠️ 2-3 ਦਿਨਾਂ ਤੋਂ ਵੱਧ ਰਹਿੰਦਾ ਹੈ
-⚠️ ਉਲਟੀਆਂ, ਚੱਕਰ ਜਾਂ ਦ੍ਰਿਸ਼ਟੀ ਸਮੱਸਿਆਵਾਂ ਨਾਲ
-⚠️ ਵਾਰ-ਵਾਰ ਹੁੰਦਾ ਹੈ
-⚠️ ਘਰੇਲੂ ਉਪਚਾਰ ਰਾਹਤ ਨਹੀਂ ਦਿੰਦੇ
-
-4️⃣ **ਕੀ ਤੁਹਾਨੂੰ ਨੇੜਲੇ ਕਲੀਨਿਕ ਦੀ ਜਾਣਕਾਰੀ ਦੀ ਲੋੜ ਹੈ?**
-ਹਾਂ ਤਾਂ, ਕਿਰਪਾ ਕਰਕੇ ਆਪਣਾ ਖੇਤਰ, ਸ਼ਹਿਰ ਜਾਂ ਪਿੰਨਕੋਡ ਸਾਂਝਾ ਕਰੋ।
-
-5️⃣ **ਬੇਦਾਅਵੇ:**
-ਇਹ ਮੈਡੀਕਲ ਡਾਇਗਨੋਸਿਸ ਨਹੀਂ ਹੈ। ਜੇ ਸਥਿਤੀ ਗੰਭੀਰ ਲੱਗੇ ਤਾਂ ਡਾਕਟਰ ਨੂੰ ਮਿਲੋ।
-""",
-        'gujarati': """
-1️⃣ **માથાના દુખાવાના સામાન્ય કારણો:**
-માથાનો દુખાવો ઊંઘની અછત, તાણ, પાણીની અછત, ટેન્શન, આંખોનો તાણ અથવા લાંબા સમય સુધી સ્ક્રીન ઉપયોગથી થઈ શકે છે.
-
-2️⃣ **ઘરે તમે આ પગલાં અજમાવી શકો છો:**
-• શાંત અને અંધારાવાળા ઓરડામાં આરામ કરો
-• ઘણું પાણી પીવો (દરરોજ 8-10 ગ્લાસ)
-• કપાળ પર ઠંડો કાપડ મૂકો
-• આંખો બંધ કરીને 15-20 મિનિટ આરામ કરો
-• સ્ક્રીન ટાઈમ ઘટાડો
-• હળવી સ્ટ્રેચિંગ અથવા ચાલવું કરો
-• યોગ્ય ઊંઘ લો (7-8 કલાક)
-
-3️⃣ **ડૉક્ટરને ક્યારે મળવું:**
-⚠️ જો દુખાવો ખૂબ તીવ્ર હોય
-⚠️ 2-3 દિવસથી વધુ ચાલે
-⚠️ ઉલ્ટી, ચક્કર અથવા દ્રષ્ટિ સમસ્યાઓ સાથે
-⚠️ વારંવાર થતું હોય
-⚠️ ઘરગથ્થુ ઉપાય રાહત ન આપે
-
-4️⃣ **શું તમને નજીકની ક્લિનિકની માહિતી જોઈએ છે?**
-હા હોય તો, તમારો વિસ્તાર, શહેર અથવા પિનકોડ શેર કરો.
-
-5️⃣ **અસ્વીકરણ:**
-આ તબીબી નિદાન નથી. સ્થિતિ ગંભીર લાગે તો ડૉક્ટરની સલાહ લો.
-"""
-    }
-    
-    return responses.get(language, responses['hindi'])
+    return get_response_catalog().get('symptom_advice', language, 'headache')
 
 
 def handle_fever(language: str) -> str:
     """Provide guidance for fever"""
-    responses = {
-        'hinglish': """
-1️⃣ **Bukhar ke bare mein:**
-Bukhar ek lakshan hai jo batata hai ki aapka sharir kisi infection se lad raha hai. Normal temperature 98.6°F (37°C) hota hai.
-
-2️⃣ **Ghar par aap ye try kar sakte hain:**
-• Zyada se zyada aaram karein
-• Pani, juice, ORS, coconut water piyein
-• Halka aur nutritious khana khayein (dal, khichdi, soup)
-• Loose aur comfortable kapde pehenein
-• Maatha par thanda pani ka kapda rakhein
-• Kamre ka temperature comfortable rakhein
-
-3️⃣ **Doctor ko kab dikhaayein:**
-⚠️ Bukhar 102°F se zyada ho
-⚠️ 3 din se zyada ho
-⚠️ Bahut kamzori, chakkar, ya body pain ho
-⚠️ Chhote bachche ya buzurg vyakti ho
-⚠️ Saans lene mein dikkat, rash, ya ulti ho
-
-4️⃣ **Kya aapko najdeeki clinic ki zaroorat hai?**
-Apna area bataayein, main clinic suggest kar dunga/dungi.
-
-5️⃣ **Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh immediately doctor ko dikhaye.
-""",
-        'hindi': """
-1️⃣ **Bukhar ke bare mein:**
-Bukhar ek lakshan hai jo batata hai ki aapka sharir kisi infection se lad raha hai. Normal temperature 98.6°F (37°C) hota hai.
-
-2️⃣ **Ghar par aap ye try kar sakte hain:**
-• Zyada se zyada aaram karein
-• Pani, juice, ORS, coconut water piyein
-• Halka aur nutritious khana khayein (dal, khichdi, soup)
-• Loose aur comfortable kapde pehenein
-• Maatha par thanda pani ka kapda rakhein
-• Kamre ka temperature comfortable rakhein
-
-3️⃣ **Doctor ko kab dikhaayein:**
-⚠️ Bukhar 102°F se zyada ho
-⚠️ 3 din se zyada ho
-⚠️ Bahut kamzori, chakkar, ya body pain ho
-⚠️ Chhote bachche ya buzurg vyakti ho
-⚠️ Saans lene mein dikkat, rash, ya ulti ho
-
-4️⃣ **Kya aapko najdeeki clinic ki zaroorat hai?**
-Apna area bataayein, main clinic suggest kar dunga/dungi.
-
-5️⃣ **Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh turant doctor ko dikhaaye.
-""",
-        'english': """
-1️⃣ **About fever:**
-Fever is a symptom indicating your body is fighting an infection. Normal temperature is 98.6°F (37°C).
-
-2️⃣ **Home care steps you can try:**
-• Get plenty of rest
-• Drink lots of fluids (water, juice, ORS, coconut water)
-• Eat light, nutritious food (lentils, khichdi, soup)
-• Wear loose, comfortable clothes
-• Apply cool compress to forehead
-• Keep room temperature comfortable
-
-3️⃣ **When to see a doctor:**
-⚠️ Fever above 102°F
-⚠️ Lasts more than 3 days
-⚠️ Severe weakness, dizziness, or body pain
-⚠️ In young children or elderly
-⚠️ Breathing difficulty, rash, or vomiting
-
-4️⃣ **Do you need nearby clinic information?**
-Share your area, and I'll suggest clinics.
-
-5️⃣ **Disclaimer:**
-This is not a medical diagnosis. If the condition seems serious, please consult a doctor immediately.
-"""
-    }
-    
-    return responses.get(language, responses['hinglish'])
+    return get_response_catalog().get('symptom_advice', language, 'fever')
 
 
 def handle_stomach_pain(language: str) -> str:
     """Provide guidance for stomach pain"""
-    responses = {
-        'hinglish': """
-1️⃣ **Pet dard ke common karan:**
-Pet dard kai reasons se ho sakta hai - gas, acidity, indigestion, khane ki galti, constipation, ya infection.
-
-2️⃣ **Ghar par aap ye try kar sakte hain:**
-• Halka garam pani piyein
-• Oily aur spicy khana avoid karein
-• Chota meals, thodi-thodi der mein khayein
-• Ajwain ya jeera pani piyein
-• Light walk karein (heavy exercise nahi)
-• Pet par halke haath se massage karein
-• Proper neend lein
-
-3️⃣ **Doctor ko kab dikhaayein:**
-⚠️ Dard bahut tez ho ya 6-8 ghante se zyada ho
-⚠️ Baar baar ulti ho rahi ho
-⚠️ Pet bahut sakht ho ya chhune par dard ho
-⚠️ Bukhar, khoon, ya kaale dast ho
-⚠️ Pregnancy mein ho
-⚠️ Dard badta ja raha ho
-
-4️⃣ **Kya aapko najdeeki clinic ki zaroorat hai?**
-Apna location share karein.
-
-5️⃣ **Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh immediately doctor ko dikhaye.
-""",
-        'hindi': """
-1️⃣ **Pet dard ke samanya karan:**
-Pet dard kai karan se ho sakta hai - gas, acidity, indigestion, khane ki galti, constipation, ya infection.
-
-2️⃣ **Ghar par aap ye try kar sakte hain:**
-• Halka garam pani piyein
-• Oily aur spicy khana avoid karein
-• Chota meals, thodi-thodi der mein khayein
-• Ajwain ya jeera pani piyein
-• Light walk karein (heavy exercise nahi)
-• Pet par halke haath se massage karein
-• Proper neend lein
-
-3️⃣ **Doctor ko kab dikhaayein:**
-⚠️ Dard bahut tez ho ya 6-8 ghante se zyada ho
-⚠️ Baar baar ulti ho rahi ho
-⚠️ Pet bahut sakht ho ya chhune par dard ho
-⚠️ Bukhar, khoon, ya kaale dast ho
-⚠️ Pregnancy mein ho
-⚠️ Dard badta ja raha ho
-
-4️⃣ **Kya aapko najdeeki clinic ki zaroorat hai?**
-Apna location share karein.
-
-5️⃣ **Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh turant doctor ko dikhaaye.
-""",
-        'english': """
-1️⃣ **Common causes of stomach pain:**
-Stomach pain can be caused by gas, acidity, indigestion, food issues, constipation, or infection.
-
-2️⃣ **Home care steps you can try:**
-• Drink warm water
-• Avoid oily and spicy food
-• Eat small, frequent meals
-• Drink ajwain or cumin water
-• Take a light walk (no heavy exercise)
-• Gently massage your stomach
-• Get proper sleep
-
-3️⃣ **When to see a doctor:**
-⚠️ Pain is severe or lasts more than 6-8 hours
-⚠️ Frequent vomiting
-⚠️ Stomach is very hard or tender to touch
-⚠️ Fever, blood in stool, or black stool
-⚠️ If pregnant
-⚠️ Pain is increasing
-
-4️⃣ **Do you need nearby clinic information?**
-Share your location.
-
-5️⃣ **Disclaimer:**
-This is not a medical diagnosis. If the condition seems serious, please consult a doctor immediately.
-"""
-    }
-    
-    return responses.get(language, responses['hinglish'])
+    return get_response_catalog().get('symptom_advice', language, 'stomach_pain')
 
 
 def get_general_symptom_advice(symptoms: List[str], language: str) -> str:
     """Provide general advice for multiple symptoms"""
-    responses = {
-        'hinglish': """
-Aapke symptoms sun kar lagta hai aapko proper medical check-up ki zaroorat hai.
-
-**Abhi kya karein:**
-• Aaram karein aur zyada exertion avoid karein
-• Pani zyada piyein
-• Halka aur nutritious khana khayein
-• Apne symptoms ko note karein
-
-**Doctor ko zaroor dikhaayein agar:**
-• Symptoms 2-3 din se zyada rahein
-• Condition bigad rahi ho
-• Daily activities karne mein dikkat ho
-
-Kya main aapke liye najdeeki clinic dhoondh doon? Apna area, city, ya pincode bataayein.
-
-**Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh immediately doctor ko dikhaye.
-""",
-        'hindi': """
-Aapke symptoms sun kar lagta hai aapko proper medical check-up ki zaroorat hai.
-
-**Abhi kya karein:**
-• Aaram karein aur zyada exertion avoid karein
-• Pani zyada piyein
-• Halka aur nutritious khana khayein
-• Apne symptoms ko note karein
-
-**Doctor ko zaroor dikhaayein agar:**
-• Symptoms 2-3 din se zyada rahein
-• Condition bigad rahi ho
-• Daily activities karne mein dikkat ho
-
-Kya main aapke liye najdeeki clinic dhoondh doon? Apna area, city, ya pincode bataayein.
-
-**Disclaimer:**
-Yeh medical diagnosis nahi hai. Agar condition serious lage toh turant doctor ko dikhaaye.
-""",
-        'english': """
-Based on your symptoms, it seems you need a proper medical check-up.
-
-**What to do now:**
-• Rest and avoid excessive exertion
-• Drink plenty of water
-• Eat light, nutritious food
-• Note down your symptoms
-
-**See a doctor if:**
-• Symptoms persist for more than 2-3 days
-• Condition is worsening
-• Difficulty performing daily activities
-
-Should I find nearby clinics for you? Please share your area, city, or pincode.
-
-**Disclaimer:**
-This is not a medical diagnosis. If the condition seems serious, please consult a doctor immediately.
-"""
-    }
-    
-    return responses.get(language, responses['hinglish'])
+    return get_response_catalog().get('symptom_advice', language)
 
 
 def get_general_health_tips(language: str) -> str:
     """Provide general health tips"""
-    responses = {
-        'hinglish': """
-Namaste! Main SwasthyaGuide hoon. 🙏
-
-**Mujhse aap ye pooch sakte hain:**
-• Sir dard, fever, stomach pain jaise common problems
-• Ghar par kya kar sakte hain
-• Doctor kab dikhana chahiye
-• Najdeeki clinic kahan hai
-
-**Kuch healthy tips:**
-✅ Din mein 7-8 hours soyein
-✅ Pani zyada piyein (8-10 glass)
-✅ Fruits aur vegetables khayein
-✅ Thoda exercise ya walk daily karein
-✅ Hand washing regularly karein
-
-Aapki kya problem hai? Mujhe detail mein bataayein toh main better help kar sakta hoon.
-
-**Yaad rakhein:**
-Yeh medical diagnosis nahi hai. Serious problem ho toh doctor se zaroor milein.
-""",
-        'hindi': """
-Namaste! Main SwasthyaGuide hoon. 🙏
-
-**Mujhse aap ye pooch sakte hain:**
-• Sir dard, bukhar, pet dard jaise common problems
-• Ghar par kya kar sakte hain
-• Doctor kab dikhana chahiye
-• Najdeeki clinic kahan hai
-
-**Kuch healthy tips:**
-✅ Din mein 7-8 ghante soyein
-✅ Pani zyada piyein (8-10 glass)
-✅ Fruits aur vegetables khayein
-✅ Thoda exercise ya walk daily karein
-✅ Hand washing regularly karein
-
-Aapki kya problem hai? Mujhe detail mein bataayein toh main better help kar sakta/sakti hoon.
-
-**Yaad rakhein:**
-Yeh medical diagnosis nahi hai. Serious problem ho toh doctor se zaroor milein.
-""",
-        'english': """
-Hello! I'm SwasthyaGuide. 🙏
-
-**You can ask me about:**
-• Common problems like headache, fever, stomach pain
-• What you can do at home
-• When to see a doctor
-• Where are nearby clinics
-
-**Some healthy tips:**
-✅ Sleep 7-8 hours daily
-✅ Drink plenty of water (8-10 glasses)
-✅ Eat fruits and vegetables
-✅ Exercise or walk daily
-✅ Wash hands regularly
-
-What's troubling you? Please share details so I can help you better.
-
-**Remember:**
-This is not medical diagnosis. For serious issues, please consult a doctor.
-""",
-        'marathi': """
-नमस्कार! मी SwasthyaGuide आहे. 🙏
-
-**तुम्ही मला याबद्दल विचारू शकता:**
-• डोकेदुखी, ताप, पोटदुखी यासारख्या सामान्य समस्या
-• घरी तुम्ही काय करू शकता
-• डॉक्टरांना कधी भेटावे
-• जवळपासचे क्लिनिक कुठे आहेत
-
-**काही आरोग्य टिपा:**
-✅ दररोज 7-8 तास झोपा
-✅ भरपूर पाणी प्या (8-10 ग्लास)
-✅ फळे आणि भाज्या खा
-✅ दररोज व्यायाम किंवा चालणे करा
-✅ नियमितपणे हात धुवा
-
-तुम्हाला काय त्रास आहे? कृपया तपशील सांगा म्हणजे मी तुम्हाला चांगली मदत करू शकेन.
-
-**लक्षात ठेवा:**
-हे वैद्यकीय निदान नाही. गंभीर समस्या असल्यास डॉक्टरांना भेटा.
-""",
-        'bengali': """
-নমস্কার! আমি SwasthyaGuide। 🙏
-
-**আপনি আমাকে জিজ্ঞাসা করতে পারেন:**
-• মাথা ব্যথা, জ্বর, পেট ব্যথার মতো সাধারণ সমস্যা
-• বাড়িতে আপনি কী করতে পারেন
-• কখন ডাক্তার দেখাবেন
-• কাছাকাছি ক্লিনিক কোথায়
-
-**কিছু স্বাস্থ্য টিপস:**
-✅ প্রতিদিন 7-8 ঘণ্টা ঘুমান
-✅ প্রচুর পানি পান করুন (8-10 গ্লাস)
-✅ ফল এবং সবজি খান
-✅ প্রতিদিন ব্যায়াম বা হাঁটাহাঁটি করুন
-✅ নিয়মিত হাত ধোয়া
-
-আপনার কী সমস্যা? বিস্তারিত জানান যাতে আমি আরও ভালো সাহায্য করতে পারি।
-
-**মনে রাখবেন:**
-এটি চিকিৎসা নির্ণয় নয়। গুরুতর সমস্যার জন্য ডাক্তারের পরামর্শ নিন।
-""",
-        'tamil': """
-வணக்கம்! நான் SwasthyaGuide. 🙏
-
-**நீங்கள் என்னிடம் கேட்கலாம்:**
-• தலைவலி, காய்ச்சல், வயிற்று வலி போன்ற பொதுவான பிரச்சினைகள்
-• வீட்டில் நீங்கள் என்ன செய்யலாம்
-• மருத்துவரை எப்போது பார்க்க வேண்டும்
-• அருகிலுள்ள கிளினிக்குகள் எங்கே உள்ளன
-
-**சில ஆரோக்கிய குறிப்புகள்:**
-✅ தினமும் 7-8 மணி நேரம் தூங்குங்கள்
-✅ நிறைய தண்ணீர் குடியுங்கள் (8-10 கிளாஸ்)
-✅ பழங்கள் மற்றும் காய்கறிகள் சாப்பிடுங்கள்
-✅ தினமும் உடற்பயிற்சி அல்லது நடைபயிற்சி
-✅ தொடர்ந்து கைகளை கழுவுங்கள்
-
-உங்களுக்கு என்ன பிரச்சனை? விவரங்களைப் பகிருங்கள், நான் சிறப்பாக உதவ முடியும்.
-
-**நினைவில் கொள்ளுங்கள்:**
-இது மருத்துவ நோயறிதல் அல்ல. தீவிர பிரச்சினைகளுக்கு மருத்துவரை ஆலோசிக்கவும்.
-""",
-        'telugu': """
-నమస్కారం! నేను SwasthyaGuide. 🙏
-
-**మీరు నన్ను అడగవచ్చు:**
-• తలనొప్పి, జ్వరం, కడుపు నొప్పి వంటి సాధారణ సమస్యలు
-• ఇంట్లో మీరు ఏమి చేయవచ్చు
-• వైద్యుడిని ఎప్పుడు చూడాలి
-• సమీప క్లినిక్‌లు ఎక్కడ ఉన్నాయి
-
-**కొన్ని ఆరోగ్య చిట్కాలు:**
-✅ ప్రతిరోజూ 7-8 గంటలు నిద్రించండి
-✅ చాలా నీళ్లు తాగండి (8-10 గ్లాసులు)
-✅ పండ్లు మరియు కూరగాయలు తినండి
-✅ ప్రతిరోజూ వ్యాయామం లేదా నడవండి
-✅ క్రమం తప్పకుండా చేతులు కడుక్కోండి
-
-మీకు ఏమి సమస్య? వివరాలు షేర్ చేయండి, నేను మెరుగ్గా సహాయం చేయగలను.
-
-**గుర్తుంచుకోండి:**
-ఇది వైద్య నిర్ధారణ కాదు. తీవ్రమైన సమస్యలకు వైద్యుని సంప్రదించండి.
-""",
-        'punjabi': """
-ਸਤ ਸ੍ਰੀ ਅਕਾਲ! ਮੈਂ SwasthyaGuide ਹਾਂ। 🙏
-
-**ਤੁਸੀਂ ਮੈਨੂੰ ਪੁੱਛ ਸਕਦੇ ਹੋ:**
-• ਸਿਰ ਦਰਦ, ਬੁਖ਼ਾਰ, ਪੇਟ ਦਰਦ ਵਰਗੀਆਂ ਆਮ ਸਮੱਸਿਆਵਾਂ
-• ਘਰ ਵਿੱਚ ਤੁਸੀਂ ਕੀ ਕਰ ਸਕਦੇ ਹੋ
-• ਡਾਕਟਰ ਨੂੰ ਕਦੋਂ ਮਿਲਣਾ ਚਾਹੀਦਾ ਹੈ
-• ਨੇੜਲੇ ਕਲੀਨਿਕ ਕਿੱਥੇ ਹਨ
-
-**ਕੁਝ ਸਿਹਤ ਟਿੱਪਸ:**
-✅ ਰੋਜ਼ਾਨਾ 7-8 ਘੰਟੇ ਸੋਵੋ
-✅ ਬਹੁਤ ਸਾਰਾ ਪਾਣੀ ਪੀਓ (8-10 ਗਲਾਸ)
-✅ ਫਲ ਅਤੇ ਸਬਜ਼ੀਆਂ ਖਾਓ
-✅ ਰੋਜ਼ਾਨਾ ਕਸਰਤ ਜਾਂ ਸੈਰ ਕਰੋ
-✅ ਨਿਯਮਿਤ ਹੱਥ ਧੋਵੋ
-
-ਤੁਹਾਡੀ ਕੀ ਸਮੱਸਿਆ ਹੈ? ਵੇਰਵੇ ਸਾਂਝੇ ਕਰੋ ਤਾਂ ਜੋ ਮੈਂ ਬਿਹਤਰ ਮਦਦ ਕਰ ਸਕਾਂ।
-
-**ਯਾਦ ਰੱਖੋ:**
-ਇਹ ਮੈਡੀਕਲ ਡਾਇਗਨੋਸਿਸ ਨਹੀਂ ਹੈ। ਗੰਭੀਰ ਸਮੱਸਿਆਵਾਂ ਲਈ ਡਾਕਟਰ ਨੂੰ ਮਿਲੋ।
-""",
-        'gujarati': """
-નમસ્તે! હું SwasthyaGuide છું. 🙏
-
-**તમે મને પૂછી શકો છો:**
-• માથાનો દુખાવો, તાવ, પેટનો દુખાવો જેવી સામાન્ય સમસ્યાઓ
-• ઘરે તમે શું કરી શકો
-• ડૉક્ટરને ક્યારે મળવું જોઈએ
-• નજીકની ક્લિનિક ક્યાં છે
-
-**કેટલીક આરોગ્ય ટિપ્સ:**
-✅ દરરોજ 7-8 કલાક ઊંઘો
-✅ ઘણું પાણી પીવો (8-10 ગ્લાસ)
-✅ ફળો અને શાકભાજી ખાઓ
-✅ દરરોજ કસરત અથવા ચાલવું
-✅ નિયમિત હાથ ધોવા
-
-તમારી શું સમસ્યા છે? વિગતો શેર કરો જેથી હું વધુ સારી મદદ કરી શકું.
-
-**યાદ રાખો:**
-આ તબીબી નિદાન નથી. ગંભીર સમસ્યાઓ માટે ડૉક્ટરની સલાહ લો.
-"""
-    }
-    
-    return responses.get(language, responses['hindi'])
+    return get_response_catalog().get('health_tips', language)
+
+
+def compose_symptom_advice(symptoms: List[str], language: str,
+                           catalog: CatalogSnapshot = None) -> Optional[str]:
+    """
+    Assemble one answer covering every symptom from catalog fragments
+
+    Causes, home care and red flags of each symptom are grouped under the
+    shared headings; repeated tips are listed once. If the answer would be
+    longer than MAX_MESSAGE_LENGTH, each symptom keeps fewer home-care
+    tips; red flags are never left out.
+
+    Args:
+        symptoms: Symptoms with fragments (symptom_causes/_home_care/_red_flags)
+        language: Reply language
+        catalog: Catalog snapshot (default: the current one)
+
+    Returns:
+        Composed text, or None when a fragment or heading has no text in
+        `language` (or its fallbacks), so the answer would mix languages,
+        or when it cannot be made short enough
+    """
+    catalog = catalog or get_response_catalog().snapshot()
+    needed = [(intent, symptom) for symptom in symptoms for intent in FRAGMENTS]
+    needed += [('composed_advice', part) for part in COMPOSED_PARTS]
+    if not all(catalog.covers(intent, language, symptom) for intent, symptom in needed):
+        return None
+
+    def part(name):
+        return catalog.get('composed_advice', language, name)
+
+    causes = []
+    home_care = []
+    red_flags = []
+    for symptom in symptoms:
+        name = catalog.get('symptom_name', language, symptom)
+        causes.append(f"*{name}:* {catalog.get('symptom_causes', language, symptom)}")
+        home_care.append(catalog.get('symptom_home_care', language, symptom).split('\n'))
+        red_flags.append(catalog.get('symptom_red_flags', language, symptom).split('\n'))
+
+    all_red_flags = _merge_lines(red_flags)
+    longest = max(len(lines) for lines in home_care)
+    for per_symptom in range(longest, 0, -1):
+        sections = [
+            part('causes_heading') + '\n' + '\n'.join(causes),
+            part('home_care_heading') + '\n' + _merge_lines(home_care, per_symptom),
+            part('red_flags_heading') + '\n' + all_red_flags,
+            part('clinic_offer'),
+            part('disclaimer'),
+        ]
+        text = '\n' + '\n\n'.join(sections) + '\n'
+        if len(text) <= Config.MAX_MESSAGE_LENGTH:
+            return text
+    return None
+
+
+def _merge_lines(per_symptom_lines: List[List[str]], limit: int = None) -> str:
+    """First `limit` lines (default: all) of each symptom, each distinct line once"""
+    lines = dict.fromkeys(line for lines in per_symptom_lines for line in lines[:limit])
+    return '\n'.join(lines)
+
+
+def _build_symptom_response(symptoms: Tuple[str, ...], language: str) -> str:
+    catalog = get_response_catalog().snapshot()
+    # Catalog order, so the same symptom set always reads the same way
+    known = [symptom for symptom in catalog.symptoms('symptom_causes') if symptom in symptoms]
+    full = [symptom for symptom in catalog.symptoms('symptom_advice') if symptom in known]
+
+    # A single symptom with a full template gets that (static) reply
+    if len(known) == 1 and full:
+        return catalog.get('symptom_advice', language, full[0])
+    if known:
+        composed = compose_symptom_advice(known, language, catalog)
+        if composed is not None:
+            return composed
+        # No fragments in this language yet (or too long): the first symptom's full template
+        if full:
+            return catalog.get('symptom_advice', language, full[0])
+    return catalog.get('symptom_advice', language)
 
 
 def get_symptom_response(symptoms: List[str], language: str) -> str:
     """
     Generate response based on detected symptoms
-    Returns formatted health guidance
+    Returns formatted health guidance covering all of them
     """
     if not symptoms:
         return get_general_health_tips(language)
-    
-    # Handle specific symptoms
-    if 'headache' in symptoms:
-        return handle_headache(language)
-    elif 'fever' in symptoms:
-        return handle_fever(language)
-    elif 'stomach_pain' in symptoms:
-        return handle_stomach_pain(language)
-    else:
-        return get_general_symptom_advice(symptoms, language)
+
+    key = (tuple(sorted(set(symptoms))), language)
+    return get_composed_cache().get_or_set(
+        key, lambda: _build_symptom_response(key[0], language),
+        version=get_response_catalog().snapshot().version
+    )
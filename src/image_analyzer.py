@@ -6,24 +6,40 @@ Enhanced with AI-powered analysis, color detection, and texture analysis
 Now powered by Hugging Face AI for accurate medical image understanding
 """
 
+# Annotations stay strings, so np.ndarray / Image.Image do not load the libraries
+from __future__ import annotations
+
 import base64
 import io
 import os
 import json
 import logging
-import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
-from PIL import Image, ImageEnhance, ImageFilter, ImageStat
 from datetime import datetime
 import hashlib
 import requests
 from dotenv import load_dotenv
 
+from .metrics import instrument
+from .lazy_import import lazy_import
+
+# NumPy and Pillow load on the first image, not at startup
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+ImageEnhance = lazy_import('PIL.ImageEnhance')
+ImageFilter = lazy_import('PIL.ImageFilter')
+ImageStat = lazy_import('PIL.ImageStat')
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+HF_API_URL = os.getenv(
+    "HUGGINGFACE_API_URL",
+    "https://api-inference.huggingface.co/models/Salesforce/blip-image-captioning-large"
+)
+
 
 class ImageAnalyzer:
     """Handles advanced medical image analysis with AI-powered insights"""
@@ -36,7 +52,7 @@ class ImageAnalyzer:
         
         # Hugging Face API configuration
         self.hf_api_key = os.getenv("HUGGINGFACE_API_KEY")
-        self.hf_api_url = "https://api-inference.huggingface.co/models/Salesforce/blip-image-captioning-large"
+        self.hf_api_url = HF_API_URL
         
         # Check if API key is available
         if not self.hf_api_key:
@@ -102,6 +118,7 @@ class ImageAnalyzer:
         # Image analysis history for tracking
         self.analysis_history = []
     
+    @instrument('image_validate')
     def validate_image(self, image_data: bytes, content_type: str) -> Tuple[bool, str, Optional[Dict]]:
         """
         Enhanced image validation with metadata extraction
@@ -168,27 +185,20 @@ class ImageAnalyzer:
         except:
             return {}
     
+    @instrument('image_preprocess')
     def preprocess_image(self, image_data: bytes, enhance: bool = True) -> Tuple[Image.Image, Image.Image]:
         """
         Advanced image preprocessing with enhancement options
         Returns: (original_image, enhanced_image)
         """
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        image = self._decode_image(image_data)
         
         # Store original
         original = image.copy()
         
         # Resize if too large (max 1024x1024 for processing)
-        max_dimension = 1024
-        if max(image.size) > max_dimension:
-            ratio = max_dimension / max(image.size)
-            new_size = tuple(int(dim * ratio) for dim in image.size)
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
-            original = original.resize(new_size, Image.Resampling.LANCZOS)
+        image = self._downscale(image)
+        original = self._downscale(original)
         
         # Apply enhancements if requested
         if enhance:
@@ -198,6 +208,23 @@ class ImageAnalyzer:
         
         return original, enhanced
     
+    def _decode_image(self, image_data: bytes) -> Image.Image:
+        """Decode image bytes to an RGB image"""
+        image = Image.open(io.BytesIO(image_data))
+        
+        # Convert to RGB if needed
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return image
+    
+    def _downscale(self, image: Image.Image, max_dimension: int = 1024) -> Image.Image:
+        """Shrink images larger than max_dimension on their longest side"""
+        if max(image.size) > max_dimension:
+            ratio = max_dimension / max(image.size)
+            new_size = tuple(int(dim * ratio) for dim in image.size)
+            image = image.resize(new_size, Image.Resampling.LANCZOS)
+        return image
+    
     def _enhance_image(self, image: Image.Image) -> Image.Image:
         """
         Apply multiple enhancement techniques for better analysis
@@ -357,6 +384,7 @@ class ImageAnalyzer:
         
         return float(edge_density)
     
+    @instrument('cv_analysis')
     def analyze_image_comprehensive(self, image: Image.Image, enhanced_image: Image.Image) -> Dict:
         """
         Comprehensive image analysis combining multiple techniques
@@ -450,6 +478,7 @@ class ImageAnalyzer:
         else:
             return "low"
     
+    @instrument('hf_inference')
     def analyze_with_ai(self, image_data: bytes) -> Dict[str, Any]:
         """
         Use Hugging Face AI to analyze medical image
@@ -597,6 +626,7 @@ class ImageAnalyzer:
         
         return sorted_conditions
     
+    @instrument('image_analysis')
     def analyze_skin_condition(self, image_data: bytes, language: str = 'english') -> Dict:
         """
         Advanced skin condition analysis with comprehensive diagnostics
@@ -1242,7 +1272,8 @@ Seek immediate medical help in case of emergency.
         
         return disclaimers.get(language, disclaimers['english'])
     
-    def get_image_analysis_instructions(self, language: str) -> str:
+    @staticmethod
+    def get_image_analysis_instructions(language: str) -> str:
         """Get instructions for sending medical images"""
         instructions = {
             'hindi': """
@@ -1296,7 +1327,8 @@ However, please consult a doctor for professional diagnosis.
         text_lower = text.lower()
         return any(keyword in text_lower for keyword in image_keywords)
     
-    def get_common_skin_conditions_info(self, language: str) -> str:
+    @staticmethod
+    def get_common_skin_conditions_info(language: str) -> str:
         """Provide information about common skin conditions"""
         info = {
             'hindi': """
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+Keyword Index
+Spelling-tolerant keyword lookup for Romanized (Hinglish etc.) messages
+
+Romanized Indian-language words have no fixed spelling: 'bukhar',
+'bukhaar' and 'bhukhar' are the same word. Keywords and message words
+are compared after phonetic folding (aspirates and long vowels
+collapsed), and a word that still does not match may be one or two
+edits away from a keyword (SymSpell-style deletion index). Keywords in
+Indic scripts are matched as substrings, as before; an index built with
+prefixes=True also matches words that start with a keyword ('feverish').
+"""
+
+import re
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set
+
+# Only Latin words are looked up; Indic-script keywords are substrings
+WORD_RE = re.compile(r'\w+', re.ASCII)
+
+# Aspirated consonants, long vowels and diphthongs -> one spelling;
+# longest first, so 'chh' is replaced before 'ch'
+_FOLDS = {
+    'chh': 'c', 'kh': 'k', 'gh': 'g', 'ch': 'c', 'jh': 'j', 'th': 't', 'dh': 'd',
+    'ph': 'f', 'bh': 'b', 'sh': 's', 'rh': 'r',
+    'ee': 'i', 'oo': 'u', 'ai': 'e', 'ae': 'e', 'au': 'o',
+    'z': 'j', 'q': 'k',
+}
+_FOLD_RE = re.compile('|'.join(sorted(_FOLDS, key=len, reverse=True)))
+_REPEAT_RE = re.compile(r'(.)\1+')
+
+# Words shorter than this are matched exactly: 'tap' or 'hai' are too
+# short to tell a spelling variant from another word
+MIN_FOLD_LENGTH = 4
+# Folded length from which 1 / 2 edits are tolerated ('fever' and 'couch'
+# are one edit from 'never' and 'cough', so five letters are not enough)
+FUZZY_LENGTHS = ((10, 2), (6, 1))
+# English inflections stripped before the fuzzy lookup ('coughing', 'headaches')
+SUFFIXES = ('ing', 'es', 's', 'ed')
+
+# Memoized lookups per index; cleared when full
+MEMO_SIZE = 4096
+
+
+def fold(word: str) -> str:
+    """
+    Phonetic key of a Romanized word: 'bhukhaar' -> 'bukar'
+
+    Aspirates lose their 'h', long vowels and diphthongs become one vowel,
+    'z' / 'q' become 'j' / 'k', and doubled letters are collapsed.
+    """
+    return _REPEAT_RE.sub(r'\1', _FOLD_RE.sub(lambda m: _FOLDS[m.group()], word))
+
+
+def max_edits(length: int) -> int:
+    """Edits tolerated for a folded keyword of this length"""
+    for min_length, edits in FUZZY_LENGTHS:
+        if length >= min_length:
+            return edits
+    return 0
+
+
+def _deletes(word: str, edits: int) -> Set[str]:
+    """`word` and every string made by deleting up to `edits` characters"""
+    result = {word}
+    frontier = {word}
+    for _ in range(edits):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions,
+    substitutions, adjacent transpositions), or limit + 1 once it is
+    certainly above `limit`
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == char_b):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class _Table:
+    """Folded keywords -> labels, with a deletion index for fuzzy lookups"""
+
+    __slots__ = ('folded', 'deletes', 'initials', 'min_length', 'max_length')
+
+    def __init__(self):
+        self.folded = {}   # folded keyword -> labels
+        self.deletes = {}  # deletion variant -> folded keywords
+        self.initials = set()
+        self.min_length = 0
+        self.max_length = 0
+
+    def add(self, folded: str, label):
+        self.folded.setdefault(folded, set()).add(label)
+        edits = max_edits(len(folded))
+        if edits:
+            for variant in _deletes(folded, edits):
+                self.deletes.setdefault(variant, set()).add(folded)
+            self.initials.add(folded[0])
+            self.min_length = min(self.min_length or len(folded), len(folded))
+            self.max_length = max(self.max_length, len(folded))
+
+    def fuzzy(self, folded: str) -> FrozenSet:
+        """Labels of the closest keywords within their edit budget"""
+        if (folded[:1] not in self.initials
+                or not self.min_length - 2 <= len(folded) <= self.max_length + 2):
+            return frozenset()
+        best, labels = None, set()
+        for variant in _deletes(folded, 2 if len(folded) >= FUZZY_LENGTHS[0][0] - 2 else 1):
+            for keyword in self.deletes.get(variant, ()):
+                # Misspellings rarely change the first letter
+                if keyword[0] != folded[0]:
+                    continue
+                limit = max_edits(len(keyword))
+                distance = edit_distance(folded, keyword, limit)
+                if distance > limit or (best is not None and distance > best):
+                    continue
+                if best is None or distance < best:
+                    best, labels = distance, set()
+                labels |= self.folded[keyword]
+        return frozenset(labels)
+
+
+class KeywordIndex:
+    """
+    Precomputed lookup of keyword lists, built once at import
+
+    A message word matches a keyword when it is the same word, the same
+    after folding, the same without an English inflection, or within the
+    keyword's edit budget after folding - tried in that order, so a word
+    listed verbatim never picks up a fuzzy neighbour. Multi-word keywords
+    ('sir dard') also match written together ('sirdard').
+    """
+
+    def __init__(self, keywords: Dict[Hashable, Iterable[str]], prefixes: bool = False):
+        """
+        Args:
+            keywords: label -> keywords (any script; Latin ones are folded)
+            prefixes: As a last resort, match words (and the last word of a
+                      phrase) that start with a keyword of at least
+                      MIN_FOLD_LENGTH letters: 'coldness', 'stomach painful'
+        """
+        self._exact = {}      # keyword, words joined -> labels
+        self._prefixes = {}   # keywords usable as prefixes, words joined -> labels
+        self._words = _Table()
+        self._phrases = _Table()
+        self._substrings = []  # (keyword, label) for non-Latin keywords
+        self._phrase_starts = set()  # Folded first words of multi-word keywords
+        self.max_words = 1
+        self._memo = {}
+
+        for label, words in keywords.items():
+            for keyword in words:
+                keyword = keyword.lower()
+                if not keyword.isascii():
+                    self._substrings.append((keyword, label))
+                    continue
+                tokens = WORD_RE.findall(keyword)
+                joined = ''.join(tokens)
+                self._exact.setdefault(joined, set()).add(label)
+                self._words.add(fold(joined), label)
+                if prefixes and len(joined) >= MIN_FOLD_LENGTH:
+                    self._prefixes.setdefault(joined, set()).add(label)
+                if len(tokens) > 1:
+                    folded = ''.join(fold(token) for token in tokens)
+                    self._phrases.add(folded, label)
+                    self._phrase_starts.add(fold(tokens[0]))
+                    self.max_words = max(self.max_words, len(tokens))
+
+    def _lookup(self, word: str) -> FrozenSet:
+        labels = self._exact.get(word)
+        if labels is not None:
+            return frozenset(labels)
+        if len(word) < MIN_FOLD_LENGTH or not word.isalpha():
+            return frozenset()
+        folded = fold(word)
+        labels = self._words.folded.get(folded)
+        if labels is not None:
+            return frozenset(labels)
+        for suffix in SUFFIXES:
+            stem = word[:-len(suffix)]
+            if word.endswith(suffix) and len(stem) >= MIN_FOLD_LENGTH:
+                labels = self._exact.get(stem) or self._words.folded.get(fold(stem))
+                if labels is not None:
+                    return frozenset(labels)
+        return self._words.fuzzy(folded) or self._prefix(word, len(word) - MIN_FOLD_LENGTH)
+
+    def _prefix(self, joined: str, tail: int) -> FrozenSet:
+        """
+        Labels of the longest prefix keyword of `joined` that leaves out at
+        most its last `tail` characters (at least one)
+        """
+        if self._prefixes:
+            for end in range(len(joined) - 1, len(joined) - tail - 1, -1):
+                labels = self._prefixes.get(joined[:end])
+                if labels is not None:
+                    return frozenset(labels)
+        return frozenset()
+
+    def _starts_phrase(self, word: str) -> bool:
+        """Whether a multi-word keyword may start with this word (up to one edit)"""
+        folded = fold(word)
+        if folded in self._phrase_starts:
+            return True
+        return any(start[0] == folded[:1] and edit_distance(folded, start, 1) <= 1
+                   for start in self._phrase_starts)
+
+    def _memoized(self, word: str):
+        """(labels, whether a multi-word keyword may start with this word)"""
+        entry = self._memo.get(word)
+        if entry is None:
+            entry = (self._lookup(word), self._starts_phrase(word))
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[word] = entry
+        return entry
+
+    def match_word(self, word: str) -> FrozenSet:
+        """
+        Labels of the keywords one message word matches
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            Frozen set of labels (empty when nothing matches)
+        """
+        return self._memoized(word)[0]
+
+    def _match_phrase(self, words: List[str]) -> FrozenSet:
+        key = ' '.join(words)
+        entry = self._memo.get(key)
+        if entry is None:
+            folded = ''.join(fold(word) for word in words)
+            labels = self._phrases.folded.get(folded)
+            if labels is not None:
+                labels = frozenset(labels)
+            else:
+                # A prefix must reach into the last word: 'stomach painful'
+                labels = (self._phrases.fuzzy(folded)
+                          or self._prefix(''.join(words), len(words[-1]) - 1))
+            entry = (labels, False)
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = entry
+        return entry[0]
+
+    def find(self, text: str) -> Set:
+        """
+        Labels of every keyword in a message
+
+        Args:
+            text: User message
+
+        Returns:
+            Set of labels
+        """
+        text_lower = text.lower()
+        found = set()
+        words = WORD_RE.findall(text_lower)
+        for i, word in enumerate(words):
+            labels, starts_phrase = self._memoized(word)
+            if labels:
+                found |= labels
+            if starts_phrase:
+                for end in range(i + 2, min(i + self.max_words, len(words)) + 1):
+                    found |= self._match_phrase(words[i:end])
+        if self._substrings and not text_lower.isascii():
+            for keyword, label in self._substrings:
+                if label not in found and keyword in text_lower:
+                    found.add(label)
+        return found
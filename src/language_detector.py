@@ -5,9 +5,66 @@ Detects user's language from input text with support for 8 Indian languages
 Supports: Hindi, English, Marathi, Bengali, Tamil, Telugu, Punjabi, Gujarati
 """
 
-import re
 from typing import Dict, List
 
+from .keyword_index import KeywordIndex
+
+# Common words per language for Romanized text; each distinct word found
+# counts once, times the language's weight
+LANGUAGE_PATTERNS = {
+    'hinglish': {  # Romanized Hindi (Hindi words in English script)
+        'patterns': ['hai', 'hain', 'mujhe', 'kya', 'aap', 'ko', 'se', 'mein',
+                    'ka', 'ki', 'ho', 'thi', 'tha', 'main', 'aapko', 'mere',
+                    'tumhe', 'usko', 'yeh', 'woh', 'kaise', 'kahan', 'kab',
+                    'bukhar', 'dard', 'sir', 'pet', 'kripya', 'zaroor', 'chahiye',
+                    'najdeeki', 'batao', 'bataye', 'dijiye', 'karein', 'hona'],
+        'weight': 1.2  # 0 when the text has Devanagari
+    },
+    'english': {
+        'patterns': ['the', 'is', 'are', 'was', 'were', 'what', 'how', 'can',
+                    'have', 'has', 'with', 'for', 'from', 'this', 'that',
+                    'my', 'your', 'his', 'her', 'their', 'pain', 'fever',
+                    'headache', 'stomach', 'need', 'help', 'please', 'want'],
+        'weight': 1
+    },
+    'marathi': {
+        'patterns': ['aahe', 'aahes', 'aahot', 'mi', 'tumhi', 'tu', 'tyala',
+                    'mala', 'tula', 'kay', 'kase', 'kuthe', 'kev', 'asa'],
+        'weight': 1.2
+    },
+    'bengali': {
+        'patterns': ['ami', 'tumi', 'apni', 'amar', 'tomar', 'apnar',
+                    'ki', 'keno', 'kothay', 'kivabe', 'ache', 'chhilo'],
+        'weight': 1.2
+    },
+    'tamil': {
+        'patterns': ['nan', 'nee', 'neenga', 'enna', 'eppadi', 'enga',
+                    'ennoda', 'ungala', 'iruku', 'irundu'],
+        'weight': 1.2
+    },
+    'telugu': {
+        'patterns': ['nenu', 'nuvvu', 'meeru', 'naa', 'nee', 'mee',
+                    'enti', 'ela', 'ekkada', 'undi', 'unnadi'],
+        'weight': 1.2
+    },
+    'punjabi': {
+        'patterns': ['main', 'tu', 'tusi', 'mera', 'tera', 'tusada',
+                    'ki', 'kivein', 'kithe', 'hai', 'hain', 'si'],
+        'weight': 1.2
+    },
+    'gujarati': {
+        'patterns': ['hu', 'tame', 'tu', 'maru', 'taru', 'tamaru',
+                    'shu', 'kem', 'kyaa', 'chhe', 'hato', 'hati'],
+        'weight': 1.2
+    }
+}
+
+# (language, pattern) labels, so a word shared by two languages counts for both
+PATTERN_INDEX = KeywordIndex({
+    (lang, pattern): [pattern]
+    for lang, data in LANGUAGE_PATTERNS.items() for pattern in data['patterns']
+})
+
 
 def detect_language(text: str) -> str:
     """
@@ -134,64 +191,14 @@ def detect_by_keywords(text: str) -> str:
     # Check if text has Devanagari script or only Latin
     has_devanagari = any(0x0900 <= ord(char) <= 0x097F for char in text)
     
-    # Language-specific keyword patterns with weights
-    language_patterns = {
-        'hinglish': {  # Romanized Hindi (Hindi words in English script)
-            'patterns': ['hai', 'hain', 'mujhe', 'kya', 'aap', 'ko', 'se', 'mein', 
-                        'ka', 'ki', 'ho', 'thi', 'tha', 'main', 'aapko', 'mere',
-                        'tumhe', 'usko', 'yeh', 'woh', 'kaise', 'kahan', 'kab',
-                        'bukhar', 'dard', 'sir', 'pet', 'kripya', 'zaroor', 'chahiye',
-                        'najdeeki', 'batao', 'bataye', 'dijiye', 'karein', 'hona'],
-            'weight': 1.2 if not has_devanagari else 0  # Only match if no Devanagari
-        },
-        'english': {
-            'patterns': ['the', 'is', 'are', 'was', 'were', 'what', 'how', 'can', 
-                        'have', 'has', 'with', 'for', 'from', 'this', 'that',
-                        'my', 'your', 'his', 'her', 'their', 'pain', 'fever',
-                        'headache', 'stomach', 'need', 'help', 'please', 'want'],
-            'weight': 1
-        },
-        'marathi': {
-            'patterns': ['aahe', 'aahes', 'aahot', 'mi', 'tumhi', 'tu', 'tyala',
-                        'mala', 'tula', 'kay', 'kase', 'kuthe', 'kev', 'asa'],
-            'weight': 1.2
-        },
-        'bengali': {
-            'patterns': ['ami', 'tumi', 'apni', 'amar', 'tomar', 'apnar',
-                        'ki', 'keno', 'kothay', 'kivabe', 'ache', 'chhilo'],
-            'weight': 1.2
-        },
-        'tamil': {
-            'patterns': ['nan', 'nee', 'neenga', 'enna', 'eppadi', 'enga',
-                        'ennoda', 'ungala', 'iruku', 'irundu'],
-            'weight': 1.2
-        },
-        'telugu': {
-            'patterns': ['nenu', 'nuvvu', 'meeru', 'naa', 'nee', 'mee',
-                        'enti', 'ela', 'ekkada', 'undi', 'unnadi'],
-            'weight': 1.2
-        },
-        'punjabi': {
-            'patterns': ['main', 'tu', 'tusi', 'mera', 'tera', 'tusada',
-                        'ki', 'kivein', 'kithe', 'hai', 'hain', 'si'],
-            'weight': 1.2
-        },
-        'gujarati': {
-            'patterns': ['hu', 'tame', 'tu', 'maru', 'taru', 'tamaru',
-                        'shu', 'kem', 'kyaa', 'chhe', 'hato', 'hati'],
-            'weight': 1.2
-        }
-    }
-    
-    # Count matches for each language
-    scores = {}
-    for lang, data in language_patterns.items():
-        count = 0
-        for pattern in data['patterns']:
-            # Use word boundaries to avoid partial matches
-            if re.search(r'\b' + re.escape(pattern) + r'\b', text_lower):
-                count += 1
-        scores[lang] = count * data['weight']
+    # Count distinct pattern matches for each language; spelling variants
+    # ('bukhaar', 'najdiki') match through the index
+    matches = PATTERN_INDEX.find(text)
+    scores = {lang: 0 for lang in LANGUAGE_PATTERNS}
+    for lang, _ in matches:
+        scores[lang] += 1
+    for lang, data in LANGUAGE_PATTERNS.items():
+        scores[lang] *= 0 if lang == 'hinglish' and has_devanagari else data['weight']
     
     # Get language with highest score
     if scores:
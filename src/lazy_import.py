@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy Import Helper
+Defers heavy optional libraries (NumPy/PIL, Google Cloud, pydub) until they
+are first used, so the web process starts without loading them
+"""
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+# Module attributes: the lock that serializes the first load, and a
+# flag set while the loading thread runs the module's code
+_LOCK_ATTR = '__lazy_lock__'
+_LOADING_ATTR = '__lazy_loading__'
+
+
+class _LazyModule(ModuleType):
+    """
+    Module that executes its code on first attribute access
+
+    importlib.util.LazyLoader has no lock before Python 3.12: a second
+    thread could see the module half-executed. Here the first access
+    holds the module's lock until the code has run; a re-entrant access
+    from that code (a circular import) gets the partial module, as a
+    regular import would.
+    """
+
+    def __getattribute__(self, attr):
+        if type(self) is _LazyModule:
+            _load(self)
+        return ModuleType.__getattribute__(self, attr)
+
+
+def _load(module: ModuleType):
+    state = ModuleType.__getattribute__(module, '__dict__')
+    lock = state.get(_LOCK_ATTR)
+    if lock is None:
+        return  # Loaded by another thread meanwhile
+    with lock:
+        if type(module) is not _LazyModule or state.get(_LOADING_ATTR):
+            return  # Loaded meanwhile, or accessed by its own code
+        state[_LOADING_ATTR] = True
+        try:
+            state['__spec__'].loader.exec_module(module)
+        finally:
+            del state[_LOADING_ATTR]
+        module.__class__ = ModuleType
+        del state[_LOCK_ATTR]
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Module whose code only runs on first attribute access
+
+    The module is found now, so a missing package still raises ImportError
+    at import time and the usual `X_AVAILABLE` try/except keeps working.
+    Errors raised while the module itself executes surface on first use.
+    Threads that use the module while it loads wait for it.
+
+    Args:
+        name: Absolute module name (e.g. 'google.cloud.texttospeech')
+
+    Returns:
+        Module object (the real one if it was already imported)
+
+    Raises:
+        ModuleNotFoundError: The module is not installed
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    module = importlib.util.module_from_spec(spec)
+    setattr(module, _LOCK_ATTR, threading.RLock())
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+
+    # Bind it on the parent package, as a regular import would
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
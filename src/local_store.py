@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Local Store Module
+Small SQLite (WAL mode) store shared by all gunicorn workers on one host
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStore:
+    """
+    Host-local SQLite database used for state that has to be shared
+    between worker processes (rate limit buckets, conversation state).
+
+    Every thread gets its own connection; WAL mode lets readers run
+    while another worker holds the write lock.
+    """
+
+    def __init__(self, path: str, schema: str = '', timeout: float = 2.0):
+        """
+        Args:
+            path: Path of the SQLite file (created if missing)
+            schema: SQL script run once per connection (CREATE TABLE IF NOT EXISTS ...)
+            timeout: Seconds to wait for another worker's write lock
+        """
+        self.path = path
+        self.schema = schema
+        self.timeout = timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def connection(self) -> sqlite3.Connection:
+        """Get (or open) the connection owned by the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if self.schema:
+                conn.executescript(self.schema)
+            self._local.conn = conn
+            # Connections must never be shared with a forked child
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a read-modify-write cycle under the database write lock
+
+        Usage:
+            with store.transaction() as conn:
+                conn.execute(...)
+        """
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def close(self):
+        """Close the connection owned by the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Location Index
+Recognizes the user's location in a message with a gazetteer of known
+places held in a token trie
+
+Places come from the clinic dataset (its location keys) and from the
+local area / pincode list (data/locations.json). Every place has a
+canonical key in the clinic key format (City_Area_SubArea, e.g.
+'Lucknow_Gomti_Nagar_Patrakarpuram'), so a recognized place can be
+searched directly; pincodes are their own key.
+"""
+
+import json
+import logging
+import re
+import string
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Punctuation, '_' and Indic dandas separate tokens. str.translate + split
+# is several times faster than a Unicode-aware regex and keeps Indic
+# combining marks inside their word (\w would split 'गोमती').
+SEPARATORS = str.maketrans({char: ' ' for char in string.punctuation + '।॥‘’“”–—…'})
+LOCATION_KEY_RE = re.compile(r'^[^\W_]+(?:_[^\W_]+)+$')
+
+# Marks a trie node where a place name ends
+_END = '\x00'
+
+# Confidence by how the place was recognized
+CONFIDENCE = {
+    'key': 1.0,         # Exact location key, as listed in clinic replies
+    'pincode': 1.0,     # Pincode in the pincode table
+    'area': 0.9,        # Area or sub-area name
+    'alias': 0.8,       # Alternative spelling of an area
+    'city': 0.6,        # Only the city
+    'unknown_pincode': 0.5,  # Well-formed pincode not in the table
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; separators (spaces, '_', '-', punctuation) are dropped"""
+    return text.lower().translate(SEPARATORS).split()
+
+
+def area_key(*names: str) -> str:
+    """Canonical key for a place path, e.g. ('Lucknow', 'Gomti Nagar') -> 'Lucknow_Gomti_Nagar'"""
+    return '_'.join('_'.join(name.translate(SEPARATORS).split()) for name in names)
+
+
+def find_pincode(tokens: List[str]) -> Optional[str]:
+    """
+    First well-formed pincode among the tokens: six digits, not starting
+    with 0, also written '226 010' or in Indic digits
+
+    Returns:
+        Pincode in ASCII digits, or None
+    """
+    for i, token in enumerate(tokens):
+        if not token.isdigit():
+            continue
+        if len(token) == 3 and i + 1 < len(tokens) and len(tokens[i + 1]) == 3 and tokens[i + 1].isdigit():
+            token += tokens[i + 1]
+        if len(token) != 6:
+            continue
+        try:
+            code = str(int(token))
+        except ValueError:  # Digits int() does not read, e.g. superscripts
+            continue
+        if len(code) == 6:  # A leading zero is dropped, so '012345' fails
+            return code
+    return None
+
+
+def load_locations(path) -> Dict:
+    """
+    Read the area / pincode list
+
+    Returns:
+        Parsed JSON ({} if the file is missing or invalid)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Location list not loaded ({path}): {e}")
+        return {}
+
+
+class LocationMatch:
+    """A recognized location: canonical key, display name and confidence (0-1)"""
+
+    __slots__ = ('key', 'name', 'confidence', 'kind')
+
+    def __init__(self, key: str, name: str, confidence: float, kind: str):
+        self.key = key
+        self.name = name
+        self.confidence = confidence
+        self.kind = kind
+
+    def __repr__(self):
+        return f"LocationMatch({self.key!r}, {self.name!r}, {self.confidence}, {self.kind!r})"
+
+
+class LocationGazetteer:
+    """
+    Token trie of place names for longest-match lookup
+
+    A message is scanned once from every token position; each walk stops
+    at the first token that continues no name, so a lookup costs
+    O(message tokens x longest name) - effectively linear. Built once per
+    clinic snapshot and never modified afterwards.
+    """
+
+    def __init__(self, clinic_keys=(), locations: Dict = None):
+        """
+        Args:
+            clinic_keys: Location keys of the clinic dataset
+            locations: Area / pincode list (data/locations.json layout)
+        """
+        self._trie = {}
+        self._keys = {}      # key (lowercased) -> key
+        self._names = {}     # key (lowercased) -> display name
+        self._pincodes = {}  # pincode -> city
+        self.phrases = 0
+
+        cities = (locations or {}).get('cities', {})
+        for city, info in cities.items():
+            self._add_place((city,), city, 'city', aliases=info.get('aliases', ()))
+            city_phrases = [tokenize(city)] + [tokenize(alias) for alias in info.get('aliases', ())]
+            self._add_areas((city,), info.get('areas', {}), city_phrases, [])
+            for pincode in info.get('pincodes', {}):
+                self._pincodes[pincode] = city
+
+        # Clinic keys not covered by the list are still recognized, with
+        # and without their city prefix
+        city_prefixes = [tokenize(city) for city in cities]
+        for key in clinic_keys:
+            tokens = tokenize(key)
+            if not tokens or key.lower() in self._keys:
+                continue
+            name = ' '.join(tokens)
+            for prefix in city_prefixes:
+                if tokens[:len(prefix)] == prefix and len(tokens) > len(prefix):
+                    name = ' '.join(key.split('_')[len(prefix):])
+                    self._insert(tokens[len(prefix):], key, 'area', 2)
+            self._register(key, name)
+            self._insert(tokens, key, 'area', 2)
+
+    def _add_areas(self, path: Tuple[str, ...], areas: Dict,
+                   city_phrases: List[List[str]], parent_phrases: List[List[str]]):
+        """Register every area below `path`, recursively for sub-areas"""
+        for name, info in areas.items():
+            aliases = info.get('aliases', ())
+            own = [(tokenize(name), 'area')] + [(tokenize(alias), 'alias') for alias in aliases]
+            key = area_key(*path, name)
+            self._register(key, name)
+            depth = len(path)
+            for tokens, kind in own:
+                self._insert(tokens, key, kind, depth)
+                # 'Lucknow Gomti Nagar', 'Gomti Nagar Vikas Khand', ...
+                for prefix in city_phrases + parent_phrases:
+                    self._insert(prefix + tokens, key, kind, depth)
+            sub_parents = [tokens for tokens, _ in own]
+            self._add_areas(path + (name,), info.get('areas', {}), city_phrases, sub_parents)
+
+    def _add_place(self, path: Tuple[str, ...], name: str, kind: str, aliases=()):
+        key = area_key(*path)
+        self._register(key, name)
+        self._insert(tokenize(name), key, kind, 0)
+        for alias in aliases:
+            self._insert(tokenize(alias), key, kind, 0)
+
+    def _register(self, key: str, name: str):
+        self._keys[key.lower()] = key
+        self._names[key.lower()] = name
+
+    def _insert(self, tokens: List[str], key: str, kind: str, depth: int):
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        existing = node.get(_END)
+        # One phrase, one place: the more specific place wins, then the first seen
+        if existing is None or depth > existing[2]:
+            if existing is None:
+                self.phrases += 1
+            node[_END] = (key, kind, depth)
+
+    def display_name(self, key: str) -> str:
+        """Name to show for a canonical key (the key itself when unknown)"""
+        return self._names.get(key.lower(), key)
+
+    def match(self, text: str) -> Optional[LocationMatch]:
+        """
+        Best location in a message
+
+        A known location key or pincode wins; otherwise the longest place
+        name in the message, the more specific place on a tie.
+
+        Args:
+            text: User message
+
+        Returns:
+            LocationMatch, or None when no known place is mentioned
+        """
+        stripped = text.strip()
+        if '_' in stripped and LOCATION_KEY_RE.match(stripped):
+            key = self._keys.get(stripped.lower())
+            if key is not None:
+                return LocationMatch(key, self.display_name(key), CONFIDENCE['key'], 'key')
+
+        tokens = tokenize(stripped)
+        pincode = find_pincode(tokens)
+        if pincode in self._pincodes:
+            return LocationMatch(pincode, pincode, CONFIDENCE['pincode'], 'pincode')
+
+        best = None  # ((tokens matched, depth, -start), entry)
+        trie = self._trie
+        count = len(tokens)
+        for start, token in enumerate(tokens):
+            node = trie.get(token)
+            end = start + 1
+            while node is not None:
+                entry = node.get(_END)
+                if entry is not None:
+                    rank = (end - start, entry[2], -start)
+                    if best is None or rank > best[0]:
+                        best = (rank, entry)
+                node = node.get(tokens[end]) if end < count else None
+                end += 1
+        if best is not None:
+            key, kind, _ = best[1]
+            return LocationMatch(key, self.display_name(key), CONFIDENCE[kind], kind)
+
+        if pincode:
+            return LocationMatch(pincode, pincode, CONFIDENCE['unknown_pincode'], 'unknown_pincode')
+        return None
+
+    def is_known_pincode(self, pincode: str) -> bool:
+        """Pincode validation: six digits listed in the pincode table"""
+        return pincode in self._pincodes
+
+
+EMPTY_GAZETTEER = LocationGazetteer()
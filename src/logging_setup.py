@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Logging Setup Module
+Structured, PII-safe, non-blocking logging for the web process
+
+- Events are built lazily: nothing is formatted unless a handler emits it
+- Records go through a QueueHandler; a QueueListener thread does the I/O
+- Verbose events are sampled (LOG_SAMPLE_RATE)
+- Phone numbers and message text are redacted (LOG_REDACT_PII)
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from typing import Optional
+
+from .config_loader import Config
+
+# Field names that carry personal data
+PHONE_FIELDS = frozenset(['sender', 'phone', 'user_phone'])
+TEXT_FIELDS = frozenset(['body', 'message', 'text', 'response', 'transcript', 'caption'])
+
+_listener = None
+_listener_pid = None  # Process whose thread drains the queue
+
+
+def redact_phone(phone: Optional[str]) -> str:
+    """
+    Mask a phone number, keeping the channel prefix and last 4 digits
+    e.g. whatsapp:+919876543210 -> whatsapp:***3210
+    """
+    if not phone:
+        return ''
+    if not Config.LOG_REDACT_PII:
+        return phone
+    prefix, _, number = phone.rpartition(':')
+    masked = f"***{number[-4:]}" if len(number) > 4 else '***'
+    return f"{prefix}:{masked}" if prefix else masked
+
+
+def redact_text(text: Optional[str]) -> str:
+    """
+    Replace message text with its length and a short fingerprint
+    so identical messages can still be correlated in logs
+    """
+    if text is None:
+        return ''
+    if not Config.LOG_REDACT_PII:
+        return text
+    digest = hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]
+    return f"<redacted len={len(text)} sha1={digest}>"
+
+
+class LogEvent:
+    """
+    Structured log event
+
+    Holds the raw fields and only redacts/serializes them when a handler
+    actually formats the record (str() or to_dict()).
+    """
+
+    __slots__ = ('event', 'fields')
+
+    def __init__(self, event: str, fields: dict):
+        self.event = event
+        self.fields = fields
+
+    def to_dict(self) -> dict:
+        """Redacted fields as a plain dict"""
+        data = {'event': self.event}
+        for key, value in self.fields.items():
+            if key in PHONE_FIELDS:
+                value = redact_phone(value)
+            elif key in TEXT_FIELDS:
+                value = redact_text(value)
+            data[key] = value
+        return data
+
+    def __str__(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+
+
+def log_event(logger: logging.Logger, level: int, event: str,
+              verbose: bool = False, **fields):
+    """
+    Log a structured event
+
+    Args:
+        logger: Target logger
+        level: Logging level (logging.INFO, ...)
+        event: Event name (e.g., 'message_received')
+        verbose: Verbose events are sampled at Config.LOG_SAMPLE_RATE
+        **fields: Event fields; PII fields are redacted when formatted
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if verbose and Config.LOG_SAMPLE_RATE < 1.0 and random.random() >= Config.LOG_SAMPLE_RATE:
+        return
+    logger.log(level, LogEvent(event, fields))
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; LogEvent fields are merged into it"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        if isinstance(record.msg, LogEvent):
+            payload.update(record.msg.to_dict())
+        else:
+            payload['message'] = record.getMessage()
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock QueueHandler formats every record in the calling thread so
+    it can be pickled; our queue is in-process, so the record is passed
+    through untouched and the request thread only pays for a put().
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            # Tracebacks reference live frames - render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == 'json':
+        return JsonFormatter()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def configure_logging(level: str = None, log_format: str = None,
+                      stream=None) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background thread
+
+    Args:
+        level: Root log level (default Config.LOG_LEVEL)
+        log_format: 'json' or 'text' (default Config.LOG_FORMAT)
+        stream: Output stream (default stderr)
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener, _listener_pid
+
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(_build_formatter(log_format or Config.LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+    return _listener
+
+
+def restart_listener():
+    """
+    Drain the queue in this process after fork()
+
+    The listener's thread stayed behind in the parent, so a forked child
+    gets a new listener on the same queue and handlers. No-op in the
+    process that started the listener.
+    """
+    global _listener, _listener_pid
+    if _listener is None or _listener_pid == os.getpid():
+        return
+    _listener = logging.handlers.QueueListener(
+        _listener.queue, *_listener.handlers, respect_handler_level=_listener.respect_handler_level
+    )
+    _listener.start()
+    _listener_pid = os.getpid()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Message Analysis
+Language, emergency, intent, symptoms and location of a text message,
+computed once per distinct text and cached
+
+A large share of messages are short and repeated ('haan', 'ok', '226010',
+'bukhar hai'). The analysis depends only on the text and the clinic data
+(location recognition), never on the conversation, so one cache serves
+every user; the chatbot applies the conversation state afterwards.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from .cache import MISS, TTLCache
+from .clinic_data import get_clinic_provider
+from .clinic_finder import check_for_clinic_request, recognize_location
+from .config_loader import Config
+from .emergency_handler import detect_emergency
+from .language_detector import detect_language
+from .location_index import LocationMatch
+from .metrics import stage_timer
+from .symptom_checker import extract_symptoms
+
+logger = logging.getLogger(__name__)
+
+_analysis_cache = None
+
+
+class MessageAnalysis:
+    """NLP results for one message text; shared between users, so never modified"""
+
+    __slots__ = ('text', 'language', 'emergency', 'clinic_request', 'symptoms', 'location')
+
+    def __init__(self, text: str, language: str, emergency: bool, clinic_request: bool,
+                 symptoms: Tuple[str, ...], location: Optional[LocationMatch]):
+        self.text = text
+        self.language = language
+        self.emergency = emergency
+        self.clinic_request = clinic_request
+        self.symptoms = symptoms
+        self.location = location
+
+    def location_key(self, min_confidence: float = 0.0) -> Optional[str]:
+        """Recognized location key (see extract_location), or None below `min_confidence`"""
+        if self.location is None or self.location.confidence < min_confidence:
+            return None
+        return self.location.key
+
+    def __repr__(self):
+        return (f"MessageAnalysis({self.text!r}, {self.language!r}, emergency={self.emergency}, "
+                f"clinic_request={self.clinic_request}, symptoms={self.symptoms}, location={self.location})")
+
+
+def get_analysis_cache() -> TTLCache:
+    """Get or create the message analysis cache"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = TTLCache('message_analysis', maxsize=Config.ANALYSIS_CACHE_SIZE,
+                                   ttl=Config.ANALYSIS_CACHE_TTL)
+    return _analysis_cache
+
+
+def normalize_message(text: str) -> str:
+    """
+    Cache key form of a message: whitespace collapsed
+
+    Case is kept: free-text locations are echoed back as the user typed them.
+    """
+    return ' '.join(text.split())
+
+
+def _analyze(text: str) -> MessageAnalysis:
+    # Each NLP stage is timed on a cache miss
+    with stage_timer('language_detection'):
+        language = detect_language(text)
+    with stage_timer('emergency_detection'):
+        emergency = detect_emergency(text)
+    with stage_timer('intent_matching'):
+        clinic_request = check_for_clinic_request(text)
+        symptoms = tuple(extract_symptoms(text))
+    with stage_timer('location_extraction'):
+        location = recognize_location(text)
+    return MessageAnalysis(text, language, emergency, clinic_request, symptoms, location)
+
+
+def analyze_message(text: str) -> MessageAnalysis:
+    """
+    Analyze a message, reusing the result for a repeated short text
+
+    The analysis runs on the message as sent; the normalized text is only
+    the cache key, so 'Haan ' reuses the result of 'Haan' (but not of
+    'haan'). Messages longer than ANALYSIS_CACHE_MAX_LENGTH are rarely
+    repeated and are not cached. A new clinic snapshot empties the cache
+    (locations are recognized against its gazetteer).
+
+    Args:
+        text: User message
+
+    Returns:
+        MessageAnalysis
+    """
+    normalized = normalize_message(text)
+    if len(normalized) > Config.ANALYSIS_CACHE_MAX_LENGTH:
+        return _analyze(text)
+
+    cache = get_analysis_cache()
+    version = get_clinic_provider().snapshot().version
+    analysis = cache.get(normalized, version)
+    if analysis is MISS:
+        analysis = _analyze(text)
+        cache.set(normalized, analysis, version)
+    return analysis
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+Metrics Module
+Prometheus counters/histograms for every stage of message processing
+
+- Disabled by default (METRICS_ENABLED); when off, timers are shared
+  no-op objects and metric factories return a null metric
+- With PROMETHEUS_MULTIPROC_DIR set, every gunicorn worker writes its
+  samples to that directory and /metrics aggregates all of them
+"""
+
+import functools
+import logging
+import os
+import shutil
+import time
+
+from .config_loader import Config
+
+logger = logging.getLogger(__name__)
+
+# prometheus_client picks its value backend when imported, so the
+# multiprocess directory has to be in the environment first
+if Config.METRICS_ENABLED and Config.METRICS_MULTIPROC_DIR:
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', Config.METRICS_MULTIPROC_DIR)
+    os.makedirs(Config.METRICS_MULTIPROC_DIR, exist_ok=True)
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+        generate_latest, multiprocess
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+
+METRIC_PREFIX = 'swasthya'
+
+# Seconds - from a dictionary lookup up to a slow HuggingFace call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Seconds - database connections live from minutes to the recycle limit
+LIFETIME_BUCKETS = (1, 10, 60, 300, 900, 1800, 3600, 7200, 14400)
+
+_enabled = Config.METRICS_ENABLED and PROMETHEUS_AVAILABLE
+if Config.METRICS_ENABLED and not PROMETHEUS_AVAILABLE:
+    logger.warning("METRICS_ENABLED is set but prometheus_client is not installed - metrics disabled")
+
+# name -> metric, so re-importing modules never registers twice
+_metrics = {}
+# stage -> bound histogram child (skips the labels() lookup per call)
+_stage_children = {}
+
+
+def metrics_enabled() -> bool:
+    """True when metrics are being collected"""
+    return _enabled
+
+
+def multiprocess_dir() -> str:
+    """Directory shared by all workers ('' in single-process mode)"""
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR', '') if _enabled else ''
+
+
+class _NullMetric:
+    """Stands in for any metric while metrics are disabled"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, amount):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+NULL_METRIC = _NullMetric()
+
+
+def _register(cls, name: str, documentation: str, labelnames=(), **kwargs):
+    if not _enabled:
+        return NULL_METRIC
+    full_name = f"{METRIC_PREFIX}_{name}"
+    metric = _metrics.get(full_name)
+    if metric is None:
+        metric = cls(full_name, documentation, labelnames=tuple(labelnames), **kwargs)
+        _metrics[full_name] = metric
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames=()):
+    """Get or create a counter (name is prefixed with 'swasthya_')"""
+    return _register(Counter if _enabled else None, name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+    """Get or create a histogram (name is prefixed with 'swasthya_')"""
+    return _register(Histogram if _enabled else None, name, documentation, labelnames,
+                     buckets=buckets)
+
+
+def gauge(name: str, documentation: str, labelnames=(), multiprocess_mode: str = 'livesum'):
+    """
+    Get or create a gauge (name is prefixed with 'swasthya_')
+
+    Args:
+        multiprocess_mode: How worker values are combined ('livesum', 'max', ...)
+    """
+    return _register(Gauge if _enabled else None, name, documentation, labelnames,
+                     multiprocess_mode=multiprocess_mode)
+
+
+STAGE_SECONDS = histogram(
+    'stage_seconds', 'Time spent in each message processing stage', ['stage']
+)
+STAGE_ERRORS = counter(
+    'stage_errors_total', 'Exceptions raised out of a processing stage', ['stage']
+)
+MESSAGES = counter(
+    'messages_total', 'Webhook messages by type and outcome', ['type', 'outcome']
+)
+DB_POOL_WAIT = histogram(
+    'db_pool_wait_seconds', 'Time to get a connection from the pool', ['pool']
+)
+DB_POOL_TIMEOUTS = counter(
+    'db_pool_timeouts_total', 'Checkouts that gave up waiting for a free connection', ['pool']
+)
+DB_POOL_SATURATION = gauge(
+    'db_pool_saturation', 'Checked-out connections as a fraction of pool capacity', ['pool'],
+    multiprocess_mode='livemax'
+)
+DB_CONNECTION_LIFETIME = histogram(
+    'db_connection_lifetime_seconds', 'Age of database connections when closed', ['pool'],
+    buckets=LIFETIME_BUCKETS
+)
+
+
+def _stage_child(stage: str):
+    child = _stage_children.get(stage)
+    if child is None:
+        child = STAGE_SECONDS.labels(stage)
+        _stage_children[stage] = child
+    return child
+
+
+class _NullTimer:
+    """Shared no-op context manager used while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _stage_child(self.stage).observe(time.perf_counter() - self.start)
+        if exc_type is not None:
+            STAGE_ERRORS.labels(self.stage).inc()
+        return False
+
+
+def stage_timer(stage: str):
+    """
+    Time a block of code as a processing stage
+
+    Usage:
+        with stage_timer('language_detection'):
+            language = detect_language(text)
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _StageTimer(stage)
+
+
+def instrument(stage: str):
+    """
+    Decorator timing every call of a function as a processing stage
+
+    Args:
+        stage: Stage label (e.g., 'stt', 'hf_inference')
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _StageTimer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_message(message_type: str, outcome: str):
+    """
+    Count a webhook message
+
+    Args:
+        message_type: 'text', 'image' or 'voice'
+        outcome: 'ok', 'error', 'rejected', ...
+    """
+    if _enabled:
+        MESSAGES.labels(message_type, outcome).inc()
+
+
+def instrument_pool(engine, name: str = 'primary'):
+    """
+    Record checkout wait time, saturation and connection lifetime for
+    one engine's connection pool
+
+    Listeners go on this engine only, once; with metrics disabled nothing
+    is attached and checkouts cost what they did before. Per checkout
+    this adds one histogram observation and two gauge updates.
+
+    Args:
+        engine: SQLAlchemy engine
+        name: 'pool' label value (e.g. 'primary', 'replica-1')
+    """
+    if not _enabled or getattr(engine, '_swasthya_pool_instrumented', False):
+        return
+    from sqlalchemy import event
+
+    wait = DB_POOL_WAIT.labels(name)
+    timeouts = DB_POOL_TIMEOUTS.labels(name)
+    saturation = DB_POOL_SATURATION.labels(name)
+    lifetime = DB_CONNECTION_LIFETIME.labels(name)
+
+    def _observe_wait(seconds, timed_out):
+        if timed_out:
+            timeouts.inc()
+        else:
+            wait.observe(seconds)
+
+    def _update_saturation(adjust=0):
+        # engine.pool is looked up each time: dispose() replaces it
+        pool = engine.pool
+        checkedout = getattr(pool, 'checkedout', None)
+        if checkedout is None:  # NullPool keeps no count
+            return
+        capacity = pool.size() + max(0, getattr(pool, '_max_overflow', 0))
+        if capacity:
+            saturation.set((checkedout() + adjust) / capacity)
+
+    if hasattr(engine.pool, 'wait_observer'):
+        engine.pool.wait_observer = _observe_wait
+
+    @event.listens_for(engine, 'checkout')
+    def _checkout(dbapi_conn, connection_record, connection_proxy):
+        _update_saturation()
+
+    @event.listens_for(engine, 'checkin')
+    def _checkin(dbapi_conn, connection_record):
+        _update_saturation(-1)  # checkin fires before the pool takes the connection back
+
+    @event.listens_for(engine, 'close')
+    def _close(dbapi_conn, connection_record):
+        # starttime is the wall-clock time the record (re)connected
+        started = getattr(connection_record, 'starttime', None)
+        if started:
+            lifetime.observe(time.time() - started)
+
+    engine._swasthya_pool_instrumented = True
+
+
+def instrument_engine(engine, stage: str = 'db_query', pool: str = 'primary'):
+    """
+    Time every SQL statement executed on a SQLAlchemy engine, and
+    instrument its connection pool (see instrument_pool)
+
+    Listeners are attached to this engine only (not the global Engine
+    class), so calling this for several engines never stacks them.
+    """
+    if not _enabled:
+        return
+    instrument_pool(engine, pool)
+    if getattr(engine, '_swasthya_instrumented', False):
+        return
+    from sqlalchemy import event
+
+    child = _stage_child(stage)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if starts:
+            child.observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, 'handle_error')
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('_query_start'):
+            conn.info['_query_start'].pop()
+        STAGE_ERRORS.labels(stage).inc()
+
+    engine._swasthya_instrumented = True
+
+
+def render_metrics():
+    """
+    Text exposition of all metrics
+
+    Returns:
+        (body bytes, content type)
+    """
+    if not _enabled:
+        return b'', CONTENT_TYPE_LATEST
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir():
+    """Remove samples left by a previous server run (call once in the master)"""
+    path = multiprocess_dir()
+    if not path:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def mark_worker_dead(pid: int):
+    """Drop live gauges of a worker that exited (gunicorn child_exit hook)"""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limiting Module
+Per-sender token buckets and a global concurrency cap for the WhatsApp webhook
+"""
+
+import logging
+import threading
+import time
+from typing import Sequence
+
+from .config_loader import Config
+from .local_store import LocalStore
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Buckets untouched for this long are full again and can be deleted
+STALE_BUCKET_SECONDS = 3600
+CLEANUP_EVERY = 500
+
+
+class TokenBucket:
+    """
+    Token bucket stored in a LocalStore so every worker on the host
+    sees the same budget for a sender
+    """
+
+    def __init__(self, store: LocalStore, rate_per_minute: float, burst: int, prefix: str):
+        """
+        Args:
+            store: Shared local store
+            rate_per_minute: Tokens refilled per minute
+            burst: Bucket capacity (messages allowed back-to-back)
+            prefix: Key prefix separating this bucket family from others
+        """
+        self.store = store
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.prefix = prefix
+
+    def consume(self, key: str, cost: float = 1.0) -> bool:
+        """
+        Take `cost` tokens for `key`
+
+        Returns:
+            True if the request is within budget
+        """
+        return consume_all(self.store, (self,), key, cost)
+
+    def _level(self, conn, key: str, now: float):
+        """(row key, tokens after refilling up to `now`) inside a transaction"""
+        bucket_key = f"{self.prefix}:{key}"
+        row = conn.execute(
+            'SELECT tokens, updated FROM buckets WHERE key = ?', (bucket_key,)
+        ).fetchone()
+        if row is None:
+            return bucket_key, self.capacity
+        return bucket_key, min(self.capacity, row[0] + (now - row[1]) * self.rate)
+
+
+def consume_all(store: LocalStore, buckets: Sequence[TokenBucket], key: str, cost: float = 1.0) -> bool:
+    """
+    Take `cost` tokens for `key` from every bucket, or from none
+
+    All buckets are checked and then debited in one transaction, so a
+    request one bucket rejects does not use up the others.
+
+    Returns:
+        True if the request is within every budget
+    """
+    now = time.time()
+    with store.transaction() as conn:
+        levels = [bucket._level(conn, key, now) for bucket in buckets]
+        allowed = all(tokens >= cost for _, tokens in levels)
+        conn.executemany(
+            'INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+            [(bucket_key, tokens - cost if allowed else tokens, now) for bucket_key, tokens in levels]
+        )
+    return allowed
+
+
+class WebhookRateLimiter:
+    """
+    Admission control for the webhook:
+    - per-sender token bucket for all messages
+    - separate, smaller bucket for media (image/voice) messages
+    - process-wide cap on requests being processed at the same time
+    """
+
+    def __init__(self, store_path: str = None, enabled: bool = None):
+        self.enabled = Config.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self.store = LocalStore(store_path or Config.RATE_LIMIT_STORE_PATH, BUCKET_SCHEMA)
+
+        self.message_bucket = TokenBucket(
+            self.store,
+            Config.RATE_LIMIT_MESSAGES_PER_MINUTE,
+            Config.RATE_LIMIT_MESSAGE_BURST,
+            'msg'
+        )
+        self.media_bucket = TokenBucket(
+            self.store,
+            Config.RATE_LIMIT_MEDIA_PER_MINUTE,
+            Config.RATE_LIMIT_MEDIA_BURST,
+            'media'
+        )
+
+        self.max_concurrent = Config.MAX_CONCURRENT_REQUESTS
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._calls = 0
+
+    def allow_sender(self, sender: str, is_media: bool = False) -> bool:
+        """
+        Check the sender's budget
+
+        Args:
+            sender: Twilio 'From' value (e.g., whatsapp:+91...)
+            is_media: True for image/voice messages
+
+        Returns:
+            True if the message should be processed
+        """
+        if not self.enabled or not sender:
+            return True
+
+        try:
+            buckets = (self.message_bucket, self.media_bucket) if is_media else (self.message_bucket,)
+            if not consume_all(self.store, buckets, sender):
+                return False
+            self._maybe_cleanup()
+            return True
+        except Exception as e:
+            # Never drop real users because the limiter store is broken
+            logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+            return True
+
+    def try_acquire(self) -> bool:
+        """Reserve a processing slot without waiting (False = shed load)"""
+        if not self.enabled:
+            return True
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        """Return a slot taken by try_acquire()"""
+        if not self.enabled:
+            return
+        try:
+            self._slots.release()
+        except ValueError:
+            logger.error("Concurrency slot released more times than acquired")
+
+    def _maybe_cleanup(self):
+        """Periodically delete buckets that have been idle long enough to be full"""
+        self._calls += 1
+        if self._calls % CLEANUP_EVERY:
+            return
+        cutoff = time.time() - STALE_BUCKET_SECONDS
+        with self.store.transaction() as conn:
+            conn.execute('DELETE FROM buckets WHERE updated < ?', (cutoff,))
+
+
+# Global limiter instance
+_rate_limiter_instance = None
+
+
+def get_rate_limiter() -> WebhookRateLimiter:
+    """Get or create singleton webhook rate limiter"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        _rate_limiter_instance = WebhookRateLimiter()
+    return _rate_limiter_instance
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Response Catalog
+Reply templates and phrases loaded once from data/translations.json and
+served by (intent, symptom, language) with a single dict lookup
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config_loader import Config, resolve_data_path
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+# Symptom key of templates that are not symptom-specific
+ANY = '*'
+# Language key of a language-neutral (e.g. bilingual) text
+NEUTRAL = '*'
+# Last language tried before a language-neutral text
+FALLBACK_LANGUAGE = 'english'
+
+# Top-level sections of translations.json that are not phrases
+RESERVED_SECTIONS = ('language_fallbacks', 'responses')
+
+RELOADS = counter(
+    'response_catalog_reloads_total', 'Response catalog reloads by outcome', ['outcome']
+)
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(sys.intern(item) for item in value)
+    raise ValueError(f"Unsupported template value: {value!r}")
+
+
+def _is_language_map(value) -> bool:
+    return isinstance(value, dict) and bool(value) and all(
+        isinstance(text, (str, list)) for text in value.values()
+    )
+
+
+class CatalogSnapshot:
+    """
+    One loaded catalog with every (intent, symptom, language) resolved
+
+    Fallbacks are applied at load time: for each template and each known
+    language the table already holds the text that language gets, so a
+    lookup never walks the fallback chain. Never modified after construction.
+    """
+
+    def __init__(self, data: Dict, version=None):
+        """
+        Args:
+            data: Parsed translations.json
+            version: Opaque source version used to detect changes
+        """
+        self.version = version
+        self.fallbacks = {
+            language: tuple(chain) for language, chain in data.get('language_fallbacks', {}).items()
+        }
+
+        # (intent, symptom) -> (default language, {language: text})
+        templates = {}
+        for section, value in data.items():
+            if section in RESERVED_SECTIONS:
+                continue
+            if _is_language_map(value):
+                templates[(section, ANY)] = (None, value)
+            elif isinstance(value, dict):
+                for key, texts in value.items():
+                    if _is_language_map(texts):
+                        templates[(section, key)] = (None, texts)
+        for intent, by_symptom in data.get('responses', {}).items():
+            for symptom, entry in by_symptom.items():
+                templates[(intent, symptom)] = (entry.get('default'), entry['text'])
+
+        languages = {}
+        for _, texts in templates.values():
+            languages.update(dict.fromkeys(texts))
+        languages.update(dict.fromkeys(self.fallbacks))
+        languages.pop(NEUTRAL, None)
+        self.languages = list(languages)
+
+        self._table = {}
+        # (intent, symptom) -> languages the template has its own text in
+        self._available = {}
+        # Templates with only a language-neutral text (no per-language variants)
+        self._neutral = set()
+        for (intent, symptom), (default, texts) in templates.items():
+            texts = {language: _intern(text) for language, text in texts.items()}
+            key = (sys.intern(intent), sys.intern(symptom))
+            self._available[key] = frozenset(texts)
+            if set(texts) == {NEUTRAL}:
+                self._neutral.add(key)
+            self._table[key + (None,)] = self._resolve(texts, None, default)
+            for language in self.languages:
+                self._table[key + (language,)] = self._resolve(texts, language, default)
+        self.templates = list(templates)
+
+    def _resolve(self, texts: Dict, language: Optional[str], default: Optional[str]):
+        """Walk the fallback chain: language, its fallbacks, template default, English, neutral"""
+        chain = (language, *self.fallbacks.get(language, ()), default, FALLBACK_LANGUAGE, NEUTRAL)
+        for candidate in chain:
+            text = texts.get(candidate)
+            if text is not None:
+                return text
+        return next(iter(texts.values()))
+
+    def get(self, intent: str, language: Optional[str] = None, symptom: str = ANY):
+        """
+        Text of a template
+
+        Args:
+            intent: Template group (e.g. 'symptom_advice', 'emergency', 'greetings')
+            language: Language code; unknown or None gives the template default
+            symptom: Template within the group; unknown symptoms fall back to '*'
+
+        Returns:
+            Text (or tuple of texts for list phrases)
+
+        Raises:
+            KeyError: Unknown intent
+        """
+        text = self._table.get((intent, symptom, language))
+        if text is None:
+            text = self._table.get((intent, symptom, None))
+            if text is None:
+                if symptom == ANY:
+                    raise KeyError(intent)
+                return self.get(intent, language, ANY)
+        return text
+
+    def covers(self, intent: str, language: Optional[str], symptom: str = ANY) -> bool:
+        """
+        True if the template has text in `language` or one of its
+        language_fallbacks (rather than only the template default or English)
+        """
+        available = self._available.get((intent, symptom), ())
+        return language in available or any(
+            fallback in available for fallback in self.fallbacks.get(language, ())
+        )
+
+    def symptoms(self, intent: str) -> List[str]:
+        """Symptom keys of an intent in catalog order, without '*'"""
+        return [symptom for template_intent, symptom in self.templates
+                if template_intent == intent and symptom != ANY]
+
+    def variants(self, intent: str, symptom: str = ANY) -> Dict[Optional[str], str]:
+        """{language: text} for every known language, plus None for the template default"""
+        if (intent, symptom) in self._neutral:
+            return {None: self._table[(intent, symptom, None)]}
+        variants = {language: self._table[(intent, symptom, language)] for language in self.languages}
+        variants[None] = self._table[(intent, symptom, None)]
+        return variants
+
+
+EMPTY_CATALOG = CatalogSnapshot({})
+
+
+class ResponseCatalog:
+    """
+    Serves the current CatalogSnapshot and reloads it when the file changes
+
+    Works like ClinicDataProvider: a watcher thread polls the file's mtime
+    and size and swaps in a rebuilt snapshot; a broken edit keeps the last
+    good one. Subscribers are called after each swap (used to refresh
+    caches derived from the catalog).
+    """
+
+    def __init__(self, path: str = None, interval: float = None):
+        """
+        Args:
+            path: Catalog JSON path
+            interval: Seconds between change checks
+        """
+        self.path = resolve_data_path(path or Config.RESPONSE_CATALOG_PATH)
+        self.interval = interval or Config.RESPONSE_CATALOG_POLL_INTERVAL
+
+        self._snapshot = None
+        self._subscribers: List[Callable[[CatalogSnapshot], None]] = []
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current snapshot; the very first call loads synchronously"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot or EMPTY_CATALOG
+        return snapshot
+
+    def get(self, intent: str, language: Optional[str] = None, symptom: str = ANY):
+        """Text of a template from the current snapshot (see CatalogSnapshot.get)"""
+        return self.snapshot().get(intent, language, symptom)
+
+    def subscribe(self, callback: Callable[[CatalogSnapshot], None]):
+        """Call `callback(snapshot)` after every reload"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def current_version(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the file, or None when it is missing"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the snapshot if the file changed
+
+        Args:
+            force: Rebuild even if the version is unchanged
+
+        Returns:
+            True when a new snapshot was swapped in
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            version = self.current_version()
+            current = self._snapshot
+            if current is not None and not force and version == current.version:
+                return False
+            try:
+                if version is None:
+                    raise FileNotFoundError(str(self.path))
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    snapshot = CatalogSnapshot(json.load(f), version)
+            except Exception as e:
+                RELOADS.labels('error').inc()
+                logger.error(f"Error loading response catalog {self.path}: {e}")
+                if self._snapshot is None:
+                    self._snapshot = EMPTY_CATALOG
+                return False
+
+            # Atomic swap: readers see the old or the new snapshot, never a mix
+            self._snapshot = snapshot
+            RELOADS.labels('success').inc()
+            logger.info(f"Loaded {len(snapshot.templates)} response templates in "
+                         f"{len(snapshot.languages)} languages in "
+                         f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+        if current is not None:
+            for callback in self._subscribers:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    logger.error(f"Response catalog subscriber failed: {e}")
+        return True
+
+    def start(self):
+        """Start the background watcher (no-op if it is running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='response-catalog-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background watcher"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def restart(self):
+        """Start a fresh watcher thread (threads do not survive fork())"""
+        self._thread = None
+        self.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.reload()
+            self._stop.wait(self.interval)
+
+
+# Global catalog instance
+_catalog_instance = None
+
+
+def get_response_catalog() -> ResponseCatalog:
+    """Get or create singleton response catalog"""
+    global _catalog_instance
+    if _catalog_instance is None:
+        _catalog_instance = ResponseCatalog()
+    return _catalog_instance
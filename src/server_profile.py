@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Server Profile
+Worker and thread counts for the host gunicorn starts on, and the steps
+gunicorn.conf.py runs around fork()
+
+The app is preloaded in the gunicorn master: clinic data, the response
+catalog, keyword tables and the TwiML cache are built once and shared
+copy-on-write by every worker. Threads, pooled connections and sockets
+do not survive fork(), so each worker re-creates them in post_fork.
+"""
+
+import gc
+import logging
+import math
+import os
+
+from .config_loader import Config
+
+logger = logging.getLogger(__name__)
+
+# cgroup files read before falling back to the host's CPUs / memory
+CGROUP_CPU_MAX = '/sys/fs/cgroup/cpu.max'  # v2: "<quota> <period>" or "max <period>"
+CGROUP_CPU_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'  # v1
+CGROUP_CPU_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
+CGROUP_MEMORY_MAX = '/sys/fs/cgroup/memory.max'  # v2: bytes or "max"
+CGROUP_MEMORY_LIMIT = '/sys/fs/cgroup/memory/memory.limit_in_bytes'  # v1
+
+# Resident memory of the master after `import app` (measured 61 MB); the
+# shared pages are counted here, not in each worker
+MASTER_MEMORY_MB = 64
+
+WORKER_CLASSES = ('gthread', 'gevent', 'sync')
+
+# Threads beyond MAX_CONCURRENT_REQUESTS. With no spare thread the
+# concurrency cap is never reached and requests queue in gunicorn instead
+# of getting the "busy" reply; the spares send that reply and answer
+# health checks while every slot is taken.
+BUSY_HEADROOM = 2
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def cpu_limit() -> float:
+    """
+    CPUs this process may use: the cgroup quota if one is set (containers,
+    Render), otherwise the CPUs in the affinity mask
+
+    Returns:
+        CPU count, possibly fractional (e.g. 0.5)
+    """
+    quota, period = None, None
+    cpu_max = _read(CGROUP_CPU_MAX).split()
+    if len(cpu_max) == 2 and cpu_max[0] != 'max':
+        quota, period = cpu_max
+    elif not cpu_max:
+        quota, period = _read(CGROUP_CPU_QUOTA), _read(CGROUP_CPU_PERIOD)
+    try:
+        if quota and period and int(quota) > 0:
+            return int(quota) / int(period)
+    except ValueError:
+        pass
+
+    try:
+        return float(len(os.sched_getaffinity(0)))
+    except AttributeError:  # macOS
+        return float(os.cpu_count() or 1)
+
+
+def memory_limit_mb() -> float:
+    """
+    Memory this process may use: the cgroup limit if one is set, otherwise
+    the host's physical memory
+
+    Returns:
+        Megabytes
+    """
+    physical = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2 ** 20
+    for path in (CGROUP_MEMORY_MAX, CGROUP_MEMORY_LIMIT):
+        value = _read(path)
+        if value.isdigit():
+            # cgroup v1 reports a huge number when there is no limit
+            return min(int(value) / 2 ** 20, physical)
+    return physical
+
+
+def worker_count(cpus: float = None, memory_mb: float = None, worker_memory_mb: float = None) -> int:
+    """
+    Worker processes for this host
+
+    One worker per CPU plus one, so a worker blocked in CPU-bound image
+    analysis does not stall the others, and at least two, so a worker
+    being recycled (max_requests) never leaves the server without one.
+    Capped by memory: each worker may grow to `worker_memory_mb` once it
+    has loaded the image and voice libraries.
+
+    Args:
+        cpus: CPU limit (default: cpu_limit())
+        memory_mb: Memory limit (default: memory_limit_mb())
+        worker_memory_mb: Memory budget per worker (default: GUNICORN_WORKER_MEMORY_MB)
+
+    Returns:
+        Number of workers (at least 1)
+    """
+    cpus = cpu_limit() if cpus is None else cpus
+    memory_mb = memory_limit_mb() if memory_mb is None else memory_mb
+    worker_memory_mb = worker_memory_mb or Config.GUNICORN_WORKER_MEMORY_MB
+
+    by_cpu = max(2, math.ceil(cpus) + 1)
+    by_memory = int((memory_mb - MASTER_MEMORY_MB) // worker_memory_mb)
+    return max(1, min(by_cpu, by_memory))
+
+
+def thread_count(worker_class: str = None) -> int:
+    """
+    Concurrent requests per worker: threads (gthread) or greenlets (gevent)
+
+    MAX_CONCURRENT_REQUESTS + BUSY_HEADROOM by default: more threads did
+    not raise throughput in the load test, only memory (see
+    DEPLOYMENT_GUIDE.md). Sync workers handle one request at a time.
+
+    Returns:
+        GUNICORN_THREADS if set, otherwise the default above
+    """
+    worker_class = worker_class or Config.GUNICORN_WORKER_CLASS
+    if worker_class == 'sync':
+        return 1
+    if not Config.GUNICORN_THREADS:
+        return Config.MAX_CONCURRENT_REQUESTS + BUSY_HEADROOM
+    if Config.RATE_LIMIT_ENABLED and Config.GUNICORN_THREADS <= Config.MAX_CONCURRENT_REQUESTS:
+        logger.warning(
+            "GUNICORN_THREADS=%d is not above MAX_CONCURRENT_REQUESTS=%d: excess requests "
+            "will queue instead of getting the busy reply",
+            Config.GUNICORN_THREADS, Config.MAX_CONCURRENT_REQUESTS
+        )
+    return Config.GUNICORN_THREADS
+
+
+def prepare_master():
+    """
+    Run in the master once the app is loaded, before the first fork
+
+    Stops the background threads (each worker runs its own) and freezes
+    the objects built so far, so the garbage collector in the workers
+    never writes to them and their pages stay shared.
+    """
+    from .clinic_data import get_clinic_provider
+    from .health_prober import get_health_prober
+    from .response_catalog import get_response_catalog
+
+    for component in (get_health_prober(), get_clinic_provider(), get_response_catalog()):
+        component.stop()
+
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded app frozen for sharing (%d objects)", gc.get_freeze_count())
+
+
+def init_worker():
+    """
+    Run in every worker right after fork()
+
+    Drops the pooled connections inherited from the master without closing
+    them (the sockets belong to the master) so each engine opens its own,
+    and any voice handler (its Google gRPC clients are not fork-safe), then
+    restarts the logging listener and the background threads.
+    """
+    from .clinic_data import get_clinic_provider
+    from .health_prober import get_health_prober
+    from .logging_setup import restart_listener
+    from .response_catalog import get_response_catalog
+    from .voice_handler import reset_voice_handler
+
+    restart_listener()
+    reset_voice_handler()
+
+    try:
+        from database import get_db_manager
+        for _, engine in get_db_manager().engines():
+            engine.dispose(close=False)
+    except (ImportError, RuntimeError):
+        pass  # Running without a database
+
+    for component in (get_health_prober(), get_clinic_provider(), get_response_catalog()):
+        component.restart()
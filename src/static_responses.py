@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Static Response Registry
+Replies that are fully determined by (template, language) - no user data in them
+Most of them come from the response catalog; see response_catalog.py
+"""
+
+import hashlib
+from typing import Dict, Iterator, Optional, Tuple
+
+from .response_catalog import ANY, CatalogSnapshot, get_response_catalog
+
+# Registry template id -> (intent, symptom) in the response catalog.
+# Template ids are stored with conversations, so they must not change.
+CATALOG_TEMPLATES = {
+    'emergency': ('emergency', ANY),
+    'health_tips': ('health_tips', ANY),
+    'headache': ('symptom_advice', 'headache'),
+    'fever': ('symptom_advice', 'fever'),
+    'stomach_pain': ('symptom_advice', 'stomach_pain'),
+    'general_symptom_advice': ('symptom_advice', ANY),
+    'location_prompt': ('location_prompt', ANY),
+    'location_retry': ('location_retry', ANY),
+    'clinic_declined': ('clinic_declined', ANY),
+    'busy': ('busy', ANY),
+    'error_empty': ('error', 'empty'),
+    'error_too_long': ('error', 'too_long'),
+    'error_generic': ('error', 'generic'),
+}
+
+# (catalog snapshot, template_id -> {language: text}), rebuilt when the catalog reloads
+_registry = None
+# (catalog snapshot, text -> (template_id, language))
+_reverse = None
+
+
+def _build_registry(catalog: CatalogSnapshot) -> Dict[str, Dict[Optional[str], str]]:
+    """Collect every static reply the bot can send"""
+    # Imported here so this module stays importable from any of them
+    from .image_analyzer import ImageAnalyzer
+
+    registry = {
+        template_id: catalog.variants(intent, symptom)
+        for template_id, (intent, symptom) in CATALOG_TEMPLATES.items()
+    }
+    for template_id, render in (
+        ('image_instructions', ImageAnalyzer.get_image_analysis_instructions),
+        ('skin_conditions_info', ImageAnalyzer.get_common_skin_conditions_info),
+    ):
+        registry[template_id] = {language: render(language) for language in catalog.languages}
+    return registry
+
+
+def _get_registry() -> Dict[str, Dict[Optional[str], str]]:
+    global _registry
+    catalog = get_response_catalog().snapshot()
+    state = _registry
+    if state is None or state[0] is not catalog:
+        state = _registry = (catalog, _build_registry(catalog))
+    return state[1]
+
+
+def get_static(template_id: str, language: Optional[str] = None) -> str:
+    """
+    Get a static reply
+
+    Args:
+        template_id: Template name (e.g., 'emergency', 'location_prompt')
+        language: Language code; templates without it fall back to
+                  their default (None) entry, then to English
+
+    Returns:
+        Reply text
+    """
+    variants = _get_registry()[template_id]
+    text = variants.get(language)
+    if text is None:
+        text = variants.get(None) or variants['english']
+    return text
+
+
+def iter_static_responses() -> Iterator[Tuple[str, Optional[str], str]]:
+    """Yield (template_id, language, text) for every static reply"""
+    for template_id, variants in _get_registry().items():
+        for language, text in variants.items():
+            yield template_id, language, text
+
+
+def find_static(text: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Identify a reply that came from the registry
+
+    Used when storing conversations, so static replies are saved as a
+    template reference instead of their full text.
+
+    Returns:
+        (template_id, language), or None for a dynamic reply
+    """
+    global _reverse
+    catalog = get_response_catalog().snapshot()
+    state = _reverse
+    if state is None or state[0] is not catalog:
+        reverse = {}
+        for template_id, language, static_text in iter_static_responses():
+            reverse.setdefault(static_text, (template_id, language))
+        state = _reverse = (catalog, reverse)
+    return state[1].get(text)
+
+
+def text_hash(text: str) -> str:
+    """Short content hash of a static reply, stored next to its template id"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def expand_response(bot_response: Optional[str], template_id: Optional[str],
+                    language: Optional[str], response_hash: Optional[str] = None) -> Optional[str]:
+    """
+    Full reply text of a stored conversation row
+
+    Args:
+        bot_response, template_id, language, response_hash: Columns of the row
+
+    Returns:
+        Reply text, or None when the template has been edited since the
+        row was logged (its hash no longer matches), so the text the user
+        saw is unknown. Rows without a hash predate it and are expanded
+        with the current text.
+    """
+    if template_id:
+        text = get_static(template_id, language)
+        if response_hash and text_hash(text) != response_hash:
+            return None
+        return text
+    return bot_response
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+TwiML Rendering Module
+Serializes bot replies to TwiML without building a MessagingResponse per request
+Static replies are rendered once at startup and served from memory
+"""
+
+import logging
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from flask import Response
+
+from .response_catalog import get_response_catalog
+from .static_responses import get_static, iter_static_responses
+
+logger = logging.getLogger(__name__)
+
+# Same bytes twilio.twiml.MessagingResponse produces around a single <Message>
+TWIML_PREFIX = b'<?xml version="1.0" encoding="UTF-8"?><Response><Message>'
+TWIML_SUFFIX = b'</Message></Response>'
+TWIML_CONTENT_TYPE = 'text/xml; charset=utf-8'
+
+# Pre-rendered replies: reply text -> TwiML bytes, (template, language) -> TwiML bytes
+_by_text = {}
+_by_template = {}
+
+
+def _serialize(text: str) -> bytes:
+    """Escape and wrap one message - one escape pass, one encode, one join"""
+    return b''.join((TWIML_PREFIX, escape(text).encode('utf-8'), TWIML_SUFFIX))
+
+
+def warm_static_cache() -> int:
+    """
+    Render every static (template, language) reply once
+
+    The cache is rebuilt whenever the response catalog reloads.
+
+    Returns:
+        Number of distinct replies cached
+    """
+    global _by_text, _by_template
+    by_text = {}
+    by_template = {}
+    for template_id, language, text in iter_static_responses():
+        body = by_text.get(text)
+        if body is None:
+            body = _serialize(text)
+            by_text[text] = body
+        by_template[(template_id, language)] = body
+    _by_text, _by_template = by_text, by_template
+
+    get_response_catalog().subscribe(_on_catalog_reload)
+    logger.info(f"Pre-rendered {len(by_text)} static TwiML replies")
+    return len(by_text)
+
+
+def _on_catalog_reload(catalog):
+    warm_static_cache()
+
+
+def render_message(text: str) -> bytes:
+    """
+    TwiML bytes for a reply
+
+    Static replies are returned from the cache (the lookup hashes a string
+    object that Python already hashed when the template was built);
+    anything else is serialized directly.
+    """
+    body = _by_text.get(text)
+    if body is None:
+        body = _serialize(text)
+    return body
+
+
+def render_static(template_id: str, language: Optional[str] = None) -> bytes:
+    """TwiML bytes for a static template in the given language"""
+    body = _by_template.get((template_id, language))
+    if body is None:
+        body = render_message(get_static(template_id, language))
+    return body
+
+
+def twiml_response(body: bytes, status: int = 200) -> Response:
+    """Wrap rendered TwiML in a Flask response with an exact Content-Length"""
+    response = Response(body, status=status, content_type=TWIML_CONTENT_TYPE)
+    response.headers['Content-Length'] = str(len(body))
+    return response
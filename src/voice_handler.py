@@ -12,18 +12,22 @@ from pathlib import Path
 from typing import Tuple, Optional
 import requests
 
+from .metrics import instrument
+from .lazy_import import lazy_import
+
 # Google Cloud Speech-to-Text and Text-to-Speech
+# (loaded on first use: importing the SDKs takes ~0.4 s)
 try:
-    from google.cloud import speech_v1p1beta1 as speech
-    from google.cloud import texttospeech
+    speech = lazy_import('google.cloud.speech_v1p1beta1')
+    texttospeech = lazy_import('google.cloud.texttospeech')
     GOOGLE_AVAILABLE = True
 except ImportError:
     GOOGLE_AVAILABLE = False
     logging.warning("Google Cloud libraries not available. Voice features will be limited.")
 
-# Audio processing libraries
+# Audio processing libraries (loaded on first use)
 try:
-    from pydub import AudioSegment
+    pydub = lazy_import('pydub')
     PYDUB_AVAILABLE = True
 except ImportError:
     PYDUB_AVAILABLE = False
@@ -86,6 +90,7 @@ class VoiceHandler:
         self.temp_dir.mkdir(exist_ok=True)
         logger.info(f"Voice handler initialized. Temp dir: {self.temp_dir}")
     
+    @instrument('media_download')
     def download_voice_message(self, media_url: str, auth_tuple: Tuple[str, str]) -> Optional[bytes]:
         """
         Download voice message from WhatsApp/Twilio
@@ -110,6 +115,7 @@ class VoiceHandler:
             logger.error(f"Failed to download voice message: {e}")
             return None
     
+    @instrument('audio_convert')
     def convert_audio_format(self, audio_data: bytes, input_format: str = 'ogg', 
                            output_format: str = 'wav') -> Optional[bytes]:
         """
@@ -138,7 +144,7 @@ class VoiceHandler:
             
             # Convert using pydub
             logger.info(f"Converting audio: {input_format} -> {output_format}")
-            audio = AudioSegment.from_file(str(input_path), format=input_format)
+            audio = pydub.AudioSegment.from_file(str(input_path), format=input_format)
             
             # For Google Speech API, use mono 16-bit PCM WAV at 16kHz
             if output_format == 'wav':
@@ -164,6 +170,7 @@ class VoiceHandler:
             logger.error(f"Audio conversion failed: {e}", exc_info=True)
             return None
     
+    @instrument('stt')
     def transcribe_audio(self, audio_data: bytes, language_hint: str = 'hindi') -> Tuple[Optional[str], Optional[str]]:
         """
         Convert speech to text using Google Speech-to-Text API
@@ -221,6 +228,7 @@ class VoiceHandler:
             logger.error(f"Speech recognition failed: {e}", exc_info=True)
             return None, None
     
+    @instrument('tts')
     def synthesize_speech(self, text: str, language: str = 'hindi', 
                          voice_gender: str = 'FEMALE') -> Optional[bytes]:
         """
@@ -284,6 +292,7 @@ class VoiceHandler:
             logger.error(f"Speech synthesis failed: {e}", exc_info=True)
             return None
     
+    @instrument('voice_pipeline')
     def process_voice_message(self, media_url: str, auth_tuple: Tuple[str, str], 
                              language_hint: str = 'hindi') -> Tuple[Optional[str], Optional[str]]:
         """
@@ -430,3 +439,9 @@ def get_voice_handler() -> VoiceHandler:
     if _voice_handler_instance is None:
         _voice_handler_instance = VoiceHandler()
     return _voice_handler_instance
+
+
+def reset_voice_handler():
+    """Drop the voice handler so the next use builds new clients (gRPC channels do not survive fork())"""
+    global _voice_handler_instance
+    _voice_handler_instance = None
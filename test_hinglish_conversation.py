@@ -1,11 +1,12 @@
 # Test Hinglish conversation flow
+import os
 import sys
-sys.path.insert(0, 'src')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from language_detector import detect_language
-from health_responses import handle_headache, get_general_health_tips
-from emergency_handler import get_emergency_response
-from clinic_finder import find_nearby_clinics
+from src.language_detector import detect_language
+from src.health_responses import handle_headache, get_general_health_tips
+from src.emergency_handler import get_emergency_response
+from src.clinic_finder import find_nearby_clinics
 
 print("=" * 60)
 print("Testing Hinglish Conversation Flow")
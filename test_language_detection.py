@@ -1,8 +1,9 @@
 # Test language detection for Hinglish vs English vs Hindi
+import os
 import sys
-sys.path.insert(0, 'src')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from language_detector import detect_language
+from src.language_detector import detect_language
 
 print("=" * 60)
 print("Testing Language Detection")
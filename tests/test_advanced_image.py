@@ -11,9 +11,9 @@ import io
 import numpy as np
 
 # Add parent directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from image_analyzer import ImageAnalyzer
+from src.image_analyzer import ImageAnalyzer
 
 
 def create_test_image(color=(200, 100, 100), size=(512, 512)):
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the TTL/LRU result cache and cached clinic replies
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import src.cache as cache_module
+import src.clinic_data as clinic_data
+import src.clinic_finder as clinic_finder
+from src.cache import MISS, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    return clock
+
+
+def test_lru_eviction_and_ttl(clock):
+    cache = TTLCache('test', maxsize=2, ttl=10, negative_ttl=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now most recently used
+    cache.set('c', 3)
+    assert cache.get('b') is MISS
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['hit_rate'] == pytest.approx(3 / 4)
+
+    cache = TTLCache('test', maxsize=10, ttl=10, negative_ttl=2)
+    cache.set('a', 1)
+    cache.set('unknown', None, negative=True)
+    assert cache.get('unknown') is None
+    clock.now += 5
+    assert cache.get('unknown') is MISS  # negative entries expire sooner
+    assert cache.get('a') == 1
+    clock.now += 6
+    assert cache.get('a') is MISS
+
+
+def test_version_change_invalidates(clock):
+    cache = TTLCache('test', maxsize=10, ttl=60)
+    cache.set('a', 1, version='v1')
+    assert cache.get('a', version='v1') == 1
+    assert cache.get('a', version='v2') is MISS
+    assert len(cache) == 0
+
+    assert TTLCache('off', maxsize=0).get_or_set('a', lambda: 1) == 1  # disabled cache still computes
+
+
+def test_clinic_replies_are_cached_per_location_and_language(monkeypatch):
+    """Repeat queries skip the search; the reply shows the location as typed"""
+    calls = []
+
+    def fake_search(location, limit=10):
+        calls.append(location)
+        if 'gomti' in location.lower():
+            return [{'name': 'City Clinic', 'address': 'Gomti Nagar, Lucknow - 226010'}]
+        return []
+
+    monkeypatch.setattr(clinic_finder, 'search_nearby_clinics', fake_search)
+    monkeypatch.setattr(clinic_finder, '_results_cache', TTLCache('clinic_test', maxsize=10, ttl=60))
+
+    first = clinic_finder.find_nearby_clinics('Gomti Nagar', 'english')
+    second = clinic_finder.find_nearby_clinics('gomti  nagar ', 'english')
+    assert calls == ['Gomti Nagar']
+    assert 'City Clinic' in first and 'in Gomti Nagar' in first
+    assert 'in gomti nagar' in second
+
+    clinic_finder.find_nearby_clinics('Gomti Nagar', 'hindi')
+    assert len(calls) == 2
+
+    # Unknown locations are cached too
+    missing = clinic_finder.find_nearby_clinics('Atlantis', 'english')
+    clinic_finder.find_nearby_clinics('Atlantis', 'english')
+    assert calls.count('Atlantis') == 1
+    assert '"Atlantis"' in missing
+
+
+def test_clinic_replies_follow_database_changes(monkeypatch):
+    """A change to the clinics table drops cached replies even with the file snapshot"""
+    calls = []
+    provider = clinic_finder.get_clinic_provider()
+    monkeypatch.setattr(clinic_finder, 'search_nearby_clinics',
+                        lambda location, limit=10: calls.append(location) or [])
+    monkeypatch.setattr(clinic_data, 'database_version',
+                        lambda: pytest.fail('queried the clinics table in the request'))
+    monkeypatch.setattr(clinic_finder, '_results_cache', TTLCache('clinic_test', maxsize=10, ttl=60))
+
+    for version in [(3, 'mon'), (3, 'mon'), (4, 'tue')]:
+        monkeypatch.setattr(provider, 'db_version', version)
+        clinic_finder.find_nearby_clinics('Atlantis', 'english')
+    assert calls == ['Atlantis', 'Atlantis']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
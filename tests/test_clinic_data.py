@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the hot-reloading clinic data provider
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import src.clinic_data as clinic_data
+from database import Clinic, DatabaseManager
+from src.clinic_data import ClinicDataProvider
+
+CLINIC = {'name': 'City Clinic', 'address': 'Hazratganj, Lucknow - 226001', 'timing': '9 AM - 5 PM'}
+
+
+def write_clinics(path, data, mtime):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_reload_swaps_snapshot_only_on_change(tmp_path):
+    """A changed file produces a new snapshot; old readers keep theirs"""
+    path = tmp_path / 'clinics.json'
+    write_clinics(path, {'Lucknow_Hazratganj': [CLINIC]}, 1_700_000_000)
+    provider = ClinicDataProvider(source='file', path=str(path), interval=60)
+
+    old = provider.snapshot()
+    assert [c['name'] for c in old.search('226001')] == ['City Clinic']
+    assert provider.reload() is False
+
+    write_clinics(path, {'Lucknow_Hazratganj': [CLINIC],
+                         'Kanpur_Civil_Lines': [{'name': 'Civil Clinic', 'address': 'Kanpur 208001'}]},
+                  1_700_000_100)
+    assert provider.reload() is True
+
+    new = provider.snapshot()
+    assert new is not old
+    assert [c['name'] for c in new.search('kanpur')] == ['Civil Clinic']
+    assert old.search('kanpur') == []
+
+
+def test_broken_file_keeps_last_good_snapshot(tmp_path):
+    path = tmp_path / 'clinics.json'
+    write_clinics(path, {'Lucknow_Hazratganj': [CLINIC]}, 1_700_000_000)
+    provider = ClinicDataProvider(source='file', path=str(path), interval=60)
+    good = provider.snapshot()
+
+    path.write_text('{"Lucknow_Hazratganj": [', encoding='utf-8')
+    os.utime(path, (1_700_000_100, 1_700_000_100))
+    assert provider.reload() is False
+    assert provider.snapshot() is good
+
+    path.unlink()
+    assert provider.reload() is False
+    assert provider.snapshot() is good
+
+
+def test_watcher_picks_up_changes(tmp_path):
+    """The background thread reloads without any reader waiting on it"""
+    path = tmp_path / 'clinics.json'
+    write_clinics(path, {}, 1_700_000_000)
+    provider = ClinicDataProvider(source='file', path=str(path), interval=0.05)
+    assert provider.snapshot().size == 0
+
+    provider.start()
+    try:
+        write_clinics(path, {'Lucknow_Hazratganj': [CLINIC]}, 1_700_000_100)
+        deadline = time.monotonic() + 5
+        while provider.snapshot().size == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert provider.snapshot().size == 1
+    finally:
+        provider.stop()
+
+
+def test_db_source_reloads_when_clinics_change(tmp_path, monkeypatch):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'clinics.db'}", replica_urls=[])
+    manager.create_tables()
+    monkeypatch.setattr(clinic_data, 'get_db_manager', lambda: manager)
+    try:
+        with manager.get_session() as session:
+            session.add(Clinic(name='City Clinic', address=CLINIC['address'], city='Lucknow',
+                               location_key='Lucknow_Hazratganj', updated_at=datetime(2024, 1, 1)))
+        provider = ClinicDataProvider(source='db', interval=60)
+        assert [c['name'] for c in provider.snapshot().search('Lucknow_Hazratganj')] == ['City Clinic']
+        assert provider.reload() is False
+
+        with manager.get_session() as session:
+            session.add(Clinic(name='Civil Clinic', address='Kanpur 208001', city='Kanpur',
+                               location_key='Kanpur_Civil_Lines', updated_at=datetime(2024, 1, 2)))
+        assert provider.reload() is True
+        assert provider.snapshot().size == 2
+    finally:
+        manager.close()
+
+
+def test_file_source_polls_database_version(tmp_path, monkeypatch):
+    path = tmp_path / 'clinics.json'
+    path.write_text(json.dumps({'Lucknow_Hazratganj': [CLINIC]}), encoding='utf-8')
+    monkeypatch.setattr(clinic_data, 'DB_AVAILABLE', True)
+    monkeypatch.setattr(clinic_data, 'database_version', lambda: ((3, 'mon'), 0.0))
+    provider = ClinicDataProvider(source='file', path=str(path), interval=60)
+    assert provider.db_version is None
+    provider.refresh_db_version()
+    assert provider.db_version == (3, 'mon')
+
+    def unreachable():
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(clinic_data, 'database_version', unreachable)
+    provider.refresh_db_version()
+    assert provider.db_version is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
@@ -3,10 +3,11 @@
 Test script for clinic finder with new JSON fallback
 """
 
+import os
 import sys
-sys.path.insert(0, 'src')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from clinic_finder import find_nearby_clinics, search_clinics_in_json, extract_location
+from src.clinic_finder import find_nearby_clinics, search_clinics_in_json, extract_location
 
 def test_clinic_search():
     """Test various clinic search scenarios"""
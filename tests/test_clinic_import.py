@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the streaming, idempotent clinic import
+"""
+
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+import pytest
+
+import migrate_to_postgres
+from checkpoint import Checkpoint, file_fingerprint
+from database import Clinic, DatabaseManager
+from migrate_to_postgres import PincodeGeocoder, import_clinics, natural_key, normalize_clinic
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'clinics.db'}", replica_urls=[])
+    manager.create_tables()
+    yield manager
+    manager.close()
+
+
+def clinic_rows(manager):
+    with manager.get_session() as session:
+        return sorted((c.name, c.city, c.area, c.latitude, c.longitude, tuple(c.specialties or ()))
+                      for c in session.query(Clinic).all())
+
+
+def test_reimport_is_idempotent(manager):
+    """Importing the bundled clinics twice leaves one row per clinic"""
+    source = os.path.join(ROOT_DIR, 'data', 'clinics.json')
+    first = import_clinics(manager, source, batch_size=50)
+    before = clinic_rows(manager)
+    # A clinic listed under two locations is stored once per location
+    assert first['inserted'] == len(before) == first['total_clinics']
+
+    second = import_clinics(manager, source, batch_size=50)
+    assert second['inserted'] == 0
+    assert clinic_rows(manager) == before
+
+    with manager.get_session() as session:
+        keys = [key for (key,) in session.query(Clinic.natural_key).all()]
+    assert len(keys) == len(set(keys)) == len(before)
+
+
+def test_normalize_and_geocode_csv(manager, tmp_path):
+    """CSV rows are cleaned, keyed ignoring case/punctuation and geocoded by pincode"""
+    source = tmp_path / 'clinics.csv'
+    source.write_text(
+        "name,address,city,area,specialties,latitude,longitude\n"
+        "City Clinic,\"Hazratganj, Lucknow - 226001\",lucknow,Hazratganj,General; Pediatrics ;General,26.85,80.94\n"
+        "Care  Pharmacy,Aminabad Lucknow 226 001,LUCKNOW,Aminabad,Pharmacy,,\n"
+        ",No name - 226001,Lucknow,,,,\n",
+        encoding='utf-8'
+    )
+    stats = import_clinics(manager, str(source), geocoder=PincodeGeocoder())
+
+    assert (stats['inserted'], stats['failed'], stats['geocoded']) == (2, 1, 1)
+    assert clinic_rows(manager) == [
+        ('Care Pharmacy', 'Lucknow', 'Aminabad', 26.85, 80.94, ('Pharmacy',)),
+        ('City Clinic', 'Lucknow', 'Hazratganj', 26.85, 80.94, ('General', 'Pediatrics')),
+    ]
+    assert natural_key('City Clinic', 'Hazratganj, Lucknow - 226001') == \
+        natural_key('city clinic', 'Hazratganj Lucknow 226001')
+    assert natural_key('City Clinic', 'Hazratganj', 'Lucknow_Hazratganj') != \
+        natural_key('City Clinic', 'Hazratganj', 'Lucknow_Aminabad')
+    assert normalize_clinic({'name': 'X', 'address': 'Y'}, 'Kanpur_Civil_Lines')['location_key'] == \
+        'Kanpur_Civil_Lines'
+
+
+def test_older_keys_are_replaced(manager, tmp_path):
+    """Rows keyed without their location key are re-keyed, so a re-import updates them"""
+    with manager.get_session() as session:
+        session.add(Clinic(name='City Clinic', address='Hazratganj, Lucknow', city='Lucknow',
+                           location_key='Lucknow_Hazratganj', natural_key='0' * 40))
+    source = tmp_path / 'clinics.ndjson'
+    source.write_text('\n'.join(json.dumps(
+        {'name': 'City Clinic', 'address': 'Hazratganj, Lucknow', 'location_key': key}
+    ) for key in ('Lucknow_Hazratganj', 'Lucknow_Aminabad')), encoding='utf-8')
+
+    stats = import_clinics(manager, str(source))
+
+    assert stats['inserted'] == 2  # One updated, one new
+    with manager.get_session() as session:
+        assert sorted(c.location_key for c in session.query(Clinic).all()) == \
+            ['Lucknow_Aminabad', 'Lucknow_Hazratganj']
+
+
+def test_resume_after_failed_batch(manager, tmp_path, monkeypatch):
+    """A crash mid-import resumes after the last committed batch"""
+    source = tmp_path / 'clinics.ndjson'
+    source.write_text('\n'.join(
+        json.dumps({'name': f'Clinic {i}', 'address': f'Road {i}, Kanpur 208001'}) for i in range(10)
+    ), encoding='utf-8')
+    checkpoint = Checkpoint(str(tmp_path / 'import.checkpoint'), file_fingerprint(str(source)))
+
+    real_upsert = migrate_to_postgres.upsert_clinics
+    calls = []
+
+    def failing_upsert(engine, rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError("connection lost")
+        return real_upsert(engine, rows)
+
+    monkeypatch.setattr(migrate_to_postgres, 'upsert_clinics', failing_upsert)
+    with pytest.raises(RuntimeError):
+        import_clinics(manager, str(source), batch_size=3, checkpoint=checkpoint)
+    assert checkpoint.load()['records'] == 6
+
+    monkeypatch.setattr(migrate_to_postgres, 'upsert_clinics', real_upsert)
+    stats = import_clinics(manager, str(source), batch_size=3, checkpoint=checkpoint)
+
+    assert (stats['total_clinics'], stats['inserted']) == (10, 10)
+    assert len(clinic_rows(manager)) == 10
+    assert not os.path.exists(checkpoint.path)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
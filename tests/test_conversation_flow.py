@@ -1,9 +1,9 @@
 # Test the exact conversation flow from WhatsApp
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from chatbot import SwasthyaGuide
+from src.chatbot import SwasthyaGuide
 
 print("=" * 60)
 print("Simulating WhatsApp Conversation Flow")
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for conversation state persistence
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import src.conversation_state as conversation_state
+from src.chatbot import SwasthyaGuide
+from src.conversation_state import ConversationStateStore, decode_state, encode_state
+
+SENDER = 'whatsapp:+915555555555'
+
+
+def make_store(tmp_path, **kwargs):
+    return ConversationStateStore(store_path=str(tmp_path / 'state.db'), enabled=True, **kwargs)
+
+
+def test_encoding_round_trip():
+    context = {
+        'language': 'hinglish',
+        'location': 'lucknow_hazratganj',
+        'symptoms': ['fever', 'headache'],
+        'emergency_detected': False,
+        'waiting_for_location': True,
+        'last_detected_symptoms': ['fever', 'headache'],
+    }
+    data = encode_state(context)
+    assert len(data) < 80
+    assert decode_state(data) == context
+
+    fresh = SwasthyaGuide(session_id=SENDER).user_context
+    assert decode_state(encode_state(fresh)) == fresh
+
+    with pytest.raises(ValueError):
+        decode_state(data[:-1])
+    with pytest.raises(ValueError):
+        decode_state(bytes([conversation_state.STATE_VERSION + 1]) + data[1:])
+
+
+def test_state_is_shared_and_expires(tmp_path):
+    """A state saved by one worker is read by another until it expires"""
+    worker_a = make_store(tmp_path, ttl=60)
+    worker_b = make_store(tmp_path, ttl=60)
+    worker_a.save(SENDER, {'language': 'hindi', 'waiting_for_location': True})
+
+    state = worker_b.load(SENDER)
+    assert state['language'] == 'hindi' and state['waiting_for_location']
+    assert worker_b.load('whatsapp:+910000000000') is None
+
+    expired = make_store(tmp_path, ttl=0)
+    assert expired.load(SENDER) is None
+
+    disabled = ConversationStateStore(store_path=str(tmp_path / 'state.db'), enabled=False)
+    disabled.save(SENDER, {'language': 'english'})
+    assert disabled.load(SENDER) is None
+
+
+def test_location_question_survives_restart(tmp_path):
+    """The answer to 'which area?' is understood by a fresh bot instance"""
+    store = make_store(tmp_path)
+    bot = SwasthyaGuide(session_id=SENDER)
+    bot.process_message('najdeeki clinic batao')
+    assert bot.user_context['waiting_for_location']
+    bot.save_state(store)
+
+    restarted = SwasthyaGuide(session_id=SENDER)
+    assert restarted.restore_state(store)
+    assert restarted.user_context['waiting_for_location']
+    restarted.process_message('Lucknow')
+    assert not restarted.user_context['waiting_for_location']
+    assert restarted.user_context['location']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
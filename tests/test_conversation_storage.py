@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for compact conversation storage and the retention job
+"""
+
+import gzip
+import json
+import os
+import sys
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+import pytest
+
+from archive_conversations import archive_conversations
+from database import Conversation, DatabaseManager
+from database.partitions import add_months, partition_name
+from src.static_responses import expand_response, find_static, get_static, text_hash
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'conversations.db'}", replica_urls=[])
+    manager.create_tables()
+    yield manager
+    manager.close()
+
+
+def test_static_replies_round_trip_as_templates():
+    """Static replies map to a template reference and back; dynamic text does not"""
+    reply = get_static('location_prompt', 'english')
+    template_id, language = find_static(reply)
+
+    assert template_id == 'location_prompt'
+    assert expand_response(None, template_id, language) == reply
+    assert find_static('Dr. Sharma Clinic, Gomti Nagar - 0522 123456') is None
+    assert expand_response('dynamic text', None, None) == 'dynamic text'
+
+
+def test_edited_templates_are_not_expanded():
+    """A row logged before its template was edited does not expand to the new text"""
+    reply = get_static('location_prompt', 'english')
+
+    assert expand_response(None, 'location_prompt', 'english', text_hash(reply)) == reply
+    assert expand_response(None, 'location_prompt', 'english', text_hash('older wording')) is None
+
+
+def test_older_conversation_tables_get_the_new_columns(tmp_path):
+    """create_tables() adds the response_* columns to a table created before them"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'old.db'}", replica_urls=[])
+    with manager.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE conversations (id INTEGER PRIMARY KEY, "
+                          "user_message TEXT, bot_response TEXT, created_at DATETIME)"))
+        conn.execute(text("INSERT INTO conversations VALUES (1, 'hi', 'hello', '2024-01-01')"))
+
+    manager.create_tables()
+    columns = {column['name'] for column in inspect(manager.engine).get_columns('conversations')}
+
+    assert {'response_template', 'response_language', 'response_hash'} <= columns
+    assert manager.add_missing_columns() == []
+    with manager.engine.connect() as conn:
+        assert conn.execute(text("SELECT bot_response, response_hash FROM conversations")).one() == ('hello', None)
+    manager.close()
+
+
+def test_month_helpers():
+    assert add_months(datetime(2024, 11, 17), 3) == datetime(2025, 2, 1)
+    assert add_months(datetime(2024, 1, 31), -1) == datetime(2023, 12, 1)
+    assert partition_name(datetime(2024, 3, 1)) == 'conversations_2024_03'
+
+
+def test_old_months_are_archived_and_removed(manager, tmp_path):
+    """Months past retention go to .jsonl.gz and leave the table; recent ones stay"""
+    with manager.get_session() as session:
+        for month, count in ((1, 3), (2, 2), (6, 4)):
+            for i in range(count):
+                session.add(Conversation(
+                    session_id='s', user_phone='whatsapp:+919800000000', message_type='text',
+                    user_message=f'msg {i}', response_template='fever', response_language='hindi',
+                    detected_symptoms=['fever'], created_at=datetime(2024, month, 10, 12, i)
+                ))
+
+    archive_dir = tmp_path / 'archive'
+    archived = archive_conversations(manager, retention_months=3, archive_dir=str(archive_dir),
+                                     now=datetime(2024, 6, 15))
+
+    assert [(os.path.basename(path), rows) for path, rows in archived] == [
+        ('conversations_2024_01.jsonl.gz', 3),
+        ('conversations_2024_02.jsonl.gz', 2),
+    ]
+    with gzip.open(archive_dir / 'conversations_2024_01.jsonl.gz', 'rt', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [row['user_message'] for row in rows] == ['msg 0', 'msg 1', 'msg 2']
+    assert rows[0]['response_template'] == 'fever'
+    assert rows[0]['created_at'].startswith('2024-01-10')
+
+    with manager.get_session() as session:
+        assert session.query(Conversation).count() == 4
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
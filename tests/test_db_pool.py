@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for connection pool sizing and liveness checks
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from database import DatabaseManager, PoolSettings
+from database.pool import TimedQueuePool
+
+
+def test_budget_is_split_across_workers():
+    """Each worker gets an equal share of the global connection budget"""
+    settings = PoolSettings(pool_size=10, max_overflow=20, max_connections=24, workers=4)
+    assert settings.worker_limits() == (6, 0)
+
+    settings = PoolSettings(pool_size=2, max_overflow=20, max_connections=24, workers=4)
+    assert settings.worker_limits() == (2, 4)
+
+    # No budget: the configured sizes are used as they are
+    assert PoolSettings(pool_size=3, max_overflow=7).worker_limits() == (3, 7)
+
+    # A budget that cannot give every worker a connection is a configuration error
+    with pytest.raises(ValueError, match='WEB_CONCURRENCY'):
+        PoolSettings(max_connections=3, workers=4)
+    assert PoolSettings(mode='null', max_connections=3, workers=4).mode == 'null'
+
+
+def test_engine_kwargs_per_mode_and_backend():
+    """Null mode skips pooling; in-memory SQLite keeps its default pool"""
+    null = PoolSettings(mode='null').engine_kwargs('postgresql://u:p@db/app')
+    assert null == {'poolclass': NullPool}
+
+    assert PoolSettings().engine_kwargs('sqlite://') == {}
+
+    queue = PoolSettings(pool_size=4, max_overflow=1).engine_kwargs('postgresql://u:p@db/app')
+    assert queue['poolclass'] is TimedQueuePool
+    assert queue['pool_size'] == 4 and queue['max_overflow'] == 1
+    assert 'pool_pre_ping' not in queue
+    assert queue['connect_args']['keepalives'] == 1
+
+
+def test_idle_dead_connection_is_replaced_on_checkout():
+    """A connection that died while idle is pinged, dropped and replaced"""
+    path = os.path.join(tempfile.mkdtemp(), 'pool.db')
+    manager = DatabaseManager(f"sqlite:///{path}",
+                              PoolSettings(pool_size=1, max_overflow=0, liveness_interval=0.001))
+    try:
+        with manager.engine.connect() as conn:
+            dead = conn.connection.dbapi_connection
+        dead.close()  # simulate the server dropping it
+        time.sleep(0.01)
+
+        with manager.engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert conn.connection.dbapi_connection is not dead
+    finally:
+        manager.close()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-v']))
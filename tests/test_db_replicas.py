@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for read replica routing, using SQLite files as primary and replicas
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import Clinic, DatabaseManager, PoolSettings
+from database import connection
+from src.clinic_finder import search_clinics_in_db
+
+
+def make_database(path, clinic_name):
+    """SQLite file with the schema and one Lucknow clinic"""
+    url = f"sqlite:///{path}"
+    manager = DatabaseManager(url, PoolSettings(pool_size=1, max_overflow=0), replica_urls=[])
+    manager.create_tables()
+    with manager.get_session() as session:
+        session.add(Clinic(name=clinic_name, address='Hazratganj', city='Lucknow'))
+    manager.close()
+    return url
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return {
+        'primary': make_database(tmp_path / 'primary.db', 'Primary Clinic'),
+        'replica_a': make_database(tmp_path / 'a.db', 'Replica A Clinic'),
+        'replica_b': make_database(tmp_path / 'b.db', 'Replica B Clinic'),
+        'dead': f"sqlite:///{tmp_path / 'missing' / 'dead.db'}",
+    }
+
+
+def read_clinic_name(manager):
+    with manager.get_read_session() as session:
+        return session.query(Clinic.name).scalar()
+
+
+def test_reads_use_replicas_and_writes_use_primary(urls, monkeypatch):
+    """Clinic search reads a replica; session writes land on the primary"""
+    manager = DatabaseManager(urls['primary'], replica_urls=[urls['replica_a']])
+    monkeypatch.setattr(connection, '_db_manager', manager)
+    try:
+        assert [c['name'] for c in search_clinics_in_db('lucknow')] == ['Replica A Clinic']
+
+        with manager.get_session() as session:
+            session.add(Clinic(name='New Clinic', address='Aliganj', city='Lucknow'))
+        with manager.get_session() as session:
+            assert session.query(Clinic).count() == 2
+        assert len(search_clinics_in_db('lucknow')) == 1
+    finally:
+        manager.close()
+
+
+def test_round_robin_skips_failed_replica(urls):
+    """A replica that fails to connect is skipped until its cooldown ends"""
+    manager = DatabaseManager(urls['primary'],
+                              replica_urls=f"{urls['replica_a']},{urls['dead']},{urls['replica_b']}")
+    try:
+        assert read_clinic_name(manager) == 'Replica A Clinic'
+        with pytest.raises(Exception):
+            read_clinic_name(manager)  # replica-2 cannot be opened
+        assert not manager.replicas.is_up('replica-2')
+
+        names = [read_clinic_name(manager) for _ in range(4)]
+        assert names == ['Replica B Clinic', 'Replica A Clinic'] * 2
+
+        assert manager.health_check()['replicas'] == {
+            'replica-1': 'up', 'replica-2': 'down', 'replica-3': 'up'
+        }
+    finally:
+        manager.close()
+
+
+def test_primary_serves_reads_when_no_replica_is_up(urls):
+    """With every replica down (or none configured), reads go to the primary"""
+    manager = DatabaseManager(urls['primary'], replica_urls=[urls['dead']])
+    try:
+        manager.replicas.mark_down('replica-1')
+        assert read_clinic_name(manager) == 'Primary Clinic'
+    finally:
+        manager.close()
+
+    manager = DatabaseManager(urls['primary'], replica_urls='')
+    try:
+        assert read_clinic_name(manager) == 'Primary Clinic'
+    finally:
+        manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
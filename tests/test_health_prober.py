@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the background health prober
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.voice_handler as voice_handler
+from src.health_prober import DISABLED, DOWN, UP, HealthProber, check_speech
+
+
+def test_ready_only_when_required_checks_are_up():
+    """Optional checks may fail without affecting readiness"""
+    prober = HealthProber(
+        checks={'database': lambda: {'status': UP}, 'ffmpeg': lambda: {'status': DOWN}},
+        required=['database'], interval=10
+    )
+    snapshot = prober.probe()
+
+    assert snapshot['ready']
+    assert snapshot['checks']['ffmpeg']['status'] == DOWN
+    assert 'latency_ms' in snapshot['checks']['database']
+
+
+def test_speech_check_reads_credentials_without_building_clients(tmp_path, monkeypatch):
+    """The speech check never creates a voice handler (or loads the Google SDKs)"""
+    monkeypatch.setattr(voice_handler, '_voice_handler_instance', None)
+    monkeypatch.setattr(voice_handler, 'GOOGLE_AVAILABLE', True)
+    credentials = tmp_path / 'credentials.json'
+    monkeypatch.setenv('GOOGLE_APPLICATION_CREDENTIALS', str(credentials))
+
+    assert check_speech()['status'] == DOWN  # Missing file
+    credentials.write_text(json.dumps({'type': 'service_account'}), encoding='utf-8')
+    assert check_speech() == {'status': UP, 'credentials_type': 'service_account'}
+    assert voice_handler._voice_handler_instance is None
+
+    monkeypatch.setattr(voice_handler, 'GOOGLE_AVAILABLE', False)
+    assert check_speech()['status'] == DISABLED
+
+
+def test_failing_check_is_reported_not_raised():
+    """An exception inside a check marks it down"""
+    def broken():
+        raise ConnectionError('refused')
+
+    prober = HealthProber(checks={'database': broken}, required=['database'], interval=10)
+    snapshot = prober.probe()
+
+    assert not snapshot['ready']
+    assert 'refused' in snapshot['checks']['database']['error']
+
+
+def test_snapshot_is_cached_between_rounds():
+    """Reading the snapshot never runs the checks"""
+    calls = []
+    prober = HealthProber(checks={'database': lambda: calls.append(1) or {'status': UP}},
+                          required=['database'], interval=10)
+
+    assert prober.snapshot() is None
+    prober.probe()
+    for _ in range(100):
+        assert prober.snapshot()['ready']
+    assert len(calls) == 1
+
+
+def test_stale_snapshot_is_not_ready():
+    """A prober that stopped running stops reporting ready"""
+    prober = HealthProber(checks={'database': lambda: {'status': UP}},
+                          required=['database'], interval=0.01)
+    prober.probe()
+    time.sleep(0.05)
+
+    snapshot = prober.snapshot()
+    assert snapshot['stale'] and not snapshot['ready']
+
+
+def test_check_that_is_not_required_does_not_block_readiness():
+    """An app running without a database is ready; the check is still reported"""
+    prober = HealthProber(checks={'database': lambda: {'status': DOWN}},
+                          required=['database'], interval=10)
+    assert not prober.probe()['ready']
+    prober.not_required('database')
+    snapshot = prober.probe()
+    assert snapshot['ready']
+    assert snapshot['checks']['database']['status'] == DOWN
+
+
+def test_background_thread_probes():
+    """start() publishes a snapshot without anyone calling probe()"""
+    prober = HealthProber(checks={'database': lambda: {'status': UP}},
+                          required=['database'], interval=0.05)
+    prober.start()
+    try:
+        deadline = time.time() + 2
+        while prober.snapshot() is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert prober.snapshot()['ready']
+    finally:
+        prober.stop()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-v']))
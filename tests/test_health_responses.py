@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for composed multi-symptom replies
+"""
+
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import src.health_responses as health_responses
+import src.response_catalog as response_catalog
+from src.cache import TTLCache
+from src.config_loader import Config, resolve_data_path
+from src.health_responses import get_symptom_response, handle_fever, handle_headache
+from src.response_catalog import ResponseCatalog, get_response_catalog
+from src.static_responses import find_static
+
+SYMPTOMS = ['headache', 'fever', 'cough', 'cold', 'stomach_pain',
+            'vomiting', 'diarrhea', 'body_pain', 'weakness']
+
+
+@pytest.fixture
+def composed_cache(monkeypatch):
+    cache = TTLCache('symptom_replies_test', maxsize=64, ttl=float('inf'))
+    monkeypatch.setattr(health_responses, '_composed_cache', cache)
+    return cache
+
+
+def test_single_symptom_keeps_static_reply(composed_cache):
+    assert get_symptom_response(['headache'], 'marathi') is handle_headache('marathi')
+    assert find_static(get_symptom_response(['fever'], 'english')) == ('fever', 'english')
+
+
+def test_every_symptom_is_covered(composed_cache):
+    reply = get_symptom_response(['stomach_pain', 'cough', 'headache'], 'english')
+    assert '*Headache:*' in reply and '*Cough:*' in reply and '*Stomach pain:*' in reply
+    assert reply.index('*Headache:*') < reply.index('*Stomach pain:*') < reply.index('*Cough:*')
+    assert find_static(reply) is None
+
+    # Tips are trimmed evenly to fit one WhatsApp message
+    for language in ('english', 'hindi', 'hinglish'):
+        for combination in itertools.combinations(SYMPTOMS, 3):
+            assert len(get_symptom_response(list(combination), language)) <= Config.MAX_MESSAGE_LENGTH
+
+    # Languages without fragments keep the first symptom's full template
+    assert get_symptom_response(['fever', 'cough'], 'tamil') is handle_fever('tamil')
+    assert get_symptom_response(['sneezing'], 'english') == get_response_catalog().get('symptom_advice', 'english')
+
+
+def test_red_flags_are_never_trimmed(composed_cache):
+    """Only home-care tips make room; a composed reply lists every red flag"""
+    catalog = get_response_catalog().snapshot()
+    composed = 0
+    for language in ('english', 'hindi', 'hinglish'):
+        for size in (2, 3, 4):
+            for combination in itertools.combinations(SYMPTOMS, size):
+                reply = get_symptom_response(list(combination), language)
+                if find_static(reply) is not None:
+                    continue  # Too long even so: a full single-symptom template
+                composed += 1
+                for symptom in combination:
+                    for line in catalog.get('symptom_red_flags', language, symptom).split('\n'):
+                        assert line in reply, (combination, language, line)
+    assert composed
+
+
+def test_replies_are_memoized_per_symptom_set(composed_cache):
+    first = get_symptom_response(['fever', 'headache'], 'hindi')
+    assert get_symptom_response(['headache', 'fever', 'headache'], 'hindi') is first
+    assert composed_cache.stats()['hits'] == 1
+    assert get_symptom_response(['headache', 'fever'], 'english') is not first
+
+
+def test_catalog_reload_invalidates_memo(composed_cache, tmp_path, monkeypatch):
+    with open(resolve_data_path('data/translations.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    path = tmp_path / 'translations.json'
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    monkeypatch.setattr(response_catalog, '_catalog_instance', ResponseCatalog(path=str(path)))
+
+    assert '*Cold:*' in get_symptom_response(['cold', 'cough'], 'english')
+    data['responses']['symptom_name']['cold']['text']['english'] = 'Common cold'
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    os.utime(path, (1_700_000_100, 1_700_000_100))
+    assert get_response_catalog().reload() is True
+    assert '*Common cold:*' in get_symptom_response(['cold', 'cough'], 'english')
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
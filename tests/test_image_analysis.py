@@ -5,9 +5,13 @@ Tests image upload, validation, and analysis features
 """
 
 import os
+import sys
 from PIL import Image
 import io
-from image_analyzer import ImageAnalyzer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.image_analyzer import ImageAnalyzer
 
 
 def create_test_image(width=800, height=600, color='red'):
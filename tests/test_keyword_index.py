@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for spelling-tolerant keyword matching
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.keyword_index import KeywordIndex, edit_distance, fold
+from src.language_detector import detect_language
+from src.symptom_checker import extract_symptoms
+
+
+def test_fold_and_edit_distance():
+    assert fold('bhukhaar') == fold('bukhar') == fold('bukhaar') == 'bukar'
+    assert fold('zukaam') == fold('jukam')
+    assert fold('khaansi') == fold('khansi')
+    assert edit_distance('kamjori', 'kamjoir', 1) == 1  # Transposition
+    assert edit_distance('sardard', 'sirdard', 1) == 1
+    assert edit_distance('headache', 'hello', 2) == 3
+
+
+@pytest.mark.parametrize('text, symptoms', [
+    ('mujhe bukhaar hai', ['fever']),
+    ('bhukhar aa raha', ['fever']),
+    ('kal se sirdard ho raha hai', ['headache']),
+    ('kamjori lag rahi', ['weakness']),
+    ('pet me dard', ['stomach_pain']),
+    ('I am coughing a lot', ['cough']),
+    ('diarrhoea since morning', ['diarrhea']),
+    ('मला खोकला आहे', ['cough']),
+    # Words that start with a keyword
+    ('I feel feverish', ['fever']),
+    ('feverishness since yesterday', ['fever']),
+    ('stomach painful after lunch', ['stomach_pain']),
+    ('coldness in my hands', ['cold']),
+    # Near misses of short English words are not symptoms
+    ('sitting on the couch', []),
+    ('fewer people came', []),
+    ('he is sick of it', []),
+])
+def test_extract_symptoms_spelling_variants(text, symptoms):
+    assert extract_symptoms(text) == symptoms
+
+
+def test_listed_words_beat_fuzzy_neighbours():
+    index = KeywordIndex({'a': ['kamzori', 'kya'], 'b': ['kamzora', 'kyaa'], 'c': ['sir dard']})
+    assert index.find('kamzori') == {'a'}
+    assert index.find('kamzoro') == {'a', 'b'}  # Equally close to both
+    assert index.find('kya hai') == {'a'}
+    assert index.find('sirdard') == index.find('sirr dard') == {'c'}
+
+    assert detect_language('bukhaar hai kya') == 'hinglish'
+    assert detect_language('najdiki clinic batao') == 'hinglish'
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
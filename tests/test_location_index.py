@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for location recognition with the gazetteer
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.clinic_data import ClinicDataProvider
+from src.chatbot import SwasthyaGuide
+from src.clinic_finder import extract_location, recognize_location
+from src.static_responses import get_static
+from src.location_index import LocationGazetteer, find_pincode, tokenize
+
+LOCATIONS = {'cities': {'Lucknow': {
+    'aliases': ['lko', 'लखनऊ'],
+    'areas': {
+        'Gomti Nagar': {'pincode': '226010', 'aliases': ['gomtinagar', 'गोमती नगर'], 'areas': {
+            'Vibhuti Khand': {'pincode': '226010'},
+        }},
+        'Hazratganj': {'pincode': '226001'},
+    },
+    'pincodes': {'226001': ['Hazratganj'], '226010': ['Gomti Nagar']},
+}}}
+
+
+def test_longest_and_most_specific_place_wins():
+    gazetteer = LocationGazetteer(['Lucknow_Aliganj'], LOCATIONS)
+
+    match = gazetteer.match('Vibhuti Khand, Gomti Nagar, Lucknow')
+    assert (match.key, match.kind) == ('Lucknow_Gomti_Nagar_Vibhuti_Khand', 'area')
+    assert match.name == 'Vibhuti Khand'
+    assert gazetteer.match('main gomtinagar mein rehta hoon').key == 'Lucknow_Gomti_Nagar'
+    assert gazetteer.match('मैं गोमती नगर में हूँ').confidence == 0.8
+    assert gazetteer.match('lko').kind == 'city'
+
+    # Clinic keys outside the list, by key and by area name
+    assert gazetteer.match('Lucknow_Aliganj').kind == 'key'
+    assert gazetteer.match('aliganj ke paas').key == 'Lucknow_Aliganj'
+    assert gazetteer.display_name('lucknow_aliganj') == 'Aliganj'
+    assert gazetteer.match('mujhe sir dard hai') is None
+
+
+def test_pincode_validation():
+    gazetteer = LocationGazetteer((), LOCATIONS)
+    assert find_pincode(tokenize('pin 226 010')) == '226010'
+    assert find_pincode(tokenize('012345')) is None
+    assert find_pincode(tokenize('call 9876543210')) is None
+
+    assert gazetteer.match('226010').kind == 'pincode'
+    assert gazetteer.match('226 001 hazratganj').key == '226001'
+    unknown = gazetteer.match('110001')
+    assert (unknown.kind, unknown.confidence) == ('unknown_pincode', 0.5)
+    assert gazetteer.is_known_pincode('226010') and not gazetteer.is_known_pincode('110001')
+
+
+def test_free_text_fallback_and_confidence():
+    assert extract_location('Gomti Nagar') == 'Lucknow_Gomti_Nagar'
+    assert recognize_location('Bhopal').kind == 'text'
+    assert extract_location('Bhopal', min_confidence=0.5) is None
+    assert extract_location('mujhe pet mein dard hai') is None
+    assert extract_location('012345') is None
+    # Chatter is not a place
+    for text in ('how are you', 'theek hoon', 'thank you', 'ok123'):
+        assert extract_location(text) is None, text
+    assert recognize_location('Xyzabad').kind == 'text'
+
+
+def test_chatter_while_waiting_for_location_gets_the_retry_prompt():
+    bot = SwasthyaGuide(session_id='whatsapp:+919800000001')
+    bot.process_message('najdeeki clinic batao')
+    assert bot.user_context['waiting_for_location']
+
+    reply = bot.process_message('how are you')
+    assert reply == get_static('location_retry', bot.user_context['language'])
+    assert bot.user_context['waiting_for_location']
+
+
+def test_locations_file_change_rebuilds_gazetteer(tmp_path):
+    clinics, locations = tmp_path / 'clinics.json', tmp_path / 'locations.json'
+    clinics.write_text(json.dumps({'Lucknow_Hazratganj': [
+        {'name': 'City Clinic', 'address': 'Vibhuti Khand, Lucknow - 226010'}]}), encoding='utf-8')
+    locations.write_text('{}', encoding='utf-8')
+    provider = ClinicDataProvider(source='file', path=str(clinics), locations_path=str(locations), interval=60)
+    assert provider.snapshot().gazetteer.match('vibhuti khand') is None
+
+    locations.write_text(json.dumps(LOCATIONS), encoding='utf-8')
+    os.utime(locations, (1_700_000_100, 1_700_000_100))
+    assert provider.reload() is True
+    snapshot = provider.snapshot()
+    key = snapshot.gazetteer.match('vibhuti khand').key
+    # Areas without clinic keys of their own are searched by name
+    assert [c['name'] for c in snapshot.search(key)] == ['City Clinic']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for structured, PII-safe logging
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config_loader import Config
+import src.logging_setup as logging_setup
+from src.logging_setup import (
+    LogEvent, configure_logging, log_event, redact_phone, redact_text, restart_listener, stop_logging
+)
+
+
+def test_phone_is_masked():
+    """Only the channel prefix and last 4 digits survive"""
+    assert redact_phone('whatsapp:+919876543210') == 'whatsapp:***3210'
+    assert redact_phone('+919876543210') == '***3210'
+    assert redact_phone(None) == ''
+
+
+def test_text_is_replaced_by_fingerprint():
+    """Message text is never logged, identical texts share a fingerprint"""
+    redacted = redact_text('mujhe bukhar hai')
+    assert 'bukhar' not in redacted
+    assert redacted.startswith('<redacted len=16 ')
+    assert redacted == redact_text('mujhe bukhar hai')
+
+
+def test_event_is_not_built_when_level_disabled():
+    """Filtered events never touch their fields"""
+    class Exploding:
+        def __str__(self):
+            raise AssertionError('formatted a filtered event')
+
+    logger = logging.getLogger('test.lazy')
+    logger.setLevel(logging.WARNING)
+    log_event(logger, logging.INFO, 'ignored', payload=Exploding())
+
+
+def test_verbose_events_are_sampled(monkeypatch):
+    """Verbose events are dropped at a zero sample rate, kept at 1.0"""
+    records = []
+    logger = logging.getLogger('test.sampling')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+
+    monkeypatch.setattr(Config, 'LOG_SAMPLE_RATE', 0.0)
+    for _ in range(50):
+        log_event(logger, logging.DEBUG, 'noisy', verbose=True)
+    log_event(logger, logging.INFO, 'important')
+    assert [r.msg.event for r in records] == ['important']
+
+    monkeypatch.setattr(Config, 'LOG_SAMPLE_RATE', 1.0)
+    log_event(logger, logging.DEBUG, 'noisy', verbose=True)
+    assert len(records) == 2
+
+
+def test_json_output_is_redacted():
+    """Queued JSON records carry the event fields with PII masked"""
+    stream = io.StringIO()
+    configure_logging(level='INFO', log_format='json', stream=stream)
+    try:
+        log_event(logging.getLogger('test.json'), logging.INFO, 'message_received',
+                  sender='whatsapp:+919876543210', body='sir dard', num_media=0)
+    finally:
+        stop_logging()  # drains the queue
+
+    line = json.loads(stream.getvalue().strip().splitlines()[-1])
+    assert line['event'] == 'message_received'
+    assert line['sender'] == 'whatsapp:***3210'
+    assert 'sir dard' not in line['body']
+    assert line['num_media'] == 0
+    assert isinstance(LogEvent('x', {}).to_dict(), dict)
+
+
+def test_forked_child_gets_its_own_listener(monkeypatch):
+    """After fork() a new listener drains the same queue into the same output"""
+    stream = io.StringIO()
+    parent = configure_logging(level='INFO', stream=stream)
+    try:
+        restart_listener()
+        assert logging_setup._listener is parent  # Same process: nothing to do
+
+        parent.stop()  # The parent's thread does not exist in a real child
+        monkeypatch.setattr(logging_setup.os, 'getpid', lambda: -1)  # As seen in a child
+        restart_listener()
+        child = logging_setup._listener
+        assert child is not parent
+        assert child.queue is parent.queue and child.handlers == parent.handlers
+
+        logging.getLogger('test.fork').info('from the child')
+    finally:
+        stop_logging()
+
+    assert 'from the child' in stream.getvalue()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the cached message analysis
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import src.message_analysis as message_analysis
+from src.config_loader import Config
+from src.message_analysis import analyze_message, get_analysis_cache, normalize_message
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(message_analysis, '_analysis_cache', None)
+
+
+def test_repeated_short_messages_are_analyzed_once():
+    first = analyze_message('Mujhe bukhar hai')
+    assert first.language == 'hinglish'
+    assert first.symptoms == ('fever',)
+    assert analyze_message('  Mujhe   bukhar hai ') is first
+    assert normalize_message('  Mujhe   bukhar hai ') == 'Mujhe bukhar hai'
+
+    pincode = analyze_message('226010')
+    assert pincode.location_key() == '226010'
+    assert analyze_message('Bhopal').location_key(min_confidence=0.5) is None
+    assert analyze_message('najdeeki clinic batao').clinic_request
+
+    stats = get_analysis_cache().stats()
+    assert (stats['hits'], stats['misses']) == (1, 4)
+
+
+def test_free_text_locations_keep_their_case():
+    """Locations are recognized in the message as sent, not in the cache key"""
+    assert analyze_message('Xyzabad').location_key() == 'Xyzabad'
+    assert analyze_message('xyzabad').location_key() == 'xyzabad'
+
+
+def test_stages_call_the_module_functions(monkeypatch):
+    """The NLP functions are timed at the call site, not rebound in this module"""
+    from src import language_detector
+    assert message_analysis.detect_language is language_detector.detect_language
+
+    monkeypatch.setattr(message_analysis, 'detect_language', lambda text: 'english')
+    assert analyze_message('Mujhe bukhar hai').language == 'english'
+
+
+def test_long_messages_and_disabled_cache_bypass_it(monkeypatch):
+    long_text = 'mujhe kal raat se bahut tez bukhar hai aur sir mein bhi dard ho raha hai doctor'
+    assert len(long_text) > Config.ANALYSIS_CACHE_MAX_LENGTH
+    assert analyze_message(long_text).symptoms == ('fever',)
+    assert len(get_analysis_cache()) == 0
+
+    monkeypatch.setattr(Config, 'ANALYSIS_CACHE_SIZE', 0)
+    monkeypatch.setattr(message_analysis, '_analysis_cache', None)
+    assert analyze_message('ok') is not analyze_message('ok')
+
+
+def test_new_clinic_snapshot_empties_cache(monkeypatch):
+    class Snapshot:
+        version = 1
+
+    class Provider:
+        def snapshot(self):
+            return Snapshot
+
+    monkeypatch.setattr(message_analysis, 'get_clinic_provider', Provider)
+    cached = analyze_message('haan')
+    assert analyze_message('haan') is cached
+    Snapshot.version = 2
+    assert analyze_message('haan') is not cached
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
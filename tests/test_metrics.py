@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the metrics module and /metrics aggregation
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src import metrics
+
+WORKER_SCRIPT = """
+from src.metrics import instrument, stage_timer, count_message
+@instrument('intent_matching')
+def work():
+    return 1
+for _ in range({n}):
+    work()
+with stage_timer('db_log'):
+    pass
+count_message('text', 'ok')
+"""
+
+POOL_SCRIPT = """
+import sys, tempfile
+from sqlalchemy import event, text
+from database import DatabaseManager, PoolSettings
+from src.metrics import instrument_engine, render_metrics
+settings = PoolSettings(pool_size=2, max_overflow=2)
+primary = DatabaseManager('sqlite:///' + tempfile.mkdtemp() + '/a.db', settings)
+other = DatabaseManager('sqlite:///' + tempfile.mkdtemp() + '/b.db', settings)
+instrument_engine(primary.engine)
+instrument_engine(primary.engine)  # second call must not stack listeners
+for _ in range(3):
+    with primary.engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+with other.engine.connect() as conn:
+    conn.execute(text('SELECT 1'))
+primary.engine.dispose()
+assert primary.engine.pool.wait_observer is not None
+assert other.engine.pool.wait_observer is None
+sys.stdout.write(render_metrics()[0].decode())
+"""
+
+RENDER_SCRIPT = """
+import sys
+from src.metrics import render_metrics
+sys.stdout.write(render_metrics()[0].decode())
+"""
+
+
+def run_python(code, multiproc_dir):
+    env = dict(os.environ, METRICS_ENABLED='True', PROMETHEUS_MULTIPROC_DIR=str(multiproc_dir))
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_disabled_metrics_are_no_ops(monkeypatch):
+    """With metrics off, timers are one shared object and decorators pass through"""
+    monkeypatch.setattr(metrics, '_enabled', False)
+
+    assert metrics.stage_timer('a') is metrics.stage_timer('b')
+    with metrics.stage_timer('a'):
+        pass
+
+    @metrics.instrument('x')
+    def add(a, b):
+        return a + b
+
+    assert add(2, 3) == 5
+    assert metrics.render_metrics()[0] == b''
+
+
+def test_workers_are_aggregated(tmp_path):
+    """Samples written by separate processes are summed by one scrape"""
+    pytest.importorskip('prometheus_client')
+
+    run_python(WORKER_SCRIPT.format(n=3), tmp_path)
+    run_python(WORKER_SCRIPT.format(n=4), tmp_path)
+    output = run_python(RENDER_SCRIPT, tmp_path)
+
+    assert 'swasthya_stage_seconds_count{stage="intent_matching"} 7.0' in output
+    assert 'swasthya_stage_seconds_count{stage="db_log"} 2.0' in output
+    assert 'swasthya_messages_total{outcome="ok",type="text"} 2.0' in output
+
+
+def test_pool_instrumentation_is_per_engine(tmp_path):
+    """Only the instrumented engine reports pool metrics, each checkout once"""
+    pytest.importorskip('prometheus_client')
+
+    output = run_python(POOL_SCRIPT, tmp_path)
+
+    assert 'swasthya_db_pool_wait_seconds_count{pool="primary"} 3.0' in output
+    assert 'swasthya_db_connection_lifetime_seconds_count{pool="primary"} 1.0' in output
+    assert 'swasthya_db_pool_saturation{pool="primary"} 0.0' in output
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
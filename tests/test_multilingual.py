@@ -4,8 +4,12 @@ Multilingual Support Test Script
 Tests language detection and response generation in all 8 languages
 """
 
-from language_detector import detect_language, get_language_name
-from chatbot import SwasthyaGuide
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.language_detector import detect_language, get_language_name
+from src.chatbot import SwasthyaGuide
 
 # Test cases for each language
 test_cases = {
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for per-sender rate limiting and load shedding
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rate_limiter import WebhookRateLimiter
+
+
+def make_limiter(tmp_path):
+    return WebhookRateLimiter(store_path=str(tmp_path / 'buckets.db'), enabled=True)
+
+
+def test_sender_burst_is_limited(tmp_path):
+    """A single sender cannot exceed the burst size"""
+    limiter = make_limiter(tmp_path)
+    burst = int(limiter.message_bucket.capacity)
+
+    results = [limiter.allow_sender('whatsapp:+911111111111') for _ in range(burst + 3)]
+
+    assert results[:burst] == [True] * burst
+    assert results[burst:] == [False] * 3
+    # Other senders keep their own budget
+    assert limiter.allow_sender('whatsapp:+912222222222')
+
+
+def test_media_has_separate_budget(tmp_path):
+    """Media messages run out before text messages do"""
+    limiter = make_limiter(tmp_path)
+    media_burst = int(limiter.media_bucket.capacity)
+
+    for _ in range(media_burst):
+        assert limiter.allow_sender('whatsapp:+913333333333', is_media=True)
+    assert not limiter.allow_sender('whatsapp:+913333333333', is_media=True)
+    assert limiter.allow_sender('whatsapp:+913333333333', is_media=False)
+
+
+def test_rejected_media_keeps_the_message_budget(tmp_path):
+    """A media message over the media budget does not spend a message token"""
+    limiter = make_limiter(tmp_path)
+    burst = int(limiter.message_bucket.capacity)
+    media_burst = int(limiter.media_bucket.capacity)
+
+    for _ in range(media_burst + 5):
+        limiter.allow_sender('whatsapp:+915555555555', is_media=True)
+    text_allowed = sum(limiter.allow_sender('whatsapp:+915555555555') for _ in range(burst))
+    assert text_allowed == burst - media_burst
+
+
+def test_budget_is_shared_between_instances(tmp_path):
+    """Two limiters on the same store (two workers) share one bucket"""
+    worker_a = make_limiter(tmp_path)
+    worker_b = make_limiter(tmp_path)
+    burst = int(worker_a.message_bucket.capacity)
+
+    for i in range(burst):
+        limiter = worker_a if i % 2 else worker_b
+        assert limiter.allow_sender('whatsapp:+914444444444')
+    assert not worker_a.allow_sender('whatsapp:+914444444444')
+    assert not worker_b.allow_sender('whatsapp:+914444444444')
+
+
+def test_concurrency_cap_sheds_load(tmp_path):
+    """Requests beyond the concurrency cap are rejected immediately"""
+    limiter = make_limiter(tmp_path)
+
+    for _ in range(limiter.max_concurrent):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-v']))
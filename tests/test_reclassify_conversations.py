@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the batch re-classification of logged conversations
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+import pytest
+
+import reclassify_conversations
+from checkpoint import Checkpoint
+from database import Conversation, DatabaseManager
+from reclassify_conversations import reclassify_conversations as reclassify
+from src.batch_analysis import classify_message
+
+START = datetime(2024, 3, 1, 9, 0)
+
+# (message_type, user_message, language, detected_intent, detected_symptoms, is_emergency) as logged
+LOGGED = [
+    ('text', 'mujhe bukhaar hai', 'hindi', 'general', [], False),         # Now a symptom in Hinglish
+    ('text', 'mujhe bukhar hai', 'hinglish', 'symptom_check', ['fever'], False),  # Unchanged
+    ('text', 'sitting on the couch', 'english', 'symptom_check', ['cough'], False),  # No longer a symptom
+    ('text', 'Lucknow', 'hindi', 'clinic_search', ['fever'], False),       # Only the language is redone
+    ('image', 'Image: skin rash', 'english', 'image_analysis', None, False),
+    ('voice', 'seene mein dard ho raha hai', 'hinglish', 'general', None, False),  # Emergency
+    ('text', 'bukhar aur khansi hai', 'hinglish', 'emergency', [], True),  # No longer an emergency
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'conversations.db'}", replica_urls=[])
+    manager.create_tables()
+    with manager.get_session() as session:
+        for i, (message_type, text, language, intent, symptoms, is_emergency) in enumerate(LOGGED):
+            session.add(Conversation(session_id='s', message_type=message_type, user_message=text,
+                                     language=language, detected_intent=intent,
+                                     detected_symptoms=symptoms, is_emergency=is_emergency,
+                                     created_at=START + timedelta(days=i)))
+        session.commit()
+    yield manager
+    manager.close()
+
+
+def logged(manager):
+    with manager.get_session() as session:
+        return [(c.language, c.detected_intent, c.detected_symptoms, c.is_emergency)
+                for c in session.query(Conversation).order_by(Conversation.id)]
+
+
+def test_only_changed_rows_are_written(manager):
+    before = logged(manager)
+    assert classify_message(*LOGGED[1]) is None
+
+    dry = reclassify(manager.engine, chunk_size=2, workers=1, dry_run=True)
+    assert (dry['rows'], dry['changed']) == (7, 5)
+    assert logged(manager) == before
+
+    stats = reclassify(manager.engine, chunk_size=2, workers=1)
+    assert (stats['rows'], stats['changed']) == (7, 5)
+    assert stats['first_changed'][:10] == '2024-03-01' and stats['last_changed'][:10] == '2024-03-07'
+    after = logged(manager)
+    assert after[0] == ('hinglish', 'symptom_check', ['fever'], False)
+    assert after[1] == before[1]
+    assert after[2] == ('english', 'general', [], False)
+    assert after[3] == ('english', 'clinic_search', ['fever'], False)
+    assert after[4] == before[4]
+    assert after[5][1:] == ('emergency', None, True)
+
+    assert reclassify(manager.engine, chunk_size=2, workers=1)['changed'] == 0
+
+
+def test_emergency_flag_follows_the_intent(manager):
+    """An emergency that is now a symptom check is no longer counted as an emergency"""
+    assert classify_message(*LOGGED[6]) == {
+        'language': 'hinglish', 'detected_intent': 'symptom_check',
+        'detected_symptoms': ['fever', 'cough'], 'is_emergency': False,
+    }
+    reclassify(manager.engine, chunk_size=2, workers=1)
+    assert logged(manager)[6] == ('hinglish', 'symptom_check', ['fever', 'cough'], False)
+
+
+def test_resume_after_failed_window(manager, tmp_path, monkeypatch):
+    """A crash mid-run resumes after the last written window"""
+    checkpoint = Checkpoint(str(tmp_path / 'reclassify.checkpoint'), {'rules': 'test'})
+    real_classify = reclassify_conversations.classify_batch
+    calls = []
+
+    def failing_classify(rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("worker died")
+        return real_classify(rows)
+
+    # One worker: windows of chunk_size * CHUNKS_PER_WORKER rows
+    monkeypatch.setattr(reclassify_conversations, 'CHUNKS_PER_WORKER', 1)
+    monkeypatch.setattr(reclassify_conversations, 'classify_batch', failing_classify)
+    with pytest.raises(RuntimeError):
+        reclassify(manager.engine, chunk_size=3, workers=1, checkpoint=checkpoint)
+    assert checkpoint.load()['last_id'] == 3
+    assert logged(manager)[0][1] == 'symptom_check'
+    assert logged(manager)[5][1] == 'general'
+
+    monkeypatch.setattr(reclassify_conversations, 'classify_batch', real_classify)
+    stats = reclassify(manager.engine, chunk_size=3, workers=1, checkpoint=checkpoint)
+    assert (stats['rows'], stats['changed']) == (7, 5)
+    assert logged(manager)[5][1] == 'emergency'
+    assert not os.path.exists(checkpoint.path)
+
+
+def test_worker_pool_matches_inline_run(manager):
+    stats = reclassify(manager.engine, chunk_size=1, workers=2, dry_run=True)
+    assert (stats['rows'], stats['changed']) == (7, 5)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the response catalog and its hot reload
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import src.response_catalog as response_catalog
+from src.config_loader import resolve_data_path
+from src.emergency_handler import get_emergency_response
+from src.health_responses import get_symptom_response, handle_fever
+from src.response_catalog import CatalogSnapshot, ResponseCatalog, get_response_catalog
+from src.static_responses import CATALOG_TEMPLATES, find_static, get_static
+from src.twiml_renderer import render_static, warm_static_cache
+
+DATA = {
+    'greetings': {'hindi': 'Namaste!', 'english': 'Hello!'},
+    'language_fallbacks': {'hinglish': ['hindi']},
+    'responses': {
+        'symptom_advice': {
+            'fever': {'default': 'hinglish', 'text': {'hinglish': 'Bukhar hai', 'english': 'Fever'}},
+            '*': {'default': 'hindi', 'text': {'hindi': 'Doctor se milein', 'english': 'See a doctor'}},
+        },
+        'error': {'empty': {'default': '*', 'text': {'*': 'संदेश भेजें / Send a message'}}},
+    },
+}
+
+
+def write_catalog(path, data, mtime):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_lookup_and_language_fallbacks():
+    catalog = CatalogSnapshot(DATA)
+    assert catalog.get('symptom_advice', 'english', 'fever') == 'Fever'
+    assert catalog.get('symptom_advice', 'tamil', 'fever') == 'Bukhar hai'  # template default
+    assert catalog.get('symptom_advice', 'hinglish') == 'Doctor se milein'  # hinglish -> hindi
+    assert catalog.get('symptom_advice', 'english', 'cough') == 'See a doctor'  # unknown symptom
+    assert catalog.get('greetings', 'xx') == 'Hello!'  # phrases fall back to English
+    assert catalog.get('error', 'hindi', 'empty') == 'संदेश भेजें / Send a message'
+    assert catalog.variants('error', 'empty') == {None: 'संदेश भेजें / Send a message'}
+    with pytest.raises(KeyError):
+        catalog.get('nonexistent', 'hindi')
+
+    # Adding a language is a data change only
+    data = json.loads(json.dumps(DATA))
+    data['greetings']['odia'] = 'Namaskar!'
+    catalog = CatalogSnapshot(data)
+    assert 'odia' in catalog.languages
+    assert catalog.get('greetings', 'odia') == 'Namaskar!'
+    assert catalog.get('symptom_advice', 'odia', 'fever') == 'Bukhar hai'
+
+
+def test_shipped_catalog_serves_every_reply():
+    """The bundled translations.json covers every registry template in every language"""
+    catalog = get_response_catalog().snapshot()
+    for language in catalog.languages + [None]:
+        for template_id, (intent, symptom) in CATALOG_TEMPLATES.items():
+            assert catalog.get(intent, language, symptom)
+
+    # One lookup, same interned object every time
+    assert handle_fever('tamil') is handle_fever('hinglish')
+    assert get_symptom_response(['fever'], 'english') is catalog.get('symptom_advice', 'english', 'fever')
+    assert '108' in get_emergency_response('bengali')
+
+
+def test_reload_swaps_catalog_and_notifies(tmp_path):
+    path = tmp_path / 'translations.json'
+    write_catalog(path, DATA, 1_700_000_000)
+    catalog = ResponseCatalog(path=str(path), interval=60)
+    notified = []
+    catalog.subscribe(notified.append)
+
+    old = catalog.snapshot()
+    assert catalog.get('greetings', 'english') == 'Hello!'
+    assert catalog.reload() is False
+    assert notified == []
+
+    data = json.loads(json.dumps(DATA))
+    data['greetings']['english'] = 'Hi there!'
+    write_catalog(path, data, 1_700_000_100)
+    assert catalog.reload() is True
+    assert catalog.get('greetings', 'english') == 'Hi there!'
+    assert notified == [catalog.snapshot()]
+    assert old.get('greetings', 'english') == 'Hello!'
+
+    # A broken edit keeps the last good catalog
+    path.write_text('{"greetings": ', encoding='utf-8')
+    os.utime(path, (1_700_000_200, 1_700_000_200))
+    assert catalog.reload() is False
+    assert catalog.get('greetings', 'english') == 'Hi there!'
+
+
+def test_reload_refreshes_static_replies(tmp_path, monkeypatch):
+    """Edited templates reach get_static, find_static and the TwiML cache"""
+    with open(resolve_data_path('data/translations.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    path = tmp_path / 'translations.json'
+    write_catalog(path, data, 1_700_000_000)
+    monkeypatch.setattr(response_catalog, '_catalog_instance', ResponseCatalog(path=str(path)))
+    try:
+        warm_static_cache()
+        edited = '🚨 Call 108 now.'
+        data['responses']['emergency']['*']['text']['english'] = edited
+        write_catalog(path, data, 1_700_000_100)
+        assert get_response_catalog().reload() is True
+
+        assert get_static('emergency', 'english') == edited
+        assert find_static(edited) == ('emergency', 'english')
+        assert edited.encode('utf-8') in render_static('emergency', 'english')
+    finally:
+        monkeypatch.undo()
+        warm_static_cache()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
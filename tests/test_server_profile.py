@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for the gunicorn server profile
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import pytest
+import requests
+
+import src.server_profile as server_profile
+from src.config_loader import Config
+from src.server_profile import cpu_limit, memory_limit_mb, thread_count, worker_count
+
+
+def test_worker_count_from_cpus_and_memory():
+    assert worker_count(cpus=0.1, memory_mb=512, worker_memory_mb=200) == 2  # Render free plan
+    assert worker_count(cpus=1, memory_mb=6000, worker_memory_mb=200) == 2
+    assert worker_count(cpus=4, memory_mb=8192, worker_memory_mb=200) == 5
+    assert worker_count(cpus=4, memory_mb=500, worker_memory_mb=200) == 2  # memory bound
+    assert worker_count(cpus=8, memory_mb=256, worker_memory_mb=200) == 1
+
+
+def test_limits_come_from_cgroup(tmp_path, monkeypatch):
+    cpu_max, memory_max = tmp_path / 'cpu.max', tmp_path / 'memory.max'
+    cpu_max.write_text('50000 100000\n')
+    memory_max.write_text(str(512 * 2 ** 20) + '\n')
+    monkeypatch.setattr(server_profile, 'CGROUP_CPU_MAX', str(cpu_max))
+    monkeypatch.setattr(server_profile, 'CGROUP_MEMORY_MAX', str(memory_max))
+    assert cpu_limit() == 0.5
+    assert memory_limit_mb() == 512
+
+    # No limit set: fall back to the host
+    cpu_max.write_text('max 100000\n')
+    memory_max.write_text('max\n')
+    assert cpu_limit() >= 1
+    assert memory_limit_mb() > 0
+
+    assert thread_count('sync') == 1
+
+
+def test_default_threads_leave_room_for_busy_replies(monkeypatch, caplog):
+    """More threads than concurrency slots, so the slot limit can actually be hit"""
+    monkeypatch.setattr(Config, 'MAX_CONCURRENT_REQUESTS', 8)
+    monkeypatch.setattr(Config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(Config, 'GUNICORN_THREADS', 0)
+    assert thread_count('gthread') == 8 + server_profile.BUSY_HEADROOM
+    assert not caplog.records
+
+    monkeypatch.setattr(Config, 'GUNICORN_THREADS', 8)
+    assert thread_count('gthread') == 8
+    assert 'busy reply' in caplog.text
+
+
+MASTER_SCRIPT = '''
+import sys
+import app
+from src import server_profile, voice_handler
+from src.health_prober import get_health_prober
+
+get_health_prober().probe()  # What the master's prober runs before the fork
+server_profile.prepare_master()
+loaded = [name for name, module in sys.modules.items()
+          if name.startswith('google.cloud.') and type(module).__name__ != '_LazyModule']
+print('loaded:', ','.join(sorted(loaded)))
+
+voice_handler._voice_handler_instance = object()  # Stands in for one built before the fork
+server_profile.init_worker()
+print('reset:', voice_handler._voice_handler_instance is None)
+'''
+
+
+def test_master_does_not_load_google_cloud(tmp_path):
+    """Preloading and probing leave the Google SDKs unloaded; workers drop any voice handler"""
+    credentials = tmp_path / 'credentials.json'
+    credentials.write_text('{"type": "service_account"}', encoding='utf-8')
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}", PROMETHEUS_MULTIPROC_DIR='',
+               GOOGLE_APPLICATION_CREDENTIALS=str(credentials), HUGGINGFACE_API_KEY='')
+    result = subprocess.run([sys.executable, '-c', MASTER_SCRIPT], cwd=ROOT_DIR, env=env,
+                            capture_output=True, text=True, timeout=120)
+
+    assert result.returncode == 0, result.stderr
+    assert 'loaded: \n' in result.stdout
+    assert 'reset: True' in result.stdout
+
+
+def test_preloaded_workers_serve_after_fork(tmp_path):
+    """Two workers forked from a preloaded master use their own DB connections and threads"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}", WEB_CONCURRENCY='2',
+               GUNICORN_THREADS='2', PROMETHEUS_MULTIPROC_DIR='')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'app:app'],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        deadline = time.monotonic() + 60
+        reports = []
+        while time.monotonic() < deadline and len(reports) < 10:
+            try:
+                response = requests.get(f"http://127.0.0.1:{port}/readyz", timeout=2)
+                if response.status_code == 200:
+                    reports.append(response.json())
+            except requests.RequestException:
+                time.sleep(0.2)
+        assert len(reports) == 10
+        assert all(report['checks']['database']['status'] == 'up' for report in reports)
+    finally:
+        server.terminate()
+        _, stderr = server.communicate(timeout=30)
+
+    assert 'Serving with 2 gthread workers x 2 threads' in stderr
+    assert 'Preloaded app frozen' in stderr
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
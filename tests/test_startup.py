@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for lazy imports and the cold-start import budget
+"""
+
+import os
+import sys
+import threading
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+import pytest
+
+from check_startup import DEFAULT_BUDGET_MS, check_startup
+from src.lazy_import import lazy_import
+
+
+def test_lazy_import_runs_module_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / 'lazy_probe.py').write_text(
+        "import builtins\nbuiltins.lazy_probe_loaded = True\nVALUE = 42\n", encoding='utf-8'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'lazy_probe', raising=False)
+    import builtins
+    monkeypatch.setattr(builtins, 'lazy_probe_loaded', False, raising=False)
+
+    module = lazy_import('lazy_probe')
+    assert builtins.lazy_probe_loaded is False
+    assert module.VALUE == 42
+    assert builtins.lazy_probe_loaded is True
+    assert lazy_import('lazy_probe') is sys.modules['lazy_probe']
+
+    with pytest.raises(ImportError):
+        lazy_import('surely_not_installed_module')
+
+
+def test_first_use_from_many_threads_waits_for_the_load(tmp_path, monkeypatch):
+    """No thread sees a half-executed module; its code runs once"""
+    (tmp_path / 'lazy_slow.py').write_text(
+        "import builtins, time\n"
+        "builtins.lazy_slow_runs += 1\n"
+        "time.sleep(0.2)\n"
+        "VALUE = 42\n", encoding='utf-8'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'lazy_slow', raising=False)
+    import builtins
+    monkeypatch.setattr(builtins, 'lazy_slow_runs', 0, raising=False)
+
+    module = lazy_import('lazy_slow')
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(getattr(module, 'VALUE', None)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 8
+    assert builtins.lazy_slow_runs == 1
+
+
+def test_image_analysis_loads_numpy_and_pil_on_demand():
+    from src.image_analyzer import Image, ImageAnalyzer
+    image = Image.new('RGB', (8, 8), (200, 40, 40))
+    colors = ImageAnalyzer().analyze_colors(image)
+    assert colors['mean_rgb'][0] == pytest.approx(200)
+
+
+def test_app_cold_start_within_budget():
+    """Heavy libraries stay unloaded and importing app.py fits the budget"""
+    budget_ms = float(os.getenv('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS))
+    report = check_startup('app', budget_ms, runs=2)
+    assert report['heavy'] == []
+    assert report['import_ms'] <= budget_ms, f"import app took {report['import_ms']:.0f} ms"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-v']))
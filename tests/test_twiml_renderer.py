@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Test script for pre-rendered TwiML replies
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from twilio.twiml.messaging_response import MessagingResponse
+
+from src.emergency_handler import get_emergency_response
+from src.static_responses import iter_static_responses
+from src.twiml_renderer import render_message, render_static, twiml_response, warm_static_cache
+
+
+def twilio_reference(text):
+    """What the Twilio helper library would have produced"""
+    resp = MessagingResponse()
+    resp.message(text)
+    return str(resp).encode('utf-8')
+
+
+def test_static_replies_match_twilio_output():
+    """Every pre-rendered reply is byte-identical to MessagingResponse"""
+    warm_static_cache()
+    for template_id, language, text in iter_static_responses():
+        assert render_static(template_id, language) == twilio_reference(text), (template_id, language)
+
+
+def test_dynamic_replies_are_escaped():
+    """Dynamic text with XML special characters is escaped like Twilio does"""
+    text = 'Clinic "A&B" <24h> - हिंदी\n2nd line'
+    assert render_message(text) == twilio_reference(text)
+
+
+def test_static_lookup_by_text():
+    """A reply returned by the bot is served from the cache"""
+    warm_static_cache()
+    text = get_emergency_response('tamil')
+    assert render_message(text) is render_static('emergency', 'tamil')
+
+
+def test_localized_busy_reply():
+    """Busy reply follows the user's language with a bilingual default"""
+    assert 'try again' in render_static('busy', 'english').decode('utf-8')
+    assert 'dobara' in render_static('busy', 'hindi').decode('utf-8')
+    assert 'Please try again' in render_static('busy', None).decode('utf-8')
+
+
+def test_response_has_content_length():
+    """Flask response carries the exact body length"""
+    body = render_static('error_empty')
+    with Flask(__name__).app_context():
+        response = twiml_response(body)
+    assert response.headers['Content-Length'] == str(len(body))
+    assert response.headers['Content-Type'] == 'text/xml; charset=utf-8'
+    assert response.get_data() == body
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-v']))
@@ -4,7 +4,11 @@ Test script to verify webhook functionality locally
 Run this to test if the bot responds correctly
 """
 
-from chatbot import SwasthyaGuide
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.chatbot import SwasthyaGuide
 
 def test_bot():
     """Test the bot with various messages"""